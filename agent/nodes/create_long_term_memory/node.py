@@ -22,6 +22,7 @@ class CreateLongTermMemoryNode(Node[AgentStore]):
         service = CreateLongTermMemoryService(
             iteration=state.iteration,
             state_string_builder=state.to_prompt_string,
+            prompt_prefix=state.to_prompt_prefix(),
             emulator=self.emulator,
         )
         await service.create_long_term_memory()
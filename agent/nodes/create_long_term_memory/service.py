@@ -2,7 +2,7 @@ from loguru import logger
 
 from agent.nodes.create_long_term_memory.prompts import CREATE_LONG_TERM_MEMORY_PROMPT
 from agent.nodes.create_long_term_memory.schemas import CreateLongTermMemoryResponse
-from common.embedding_service import get_embedding
+from common.embedding_service import EmbeddingRequest, get_embeddings
 from common.types import StateStringBuilderT
 from database.long_term_memory.repository import (
     create_long_term_memory,
@@ -12,6 +12,7 @@ from database.long_term_memory.schemas import LongTermMemoryCreate
 from emulator.emulator import YellowLegacyEmulator
 from llm.schemas import GEMINI_FLASH_2_5
 from llm.service import GeminiLLMService
+from memory.embedding_index import embedding_index
 
 
 class CreateLongTermMemoryService:
@@ -23,10 +24,12 @@ class CreateLongTermMemoryService:
         self,
         iteration: int,
         state_string_builder: StateStringBuilderT,
+        prompt_prefix: str,
         emulator: YellowLegacyEmulator,
     ) -> None:
         self.iteration = iteration
         self.state_string_builder = state_string_builder
+        self.prompt_prefix = prompt_prefix
         self.emulator = emulator
 
     async def create_long_term_memory(self) -> None:
@@ -42,9 +45,12 @@ class CreateLongTermMemoryService:
                 prompt,
                 CreateLongTermMemoryResponse,
                 prompt_name="create_long_term_memory",
+                prompt_prefix=self.prompt_prefix,
             )
-            for piece in response.pieces:
-                embedding = await get_embedding(piece.content, piece.title)
+            embeddings = await get_embeddings(
+                [EmbeddingRequest(text=p.content, title=p.title) for p in response.pieces],
+            )
+            for piece, embedding in zip(response.pieces, embeddings, strict=True):
                 await create_long_term_memory(
                     LongTermMemoryCreate(
                         title=piece.title,
@@ -54,5 +60,6 @@ class CreateLongTermMemoryService:
                         embedding=embedding,
                     ),
                 )
+                embedding_index.add(piece.title, embedding)
         except Exception as e:  # noqa: BLE001
             logger.warning(f"Error creating long-term memory. Skipping.\n{e}")
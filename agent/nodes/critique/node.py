@@ -23,6 +23,7 @@ class CritiqueNode(Node[AgentStore]):
             iteration=state.iteration,
             raw_memory=state.raw_memory,
             state_string_builder=state.to_prompt_string,
+            prompt_prefix=state.to_prompt_prefix(),
             emulator=self.emulator,
         )
         raw_memory = await service.critique()
@@ -15,18 +15,20 @@ class CritiqueService:
         iteration: int,
         raw_memory: RawMemory,
         state_string_builder: StateStringBuilderT,
+        prompt_prefix: str,
         emulator: YellowLegacyEmulator,
     ) -> None:
         self.iteration = iteration
         self.raw_memory = raw_memory
         self.state_string_builder = state_string_builder
+        self.prompt_prefix = prompt_prefix
         self.emulator = emulator
         self.llm_service = GeminiLLMService(GEMINI_PRO_2_5)
 
     async def critique(self) -> RawMemory:
         """Critique the current state of the game."""
         game_state = self.emulator.get_game_state()
-        screenshot = self.emulator.get_screenshot()
+        screenshot = self.emulator.get_screenshot().png
         prompt = CRITIQUE_PROMPT.format(
             state=self.state_string_builder(game_state),
             onscreen_text=game_state.screen.text,
@@ -36,6 +38,7 @@ class CritiqueService:
                 [screenshot, prompt],
                 schema=CritiqueResponse,
                 prompt_name="general_critique",
+                prompt_prefix=self.prompt_prefix,
                 thinking_tokens=1024,
             )
             self.raw_memory.add_memory(
@@ -1,5 +1,6 @@
 from agent.enums import AgentStateHandler
 from common.constants import ITERATIONS_PER_LONG_TERM_MEMORY_RETRIEVAL
+from emulator.animation import CUTSCENE_ANIMATION
 from emulator.emulator import YellowLegacyEmulator
 from memory.long_term_memory import LongTermMemory
 
@@ -21,11 +22,10 @@ class PrepareAgentStateService:
         """
         Wait until all animations have finished so that we can begin the Agent loop.
 
-        We run the check twice to be absolutely sure. Some cutscenes have a slight delay between
-        actions, and missing that can cause weird downstream issues.
+        Some cutscenes have a slight delay between actions, and missing that can cause weird
+        downstream issues, so this waits with the longer cutscene thresholds.
         """
-        await self.emulator.wait_for_animation_to_finish()
-        await self.emulator.wait_for_animation_to_finish()
+        await self.emulator.wait_for_animation_to_finish(CUTSCENE_ANIMATION)
 
     async def determine_handler(self) -> AgentStateHandler:
         """Determine which handler to use based on the current game state."""
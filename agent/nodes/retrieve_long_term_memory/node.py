@@ -23,6 +23,7 @@ class RetrieveLongTermMemoryNode(Node[AgentStore]):
             iteration=state.iteration,
             long_term_memory=state.long_term_memory,
             state_string_builder=state.to_prompt_string,
+            prompt_prefix=state.to_prompt_prefix(),
             emulator=self.emulator,
         )
         long_term_memory = await service.retrieve_long_term_memory()
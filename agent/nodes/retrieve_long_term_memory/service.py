@@ -20,23 +20,26 @@ class RetrieveLongTermMemoryService:
         iteration: int,
         long_term_memory: LongTermMemory,
         state_string_builder: StateStringBuilderT,
+        prompt_prefix: str,
         emulator: YellowLegacyEmulator,
     ) -> None:
         self.iteration = iteration
         self.long_term_memory = long_term_memory
         self.state_string_builder = state_string_builder
+        self.prompt_prefix = prompt_prefix
         self.emulator = emulator
 
     async def retrieve_long_term_memory(self) -> LongTermMemory:
         """Retrieve the long-term memory."""
         game_state = self.emulator.get_game_state()
-        screenshot = self.emulator.get_screenshot()
+        screenshot = self.emulator.get_screenshot().png
 
         prompt = GET_RETRIEVAL_QUERY_PROMPT.format(state=self.state_string_builder(game_state))
         try:
             query = await self.llm_service.get_llm_response(
                 [screenshot, prompt],
                 prompt_name="get_retrieval_query",
+                prompt_prefix=self.prompt_prefix,
             )
         except Exception as e:  # noqa: BLE001
             logger.warning(f"Error in the retrieval query. Returning the previous memories. {e}")
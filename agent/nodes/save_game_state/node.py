@@ -2,18 +2,26 @@ from junjo import Node
 from loguru import logger
 
 from agent.state import AgentStore
+from database.db_config import commit_unit_of_work
 from emulator.emulator import YellowLegacyEmulator
+from overworld_map.store import map_store
 
 
 class SaveGameStateNode(Node[AgentStore]):
-    """Save the game state to the AgentStore."""
+    """
+    Capture the emulator save state into the emulator's save state history, which backups are taken
+    from. The raw bytes are kept out of the store, so they don't go through the state telemetry.
+    This is also where the map store is checkpointed and the iteration's DB writes are committed.
+    """
 
     def __init__(self, emulator: YellowLegacyEmulator) -> None:
         self.emulator = emulator
         super().__init__()
 
-    async def service(self, store: AgentStore) -> None:
+    async def service(self, store: AgentStore) -> None:  # noqa: ARG002
         """The service for the node."""
         logger.info("Saving the game state...")
 
-        await store.set_emulator_save_state_from_emulator(self.emulator)
+        await self.emulator.capture_save_state()
+        await map_store.checkpoint()
+        await commit_unit_of_work()
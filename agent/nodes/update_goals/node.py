@@ -23,6 +23,7 @@ class UpdateGoalsNode(Node[AgentStore]):
             iteration=state.iteration,
             goals=state.goals,
             state_string_builder=state.to_prompt_string,
+            prompt_prefix=state.to_prompt_prefix(),
             emulator=self.emulator,
         )
         goals = await service.update_goals()
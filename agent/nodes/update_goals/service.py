@@ -21,10 +21,12 @@ class UpdateGoalsService:
         iteration: int,
         goals: Goals,
         state_string_builder: StateStringBuilderT,
+        prompt_prefix: str,
     ) -> None:
         self.iteration = iteration
         self.goals = goals
         self.state_string_builder = state_string_builder
+        self.prompt_prefix = prompt_prefix
         self.emulator = emulator
 
     async def update_goals(self) -> Goals:
@@ -39,6 +41,7 @@ class UpdateGoalsService:
                 messages=prompt,
                 schema=UpdateGoalsResponse,
                 prompt_name="update_goals",
+                prompt_prefix=self.prompt_prefix,
             )
         except Exception as e:  # noqa: BLE001
             logger.warning(f"Error updating goals. Skipping. {e}")
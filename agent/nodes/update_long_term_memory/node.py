@@ -23,6 +23,7 @@ class UpdateLongTermMemoryNode(Node[AgentStore]):
             iteration=state.iteration,
             long_term_memory=state.long_term_memory,
             state_string_builder=state.to_prompt_string,
+            prompt_prefix=state.to_prompt_prefix(),
             emulator=self.emulator,
         )
         await service.update_long_term_memory()
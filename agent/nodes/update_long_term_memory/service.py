@@ -2,13 +2,14 @@ from loguru import logger
 
 from agent.nodes.update_long_term_memory.prompts import UPDATE_LONG_TERM_MEMORY_PROMPT
 from agent.nodes.update_long_term_memory.schemas import UpdateLongTermMemoryResponse, UpdateType
-from common.embedding_service import get_embedding
+from common.embedding_service import EmbeddingRequest, get_embeddings
 from common.types import StateStringBuilderT
 from database.long_term_memory.repository import update_long_term_memory
 from database.long_term_memory.schemas import LongTermMemoryUpdate
 from emulator.emulator import YellowLegacyEmulator
 from llm.schemas import GEMINI_FLASH_2_5
 from llm.service import GeminiLLMService
+from memory.embedding_index import embedding_index
 from memory.long_term_memory import LongTermMemory
 
 
@@ -22,11 +23,13 @@ class UpdateLongTermMemoryService:
         iteration: int,
         long_term_memory: LongTermMemory,
         state_string_builder: StateStringBuilderT,
+        prompt_prefix: str,
         emulator: YellowLegacyEmulator,
     ) -> None:
         self.iteration = iteration
         self.long_term_memory = long_term_memory
         self.state_string_builder = state_string_builder
+        self.prompt_prefix = prompt_prefix
         self.emulator = emulator
 
     async def update_long_term_memory(self) -> None:
@@ -41,7 +44,9 @@ class UpdateLongTermMemoryService:
                 prompt,
                 UpdateLongTermMemoryResponse,
                 prompt_name="update_long_term_memory",
+                prompt_prefix=self.prompt_prefix,
             )
+            contents = []
             for update_piece in response.pieces:
                 orig_piece = self.long_term_memory.pieces.get(update_piece.title)
                 if orig_piece is None:
@@ -54,15 +59,21 @@ class UpdateLongTermMemoryService:
                     content = f"{orig_piece.content}\n{update_piece.content}"
                 else:  # Rewrite.
                     content = update_piece.content
-                embedding = await get_embedding(content, update_piece.title)
+                contents.append((update_piece, content))
+
+            embeddings = await get_embeddings(
+                [EmbeddingRequest(text=content, title=piece.title) for piece, content in contents],
+            )
+            for (piece, content), embedding in zip(contents, embeddings, strict=True):
                 await update_long_term_memory(
                     LongTermMemoryUpdate(
-                        title=update_piece.title,
+                        title=piece.title,
                         content=content,
-                        importance=update_piece.importance,
+                        importance=piece.importance,
                         iteration=self.iteration,
                         embedding=embedding,
                     ),
                 )
+                embedding_index.add(piece.title, embedding)
         except Exception as e:  # noqa: BLE001
             logger.warning(f"Error updating long-term memory. Skipping.\n{e}")
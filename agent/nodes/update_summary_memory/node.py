@@ -23,6 +23,7 @@ class UpdateSummaryMemoryNode(Node[AgentStore]):
             iteration=state.iteration,
             summary_memory=state.summary_memory,
             state_string_builder=state.to_prompt_string,
+            prompt_prefix=state.to_prompt_prefix(),
             emulator=self.emulator,
         )
         summary_memory = await service.update_summary_memory()
@@ -18,12 +18,14 @@ class UpdateSummaryMemoryService:
         iteration: int,
         summary_memory: SummaryMemory,
         state_string_builder: StateStringBuilderT,
+        prompt_prefix: str,
         emulator: YellowLegacyEmulator,
     ) -> None:
         self.emulator = emulator
         self.iteration = iteration
         self.summary_memory = summary_memory
         self.state_string_builder = state_string_builder
+        self.prompt_prefix = prompt_prefix
 
     async def update_summary_memory(self) -> SummaryMemory:
         """Update the summary memory."""
@@ -40,6 +42,7 @@ class UpdateSummaryMemoryService:
             prompt,
             UpdateSummaryMemoryResponse,
             prompt_name="update_summary_memory",
+            prompt_prefix=self.prompt_prefix,
         )
         self.summary_memory.add_memories(
             self.iteration,
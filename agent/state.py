@@ -5,7 +5,6 @@ from junjo import BaseState, BaseStore
 from pydantic import Field
 
 from agent.enums import AgentStateHandler
-from emulator.emulator import YellowLegacyEmulator
 from emulator.game_state import YellowLegacyGameState
 from memory.goals import Goals
 from memory.long_term_memory import LongTermMemory
@@ -28,16 +27,26 @@ class AgentState(BaseState):
     previous_handler: AgentStateHandler | None = None
     should_retrieve_memory: bool | None = None
     should_critique: bool | None = None
-    emulator_save_state: str | None = None
+    # Backups used to keep the Base64 encoded save state here. They're now stored in their own file.
+    emulator_save_state: str | None = Field(default=None, exclude=True)
+
+    def to_prompt_prefix(self) -> str:
+        """
+        Get the parts of the agent state that only change every few iterations, to be put at the
+        start of prompts where they can be cached.
+        """
+        return "\n\n".join(
+            (str(self.summary_memory), str(self.long_term_memory), str(self.goals)),
+        )
 
     def to_prompt_string(self, game_state: YellowLegacyGameState) -> str:
-        """Get a string representation of the agent and game state to be used in prompts."""
+        """
+        Get a string representation of the agent and game state to be used in prompts, after the
+        prompt prefix.
+        """
         return "\n\n".join(
             (
                 str(self.raw_memory),
-                str(self.summary_memory),
-                str(self.long_term_memory),
-                str(self.goals),
                 game_state.player_info,
             ),
         )
@@ -97,11 +106,3 @@ class AgentStore(BaseStore[AgentState]):
         await self.set_state(
             {"iterations_since_last_ltm_retrieval": iterations_since_last_ltm_retrieval}
         )
-
-    async def set_emulator_save_state_from_emulator(self, emulator: YellowLegacyEmulator) -> None:
-        """
-        Set the emulator save state from the emulator. Do this sparingly. Saving takes about two
-        frames, so doing it too often messes with the game's audio, and it also hammers the
-        telemetry.
-        """
-        await self.set_state({"emulator_save_state": await emulator.get_emulator_save_state()})
@@ -27,11 +27,13 @@ class DetermineHandlerService:
         iteration: int,
         raw_memory: RawMemory,
         state_string_builder: StateStringBuilderT,
+        prompt_prefix: str,
         emulator: YellowLegacyEmulator,
     ) -> None:
         self.iteration = iteration
         self.raw_memory = raw_memory
         self.state_string_builder = state_string_builder
+        self.prompt_prefix = prompt_prefix
         self.emulator = emulator
 
     async def determine_handler(self) -> tuple[RawMemory, BattleToolArgs | None]:
@@ -112,7 +114,7 @@ class DetermineHandlerService:
         game_state: YellowLegacyGameState,
     ) -> tuple[str, BattleToolArgs]:
         """Choose the action to take based on the available arguments."""
-        img = self.emulator.get_screenshot()
+        img = self.emulator.get_screenshot().png
         actions = "\n".join([f"[{i}]: {a}" for i, a in enumerate(args)])
         prompt = CHOOSE_ARGS_PROMPT.format(
             state=self.state_string_builder(game_state),
@@ -123,5 +125,6 @@ class DetermineHandlerService:
             messages=[img, prompt],
             schema=DetermineArgsResponse,
             prompt_name="determine_battle_args",
+            prompt_prefix=self.prompt_prefix,
         )
         return response.thoughts, args[response.index]
@@ -16,6 +16,7 @@ async def test_use_move() -> None:
         save_state_path=save_file,
         mute_sound=True,
         headless=True,
+        speed=0,
     ) as emulator:
         game_state = emulator.get_game_state()
         move_index = 2
@@ -27,6 +27,7 @@ class MakeDecisionNode(Node[BattleHandlerStore]):
             iteration=state.iteration,
             raw_memory=state.raw_memory,
             state_string_builder=state.to_prompt_string,
+            prompt_prefix=state.to_prompt_prefix(),
             emulator=self.emulator,
         )
 
@@ -19,11 +19,13 @@ class MakeDecisionService:
         iteration: int,
         raw_memory: RawMemory,
         state_string_builder: StateStringBuilderT,
+        prompt_prefix: str,
         emulator: YellowLegacyEmulator,
     ) -> None:
         self.iteration = iteration
         self.raw_memory = raw_memory
         self.state_string_builder = state_string_builder
+        self.prompt_prefix = prompt_prefix
         self.emulator = emulator
 
     async def make_decision(self) -> RawMemory:
@@ -32,7 +34,7 @@ class MakeDecisionService:
 
         :return: The raw memory with the decision added.
         """
-        img = self.emulator.get_screenshot()
+        img = self.emulator.get_screenshot().png
         game_state = self.emulator.get_game_state()
         state_string = self.state_string_builder(game_state)
         prompt = MAKE_DECISION_PROMPT.format(state=state_string, text=game_state.screen.text)
@@ -41,6 +43,7 @@ class MakeDecisionService:
                 messages=[img, prompt],
                 schema=MakeDecisionResponse,
                 prompt_name="make_battle_decision",
+                prompt_prefix=self.prompt_prefix,
             )
             self.raw_memory.add_memory(iteration=self.iteration, content=str(response))
             for i, button in enumerate(response.buttons):
@@ -15,6 +15,7 @@ async def test_run_away_from_battle() -> None:
         save_state_path=save_file,
         mute_sound=True,
         headless=True,
+        speed=0,
     ) as emulator:
         game_state = emulator.get_game_state()
 
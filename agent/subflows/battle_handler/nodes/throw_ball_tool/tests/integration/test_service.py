@@ -1,4 +1,3 @@
-import asyncio
 from pathlib import Path
 
 import pytest
@@ -18,6 +17,7 @@ async def test_throw_pokeball() -> None:
         save_state_path=save_file,
         mute_sound=True,
         headless=True,
+        speed=0,
     ) as emulator:
         game_state = emulator.get_game_state()
 
@@ -39,7 +39,7 @@ async def test_throw_pokeball() -> None:
             emulator=emulator,
         )
         raw_memory = await service.throw_ball()
-        await asyncio.sleep(0.1)  # Enough time to change frames, but not to catch the pokemon.
+        await emulator.wait_frames(6)  # Enough time to change frames, but not to catch the pokemon.
 
         game_state = emulator.get_game_state()
         assert "POKé BALL!" in game_state.screen.text  # Used Poke Ball text.
@@ -19,14 +19,23 @@ class BattleHandlerState(BaseState):
     goals: Goals | None = None
     tool_args: BattleToolArgs | None = None
 
+    def to_prompt_prefix(self) -> str:
+        """
+        Get the parts of the agent state that only change every few iterations, to be put at the
+        start of prompts where they can be cached.
+        """
+        return "\n\n".join(
+            (str(self.summary_memory), str(self.long_term_memory), str(self.goals)),
+        )
+
     def to_prompt_string(self, game_state: YellowLegacyGameState) -> str:
-        """Get a string representation of the agent and game state to be used in prompts."""
+        """
+        Get a string representation of the agent and game state to be used in prompts, after the
+        prompt prefix.
+        """
         return "\n\n".join(
             (
                 str(self.raw_memory),
-                str(self.summary_memory),
-                str(self.long_term_memory),
-                str(self.goals),
                 game_state.player_info,
                 game_state.battle_info,
             ),
@@ -7,6 +7,7 @@ algorithmic logic to make them easier to test.
 
 from itertools import groupby
 
+from agent.subflows.overworld_handler.nodes.navigate.schemas import ExplorationResult
 from common.enums import FacingDirection
 from common.schemas import Coords
 from overworld_map.schemas import OverworldMap
@@ -37,6 +38,31 @@ def format_coordinates_grid(coordinates: list[Coords], map_data: OverworldMap) -
     return "\n".join(rows)
 
 
+def format_accessible_coords(exploration: ExplorationResult, map_data: OverworldMap) -> str:
+    """
+    Format the accessible coordinates of an exploration result in the same way as
+    `format_coordinates_grid`. The distance field is already laid out as a grid, so this skips
+    sorting and grouping the coordinates.
+
+    :param exploration: The result of a flood fill from the player's position
+    :param map_data: Map data containing tiles
+    :return: Formatted string for LLM
+    """
+    rows = []
+    for row, (row_distances, row_tiles) in enumerate(
+        zip(exploration.distances, map_data.ascii_tiles, strict=True),
+    ):
+        row_str = ", ".join(
+            f"({row}, {col}, {tile})"
+            for col, (distance, tile) in enumerate(zip(row_distances, row_tiles, strict=True))
+            if distance >= 0
+        )
+        if row_str:
+            rows.append(row_str)
+
+    return "\n".join(rows)
+
+
 def format_exploration_candidates(candidates: list[Coords], map_data: OverworldMap) -> str:
     """
     Format exploration candidates for LLM consumption.
@@ -0,0 +1,331 @@
+"""
+The movement graph that the navigation algorithms search, and a cache of recently built graphs.
+
+Building the graph is the most expensive part of a search, and the map only changes when new tiles
+are revealed, so graphs are cached by the content of the map and patched incrementally when only a
+small window of tiles has changed.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from common.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from common.enums import AsciiTile, BlockedDirection, Button, MapId
+from common.schemas import Coords
+from overworld_map.schemas import OverworldMap
+
+# The order of these determines the order in which neighbours are explored.
+DIRECTION_BUTTONS = [Button.RIGHT, Button.DOWN, Button.LEFT, Button.UP]
+
+
+class NavigationGraph:
+    """
+    The movement graph of a map for a given set of HMs, over integer cell indices.
+
+    The cell at (row, col) has the index `row * width + col`. For each cell, `destinations` holds
+    the index of the cell that each of the `DIRECTION_BUTTONS` leads to, with ledge jumps and
+    spinners already resolved, or -1 if the move is impossible. `costs` holds the cost of moving
+    onto each cell. Graphs are shared between searches, so they must not be modified.
+    """
+
+    def __init__(self, map_data: OverworldMap, hm_tiles: frozenset[AsciiTile]) -> None:
+        self.tiles = map_data.ascii_tiles_ndarray
+        self.blockages = _get_blockage_array(map_data, self.tiles.shape)
+        self.hm_tiles = hm_tiles
+        self.height, self.width = self.tiles.shape
+        self.has_spinners = bool(np.isin(self.tiles, _SPINNER_TILES).any())
+
+        everything = (slice(0, self.height), slice(0, self.width))
+        destinations = _get_destinations(self.tiles, self.blockages, hm_tiles, everything)
+        self.destinations: list[list[int]] = destinations.reshape(-1, 4).tolist()
+        self.costs: list[int] = _get_costs(self.tiles).ravel().tolist()
+
+    def contains(self, c: Coords) -> bool:
+        """Check if the coords are inside the map."""
+        return 0 <= c.row < self.height and 0 <= c.col < self.width
+
+    def to_index(self, c: Coords) -> int:
+        """Convert coords to a cell index."""
+        return c.row * self.width + c.col
+
+    def to_coords(self, index: int) -> Coords:
+        """Convert a cell index to coords."""
+        row, col = divmod(index, self.width)
+        return Coords(row=row, col=col)
+
+    def patch(self, map_data: OverworldMap) -> "NavigationGraph | None":
+        """
+        Get the graph of a newer version of the same map by only recomputing the cells around the
+        tiles that have changed.
+
+        :param map_data: The updated map, with the same ID as the one this graph was built from.
+        :return: The patched graph, or None if the changes are too large to patch.
+        """
+        tiles = map_data.ascii_tiles_ndarray
+        if tiles.shape != self.tiles.shape:
+            return None
+        # Spinner destinations can depend on tiles anywhere on the map.
+        if self.has_spinners or np.isin(tiles, _SPINNER_TILES).any():
+            return None
+
+        blockages = _get_blockage_array(map_data, tiles.shape)
+        changed = np.argwhere((tiles != self.tiles) | (blockages != self.blockages))
+        if changed.size == 0:
+            return self
+        top, left = changed.min(axis=0)
+        bottom, right = changed.max(axis=0) + 1
+        if bottom - top > SCREEN_HEIGHT or right - left > SCREEN_WIDTH:
+            return None
+
+        # The moves out of a cell depend on the tiles up to a ledge jump away.
+        top, left = max(top - _MAX_MOVE_DISTANCE, 0), max(left - _MAX_MOVE_DISTANCE, 0)
+        bottom = min(bottom + _MAX_MOVE_DISTANCE, self.height)
+        right = min(right + _MAX_MOVE_DISTANCE, self.width)
+        window = (slice(top, bottom), slice(left, right))
+        window_destinations = _get_destinations(tiles, blockages, self.hm_tiles, window).tolist()
+        window_costs = _get_costs(tiles[window]).tolist()
+
+        graph = copy.copy(self)
+        graph.tiles = tiles
+        graph.blockages = blockages
+        graph.destinations = list(self.destinations)
+        graph.costs = list(self.costs)
+        for row, row_destinations, row_costs in zip(
+            range(top, bottom),
+            window_destinations,
+            window_costs,
+            strict=True,
+        ):
+            start = row * self.width + left
+            graph.destinations[start : start + right - left] = row_destinations
+            graph.costs[start : start + right - left] = row_costs
+        return graph
+
+
+class NavigationGraphCache:
+    """
+    A thread-safe LRU cache of navigation graphs.
+
+    A fresh OverworldMap is loaded from the database every time the map is updated, so graphs are
+    keyed by the content of the map rather than by the object: (map ID, tile revision, HM tiles),
+    where the tile revision is the tiles and blockages themselves. On a miss, the most recently used
+    graph of the same map and HMs is patched if possible.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.patches = 0
+        self.builds = 0
+        self._graphs: OrderedDict[
+            tuple[MapId, tuple[bytes, frozenset], frozenset[AsciiTile]],
+            NavigationGraph,
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, map_data: OverworldMap, hm_tiles: list[AsciiTile]) -> NavigationGraph:
+        """
+        Get the navigation graph of a map, building or patching it if necessary.
+
+        :param map_data: Map data containing tiles and blockages
+        :param hm_tiles: List of tiles that are accessible using the player's current HMs.
+        :return: The navigation graph.
+        """
+        hm_tile_set = frozenset(hm_tiles)
+        revision = (map_data.tile_codes, frozenset(map_data.blockages.items()))
+        key = (map_data.id, revision, hm_tile_set)
+        with self._lock:
+            graph = self._graphs.get(key)
+            if graph is not None:
+                self._graphs.move_to_end(key)
+                self.hits += 1
+                return graph
+
+            previous = next(
+                (
+                    g
+                    for (map_id, _, g_hm_tiles), g in reversed(self._graphs.items())
+                    if map_id == map_data.id and g_hm_tiles == hm_tile_set
+                ),
+                None,
+            )
+            graph = previous.patch(map_data) if previous is not None else None
+            if graph is not None:
+                self.patches += 1
+            else:
+                graph = NavigationGraph(map_data, hm_tile_set)
+                self.builds += 1
+
+            self._graphs[key] = graph
+            if len(self._graphs) > self.max_size:
+                self._graphs.popitem(last=False)
+            return graph
+
+
+def get_navigation_graph(map_data: OverworldMap, hm_tiles: list[AsciiTile]) -> NavigationGraph:
+    """
+    Get the navigation graph of a map from the shared cache.
+
+    :param map_data: Map data containing tiles and blockages
+    :param hm_tiles: List of tiles that are accessible using the player's current HMs.
+    :return: The navigation graph.
+    """
+    return _GRAPH_CACHE.get(map_data, hm_tiles)
+
+
+def _get_blockage_array(map_data: OverworldMap, shape: tuple[int, ...]) -> np.ndarray:
+    """Get the paired tile collisions of each cell as an array of BlockedDirection flags."""
+    blockages = np.zeros(shape, dtype=np.uint8)
+    for c, blocked in map_data.blockages.items():
+        if 0 <= c.row < shape[0] and 0 <= c.col < shape[1]:
+            blockages[c.row, c.col] = blocked
+    return blockages
+
+
+def _get_costs(tiles: np.ndarray) -> np.ndarray:
+    """Get the cost of moving onto each tile, biased away from tiles that are slow to traverse."""
+    return np.where(np.isin(tiles, _EXPENSIVE_TILES), _EXPENSIVE_TILE_COST, 1)
+
+
+def _get_destinations(
+    tiles: np.ndarray,
+    blockages: np.ndarray,
+    hm_tiles: frozenset[AsciiTile],
+    window: tuple[slice, slice],
+) -> np.ndarray:
+    """
+    Get the destination of each move out of each cell in a window of the map.
+
+    :param tiles: The tiles of the whole map.
+    :param blockages: The BlockedDirection flags of the whole map.
+    :param hm_tiles: The tiles that are accessible using the player's current HMs.
+    :param window: The (rows, cols) slices of the cells to get the moves of.
+    :return: An array of shape (rows, cols, 4) holding the destination cell index of each move in
+        the order of `DIRECTION_BUTTONS`, or -1 where the move is impossible.
+    """
+    height, width = tiles.shape
+    rows, cols = window
+    pad = _MAX_MOVE_DISTANCE
+
+    # Only the window and the cells up to a move away from it are needed. Crop to those, then pad
+    # the parts that fall outside of the map so that the target of a move and the landing cell of a
+    # ledge jump can be read with a plain slice. The padding is never a valid destination.
+    top, bottom = max(rows.start - pad, 0), min(rows.stop + pad, height)
+    left, right = max(cols.start - pad, 0), min(cols.stop + pad, width)
+    region = (slice(top, bottom), slice(left, right))
+    padding = (
+        (pad - (rows.start - top), pad - (bottom - rows.stop)),
+        (pad - (cols.start - left), pad - (right - cols.stop)),
+    )
+    region_tiles = tiles[region]
+    index = np.arange(top, bottom)[:, None] * width + np.arange(left, right)
+
+    passable = np.isin(region_tiles, _WALKABLE_TILES)
+    for hm_tile in [AsciiTile.CUT_TREE, AsciiTile.WATER]:
+        if hm_tile in hm_tiles:
+            passable |= region_tiles == hm_tile
+    spinner_destinations = np.full(region_tiles.shape, -1)
+    for row, col in np.argwhere(np.isin(region_tiles, _SPINNER_TILES)):
+        dest_row, dest_col = _get_spinner_destination(top + row, left + col, tiles)
+        spinner_destinations[row, col] = dest_row * width + dest_col
+
+    padded_tiles = np.pad(region_tiles, padding, constant_values=AsciiTile.WALL)
+    padded_index = np.pad(index, padding, constant_values=-1)
+    padded_passable = np.pad(passable, padding, constant_values=False)
+    padded_spinners = np.pad(spinner_destinations, padding, constant_values=-1)
+
+    window_tiles = tiles[window]
+    window_height, window_width = window_tiles.shape
+    destinations = np.full((window_height, window_width, len(_DIRECTIONS)), -1)
+    for i, (dy, dx) in enumerate(_DIRECTIONS):
+        step = (
+            slice(pad + dy, pad + dy + window_height),
+            slice(pad + dx, pad + dx + window_width),
+        )
+        jump = (
+            slice(pad + 2 * dy, pad + 2 * dy + window_height),
+            slice(pad + 2 * dx, pad + 2 * dx + window_width),
+        )
+        is_blocked = (blockages[window] & _DIRECTION_BLOCKAGE_MAP[(dy, dx)]) != 0
+        # Jumping over a ledge skips a tile. Ledges and spinners ignore paired tile collisions.
+        destinations[..., i] = np.where(
+            padded_tiles[step] == _DIRECTION_LEDGE_MAP.get((dy, dx)),
+            padded_index[jump],
+            np.where(
+                padded_spinners[step] >= 0,
+                padded_spinners[step],
+                np.where(padded_passable[step] & ~is_blocked, padded_index[step], -1),
+            ),
+        )
+    # You can walk on these tiles, but they have no neighbours because they warp you.
+    destinations[np.isin(window_tiles, _WARPING_TILES)] = -1
+    return destinations
+
+
+def _get_spinner_destination(row: int, col: int, tiles: np.ndarray) -> tuple[int, int]:
+    """Get the (row, col) destination of a spinner tile."""
+    height, width = tiles.shape
+    dy, dx = _SPINNER_DIRECTION_MAP[tiles[row, col]]
+    visited = {(row, col, dy, dx)}
+
+    while True:
+        new_row, new_col = row + dy, col + dx
+        # Unseen is an edge case. We don't know where it goes, but we can't follow it any further.
+        # Assume we stop just before it. This breaks navigation, but there's nothing we can do
+        # until the tile is revealed on the next Agent iteration. The same goes for the map edge,
+        # and for partially revealed spinners that appear to loop forever.
+        step = (new_row, new_col, dy, dx)
+        if not (0 <= new_row < height and 0 <= new_col < width) or step in visited:
+            return row, col
+        visited.add(step)
+        new_tile = tiles[new_row, new_col]
+        if new_tile == AsciiTile.UNSEEN:
+            return row, col
+        if new_tile == AsciiTile.SPINNER_STOP:
+            return new_row, new_col
+        if new_tile in _SPINNER_DIRECTION_MAP:
+            dy, dx = _SPINNER_DIRECTION_MAP[new_tile]
+        row, col = new_row, new_col
+
+
+_DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+# The furthest a single move can take you without a spinner, i.e. a ledge jump.
+_MAX_MOVE_DISTANCE = 2
+
+_DIRECTION_BLOCKAGE_MAP = {
+    (0, 1): BlockedDirection.RIGHT,
+    (1, 0): BlockedDirection.DOWN,
+    (0, -1): BlockedDirection.LEFT,
+    (-1, 0): BlockedDirection.UP,
+}
+
+_DIRECTION_LEDGE_MAP = {
+    (0, 1): AsciiTile.LEDGE_RIGHT,
+    (1, 0): AsciiTile.LEDGE_DOWN,
+    (0, -1): AsciiTile.LEDGE_LEFT,
+}
+
+_SPINNER_DIRECTION_MAP = {
+    AsciiTile.SPINNER_UP: (-1, 0),
+    AsciiTile.SPINNER_DOWN: (1, 0),
+    AsciiTile.SPINNER_LEFT: (0, -1),
+    AsciiTile.SPINNER_RIGHT: (0, 1),
+}
+
+# Tile sets used with np.isin, as arrays so that they aren't converted on every call.
+_WALKABLE_TILES = np.array(AsciiTile.get_walkable_tiles(), dtype=str)
+_SPINNER_TILES = np.array(AsciiTile.get_spinner_tiles(), dtype=str)
+_WARPING_TILES = np.array([AsciiTile.WARP, AsciiTile.BOULDER_HOLE], dtype=str)
+_EXPENSIVE_TILES = np.array(
+    [AsciiTile.GRASS, AsciiTile.CUT_TREE, AsciiTile.WATER, *AsciiTile.get_spinner_tiles()],
+    dtype=str,
+)
+_EXPENSIVE_TILE_COST = 5
+
+# A handful of maps covers the current map, the one you just came from, and a few HM changes.
+_MAX_CACHED_GRAPHS = 8
+_GRAPH_CACHE = NavigationGraphCache(_MAX_CACHED_GRAPHS)
@@ -1,7 +1,9 @@
 from junjo import Node
 from loguru import logger
 
+from agent.subflows.overworld_handler.enums import OverworldTool
 from agent.subflows.overworld_handler.nodes.navigate.service import NavigationService
+from agent.subflows.overworld_handler.speculation import speculative_calls
 from agent.subflows.overworld_handler.state import OverworldHandlerStore
 from emulator.emulator import YellowLegacyEmulator
 
@@ -31,8 +33,11 @@ class NavigationNode(Node[OverworldHandlerStore]):
             current_map=state.current_map,
             raw_memory=state.raw_memory,
             state_string_builder=state.to_prompt_string,
+            prompt_prefix=state.to_prompt_prefix(),
         )
-        current_map, raw_memory = await service.navigate()
+        speculation = speculative_calls.take(OverworldTool.NAVIGATION)
+        speculated = speculation.response if speculation else None
+        current_map, raw_memory = await service.navigate(speculated)
 
         await store.set_current_map(current_map)
         await store.set_raw_memory(raw_memory)
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 
+from common.enums import FacingDirection
 from common.schemas import Coords
 
 
@@ -8,3 +9,20 @@ class NavigationResponse(BaseModel):
 
     thoughts: str
     coords: Coords
+
+
+class ExplorationResult(BaseModel):
+    """Everything the navigation tool needs to know about the reachable part of the map."""
+
+    accessible_coords: list[Coords]  # In order of increasing distance from the start.
+    exploration_candidates: list[Coords]
+    boundary_tiles: dict[FacingDirection, list[Coords]]
+    distances: list[list[int]]  # The number of moves to reach each tile, or -1 if inaccessible.
+
+    def is_accessible(self, c: Coords) -> bool:
+        """Check if the coords are accessible."""
+        return (
+            0 <= c.row < len(self.distances)
+            and 0 <= c.col < len(self.distances[c.row])
+            and self.distances[c.row][c.col] >= 0
+        )
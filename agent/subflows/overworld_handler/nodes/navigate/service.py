@@ -1,19 +1,29 @@
+import asyncio
+from collections.abc import Awaitable
+
 from loguru import logger
 
 from agent.subflows.overworld_handler.nodes.navigate import formatting, utils
 from agent.subflows.overworld_handler.nodes.navigate.prompts import DETERMINE_TARGET_COORDS_PROMPT
-from agent.subflows.overworld_handler.nodes.navigate.schemas import NavigationResponse
+from agent.subflows.overworld_handler.nodes.navigate.schemas import (
+    ExplorationResult,
+    NavigationResponse,
+)
+from agent.subflows.overworld_handler.speculation import Speculation
 from common.enums import AsciiTile, Button, FacingDirection, MapId
 from common.schemas import Coords
 from common.types import StateStringBuilderT
 from emulator.emulator import YellowLegacyEmulator
 from emulator.game_state import YellowLegacyGameState
-from llm.schemas import GEMINI_FLASH_2_5
-from llm.service import GeminiLLMService
+from llm.schemas import GEMINI_FLASH_2_5, LLMMessage
+from llm.service import GeminiLLMService, estimate_tokens
 from memory.raw_memory import RawMemory
 from overworld_map.schemas import OverworldMap
 from overworld_map.service import update_map_with_screen_info
 
+# The exploration that the prompt was built from, and the call for the response.
+type SpeculativeTargetCoords = tuple[ExplorationResult, asyncio.Task[NavigationResponse]]
+
 
 class NavigationService:
     """
@@ -25,36 +35,63 @@ class NavigationService:
 
     llm_service = GeminiLLMService(GEMINI_FLASH_2_5)
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         iteration: int,
         emulator: YellowLegacyEmulator,
         current_map: OverworldMap,
         raw_memory: RawMemory,
         state_string_builder: StateStringBuilderT,
+        prompt_prefix: str,
     ) -> None:
         self.iteration = iteration
         self.emulator = emulator
         self.current_map = current_map
         self.raw_memory = raw_memory
         self.state_string_builder = state_string_builder
+        self.prompt_prefix = prompt_prefix
 
-    async def navigate(self) -> tuple[OverworldMap, RawMemory]:
-        """Determine the target coordinates and navigate to them."""
+    async def speculate(self) -> Speculation[SpeculativeTargetCoords]:
+        """Start the LLM call before the tool is selected, for `navigate` if it's selected."""
         game_state = self.emulator.get_game_state()
-        hm_tiles = game_state.get_hm_tiles()
-        accessible_coords = await utils.get_accessible_coords(
+        exploration = await utils.explore_from(
             game_state.player.coords,
             self.current_map,
-            hm_tiles,
+            game_state.get_hm_tiles(),
         )
+        messages = self._get_target_coords_messages(exploration)
+        task = asyncio.create_task(self._request_target_coords(messages))
+        return Speculation((exploration, task), task, estimate_tokens(messages))
+
+    async def navigate(
+        self,
+        speculated: SpeculativeTargetCoords | None = None,
+    ) -> tuple[OverworldMap, RawMemory]:
+        """
+        Determine the target coordinates and navigate to them.
+
+        :param speculated: The exploration and the response of a speculative call, made before the
+            tool was selected.
+        :return: The updated map and raw memory.
+        """
+        game_state = self.emulator.get_game_state()
+        hm_tiles = game_state.get_hm_tiles()
+        if speculated is None:
+            exploration = await utils.explore_from(
+                game_state.player.coords,
+                self.current_map,
+                hm_tiles,
+            )
+            request = None
+        else:
+            exploration, request = speculated
         try:
-            coords = await self._determine_target_coords(accessible_coords)
+            coords = await self._determine_target_coords(exploration, request)
         except Exception as e:  # noqa: BLE001
             logger.warning(f"Error determining target coordinates. Skipping. {e}")
             return self.current_map, self.raw_memory
 
-        if not await self._validate_target_coords(game_state, coords, accessible_coords):
+        if not await self._validate_target_coords(game_state, coords, exploration):
             logger.warning("Cancelling navigation due to invalid target coordinates.")
             return self.current_map, self.raw_memory
 
@@ -78,50 +115,63 @@ class NavigationService:
 
         starting_map_id = self.current_map.id
         await self._handle_pikachu(path[0])
-        for button in path:
-            next_tile = self._get_next_tile(button, game_state)
-            if next_tile in hm_tiles:
-                await self._handle_hm_use(button, game_state)
+        while path:
+            if self._get_next_tile(path[0], game_state.player.coords) in hm_tiles:
+                await self._handle_hm_use(path[0], game_state)
+                game_states = [self.emulator.get_game_state()]
+                is_interrupted = False
             else:
-                await self.emulator.press_button(button)
+                # Walk as far as possible in one go, up to the next tile that needs an HM.
+                walk = utils.get_walk(
+                    path,
+                    game_state.player.coords,
+                    self.current_map,
+                    hm_tiles,
+                )
+                result = await self.emulator.run_input_sequence(walk)
+                game_states, is_interrupted = result.game_states, result.is_stopped_early
+            path = path[len(game_states) :]
 
-            prev_pos = game_state.player.coords
-            game_state = self.emulator.get_game_state()
-            if self._should_cancel_navigation(game_state, prev_pos, starting_map_id, coords):
+            for next_game_state in game_states:
+                prev_pos = game_state.player.coords
+                game_state = next_game_state
+                if self._should_cancel_navigation(game_state, prev_pos, starting_map_id, coords):
+                    return self.current_map, self.raw_memory
+                # Can't update the map until we validate above that we haven't switched maps.
+                self.current_map = await update_map_with_screen_info(
+                    self.iteration,
+                    game_state,
+                    self.current_map,
+                )
+            if is_interrupted:
+                logger.warning("Navigation interrupted. Cancelling.")
+                self.raw_memory.add_memory(
+                    iteration=self.iteration,
+                    content=(
+                        f"Navigation to {coords} interrupted at position"
+                        f" {game_state.player.coords}."
+                    ),
+                )
                 return self.current_map, self.raw_memory
-            # Can't update the map until we validate above that we haven't switched maps.
-            self.current_map = await update_map_with_screen_info(
-                self.iteration,
-                game_state,
-                self.current_map,
-            )
         return self.current_map, self.raw_memory
 
-    async def _determine_target_coords(self, accessible_coords: list[Coords]) -> Coords:
-        """Determine the target coordinates to navigate to."""
-        # Get algorithmic data.
-        exploration_candidates = utils.get_exploration_candidates(
-            accessible_coords,
-            self.current_map,
-        )
-        boundary_tiles = utils.get_map_boundary_tiles(accessible_coords, self.current_map)
-
+    def _get_target_coords_messages(self, exploration: ExplorationResult) -> list[LLMMessage]:
+        """Get the messages of the prompt to determine the target coordinates."""
         # Format data for LLM.
-        formatted_accessible_coords = formatting.format_coordinates_grid(
-            accessible_coords,
+        formatted_accessible_coords = formatting.format_accessible_coords(
+            exploration,
             self.current_map,
         )
         formatted_exploration_candidates = formatting.format_exploration_candidates(
-            exploration_candidates,
+            exploration.exploration_candidates,
             self.current_map,
         )
         formatted_map_boundaries = formatting.format_map_boundary_tiles(
-            boundary_tiles,
+            exploration.boundary_tiles,
             self.current_map,
         )
 
-        # Get model response.
-        img = self.emulator.get_screenshot()
+        img = self.emulator.get_screenshot().png
         game_state = self.emulator.get_game_state()
         last_memory = self.raw_memory.pieces.get(self.iteration) or ""
 
@@ -132,11 +182,26 @@ class NavigationService:
             map_boundaries=formatted_map_boundaries,
             last_memory=last_memory,
         )
-        response = await self.llm_service.get_llm_response_pydantic(
-            messages=[img, prompt],
+        return [img, prompt]
+
+    async def _request_target_coords(self, messages: list[LLMMessage]) -> NavigationResponse:
+        """Get the model's response to the prompt to determine the target coordinates."""
+        return await self.llm_service.get_llm_response_pydantic(
+            messages=messages,
             schema=NavigationResponse,
             prompt_name="determine_target_coords",
+            prompt_prefix=self.prompt_prefix,
         )
+
+    async def _determine_target_coords(
+        self,
+        exploration: ExplorationResult,
+        request: Awaitable[NavigationResponse] | None = None,
+    ) -> Coords:
+        """Determine the target coordinates to navigate to, from the request in flight if any."""
+        if request is None:
+            request = self._request_target_coords(self._get_target_coords_messages(exploration))
+        response = await request
         self.raw_memory.add_memory(
             iteration=self.iteration,
             content=f"{response.thoughts} Navigating to {response.coords}.",
@@ -147,7 +212,7 @@ class NavigationService:
         self,
         game_state: YellowLegacyGameState,
         coords: Coords,
-        accessible_coords: list[Coords],
+        exploration: ExplorationResult,
     ) -> bool:
         """Validate the target coordinates. Return True if the coordinates are valid."""
         if (
@@ -180,7 +245,7 @@ class NavigationService:
                 ),
             )
             return False
-        if coords not in accessible_coords:
+        if not exploration.is_accessible(coords):
             self.raw_memory.add_memory(
                 iteration=self.iteration,
                 content=(
@@ -230,17 +295,20 @@ class NavigationService:
         ):
             await self.emulator.press_button(Button.RIGHT)
 
-    def _get_next_tile(self, button: Button, game_state: YellowLegacyGameState) -> AsciiTile:
+    def _get_next_tile(self, button: Button, player_pos: Coords) -> AsciiTile:
         """Get the next tile type that the player will move to."""
-        tile_arr = self.current_map.ascii_tiles_ndarray
-        player_pos = game_state.player.coords
+        next_pos = self._get_next_pos(button, player_pos)
+        return self.current_map.ascii_tiles_ndarray[next_pos.row, next_pos.col]
+
+    def _get_next_pos(self, button: Button, player_pos: Coords) -> Coords:
+        """Get the position that the player will move to."""
         if button == Button.UP:
-            return tile_arr[player_pos.row - 1, player_pos.col]
+            return Coords(row=player_pos.row - 1, col=player_pos.col)
         if button == Button.DOWN:
-            return tile_arr[player_pos.row + 1, player_pos.col]
+            return Coords(row=player_pos.row + 1, col=player_pos.col)
         if button == Button.LEFT:
-            return tile_arr[player_pos.row, player_pos.col - 1]
-        return tile_arr[player_pos.row, player_pos.col + 1]
+            return Coords(row=player_pos.row, col=player_pos.col - 1)
+        return Coords(row=player_pos.row, col=player_pos.col + 1)
 
     async def _handle_hm_use(self, button: Button, game_state: YellowLegacyGameState) -> None:
         """Handle using an HM to access a tile."""
@@ -9,6 +9,7 @@ from common.schemas import Coords
 from emulator.emulator import YellowLegacyEmulator
 from memory.raw_memory import RawMemory
 from overworld_map.service import get_overworld_map, update_map_with_screen_info
+from overworld_map.store import MapStore
 
 
 @pytest.mark.integration
@@ -19,6 +20,7 @@ async def test_navigate_through_pikachu() -> None:
         save_state_path=save_file,
         mute_sound=True,
         headless=True,
+        speed=0,
     ) as emulator:
         game_state = emulator.get_game_state()
         assert game_state.player.coords == Coords(row=28, col=23)
@@ -44,6 +46,7 @@ async def test_navigate_through_cut_tree() -> None:
         save_state_path=save_file,
         mute_sound=True,
         headless=True,
+        speed=0,
     ) as emulator:
         game_state = emulator.get_game_state()
         assert game_state.player.coords == Coords(row=17, col=17)
@@ -65,6 +68,7 @@ async def test_navigate_through_spinners() -> None:
         save_state_path=save_file,
         mute_sound=True,
         headless=True,
+        speed=0,
     ) as emulator:
         game_state = emulator.get_game_state()
         assert game_state.player.coords == Coords(row=13, col=4)
@@ -86,6 +90,7 @@ async def test_navigate_through_water() -> None:
         save_state_path=save_file,
         mute_sound=True,
         headless=True,
+        speed=0,
     ) as emulator:
         game_state = emulator.get_game_state()
         assert game_state.player.coords == Coords(row=20, col=19)
@@ -103,12 +108,7 @@ async def _get_nav_service(emulator: YellowLegacyEmulator) -> NavigationService:
     """Helper function to get a navigation service with the proper mocks."""
     game_state = emulator.get_game_state()
     with (
-        patch("database.map_memory.repository.get_map_memory", return_value=None),
-        patch(
-            "database.map_entity_memory.repository.get_map_entity_memories_for_map",
-            return_value=[],
-        ),
-        patch("database.map_memory.repository.update_map_tiles", return_value=None),
+        patch("overworld_map.service.map_store", MapStore()),
         patch("overworld_map.service._add_remove_map_entities", return_value=None),
     ):
         overworld_map = await get_overworld_map(0, game_state)
@@ -120,4 +120,5 @@ async def _get_nav_service(emulator: YellowLegacyEmulator) -> NavigationService:
         current_map=overworld_map,
         raw_memory=RawMemory(),
         state_string_builder=MagicMock(),
+        prompt_prefix="",
     )
@@ -0,0 +1,86 @@
+from copy import deepcopy
+
+import numpy as np
+import pytest
+
+from agent.subflows.overworld_handler.nodes.navigate.graph import (
+    NavigationGraph,
+    NavigationGraphCache,
+)
+from common.enums import AsciiTile, BlockedDirection, MapId
+from common.schemas import Coords
+from overworld_map.schemas import OverworldMap
+
+DUMMY_MAP = OverworldMap(
+    id=MapId.PALLET_TOWN,
+    ascii_tiles=[[]],
+    blockages={},
+    known_sprites={},
+    known_signs={},
+    known_warps={},
+    north_connection=None,
+    south_connection=None,
+    east_connection=None,
+    west_connection=None,
+)
+
+
+@pytest.mark.unit
+def test_patched_graph_matches_rebuilt_graph() -> None:
+    """Test that patching a graph after revealing a screen of tiles matches a full rebuild."""
+    rng = np.random.default_rng(0)
+    tile_choices = [
+        AsciiTile.FREE,
+        AsciiTile.WALL,
+        AsciiTile.GRASS,
+        AsciiTile.WATER,
+        AsciiTile.CUT_TREE,
+        AsciiTile.WARP,
+        AsciiTile.LEDGE_DOWN,
+        AsciiTile.LEDGE_LEFT,
+        AsciiTile.LEDGE_RIGHT,
+    ]
+    hm_tiles = frozenset([AsciiTile.WATER])
+    for _ in range(50):
+        old_map = deepcopy(DUMMY_MAP)
+        old_map.ascii_tiles = rng.choice(tile_choices, size=(20, 24)).astype(str).tolist()
+        new_map = deepcopy(old_map)
+        new_tiles = new_map.ascii_tiles_ndarray
+        top, left = rng.integers(0, 12), rng.integers(0, 15)
+        new_tiles[top : top + 9, left : left + 10] = rng.choice(tile_choices, size=(9, 10))
+        new_map.ascii_tiles = new_tiles.tolist()
+        new_map.blockages = {Coords(row=top + 1, col=left + 1): BlockedDirection.DOWN}
+
+        patched = NavigationGraph(old_map, hm_tiles).patch(new_map)
+        rebuilt = NavigationGraph(new_map, hm_tiles)
+
+        assert patched is not None
+        assert patched.destinations == rebuilt.destinations
+        assert patched.costs == rebuilt.costs
+
+
+@pytest.mark.unit
+def test_graph_cache_hits_patches_and_evicts() -> None:
+    """Test that the cache reuses graphs by content, patches small changes, and evicts the LRU."""
+    cache = NavigationGraphCache(max_size=2)
+    map_data = deepcopy(DUMMY_MAP)
+    map_data.ascii_tiles = [[AsciiTile.UNSEEN] * 30 for _ in range(30)]
+
+    graph = cache.get(map_data, [])
+    assert cache.get(deepcopy(map_data), []) is graph  # A fresh copy of the same map is a hit.
+    assert (cache.hits, cache.patches, cache.builds) == (1, 0, 1)
+
+    revealed = deepcopy(map_data)
+    revealed.update_tiles(0, 0, np.full((9, 10), AsciiTile.FREE))
+    cache.get(revealed, [])
+    assert (cache.hits, cache.patches, cache.builds) == (1, 1, 1)
+
+    # Revealing more than a screen at once needs a full rebuild, and evicts the original map.
+    fully_revealed = deepcopy(map_data)
+    fully_revealed.ascii_tiles = [[AsciiTile.FREE] * 30 for _ in range(30)]
+    cache.get(fully_revealed, [])
+    assert (cache.hits, cache.patches, cache.builds) == (1, 1, 2)
+
+    cache.get(map_data, [AsciiTile.CUT_TREE])  # Different HMs are a different graph.
+    cache.get(map_data, [])
+    assert (cache.hits, cache.patches, cache.builds) == (1, 1, 4)
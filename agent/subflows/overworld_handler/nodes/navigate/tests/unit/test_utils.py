@@ -246,6 +246,28 @@ async def test_get_map_boundary_tiles_collision_pairs() -> None:
     assert boundary_tiles[FacingDirection.UP] == []
 
 
+@pytest.mark.unit
+async def test_explore_from_plateau() -> None:
+    """Test that a single flood fill matches the separate searches and records the distances."""
+    map_data = deepcopy(DUMMY_MAP)
+    map_data.ascii_tiles = PLATEAU_MAP
+    map_data.south_connection = MapId.ROUTE_1
+
+    exploration = await utils.explore_from(PLATEAU_CENTER, map_data, [])
+    accessible_coords = await utils.get_accessible_coords(PLATEAU_CENTER, map_data, [])
+
+    assert exploration.accessible_coords == accessible_coords
+    assert exploration.exploration_candidates == utils.get_exploration_candidates(
+        accessible_coords,
+        map_data,
+    )
+    assert exploration.boundary_tiles == utils.get_map_boundary_tiles(accessible_coords, map_data)
+    # Jumping a ledge counts as one move.
+    assert exploration.distances[2] == [-1, 3, -1, 2, 1, 0, 1, 2, -1, 3, -1]
+    assert exploration.is_accessible(Coords(row=6, col=5))
+    assert not exploration.is_accessible(Coords(row=7, col=5))
+
+
 @pytest.mark.unit
 async def test_calculate_path_to_target_plateau_jump_left() -> None:
     """Test that the path to the target is correct for the plateau map when jumping left."""
@@ -434,6 +456,44 @@ async def test_calculate_path_through_spinners() -> None:
     assert path == [Button.DOWN]
 
 
+@pytest.mark.unit
+async def test_calculate_path_through_spinner_loop() -> None:
+    """Test that a partially revealed spinner loop stops the player instead of spinning forever."""
+    map_data = deepcopy(DUMMY_MAP)
+    map_data.ascii_tiles = [list("∙→∙⇩"), list("∙⇧∙←")]
+
+    # Stepping onto the loop sends the player around it and back to where it started.
+    path = await utils.calculate_path_to_target(
+        Coords(row=0, col=0),
+        Coords(row=0, col=1),
+        map_data,
+        [],
+    )
+    assert path == [Button.RIGHT]
+
+
+@pytest.mark.unit
+def test_get_walk_stops_before_hm_tile_after_ledge() -> None:
+    """Test that the walk accounts for ledge jumps covering two tiles when looking for HM tiles."""
+    map_data = deepcopy(DUMMY_MAP)
+    map_data.ascii_tiles = [list("∙⌋∙┬∙")]
+
+    path = 3 * [Button.RIGHT]
+    walk = utils.get_walk(path, Coords(row=0, col=0), map_data, [AsciiTile.CUT_TREE])
+    assert walk == [Button.RIGHT]
+
+
+@pytest.mark.unit
+def test_get_walk_stops_before_hm_tile_after_spinner() -> None:
+    """Test that the walk follows spinners when looking for HM tiles."""
+    map_data = deepcopy(DUMMY_MAP)
+    map_data.ascii_tiles = [list("∙→∙∙⊙┬∙")]
+
+    path = 2 * [Button.RIGHT]
+    walk = utils.get_walk(path, Coords(row=0, col=0), map_data, [AsciiTile.CUT_TREE])
+    assert walk == [Button.RIGHT]
+
+
 def _coords_to_binary_map(coords: set[Coords], height: int, width: int) -> list[str]:
     """Convert a coords to a binary string for more visual matching."""
     return [
@@ -6,10 +6,18 @@ concerns to make them easier to test.
 """
 
 import asyncio
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count
 
 import numpy as np
 
-from common.enums import AsciiTile, BlockedDirection, Button, FacingDirection
+from agent.subflows.overworld_handler.nodes.navigate.graph import (
+    DIRECTION_BUTTONS,
+    get_navigation_graph,
+)
+from agent.subflows.overworld_handler.nodes.navigate.schemas import ExplorationResult
+from common.enums import AsciiTile, Button, FacingDirection
 from common.schemas import Coords
 from overworld_map.schemas import OverworldMap
 
@@ -32,6 +40,24 @@ async def get_accessible_coords(
     return await asyncio.to_thread(_get_accessible_coords, start_pos, map_data, hm_tiles)
 
 
+async def explore_from(
+    start_pos: Coords,
+    map_data: OverworldMap,
+    hm_tiles: list[AsciiTile],
+) -> ExplorationResult:
+    """
+    Flood fill outward from the player's position to find the accessible coords, the exploration
+    candidates, the map boundary tiles, and the distance to every tile, all in a single pass. Do
+    this on a thread because it's pretty slow.
+
+    :param start_pos: Starting position to search from
+    :param map_data: Map data containing tiles and blockages
+    :param hm_tiles: List of tiles that are accessible using the player's current HMs.
+    :return: The result of the search.
+    """
+    return await asyncio.to_thread(_explore_from, start_pos, map_data, hm_tiles)
+
+
 async def calculate_path_to_target(
     start_pos: Coords,
     target_pos: Coords,
@@ -68,18 +94,8 @@ def get_exploration_candidates(
     :param map_data: Map data containing tiles
     :return: List of coordinates that are adjacent to unseen tiles
     """
-    candidates = []
-    tiles = map_data.ascii_tiles_ndarray
-    height, width = tiles.shape
-
-    for c in accessible_coords:
-        for dy, dx in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            ny, nx = c.row + dy, c.col + dx
-            if 0 <= ny < height and 0 <= nx < width and tiles[ny, nx] == AsciiTile.UNSEEN:
-                candidates.append(c)
-                break
-
-    return candidates
+    is_candidate = _get_unseen_neighbour_mask(map_data.ascii_tiles_ndarray)
+    return [c for c in accessible_coords if is_candidate[c.row, c.col]]
 
 
 def get_map_boundary_tiles(
@@ -93,8 +109,7 @@ def get_map_boundary_tiles(
     :param map_data: Map data containing tiles
     :return: Dictionary mapping directions to lists of boundary coordinates
     """
-    tiles = map_data.ascii_tiles_ndarray
-    height, width = tiles.shape
+    height, width = map_data.height, map_data.width
     boundary_tiles = {
         FacingDirection.UP: [],
         FacingDirection.DOWN: [],
@@ -115,24 +130,79 @@ def get_map_boundary_tiles(
     return boundary_tiles
 
 
+def get_walk(
+    path: list[Button],
+    start_pos: Coords,
+    map_data: OverworldMap,
+    hm_tiles: list[AsciiTile],
+) -> list[Button]:
+    """
+    Get the start of the path that can be walked in one go, up to the next tile that needs an HM.
+    The positions along the path come from the navigation graph, because ledge jumps and spinners
+    move the player more than one tile per button.
+
+    :param path: The button presses of the path.
+    :param start_pos: The position that the path starts from.
+    :param map_data: Map data containing tiles and blockages
+    :param hm_tiles: List of tiles that are accessible using the player's current HMs.
+    :return: The button presses to walk before the next HM use.
+    """
+    graph = get_navigation_graph(map_data, hm_tiles)
+    current = graph.to_index(start_pos)
+    for i, button in enumerate(path):
+        current = graph.destinations[current][DIRECTION_BUTTONS.index(button)]
+        if current < 0:
+            # The path doesn't match the map, so there's no telling where the player ends up.
+            return path[: i + 1]
+        if graph.tiles.flat[current] in hm_tiles:
+            return path[:i]
+    return path
+
+
 def _get_accessible_coords(
     start_pos: Coords,
     map_data: OverworldMap,
     hm_tiles: list[AsciiTile],
 ) -> list[Coords]:
-    """Recursively search outward from the player's position to find all accessible coords."""
-    visited = {start_pos}
-    queue = [start_pos]
-    accessible = [start_pos]
+    """Breadth-first search outward from the player's position to find all accessible coords."""
+    return _explore_from(start_pos, map_data, hm_tiles).accessible_coords
+
+
+def _explore_from(
+    start_pos: Coords,
+    map_data: OverworldMap,
+    hm_tiles: list[AsciiTile],
+) -> ExplorationResult:
+    """
+    Breadth-first search outward from the player's position, recording the distance to each tile,
+    then derive the exploration candidates and boundary tiles from the accessible coords.
+    """
+    graph = get_navigation_graph(map_data, hm_tiles)
+    start = graph.to_index(start_pos)
+    distances = [-1] * len(graph.destinations)
+    distances[start] = 0
+    queue = deque([start])
+    accessible = [start]
     while queue:
-        current = queue.pop(0)
-        for neighbor, _ in _get_neighbors(current, map_data, hm_tiles):
-            if neighbor not in visited:
-                visited.add(neighbor)
+        current = queue.popleft()
+        distance = distances[current] + 1
+        for neighbor in graph.destinations[current]:
+            if neighbor >= 0 and distances[neighbor] < 0:
+                distances[neighbor] = distance
                 queue.append(neighbor)
                 accessible.append(neighbor)
 
-    return accessible
+    accessible_coords = [graph.to_coords(i) for i in accessible]
+    is_candidate = _get_unseen_neighbour_mask(graph.tiles).ravel().tolist()
+    width = graph.width
+    return ExplorationResult(
+        accessible_coords=accessible_coords,
+        exploration_candidates=[
+            c for i, c in zip(accessible, accessible_coords, strict=True) if is_candidate[i]
+        ],
+        boundary_tiles=get_map_boundary_tiles(accessible_coords, map_data),
+        distances=[distances[i : i + width] for i in range(0, len(distances), width)],
+    )
 
 
 def _calculate_path_to_target(
@@ -151,150 +221,63 @@ def _calculate_path_to_target(
     :param hm_tiles: List of tiles that are accessible using the player's current HMs.
     :return: List of button presses to reach target, or None if no path found
     """
-    open_set = {start_pos}
-    came_from: dict[Coords, tuple[Coords, Button]] = {}
-    g_score = {start_pos: 0}
-    f_score = {start_pos: (start_pos - target_pos).length}
-    tile_arr = map_data.ascii_tiles_ndarray
-    expensive_tiles = [
-        AsciiTile.GRASS,
-        AsciiTile.CUT_TREE,
-        AsciiTile.WATER,
-        *AsciiTile.get_spinner_tiles(),
-    ]
-
-    while open_set:
-        current = min(open_set, key=lambda pos: f_score.get(pos, float("inf")))
-
-        if current == target_pos:
+    graph = get_navigation_graph(map_data, hm_tiles)
+    if not graph.contains(target_pos):
+        return None
+    width = graph.width
+    destinations = graph.destinations
+    costs = graph.costs
+    start = graph.to_index(start_pos)
+    target = graph.to_index(target_pos)
+    target_row, target_col = target_pos.row, target_pos.col
+
+    came_from: dict[int, tuple[int, Button]] = {}
+    g_score = {start: 0}
+    # Entries are (f score, insertion order, g score, cell). Ledges and spinners cover more than one
+    # tile per step, so the Manhattan heuristic isn't admissible and cells may need to be reopened.
+    # Rather than updating entries in place, improved cells are pushed again and the stale entries
+    # are skipped when they're popped.
+    open_heap = [((start_pos - target_pos).length, 0, 0, start)]
+    counter = count(1)
+
+    while open_heap:
+        _, _, g, current = heappop(open_heap)
+        if g > g_score[current]:
+            continue
+
+        if current == target:
             # Reconstruct path and convert to button presses
             path = []
             while current in came_from:
-                prev, button = came_from[current]
+                current, button = came_from[current]
                 path.append(button)
-                current = prev
 
             return list(reversed(path))  # Reverse to get start->target order
 
-        open_set.remove(current)
-
-        for neighbor, button in _get_neighbors(current, map_data, hm_tiles):
-            # Bias movement away from tiles that take more time to traverse.
-            increment = 5 if tile_arr[neighbor.row, neighbor.col] in expensive_tiles else 1
-            tentative_g_score = g_score[current] + increment
-
-            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                came_from[neighbor] = (current, button)
+        for direction, neighbor in enumerate(destinations[current]):
+            if neighbor < 0:
+                continue
+            tentative_g_score = g + costs[neighbor]
+            if tentative_g_score < g_score.get(neighbor, tentative_g_score + 1):
+                came_from[neighbor] = (current, DIRECTION_BUTTONS[direction])
                 g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + (neighbor - target_pos).length
-                open_set.add(neighbor)
+                row, col = divmod(neighbor, width)
+                h_score = abs(row - target_row) + abs(col - target_col)
+                heappush(
+                    open_heap,
+                    (tentative_g_score + h_score, next(counter), tentative_g_score, neighbor),
+                )
 
     # If we get here, no path was found
     return None
 
 
-def _get_neighbors(
-    pos: Coords,
-    map_data: OverworldMap,
-    hm_tiles: list[AsciiTile],
-) -> list[tuple[Coords, Button]]:
-    """
-    Get all valid neighboring coordinates from a given position.
-
-    :param pos: The position to get neighbors for
-    :param map_data: Map data containing tiles and blockages
-    :param hm_tiles: List of tiles that are accessible using the player's current HMs.
-    :return: List of valid neighboring coordinates, and the button to press to get there.
-    """
-    neighbors: list[tuple[Coords, Button]] = []
-    walkable_tiles = AsciiTile.get_walkable_tiles()
-    spinner_tiles = AsciiTile.get_spinner_tiles()
-
-    tiles = map_data.ascii_tiles_ndarray
-    if tiles[pos.row, pos.col] in [AsciiTile.WARP, AsciiTile.BOULDER_HOLE]:
-        return []  # You can walk on these tiles, but they have no neighbours because they warp you.
-
-    for dy, dx in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-        new_pos = pos + (dy, dx)  # noqa: RUF005
-        button = _DIRECTION_BUTTON_MAP[(dy, dx)]
-
-        if (
-            new_pos.row < 0
-            or new_pos.row >= map_data.height
-            or new_pos.col < 0
-            or new_pos.col >= map_data.width
-        ):
-            continue
-
-        target_tile = tiles[new_pos.row, new_pos.col]
-
-        if (
-            (target_tile == AsciiTile.LEDGE_DOWN and dy == 1)
-            or (target_tile == AsciiTile.LEDGE_LEFT and dx == -1)
-            or (target_tile == AsciiTile.LEDGE_RIGHT and dx == 1)
-        ):
-            # Jumping over a ledge skips a tile.
-            ledge_pos = new_pos + (dy, dx)  # noqa: RUF005
-            neighbors.append((ledge_pos, button))
-        elif target_tile in spinner_tiles:
-            destination = _get_spinner_destination(new_pos, tiles)
-            neighbors.append((destination, button))
-        elif not _is_blocked(pos, dy, dx, map_data) and (
-            target_tile in walkable_tiles
-            or (target_tile == AsciiTile.CUT_TREE and AsciiTile.CUT_TREE in hm_tiles)
-            or (target_tile == AsciiTile.WATER and AsciiTile.WATER in hm_tiles)
-        ):
-            neighbors.append((new_pos, button))
-
-    return neighbors
-
-
-def _is_blocked(current: Coords, dy: int, dx: int, map_data: OverworldMap) -> bool:
-    """Check if the movement is blocked by a paired tile collision."""
-    blockages = map_data.blockages.get(current)
-    if not blockages:
-        return False
-    if dy == 1:
-        return bool(blockages & BlockedDirection.DOWN)
-    if dy == -1:
-        return bool(blockages & BlockedDirection.UP)
-    if dx == 1:
-        return bool(blockages & BlockedDirection.RIGHT)
-    if dx == -1:
-        return bool(blockages & BlockedDirection.LEFT)
-    return False
-
-
-def _get_spinner_destination(pos: Coords, tiles: np.ndarray) -> Coords:
-    """Get the destination of a spinner tile."""
-    tile = tiles[pos.row, pos.col]
-    direction = _SPINNER_DIRECTION_MAP[tile]
-
-    while True:
-        new_pos = pos + direction
-        new_tile = tiles[new_pos.row, new_pos.col]
-        # Unseen is an edge case. We don't know where it goes, but we can't follow it any further.
-        # Assume we stop just before it. This breaks navigation, but there's nothing we can do
-        # until the tile is revealed on the next Agent iteration.
-        if new_tile == AsciiTile.UNSEEN:
-            return pos
-        if new_tile == AsciiTile.SPINNER_STOP:
-            return new_pos
-        if new_tile in AsciiTile.get_spinner_tiles():
-            direction = _SPINNER_DIRECTION_MAP[new_tile]
-        pos = new_pos
-
-
-_DIRECTION_BUTTON_MAP = {
-    (0, 1): Button.RIGHT,
-    (1, 0): Button.DOWN,
-    (0, -1): Button.LEFT,
-    (-1, 0): Button.UP,
-}
-
-_SPINNER_DIRECTION_MAP = {
-    AsciiTile.SPINNER_UP: Coords(row=-1, col=0),
-    AsciiTile.SPINNER_DOWN: Coords(row=1, col=0),
-    AsciiTile.SPINNER_LEFT: Coords(row=0, col=-1),
-    AsciiTile.SPINNER_RIGHT: Coords(row=0, col=1),
-}
+def _get_unseen_neighbour_mask(tiles: np.ndarray) -> np.ndarray:
+    """Get a boolean mask of the tiles that are directly adjacent to an unseen tile."""
+    padded_unseen = np.pad(tiles == AsciiTile.UNSEEN, 1, constant_values=False)
+    return (
+        padded_unseen[:-2, 1:-1]
+        | padded_unseen[2:, 1:-1]
+        | padded_unseen[1:-1, :-2]
+        | padded_unseen[1:-1, 2:]
+    )
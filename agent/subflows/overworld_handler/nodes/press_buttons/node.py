@@ -1,7 +1,9 @@
 from junjo import Node
 from loguru import logger
 
+from agent.subflows.overworld_handler.enums import OverworldTool
 from agent.subflows.overworld_handler.nodes.press_buttons.service import PressButtonsService
+from agent.subflows.overworld_handler.speculation import speculative_calls
 from agent.subflows.overworld_handler.state import OverworldHandlerStore
 from emulator.emulator import YellowLegacyEmulator
 
@@ -27,8 +29,11 @@ class PressButtonsNode(Node[OverworldHandlerStore]):
             iteration=state.iteration,
             raw_memory=state.raw_memory,
             state_string_builder=state.to_prompt_string,
+            prompt_prefix=state.to_prompt_prefix(),
             emulator=self.emulator,
         )
-        raw_memory = await service.press_buttons()
+        speculation = speculative_calls.take(OverworldTool.PRESS_BUTTONS)
+        speculated = speculation.response if speculation else None
+        raw_memory = await service.press_buttons(speculated)
 
         await store.set_raw_memory(raw_memory)
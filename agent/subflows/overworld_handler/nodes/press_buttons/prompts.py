@@ -25,6 +25,6 @@ Your most recent raw memory is repeated below for reference. Pay close attention
 If you see specific button presses in the <last_memory> section, do not treat them as mandatory. You have more information available to you in this prompt than you did when the above memory was generated, so you are allowed to overrule it if the request does not make sense (e.g. if it is asking you to face right to interact with a sprite that is to your left). Determine what the memory is trying to tell you and choose the best button(s) from the list of available buttons above.
 
 Reflect on the information provided to you and respond in the format given below. The relevant keys are:
-- thoughts: Your one sentence long thoughts on which buttons to press given the information provided. These thoughts will be appended verbatim to the end of the <last_memory> in your raw memory, so try to continue the thought process from there.
 - buttons: The button(s) to press. This can either be a single button, or a list of buttons to be pressed in sequence. You should generally prefer to press a single button at a time, but you can use a combination of buttons to, say, rotate the player and then interact with an object.
+- thoughts: Your one sentence long thoughts on why you chose these buttons given the information provided. These thoughts will be appended verbatim to the end of the <last_memory> in your raw memory, so try to continue the thought process from there.
 """.strip()
@@ -1,13 +1,16 @@
 from loguru import logger
+from opentelemetry import trace
 
 from agent.subflows.overworld_handler.nodes.press_buttons.prompts import PRESS_BUTTONS_PROMPT
 from agent.subflows.overworld_handler.nodes.press_buttons.schemas import PressButtonsResponse
+from agent.subflows.overworld_handler.speculation import Speculation
 from common.enums import Button, FacingDirection, MapId
 from common.schemas import Coords
 from common.types import StateStringBuilderT
 from emulator.emulator import YellowLegacyEmulator
-from llm.schemas import GEMINI_FLASH_2_5
-from llm.service import GeminiLLMService
+from llm.schemas import GEMINI_FLASH_2_5, LLMMessage
+from llm.service import GeminiLLMService, estimate_tokens
+from llm.streaming import StreamedResponse
 from memory.raw_memory import RawMemory
 
 
@@ -21,39 +24,41 @@ class PressButtonsService:
         iteration: int,
         raw_memory: RawMemory,
         state_string_builder: StateStringBuilderT,
+        prompt_prefix: str,
         emulator: YellowLegacyEmulator,
     ) -> None:
         self.iteration = iteration
         self.raw_memory = raw_memory
         self.state_string_builder = state_string_builder
+        self.prompt_prefix = prompt_prefix
         self.emulator = emulator
 
-    async def press_buttons(self) -> RawMemory:
-        """Press buttons based on the current overworld game state."""
-        game_state = self.emulator.get_game_state()
-        img = self.emulator.get_screenshot()
-        last_memory = self.raw_memory.pieces.get(self.iteration) or ""
-        prompt = PRESS_BUTTONS_PROMPT.format(
-            state=self.state_string_builder(game_state),
-            last_memory=last_memory,
-        )
+    async def speculate(self) -> Speculation[StreamedResponse[PressButtonsResponse]]:
+        """Start the LLM call before the tool is selected, for `press_buttons` if it's selected."""
+        messages = self._get_messages()
+        response = await self._request_buttons(messages)
+        return Speculation(response, response.task, estimate_tokens(messages))
+
+    async def press_buttons(
+        self,
+        speculated: StreamedResponse[PressButtonsResponse] | None = None,
+    ) -> RawMemory:
+        """
+        Press buttons based on the current overworld game state.
+
+        :param speculated: The response of a speculative call, made before the tool was selected.
+        :return: The updated raw memory.
+        """
         try:
-            response = await self.llm_service.get_llm_response_pydantic(
-                messages=[img, prompt],
-                schema=PressButtonsResponse,
-                prompt_name="press_buttons",
-            )
+            response = speculated or await self._request_buttons(self._get_messages())
+            # The buttons are pressed as soon as they're parsed, before the rest of the response.
+            buttons = await response.field("buttons")
         except Exception as e:  # noqa: BLE001
             logger.warning(f"Error in the button pressing response. Skipping. {e}")
             return self.raw_memory
 
-        buttons = response.buttons if isinstance(response.buttons, list) else [response.buttons]
-        self.raw_memory.add_memory(
-            iteration=self.iteration,
-            content=(
-                f"{response.thoughts} Selected the following buttons: {[str(b) for b in buttons]}."
-            ),
-        )
+        trace.get_current_span().set_attribute("llm.time_to_first_action_s", response.elapsed)
+        buttons = buttons if isinstance(buttons, list) else [buttons]
         for b in buttons:
             game_state = self.emulator.get_game_state()
             await self.emulator.press_button(b)
@@ -67,8 +72,38 @@ class PressButtonsService:
             state_changed = self._check_for_state_change()
             if not passed_collision or not passed_action or state_changed:
                 break
+        content = f"Selected the following buttons: {[str(b) for b in buttons]}."
+        try:
+            content = f"{await response.field('thoughts')} {content}"
+            await response.result()
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Error in the rest of the button pressing response. {e}")
+        self.raw_memory.add_memory(iteration=self.iteration, content=content)
         return self.raw_memory
 
+    def _get_messages(self) -> list[LLMMessage]:
+        """Get the messages of the button pressing prompt."""
+        game_state = self.emulator.get_game_state()
+        img = self.emulator.get_screenshot().png
+        last_memory = self.raw_memory.pieces.get(self.iteration) or ""
+        prompt = PRESS_BUTTONS_PROMPT.format(
+            state=self.state_string_builder(game_state),
+            last_memory=last_memory,
+        )
+        return [img, prompt]
+
+    async def _request_buttons(
+        self,
+        messages: list[LLMMessage],
+    ) -> StreamedResponse[PressButtonsResponse]:
+        """Start streaming the response to the button pressing prompt."""
+        return await self.llm_service.stream_llm_response_pydantic(
+            messages=messages,
+            schema=PressButtonsResponse,
+            prompt_name="press_buttons",
+            prompt_prefix=self.prompt_prefix,
+        )
+
     def _check_for_collision(
         self,
         button: Button,
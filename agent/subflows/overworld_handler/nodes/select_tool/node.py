@@ -1,8 +1,15 @@
+import asyncio
+
 from junjo import Node
 from loguru import logger
 
+from agent.subflows.overworld_handler.enums import OverworldTool
+from agent.subflows.overworld_handler.nodes.navigate.service import NavigationService
+from agent.subflows.overworld_handler.nodes.press_buttons.service import PressButtonsService
 from agent.subflows.overworld_handler.nodes.select_tool.service import SelectToolService
-from agent.subflows.overworld_handler.state import OverworldHandlerStore
+from agent.subflows.overworld_handler.speculation import speculative_calls
+from agent.subflows.overworld_handler.state import OverworldHandlerState, OverworldHandlerStore
+from common.settings import settings
 from emulator.emulator import YellowLegacyEmulator
 
 
@@ -33,9 +40,48 @@ class SelectToolNode(Node[OverworldHandlerStore]):
             current_map=state.current_map,
             iterations_since_last_critique=state.iterations_since_last_critique,
             state_string_builder=state.to_prompt_string,
+            prompt_prefix=state.to_prompt_prefix(),
             emulator=self.emulator,
         )
-        tool, raw_memory = await service.select_tool()
+        if settings.speculative_overworld_tools:
+            (tool, raw_memory), _ = await asyncio.gather(
+                service.select_tool(),
+                self._speculate(state),
+            )
+            speculative_calls.select(tool)
+        else:
+            tool, raw_memory = await service.select_tool()
 
         await store.set_raw_memory(raw_memory)
         await store.set_tool(tool)
+
+    async def _speculate(self, state: OverworldHandlerState) -> None:
+        """
+        Start the calls of the common tools while the tool is being selected, for the selected one
+        to pick up. Their prompts don't include the selector's thoughts, which aren't known yet.
+        """
+        speculative_calls.discard_all()
+        if state.raw_memory is None or state.iteration is None or state.current_map is None:
+            return
+        try:
+            press_buttons = PressButtonsService(
+                iteration=state.iteration,
+                raw_memory=state.raw_memory,
+                state_string_builder=state.to_prompt_string,
+                prompt_prefix=state.to_prompt_prefix(),
+                emulator=self.emulator,
+            )
+            speculative_calls.start(OverworldTool.PRESS_BUTTONS, await press_buttons.speculate())
+            if self.emulator.get_game_state().player.is_biking:
+                return  # The navigation tool isn't available.
+            navigation = NavigationService(
+                iteration=state.iteration,
+                emulator=self.emulator,
+                current_map=state.current_map,
+                raw_memory=state.raw_memory,
+                state_string_builder=state.to_prompt_string,
+                prompt_prefix=state.to_prompt_prefix(),
+            )
+            speculative_calls.start(OverworldTool.NAVIGATION, await navigation.speculate())
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Error starting the speculative tool calls. {e}")
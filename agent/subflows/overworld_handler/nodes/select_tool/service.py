@@ -35,6 +35,7 @@ class SelectToolService:
         current_map: OverworldMap,
         iterations_since_last_critique: int,
         state_string_builder: StateStringBuilderT,
+        prompt_prefix: str,
         emulator: YellowLegacyEmulator,
     ) -> None:
         self.iteration = iteration
@@ -42,12 +43,13 @@ class SelectToolService:
         self.current_map = current_map
         self.iterations_since_last_critique = iterations_since_last_critique
         self.state_string_builder = state_string_builder
+        self.prompt_prefix = prompt_prefix
         self.emulator = emulator
 
     async def select_tool(self) -> tuple[OverworldTool, RawMemory]:
         """Select a tool based on the current overworld game state."""
         game_state = self.emulator.get_game_state()
-        img = self.emulator.get_screenshot()
+        img = self.emulator.get_screenshot().png
         prompt = SELECT_TOOL_PROMPT.format(
             state=self.state_string_builder(game_state),
             tools=self._get_available_tool_info(game_state),
@@ -57,6 +59,7 @@ class SelectToolService:
                 messages=[img, prompt],
                 schema=SelectToolResponse,
                 prompt_name="select_overworld_tool",
+                prompt_prefix=self.prompt_prefix,
             )
             tool = OverworldTool(response.tool)
         except Exception as e:  # noqa: BLE001
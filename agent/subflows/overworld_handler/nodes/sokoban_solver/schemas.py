@@ -2,6 +2,10 @@ from pydantic import BaseModel
 
 from common.schemas import Coords
 
+FREE_TILE = "F"
+WALL_TILE = "W"
+WARP_TILE = "P"
+
 
 class SokobanMap(BaseModel):
     """A simplified map of the Sokoban puzzle."""
@@ -2,18 +2,21 @@ import asyncio
 
 from loguru import logger
 
-from agent.subflows.overworld_handler.nodes.sokoban_solver.schemas import SokobanMap
-from common.enums import AsciiTile, BlockedDirection, Button, FacingDirection, SpriteLabel
+from agent.subflows.overworld_handler.nodes.sokoban_solver.schemas import (
+    FREE_TILE,
+    WALL_TILE,
+    WARP_TILE,
+    SokobanMap,
+)
+from agent.subflows.overworld_handler.nodes.sokoban_solver.solver import SokobanSolver
+from common.enums import AsciiTile, Button, FacingDirection, SpriteLabel
 from common.schemas import Coords
+from emulator.animation import BOULDER_ANIMATION
 from emulator.emulator import YellowLegacyEmulator
 from emulator.game_state import YellowLegacyGameState
 from memory.raw_memory import RawMemory
 from overworld_map.schemas import OverworldMap
 
-FREE_TILE = "F"
-WALL_TILE = "W"
-WARP_TILE = "P"
-
 
 class SokobanSolverService:
     """Solve the Sokoban puzzle."""
@@ -83,90 +86,15 @@ class SokobanSolverService:
         return SokobanMap(tiles=simplified_tiles, boulders=boulders, goals=goals)
 
     def _solve_sokoban(self, sokoban_map: SokobanMap) -> list[Button] | None:
-        """
-        Solve the Sokoban puzzle using BFS on the state space. This could be optimized, but the
-        state spaces in Pokemon are small and simple enough that this is likely fine.
-        """
+        """Solve the Sokoban puzzle with a search over the boulder pushes."""
         player_pos = self.emulator.get_game_state().player.coords
-        initial_state = (player_pos, frozenset(sokoban_map.boulders))
-
-        queue = [(initial_state, [])]
-        visited = {initial_state}
-
-        while queue:
-            (current_player_pos, current_boulders), path = queue.pop(0)
-            if current_boulders & sokoban_map.goals:  # At least one goal is solved.
-                return path
-
-            # There's thankfully no special neighbour logic here. Unlike the general navigation
-            # service, the Sokoban puzzles never involve spinner tiles, surfing, or ledges.
-            for direction in [
-                Coords(row=0, col=1),
-                Coords(row=1, col=0),
-                Coords(row=0, col=-1),
-                Coords(row=-1, col=0),
-            ]:
-                new_player_pos = current_player_pos + direction
-                if not self._is_movement_possible(
-                    new_player_pos,
-                    direction,
-                    sokoban_map,
-                    is_boulder=False,
-                ):
-                    continue
-
-                button = _DIRECTION_TO_BUTTON_MAP[direction]
-                if new_player_pos in current_boulders:  # Pushing a boulder.
-                    new_boulder_pos = new_player_pos + direction
-                    is_boulder_tile_free = self._is_movement_possible(
-                        new_boulder_pos,
-                        direction,
-                        sokoban_map,
-                        is_boulder=True,
-                    )
-                    if new_boulder_pos in current_boulders or not is_boulder_tile_free:
-                        continue  # Push is illegal.
-
-                    new_boulders = set(current_boulders)
-                    new_boulders.remove(new_player_pos)
-                    new_boulders.add(new_boulder_pos)
-                    # Pushing a boulder doesn't change the player's position!
-                    new_state = (current_player_pos, frozenset(new_boulders))
-
-                    if new_state not in visited:
-                        visited.add(new_state)
-                        queue.append((new_state, [*path, button]))
-
-                else:  # Regular walking.
-                    new_state = (new_player_pos, current_boulders)
-                    if new_state not in visited:
-                        visited.add(new_state)
-                        queue.append((new_state, [*path, button]))
-
-        return None  # No solution found.
-
-    def _is_movement_possible(
-        self,
-        pos: Coords,
-        direction: Coords,
-        sokoban_map: SokobanMap,
-        *,
-        is_boulder: bool,
-    ) -> bool:
-        """Check if a position is valid (within bounds, walkable, and not blocked)."""
-        if (
-            pos.row < 0
-            or pos.row >= len(sokoban_map.tiles)
-            or pos.col < 0
-            or pos.col >= len(sokoban_map.tiles[0])
-            or self._is_blocked(pos, direction.row, direction.col)
-        ):
-            return False
-        valid_tiles = (FREE_TILE,)
-        if is_boulder:
-            # Boulders can be pushed onto warp tiles, but the player should avoid them.
-            valid_tiles += (WARP_TILE,)
-        return sokoban_map.tiles[pos.row][pos.col] in valid_tiles
+        solver = SokobanSolver(sokoban_map, self.current_map.blockages)
+        solution = solver.solve(player_pos)
+        logger.info(
+            f"Sokoban solver expanded {solver.expanded_states} states and generated"
+            f" {solver.generated_states}.",
+        )
+        return solution
 
     async def _execute_solution(self, solution: list[Button], sokoban_map: SokobanMap) -> None:
         """Execute the solution by pressing buttons."""
@@ -186,12 +114,13 @@ class SokobanSolverService:
                 # We have to face Pikachu before we can walk through it.
                 await self._face_next_pos(button, game_state)
 
-            await self.emulator.press_button(button)
             if next_pos in sokoban_map.boulders:
+                # The boulders have a slow, irregular animation, so they need a longer wait.
+                await self.emulator.press_button(button, animation=BOULDER_ANIMATION)
                 sokoban_map.boulders.remove(next_pos)
                 sokoban_map.boulders.add(next_pos + _BUTTON_TO_DIRECTION_MAP[button])
-                # The boulders have a slow, irregular animation, so we add an extra wait.
-                await asyncio.sleep(1)
+            else:
+                await self.emulator.press_button(button)
 
             next_game_state = self.emulator.get_game_state()
             if (
@@ -210,21 +139,6 @@ class SokobanSolverService:
             content="Executed a Sokoban solution.",
         )
 
-    def _is_blocked(self, current: Coords, dy: int, dx: int) -> bool:
-        """Check if the movement is blocked by a paired tile collision."""
-        blockages = self.current_map.blockages.get(current)
-        if not blockages:
-            return False
-        if dy == 1:
-            return bool(blockages & BlockedDirection.DOWN)
-        if dy == -1:
-            return bool(blockages & BlockedDirection.UP)
-        if dx == 1:
-            return bool(blockages & BlockedDirection.RIGHT)
-        if dx == -1:
-            return bool(blockages & BlockedDirection.LEFT)
-        return False
-
     async def _face_next_pos(
         self,
         button: Button,
@@ -248,4 +162,3 @@ _BUTTON_TO_DIRECTION_MAP = {
     Button.DOWN: Coords(row=1, col=0),
     Button.UP: Coords(row=-1, col=0),
 }
-_DIRECTION_TO_BUTTON_MAP = {v: k for k, v in _BUTTON_TO_DIRECTION_MAP.items()}
@@ -0,0 +1,311 @@
+"""
+A push-level Sokoban solver.
+
+Rather than searching over every button press, the solver searches over boulder pushes. In each
+state it flood fills the tiles the player can reach, and every boulder that can be pushed from one
+of those tiles is a move, costing the walk to the boulder plus the push. States where the player
+can reach the same tiles are equivalent, so only one of them is expanded.
+
+Positions are integer cell indices and the set of boulders is a bitmask over them, so states are
+cheap to hash and store. States where no boulder can ever reach a goal are pruned, using the
+squares from which a boulder can't reach a goal even on an otherwise empty map (dead squares) and
+boulders that are frozen in place against walls and each other.
+"""
+
+import heapq
+from collections import deque
+from itertools import count
+
+from agent.subflows.overworld_handler.nodes.sokoban_solver.schemas import (
+    FREE_TILE,
+    WARP_TILE,
+    SokobanMap,
+)
+from common.enums import BlockedDirection, Button
+from common.schemas import Coords
+
+# The order of these determines the order in which pushes are explored. Opposite directions are two
+# apart, so the axes are (0, 2) and (1, 3).
+_DIRECTIONS = [
+    (Button.RIGHT, BlockedDirection.RIGHT, 0, 1),
+    (Button.DOWN, BlockedDirection.DOWN, 1, 0),
+    (Button.LEFT, BlockedDirection.LEFT, 0, -1),
+    (Button.UP, BlockedDirection.UP, -1, 0),
+]
+
+
+class SokobanSolver:
+    """
+    Find a short sequence of button presses that pushes any boulder onto any goal.
+
+    The search is an A* over pushes, so the pushes and the walking between them are minimized
+    together, except that each region of reachable tiles is only expanded from the first tile in it
+    that the search reaches. States are the player's cell index and the bitmask of boulders, where
+    the cell at (row, col) has the index `row * width + col`.
+    """
+
+    def __init__(
+        self,
+        sokoban_map: SokobanMap,
+        blockages: dict[Coords, BlockedDirection],
+    ) -> None:
+        self.height = len(sokoban_map.tiles)
+        self.width = len(sokoban_map.tiles[0])
+        self.boulders = sum(1 << self.to_index(b) for b in sokoban_map.boulders)
+        self.goals = sum(1 << self.to_index(g) for g in sokoban_map.goals)
+        self.expanded_states = 0
+        self.generated_states = 0
+
+        num_cells = self.height * self.width
+        # The cell in each direction from each cell, or -1 if it's off the map.
+        self._neighbours = [[-1] * 4 for _ in range(num_cells)]
+        # The same, but -1 if the player or a boulder can't move there.
+        self._walks = [[-1] * 4 for _ in range(num_cells)]
+        self._slides = [[-1] * 4 for _ in range(num_cells)]
+        for row in range(self.height):
+            for col in range(self.width):
+                for i, (_, blocked, dy, dx) in enumerate(_DIRECTIONS):
+                    target = Coords(row=row + dy, col=col + dx)
+                    if not (0 <= target.row < self.height and 0 <= target.col < self.width):
+                        continue
+                    index, target_index = row * self.width + col, self.to_index(target)
+                    self._neighbours[index][i] = target_index
+                    if blockages.get(target, BlockedDirection(0)) & blocked:
+                        continue
+                    tile = sokoban_map.tiles[target.row][target.col]
+                    # Boulders can be pushed onto warp tiles, but the player should avoid them.
+                    if tile == FREE_TILE:
+                        self._walks[index][i] = target_index
+                    if tile in (FREE_TILE, WARP_TILE):
+                        self._slides[index][i] = target_index
+
+        self._is_walking_reversible = all(
+            self._walks[target][(i + 2) % 4] == index
+            for index, walks in enumerate(self._walks)
+            for i, target in enumerate(walks)
+            if target != -1
+        )
+
+        # Where a boulder on each cell ends up when it's pushed in each direction, ignoring other
+        # boulders, or -1 if it can't be pushed that way.
+        self._push_targets = [
+            [
+                self._slides[index][i] if self._is_pushable_from_behind(index, i) else -1
+                for i in range(4)
+            ]
+            for index in range(num_cells)
+        ]
+        self._push_distances = self._get_push_distances()
+
+    def to_index(self, c: Coords) -> int:
+        """Convert coords to a cell index."""
+        return c.row * self.width + c.col
+
+    def solve(self, player_pos: Coords) -> list[Button] | None:
+        """
+        Solve the puzzle from the given starting position.
+
+        :param player_pos: The starting position of the player.
+        :return: The buttons to press, or None if no boulder can be pushed onto a goal.
+        """
+        start = (self.to_index(player_pos), self.boulders)
+        best_costs = {start: 0}
+        parents: dict[tuple[int, int], tuple[tuple[int, int], int]] = {}
+        expanded_regions = set()
+        tie_breaker = count()
+        # Ties are broken towards the deepest state, then first in, first out.
+        heap = [(self._get_heuristic(*start), 0, next(tie_breaker), start)]
+
+        while heap:
+            _, negative_cost, _, state = heapq.heappop(heap)
+            cost = -negative_cost
+            if cost > best_costs[state]:
+                continue
+            player, boulders = state
+            if boulders & self.goals:  # At least one goal is solved.
+                return self._get_buttons(state, parents)
+
+            boulder_cells = set(_iter_bits(boulders))
+            distances = self._get_walking_distances(player, boulder_cells)
+            # Any tile can stand in for the region, unless blockages make some walking one-way.
+            region = (
+                min(distances) if self._is_walking_reversible else frozenset(distances),
+                boulders,
+            )
+            if region in expanded_regions:
+                continue
+            expanded_regions.add(region)
+            self.expanded_states += 1
+
+            for stand, distance in distances.items():
+                for i, boulder in enumerate(self._walks[stand]):
+                    if boulder not in boulder_cells:
+                        continue
+                    target = self._push_targets[boulder][i]
+                    if target == -1 or target in boulder_cells:
+                        continue
+                    # Pushing a boulder doesn't change the player's position!
+                    new_boulders = boulders & ~(1 << boulder) | 1 << target
+                    new_state = (stand, new_boulders)
+                    new_cost = cost + distance + 1
+                    if new_cost >= best_costs.get(new_state, new_cost + 1):
+                        continue
+                    if not new_boulders & self.goals and self._is_deadlocked(new_boulders):
+                        continue
+                    best_costs[new_state] = new_cost
+                    parents[new_state] = (state, i)
+                    self.generated_states += 1
+                    priority = new_cost + self._get_heuristic(stand, new_boulders)
+                    heapq.heappush(heap, (priority, -new_cost, next(tie_breaker), new_state))
+
+        return None  # No solution found.
+
+    def _is_pushable_from_behind(self, index: int, direction: int) -> bool:
+        """Check if there's a tile behind a cell that the player can push it from."""
+        behind = self._neighbours[index][(direction + 2) % 4]
+        return behind != -1 and self._walks[behind][direction] == index
+
+    def _get_push_distances(self) -> list[int]:
+        """
+        Get the fewest pushes it takes to move a boulder from each cell onto a goal, ignoring the
+        other boulders, or -1 for dead squares where it's impossible.
+        """
+        num_cells = self.height * self.width
+        distances = [0 if self.goals >> index & 1 else -1 for index in range(num_cells)]
+        sources: list[list[int]] = [[] for _ in range(num_cells)]
+        for index, targets in enumerate(self._push_targets):
+            for target in targets:
+                if target != -1:
+                    sources[target].append(index)
+
+        queue = deque(index for index, distance in enumerate(distances) if distance == 0)
+        while queue:
+            current = queue.popleft()
+            for source in sources[current]:
+                if distances[source] == -1:
+                    distances[source] = distances[current] + 1
+                    queue.append(source)
+        return distances
+
+    def _get_heuristic(self, player: int, boulders: int) -> int:
+        """
+        Get a lower bound on the number of button presses left, which is the fewest pushes any
+        boulder needs plus the steps to walk next to it.
+        """
+        row, col = divmod(player, self.width)
+        return min(
+            (
+                self._push_distances[b]
+                + max(abs(b // self.width - row) + abs(b % self.width - col) - 1, 0)
+                for b in _iter_bits(boulders)
+                if self._push_distances[b] != -1
+            ),
+            default=0,
+        )
+
+    def _is_deadlocked(self, boulders: int) -> bool:
+        """Check if none of the boulders can ever be pushed onto a goal."""
+        return not any(
+            self._push_distances[boulder] != -1
+            and not self._is_frozen(boulder, boulders, assumed=0, is_live_only=True)
+            for boulder in _iter_bits(boulders)
+        )
+
+    def _is_frozen(
+        self,
+        boulder: int,
+        boulders: int,
+        assumed: int,
+        *,
+        is_live_only: bool = False,
+    ) -> bool:
+        """
+        Check if a boulder can never be pushed again, because it's blocked along both axes.
+
+        :param boulder: The cell of the boulder to check.
+        :param boulders: The bitmask of all boulders.
+        :param assumed: The bitmask of boulders to treat as walls, to break cycles between boulders
+            that block each other.
+        :param is_live_only: Only count pushes onto live squares, to check if the boulder can never
+            reach a goal instead.
+        :return: Whether the boulder is frozen.
+        """
+        assumed |= 1 << boulder
+        for axis in [(0, 2), (1, 3)]:
+            targets = [self._push_targets[boulder][i] for i in axis]
+            if any(
+                t != -1 and (self._push_distances[t] != -1 or not is_live_only) for t in targets
+            ) and not any(
+                self._is_blocking(self._neighbours[boulder][i], boulders, assumed) for i in axis
+            ):
+                return False
+        return True
+
+    def _is_blocking(self, neighbour: int, boulders: int, assumed: int) -> bool:
+        """Check if a neighbouring cell holds a boulder that's frozen or assumed to be a wall."""
+        if neighbour == -1 or not boulders >> neighbour & 1:
+            return False
+        return bool(assumed >> neighbour & 1) or self._is_frozen(neighbour, boulders, assumed)
+
+    def _get_walking_distances(self, player: int, boulder_cells: set[int]) -> dict[int, int]:
+        """Get the number of steps to each tile the player can reach without pushing a boulder."""
+        # There's an extra cell at the end that's always seen, so that -1 for no neighbour is too.
+        is_seen = bytearray(self.height * self.width + 1)
+        is_seen[-1] = is_seen[player] = 1
+        for boulder in boulder_cells:
+            is_seen[boulder] = 1
+
+        distances = {player: 0}
+        order = [player]
+        for current in order:
+            distance = distances[current] + 1
+            for neighbour in self._walks[current]:
+                if not is_seen[neighbour]:
+                    is_seen[neighbour] = 1
+                    distances[neighbour] = distance
+                    order.append(neighbour)
+        return distances
+
+    def _get_buttons(
+        self, state: tuple[int, int], parents: dict[tuple[int, int], tuple[tuple[int, int], int]]
+    ) -> list[Button]:
+        """Reconstruct the buttons to press to reach a state from the search tree."""
+        pushes = []
+        while state in parents:
+            parent, direction = parents[state]
+            pushes.append((parent, state[0], direction))
+            state = parent
+
+        buttons = []
+        for (player, boulders), stand, direction in reversed(pushes):
+            buttons += self._get_walking_path(player, stand, boulders)
+            buttons.append(_DIRECTIONS[direction][0])
+        return buttons
+
+    def _get_walking_path(self, start: int, target: int, boulders: int) -> list[Button]:
+        """Get the shortest path between two tiles without pushing a boulder."""
+        previous = {start: (start, -1)}
+        queue = deque([start])
+        while target not in previous:
+            current = queue.popleft()
+            for i, neighbour in enumerate(self._walks[current]):
+                if neighbour == -1 or neighbour in previous or boulders >> neighbour & 1:
+                    continue
+                previous[neighbour] = (current, i)
+                queue.append(neighbour)
+
+        path = []
+        while target != start:
+            target, direction = previous[target]
+            path.append(_DIRECTIONS[direction][0])
+        return path[::-1]
+
+
+def _iter_bits(mask: int) -> list[int]:
+    """Get the indices of the set bits of a mask."""
+    indices = []
+    while mask:
+        low_bit = mask & -mask
+        indices.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return indices
@@ -11,6 +11,7 @@ from emulator.game_state import YellowLegacyGameState
 from memory.raw_memory import RawMemory
 from overworld_map.schemas import OverworldSprite
 from overworld_map.service import get_overworld_map, update_map_with_screen_info
+from overworld_map.store import MapStore
 
 
 @pytest.mark.integration
@@ -21,6 +22,7 @@ async def test_solve_sokoban_puzzle_victory_road() -> None:
         save_state_path=save_file,
         mute_sound=True,
         headless=True,
+        speed=0,
     ) as emulator:
         game_state = emulator.get_game_state()
         assert game_state.player.coords == Coords(row=14, col=12)
@@ -49,6 +51,7 @@ async def test_solve_sokoban_puzzle_seafoam_islands() -> None:
         save_state_path=save_file,
         mute_sound=True,
         headless=True,
+        speed=0,
     ) as emulator:
         game_state = emulator.get_game_state()
         assert game_state.player.coords == Coords(row=15, col=6)
@@ -80,12 +83,7 @@ async def _get_sokoban_service(emulator: YellowLegacyEmulator) -> SokobanSolverS
     """Helper function to get a Sokoban solver service with the proper mocks."""
     game_state = emulator.get_game_state()
     with (
-        patch("database.map_memory.repository.get_map_memory", return_value=None),
-        patch(
-            "database.map_entity_memory.repository.get_map_entity_memories_for_map",
-            return_value=[],
-        ),
-        patch("database.map_memory.repository.update_map_tiles", return_value=None),
+        patch("overworld_map.service.map_store", MapStore()),
         patch("overworld_map.service._add_remove_map_entities", return_value=None),
     ):
         overworld_map = await get_overworld_map(0, game_state)
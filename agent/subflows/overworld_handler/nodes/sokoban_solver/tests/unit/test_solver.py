@@ -0,0 +1,96 @@
+"""
+Tests for the Sokoban solver.
+
+The maps use the simplified tiles from the solver service: "F" is free, "W" is a wall, and "P" is a
+warp (or a boulder hole) that boulders can be pushed onto, but the player avoids.
+"""
+
+import pytest
+
+from agent.subflows.overworld_handler.nodes.sokoban_solver.schemas import SokobanMap
+from agent.subflows.overworld_handler.nodes.sokoban_solver.solver import SokobanSolver
+from common.enums import BlockedDirection, Button
+from common.schemas import Coords
+
+
+@pytest.mark.unit
+def test_solve_single_push() -> None:
+    """Test walking around a boulder to push it onto a pressure plate."""
+    sokoban_map = SokobanMap(
+        tiles=[list(row) for row in ["FFFF", "FFFF", "FFFF"]],
+        boulders={Coords(row=1, col=1)},
+        goals={Coords(row=1, col=2)},
+    )
+    solver = SokobanSolver(sokoban_map, {})
+    solution = solver.solve(Coords(row=0, col=0))
+    assert solution == [Button.DOWN, Button.RIGHT]
+
+
+@pytest.mark.unit
+def test_solve_hole_behind_wall() -> None:
+    """Test pushing a boulder around a corner into a hole, without walking onto the hole."""
+    sokoban_map = SokobanMap(
+        tiles=[list(row) for row in ["FFFFF", "FFFFF", "WWWPW"]],
+        boulders={Coords(row=1, col=1)},
+        goals={Coords(row=2, col=3)},
+    )
+    solver = SokobanSolver(sokoban_map, {})
+    solution = solver.solve(Coords(row=1, col=0))
+    assert solution == [
+        Button.RIGHT,
+        Button.RIGHT,
+        Button.RIGHT,
+        Button.RIGHT,
+        Button.UP,
+        Button.RIGHT,
+        Button.DOWN,
+    ]
+
+
+@pytest.mark.unit
+def test_solve_respects_blockages() -> None:
+    """Test that boulders can't be pushed across blockages."""
+    sokoban_map = SokobanMap(
+        tiles=[list(row) for row in ["FFF", "FFF", "FFF"]],
+        boulders={Coords(row=1, col=1)},
+        goals={Coords(row=1, col=2)},
+    )
+    blockages = {Coords(row=1, col=2): BlockedDirection.RIGHT}
+    solver = SokobanSolver(sokoban_map, blockages)
+    assert solver.solve(Coords(row=1, col=0)) is None
+
+    sokoban_map.goals = {Coords(row=2, col=1)}
+    solver = SokobanSolver(sokoban_map, blockages)
+    assert solver.solve(Coords(row=1, col=0)) == [Button.UP, Button.RIGHT, Button.DOWN]
+
+
+@pytest.mark.unit
+def test_solve_any_goal_with_a_boulder_out_of_the_way() -> None:
+    """Test that a boulder can be pushed into a corner to clear the way for another one."""
+    sokoban_map = SokobanMap(
+        tiles=[list(row) for row in ["WWWFW", "FFFFF", "WWWFW"]],
+        boulders={Coords(row=1, col=2), Coords(row=1, col=3)},
+        goals={Coords(row=1, col=0)},
+    )
+    solver = SokobanSolver(sokoban_map, {})
+    solution = solver.solve(Coords(row=2, col=3))
+    assert solution == [Button.UP, Button.UP, Button.LEFT, Button.LEFT, Button.LEFT]
+
+
+@pytest.mark.unit
+def test_prune_deadlocked_states() -> None:
+    """Test that the solver gives up without searching when every boulder is deadlocked."""
+    sokoban_map = SokobanMap(
+        tiles=[list(row) for row in ["FFFFFF", "FFFFFF", "FFFFFF", "FFFFFF"]],
+        boulders={Coords(row=1, col=1), Coords(row=1, col=2)},
+        goals={Coords(row=3, col=5)},
+    )
+    solver = SokobanSolver(sokoban_map, {})
+    assert solver.solve(Coords(row=3, col=0)) is not None
+
+    # Boulders against the top wall can never move down, and two boulders next to each other
+    # against the wall can't move at all.
+    sokoban_map.boulders = {Coords(row=0, col=1), Coords(row=0, col=2)}
+    solver = SokobanSolver(sokoban_map, {})
+    assert solver.solve(Coords(row=3, col=0)) is None
+    assert (solver.expanded_states, solver.generated_states) == (1, 0)
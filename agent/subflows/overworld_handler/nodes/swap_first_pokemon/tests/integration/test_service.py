@@ -17,6 +17,7 @@ async def test_switch_to_pokemon() -> None:
         save_state_path=save_file,
         mute_sound=True,
         headless=True,
+        speed=0,
     ) as emulator:
         game_state = emulator.get_game_state()
         party_index = 3
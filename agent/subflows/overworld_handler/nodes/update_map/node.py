@@ -28,6 +28,7 @@ class UpdateMapNode(Node[OverworldHandlerStore]):
             iteration=state.iteration,
             current_map=state.current_map,
             state_string_builder=state.to_prompt_string,
+            prompt_prefix=state.to_prompt_prefix(),
         )
         current_map = await service.update_map()
 
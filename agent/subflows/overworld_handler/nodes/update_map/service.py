@@ -1,7 +1,6 @@
 import asyncio
 
 from loguru import logger
-from PIL.Image import Image
 
 from agent.subflows.overworld_handler.nodes.update_map.prompts import (
     UPDATE_SIGNS_PROMPT,
@@ -10,7 +9,6 @@ from agent.subflows.overworld_handler.nodes.update_map.prompts import (
 from agent.subflows.overworld_handler.nodes.update_map.schemas import UpdateEntitiesResponse
 from common.enums import MapEntityType
 from common.types import StateStringBuilderT
-from database.map_entity_memory.repository import update_map_entity_memory
 from database.map_entity_memory.schemas import MapEntityMemoryUpdate
 from emulator.emulator import YellowLegacyEmulator
 from emulator.game_state import YellowLegacyGameState
@@ -18,6 +16,7 @@ from llm.schemas import GEMINI_FLASH_2_5
 from llm.service import GeminiLLMService
 from overworld_map.schemas import OverworldMap, OverworldSign, OverworldSprite
 from overworld_map.service import update_map_with_screen_info
+from overworld_map.store import map_store
 
 
 class UpdateMapService:
@@ -30,16 +29,18 @@ class UpdateMapService:
         iteration: int,
         current_map: OverworldMap,
         state_string_builder: StateStringBuilderT,
+        prompt_prefix: str,
         emulator: YellowLegacyEmulator,
     ) -> None:
         self.iteration = iteration
         self.current_map = current_map
         self.state_string_builder = state_string_builder
+        self.prompt_prefix = prompt_prefix
         self.emulator = emulator
 
     async def update_map(self) -> OverworldMap:
         """Update the current map and nearby entities with the latest screen info."""
-        screenshot = self.emulator.get_screenshot()
+        screenshot = self.emulator.get_screenshot().png
         game_state = self.emulator.get_game_state()
         self.current_map = await update_map_with_screen_info(
             self.iteration,
@@ -70,7 +71,7 @@ class UpdateMapService:
         self,
         entities: list[OverworldSprite | OverworldSign],
         entity_type: MapEntityType,
-        screenshot: Image,
+        screenshot: bytes,
         game_state: YellowLegacyGameState,
         prompt: str,
     ) -> None:
@@ -81,7 +82,7 @@ class UpdateMapService:
 
         :param entities: The entities to update.
         :param entity_type: The type of entity to update.
-        :param screenshot: The screenshot of the current screen.
+        :param screenshot: The screenshot of the current screen, encoded as a PNG.
         :param game_state: The current game state.
         :param prompt: The prompt to use for the LLM.
         """
@@ -95,19 +96,25 @@ class UpdateMapService:
         entity_text = "\n".join(
             [f"- [{e.index}] {e.to_string(self.current_map.id)}" for e in updatable_entities],
         )
-        prompt = prompt.format(
-            state=self.state_string_builder(game_state),
-            entities=entity_text.strip(),
-        )
         try:
             response = await self.llm_service.get_llm_response_pydantic(
-                messages=[screenshot, prompt],
+                messages=[
+                    screenshot,
+                    prompt.format(
+                        state=self.state_string_builder(game_state),
+                        entities=entity_text.strip(),
+                    ),
+                ],
                 schema=UpdateEntitiesResponse,
                 prompt_name=f"update_{entity_type.name.lower()}s",
+                prompt_prefix=self.prompt_prefix,
+                # What the entities look like and what's known about them, not the rest of the
+                # state, which changes every iteration.
+                cache_key=[screenshot, prompt, entity_text],
             )
             await asyncio.gather(
                 *[
-                    update_map_entity_memory(
+                    map_store.update_entity(
                         MapEntityMemoryUpdate(
                             map_id=self.current_map.id,
                             entity_id=u.index,
@@ -15,6 +15,7 @@ async def test_use_item() -> None:
         save_state_path=save_file,
         mute_sound=True,
         headless=True,
+        speed=0,
     ) as emulator:
         raw_memory = RawMemory()
         raw_memory.add_memory(
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from typing import Any
+
+from loguru import logger
+
+from agent.subflows.overworld_handler.enums import OverworldTool
+
+
+class Speculation[T]:
+    """An LLM call for a tool, started before the tool was selected."""
+
+    def __init__(self, response: T, task: asyncio.Task[Any] | None, estimated_tokens: int) -> None:
+        """
+        Initialize the speculation, once its call is in flight.
+
+        :param response: What the tool needs to use the call's response, e.g. a streamed response.
+        :param task: The task that makes the call, to cancel it if the tool isn't selected.
+        :param estimated_tokens: The estimated tokens of the call, i.e. what's wasted if it is.
+        """
+        self.response = response
+        self.task = task
+        self.estimated_tokens = estimated_tokens
+        self.started_at = time.perf_counter()
+        self.finished_at: float | None = None
+        self.selected_at: float | None = None
+        if task is not None:
+            task.add_done_callback(self._on_done)
+
+    @property
+    def seconds_saved(self) -> float:
+        """The head start that the call got on the tool, up to the time it took to finish."""
+        if self.selected_at is None:
+            return 0
+        if self.finished_at is None:
+            return self.selected_at - self.started_at
+        return min(self.finished_at, self.selected_at) - self.started_at
+
+    def cancel(self) -> None:
+        """Cancel the call, if it's still in flight."""
+        if self.task is not None:
+            self.task.cancel()
+
+    def _on_done(self, task: asyncio.Task[Any]) -> None:
+        self.finished_at = time.perf_counter()
+        if not task.cancelled():
+            task.exception()  # Mark it as retrieved, in case the call is discarded.
+
+
+class SpeculativeCalls:
+    """
+    The LLM calls of the common tools, started while the tool selector is still deciding, so the
+    selected tool can pick up its call with a head start. The calls for the other tools are
+    cancelled once the tool is known. Keeps track of the time saved and the tokens wasted.
+    """
+
+    def __init__(self) -> None:
+        self.used = 0
+        self.discarded = 0
+        self.seconds_saved = 0.0
+        self.wasted_tokens = 0
+        self._speculations: dict[OverworldTool, Speculation[Any]] = {}
+
+    def start(self, tool: OverworldTool, speculation: Speculation[Any]) -> None:
+        """
+        Keep a call for a tool until the tool is selected.
+
+        :param tool: The tool that the call is for.
+        :param speculation: The call, already in flight.
+        """
+        if tool in self._speculations:
+            self._discard(self._speculations.pop(tool))
+        self._speculations[tool] = speculation
+
+    def discard_all(self) -> None:
+        """Discard every call, e.g. the ones from an earlier iteration that were never picked up."""
+        for tool in list(self._speculations):
+            self._discard(self._speculations.pop(tool))
+
+    def select(self, tool: OverworldTool) -> None:
+        """
+        Discard the calls for every tool but the selected one.
+
+        :param tool: The selected tool.
+        """
+        selected_at = time.perf_counter()
+        for other_tool in list(self._speculations):
+            if other_tool == tool:
+                self._speculations[tool].selected_at = selected_at
+            else:
+                self._discard(self._speculations.pop(other_tool))
+
+    def take(self, tool: OverworldTool) -> Speculation[Any] | None:
+        """
+        Pick up the call for the selected tool.
+
+        :param tool: The selected tool.
+        :return: The call, or None if none was made or another tool was selected.
+        """
+        speculation = self._speculations.pop(tool, None)
+        if speculation is None:
+            return None
+        if speculation.selected_at is None:  # The tool wasn't selected through `select`.
+            self._discard(speculation)
+            return None
+        self.used += 1
+        self.seconds_saved += speculation.seconds_saved
+        logger.info(f"Using the speculative call, saving {speculation.seconds_saved:.2f}s.")
+        return speculation
+
+    def _discard(self, speculation: Speculation[Any]) -> None:
+        """Cancel an unneeded call, and count its tokens as wasted."""
+        speculation.cancel()
+        self.discarded += 1
+        self.wasted_tokens += speculation.estimated_tokens
+
+    def __str__(self) -> str:
+        """Get a one-line summary of the time saved and the tokens wasted."""
+        return (
+            f"{self.used} used, saving {self.seconds_saved:.1f}s,"
+            f" {self.discarded} discarded, wasting ~{self.wasted_tokens} tokens"
+        )
+
+
+speculative_calls = SpeculativeCalls()
@@ -22,16 +22,25 @@ class OverworldHandlerState(BaseState):
     tool: OverworldTool | None = None
     iterations_since_last_critique: int | None = None
 
+    def to_prompt_prefix(self) -> str:
+        """
+        Get the parts of the agent state that only change every few iterations, to be put at the
+        start of prompts where they can be cached.
+        """
+        return "\n\n".join(
+            (str(self.summary_memory), str(self.long_term_memory), str(self.goals)),
+        )
+
     def to_prompt_string(self, game_state: YellowLegacyGameState) -> str:
-        """Get a string representation of the agent and game state to be used in prompts."""
+        """
+        Get a string representation of the agent and game state to be used in prompts, after the
+        prompt prefix.
+        """
         if self.current_map is None:
             raise ValueError("Current map is not set")
         return "\n\n".join(
             (
                 str(self.raw_memory),
-                str(self.summary_memory),
-                str(self.long_term_memory),
-                str(self.goals),
                 self.current_map.to_string(game_state),
                 game_state.player_info,
             ),
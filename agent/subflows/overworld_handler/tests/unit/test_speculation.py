@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from agent.subflows.overworld_handler.enums import OverworldTool
+from agent.subflows.overworld_handler.speculation import Speculation, SpeculativeCalls
+
+
+def _speculate(seconds: float, estimated_tokens: int) -> Speculation[asyncio.Task[float]]:
+    task = asyncio.create_task(asyncio.sleep(seconds, result=seconds))
+    return Speculation(task, task, estimated_tokens)
+
+
+@pytest.mark.unit
+async def test_only_the_selected_tool_keeps_its_call() -> None:
+    """Test that the other tools' calls are cancelled, and the selected one's picked up."""
+    calls = SpeculativeCalls()
+    navigation = _speculate(0.05, estimated_tokens=100)
+    press_buttons = _speculate(1, estimated_tokens=200)
+    calls.start(OverworldTool.NAVIGATION, navigation)
+    calls.start(OverworldTool.PRESS_BUTTONS, press_buttons)
+    await asyncio.sleep(0.02)
+
+    calls.select(OverworldTool.NAVIGATION)
+    speculation = calls.take(OverworldTool.NAVIGATION)
+    assert speculation is navigation
+    assert await speculation.response == 0.05  # noqa: PLR2004
+    await asyncio.sleep(0)
+    assert press_buttons.task is not None
+    assert press_buttons.task.cancelled()
+    assert calls.take(OverworldTool.PRESS_BUTTONS) is None
+
+    assert (calls.used, calls.discarded, calls.wasted_tokens) == (1, 1, 200)
+    assert 0.02 <= calls.seconds_saved < 0.05  # noqa: PLR2004
+
+
+@pytest.mark.unit
+async def test_head_start_is_capped_at_the_call_latency() -> None:
+    """Test that a call that finished before the selection only saves its own latency."""
+    calls = SpeculativeCalls()
+    calls.start(OverworldTool.PRESS_BUTTONS, _speculate(0.01, estimated_tokens=100))
+    await asyncio.sleep(0.05)
+
+    calls.select(OverworldTool.PRESS_BUTTONS)
+    assert calls.take(OverworldTool.PRESS_BUTTONS) is not None
+    assert 0.01 <= calls.seconds_saved < 0.05  # noqa: PLR2004
+
+
+@pytest.mark.unit
+async def test_calls_that_were_never_selected_are_discarded() -> None:
+    """Test that leftover calls, e.g. from an iteration that failed, aren't picked up later."""
+    calls = SpeculativeCalls()
+    calls.start(OverworldTool.NAVIGATION, _speculate(1, estimated_tokens=100))
+    calls.discard_all()
+    calls.select(OverworldTool.NAVIGATION)
+    assert calls.take(OverworldTool.NAVIGATION) is None
+
+    calls.start(OverworldTool.NAVIGATION, _speculate(1, estimated_tokens=100))
+    assert calls.take(OverworldTool.NAVIGATION) is None  # Not selected.
+    assert (calls.used, calls.discarded, calls.wasted_tokens) == (0, 2, 200)
@@ -1,5 +1,3 @@
-import asyncio
-
 from agent.utils import append_dialog_to_list_inplace, is_blinking_cursor_on_screen
 from common.enums import Button
 from emulator.emulator import YellowLegacyEmulator
@@ -37,7 +35,8 @@ class HandleDialogBoxService:
         while dialog_box and (is_blinking_cursor or not is_text_outside_dialog_box):
             append_dialog_to_list_inplace(text, dialog_box)
             await self.emulator.press_button(Button.A)
-            await asyncio.sleep(0.5)  # Buffer to ensure that no new dialog boxes have opened.
+            # Buffer to ensure that no new dialog boxes have opened.
+            await self.emulator.wait_frames(30)
 
             game_state = self.emulator.get_game_state()
             dialog_box = game_state.get_dialog_box()
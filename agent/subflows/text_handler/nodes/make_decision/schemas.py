@@ -6,5 +6,6 @@ from common.enums import Button
 class DecisionMakerTextResponse(BaseModel):
     """The response from the text decision maker prompt."""
 
-    thoughts: str
+    # The buttons come first, so they can be pressed while the thoughts are still being generated.
     buttons: Button | list[Button]
+    thoughts: str
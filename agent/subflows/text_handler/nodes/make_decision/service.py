@@ -1,4 +1,5 @@
 from loguru import logger
+from opentelemetry import trace
 
 from agent.subflows.text_handler.nodes.make_decision.prompts import DECISION_MAKER_TEXT_PROMPT
 from agent.subflows.text_handler.nodes.make_decision.schemas import DecisionMakerTextResponse
@@ -21,11 +22,13 @@ class DecisionMakerTextService:
         iteration: int,
         raw_memory: RawMemory,
         state_string_builder: StateStringBuilderT,
+        prompt_prefix: str,
         emulator: YellowLegacyEmulator,
     ) -> None:
         self.iteration = iteration
         self.raw_memory = raw_memory
         self.state_string_builder = state_string_builder
+        self.prompt_prefix = prompt_prefix
         self.emulator = emulator
 
     async def make_decision(self) -> RawMemory:
@@ -34,7 +37,7 @@ class DecisionMakerTextService:
 
         :return: The button to press.
         """
-        img = self.emulator.get_screenshot()
+        img = self.emulator.get_screenshot().png
         game_state = self.emulator.get_game_state()
         state_string = self.state_string_builder(game_state)
         prompt = DECISION_MAKER_TEXT_PROMPT.format(
@@ -42,28 +45,32 @@ class DecisionMakerTextService:
             text=game_state.screen.text,
         )
         try:
-            response = await self.llm_service.get_llm_response_pydantic(
+            response = await self.llm_service.stream_llm_response_pydantic(
                 messages=[img, prompt],
                 schema=DecisionMakerTextResponse,
                 prompt_name="make_text_decision",
+                prompt_prefix=self.prompt_prefix,
             )
-            buttons = response.buttons if isinstance(response.buttons, list) else [response.buttons]
-            self.raw_memory.add_memory(
-                iteration=self.iteration,
-                content=(
-                    f"{response.thoughts} Selected the following buttons:"
-                    f" {[str(b) for b in buttons]}"
-                ),
-            )
+            # The buttons are pressed as soon as they're parsed, before the rest of the response.
+            buttons = await response.field("buttons")
+            trace.get_current_span().set_attribute("llm.time_to_first_action_s", response.elapsed)
+            buttons = buttons if isinstance(buttons, list) else [buttons]
             for b in buttons:
                 game_state = self.emulator.get_game_state()
                 await self.emulator.press_button(b)
                 if self._check_for_state_change() or self._check_for_failed_action(b, game_state):
                     break
-
         except Exception as e:  # noqa: BLE001
             logger.warning(f"Error making decision. Skipping. {e}")
+            return self.raw_memory
 
+        content = f"Selected the following buttons: {[str(b) for b in buttons]}"
+        try:
+            content = f"{await response.field('thoughts')} {content}"
+            await response.result()
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Error in the rest of the decision. {e}")
+        self.raw_memory.add_memory(iteration=self.iteration, content=content)
         return self.raw_memory
 
     def _check_for_state_change(self) -> bool:
@@ -1,5 +1,3 @@
-import asyncio
-
 from emulator.emulator import YellowLegacyEmulator
 from emulator.schemas import DialogBox
 
@@ -28,10 +26,10 @@ def append_dialog_to_list_inplace(text: list[str], dialog_box: DialogBox) -> Non
 async def is_blinking_cursor_on_screen(emulator: YellowLegacyEmulator) -> bool:
     """Check if the blinking cursor is on screen."""
     counter = 0
-    blink_wait_time = 0.1
+    blink_wait_frames = 6
     max_counter = 6  # Cursor blinks on/off a bit more than 2x per second.
     while counter < max_counter:
-        await asyncio.sleep(blink_wait_time)
+        await emulator.wait_frames(blink_wait_frames)
         game_state = emulator.get_game_state()
         dialog_box = game_state.get_dialog_box()
         if dialog_box and dialog_box.has_cursor:
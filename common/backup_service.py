@@ -1,4 +1,6 @@
 import asyncio
+import base64
+import zlib
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -6,7 +8,13 @@ import aiofiles
 from loguru import logger
 
 from agent.state import AgentState
-from common.constants import BACKUP_AGENT_STATE_NAME, DB_FILE_PATH, DB_FOLDER_NAME, OUTPUTS_FOLDER
+from common.constants import (
+    BACKUP_AGENT_STATE_NAME,
+    BACKUP_EMULATOR_STATE_NAME,
+    DB_FILE_PATH,
+    DB_FOLDER_NAME,
+    OUTPUTS_FOLDER,
+)
 
 OUTPUT_PREFIX = "agent_"
 BACKUP_PREFIX = "backup_"
@@ -18,8 +26,13 @@ async def get_output_folder() -> Path:
     return OUTPUTS_FOLDER / f"{OUTPUT_PREFIX}{timestamp}"
 
 
-async def create_backup(agent_state: AgentState) -> None:
-    """Save the current game state, agent state, and database to a backup folder."""
+async def create_backup(agent_state: AgentState, emulator_save_state: bytes | None) -> None:
+    """
+    Save the current game state, agent state, and database to a backup folder.
+
+    :param agent_state: The agent state to back up.
+    :param emulator_save_state: The latest raw emulator save state, which is stored compressed.
+    """
     logger.info(f"Creating backup at iteration {agent_state.iteration}.")
 
     timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
@@ -32,21 +45,44 @@ async def create_backup(agent_state: AgentState) -> None:
     async with aiofiles.open(backup_folder / BACKUP_AGENT_STATE_NAME, "w") as f:
         await f.write(agent_state.model_dump_json())
 
+    if emulator_save_state:
+        compressed = await asyncio.to_thread(zlib.compress, emulator_save_state)
+        async with aiofiles.open(backup_folder / BACKUP_EMULATOR_STATE_NAME, "wb") as f:
+            await f.write(compressed)
+        logger.info(
+            f"Backed up the emulator save state: {len(emulator_save_state)} bytes compressed to"
+            f" {len(compressed)}.",
+        )
+
     await _copy_dir_async(src=DB_FILE_PATH.parent, dst=backup_db_folder)
 
 
-async def load_backup(backup_folder: Path) -> AgentState:
-    """Load the agent state from a backup folder and set the current DB to the backup DB."""
+async def load_backup(backup_folder: Path) -> tuple[AgentState, bytes | None]:
+    """
+    Load the agent state from a backup folder and set the current DB to the backup DB.
+
+    :param backup_folder: The backup folder to load from.
+    :return: The agent state, and the raw emulator save state if the backup has one.
+    """
     async with aiofiles.open(backup_folder / BACKUP_AGENT_STATE_NAME) as f:
         agent_state = AgentState.model_validate_json(await f.read())
 
+    emulator_save_state = None
+    emulator_state_path = backup_folder / BACKUP_EMULATOR_STATE_NAME
+    if emulator_state_path.exists():
+        async with aiofiles.open(emulator_state_path, "rb") as f:
+            emulator_save_state = zlib.decompress(await f.read())
+    elif agent_state.emulator_save_state:  # Older backups keep it in the agent state.
+        emulator_save_state = base64.b64decode(agent_state.emulator_save_state)
+        agent_state.emulator_save_state = None
+
     backup_db_folder = backup_folder / DB_FOLDER_NAME
     await _copy_dir_async(src=backup_db_folder, dst=DB_FILE_PATH.parent)
 
-    return agent_state
+    return agent_state, emulator_save_state
 
 
-async def load_latest_backup() -> AgentState:
+async def load_latest_backup() -> tuple[AgentState, bytes | None]:
     """Load the latest backup from the backups folder."""
     subfolders = [
         f for f in OUTPUTS_FOLDER.iterdir() if f.is_dir() and f.name.startswith(OUTPUT_PREFIX)
@@ -30,3 +30,4 @@ DB_FILE_PATH = OUTPUTS_FOLDER / DB_FOLDER_NAME / "memory.db"
 DB_URL = f"sqlite+aiosqlite:///{DB_FILE_PATH}"
 
 BACKUP_AGENT_STATE_NAME = "agent_state.json"
+BACKUP_EMULATOR_STATE_NAME = "emulator_state.zlib"
@@ -1,42 +1,208 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
+
 from google import genai
 from google.genai.errors import ServerError
 from google.genai.types import EmbedContentConfig
+from pydantic import BaseModel, ConfigDict
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
 
 from common.settings import settings
+from database.embedding_cache.repository import create_cached_embeddings, get_cached_embeddings
 
-client = genai.Client(api_key=settings.gemini_api_key)
 model = "gemini-embedding-001"  # The only one for now.
+_DIMENSIONS = 768
+_MAX_MEMORY_CACHE_SIZE = 1024
+_MAX_DB_CACHE_SIZE = 100_000
+
+
+class _AbandonedFetchError(Exception):
+    """The fetch that a request was waiting on was cancelled by the caller that started it."""
+
+
+class EmbeddingRequest(BaseModel):
+    """A text to embed, with an optional title to improve the embedding."""
+
+    text: str
+    title: str | None = None
+
+    model_config = ConfigDict(frozen=True)
+
+    @property
+    def cache_key(self) -> str:
+        """A hash of everything that determines the embedding."""
+        content = "\0".join([model, str(_DIMENSIONS), self.title or "", self.text])
+        return hashlib.sha256(content.encode()).hexdigest()
+
+
+class EmbeddingService:
+    """
+    Gets embeddings from the Gemini Embedding API, in as few requests as possible.
+
+    Embeddings are cached by a hash of their request, in memory with LRU eviction, and in the DB so
+    they survive restarts. Concurrent requests for the same embedding share a single fetch, and the
+    embeddings that aren't cached are fetched in one request per title.
+    """
+
+    def __init__(
+        self,
+        client: genai.Client,
+        *,
+        max_memory_cache_size: int = _MAX_MEMORY_CACHE_SIZE,
+        max_db_cache_size: int | None = _MAX_DB_CACHE_SIZE,
+    ) -> None:
+        """
+        Initialize the embedding service.
+
+        :param client: The Gemini client, or anything with the same `aio.models.embed_content`.
+        :param max_memory_cache_size: The number of embeddings to keep in memory.
+        :param max_db_cache_size: The number of embeddings to keep in the DB, or None to not use the
+            DB at all.
+        """
+        self.client = client
+        self.max_memory_cache_size = max_memory_cache_size
+        self.max_db_cache_size = max_db_cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Future[list[float]]] = {}
+
+    async def get_embeddings(self, batch: list[EmbeddingRequest]) -> list[list[float]]:
+        """
+        Get the embeddings of a batch of texts.
+
+        :param batch: The texts to embed.
+        :return: The embedding of each text, in the same order.
+        """
+        futures: dict[str, asyncio.Future[list[float]]] = {}
+        to_fetch: dict[str, EmbeddingRequest] = {}
+        loop = asyncio.get_running_loop()
+        for request in batch:
+            key = request.cache_key
+            if key in futures:
+                continue
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                futures[key] = loop.create_future()
+                futures[key].set_result(self._cache[key])
+                self.hits += 1
+            elif key in self._in_flight:  # Someone else is already fetching it.
+                futures[key] = self._in_flight[key]
+                self.hits += 1
+            else:
+                futures[key] = self._in_flight[key] = loop.create_future()
+                to_fetch[key] = request
+
+        if to_fetch:
+            try:
+                embeddings = await self._fetch(to_fetch)
+            except BaseException as e:
+                # Only this caller was cancelled, so the others waiting on the fetch take it over.
+                error = e if isinstance(e, Exception) else _AbandonedFetchError()
+                for key in to_fetch:
+                    future = self._in_flight.pop(key)
+                    future.set_exception(error)
+                    future.exception()  # Mark it as retrieved, in case nobody else is waiting.
+                raise
+            for key, embedding in embeddings.items():
+                self._remember(key, embedding)
+                self._in_flight.pop(key).set_result(embedding)
+
+        try:
+            # Shielded, so that cancelling this caller doesn't cancel a fetch that others share.
+            results = {key: await asyncio.shield(future) for key, future in futures.items()}
+        except _AbandonedFetchError:
+            return await self.get_embeddings(batch)
+        return [results[request.cache_key] for request in batch]
+
+    async def _fetch(self, requests: dict[str, EmbeddingRequest]) -> dict[str, list[float]]:
+        """Get the embeddings that aren't in memory, from the DB or from the API."""
+        embeddings = {}
+        if self.max_db_cache_size is not None:
+            embeddings = await get_cached_embeddings(list(requests))
+            self.hits += len(embeddings)
+
+        by_title: dict[str | None, dict[str, str]] = {}
+        for key, request in requests.items():
+            if key not in embeddings:
+                by_title.setdefault(request.title, {})[key] = request.text
+        if not by_title:
+            return embeddings
+
+        # The title is part of the request config, so each title needs its own request.
+        responses = await asyncio.gather(
+            *[self._embed_content(list(t.values()), title) for title, t in by_title.items()],
+        )
+        fetched = {
+            key: embedding
+            for texts, response in zip(by_title.values(), responses, strict=True)
+            for key, embedding in zip(texts, response, strict=True)
+        }
+        self.misses += len(fetched)
+        if self.max_db_cache_size is not None:
+            await create_cached_embeddings(fetched, self.max_db_cache_size)
+        return embeddings | fetched
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_fixed(1),
+        retry=retry_if_exception_type(ServerError),
+        reraise=True,
+    )
+    async def _embed_content(self, texts: list[str], title: str | None) -> list[list[float]]:
+        """Embed several texts with the same title in a single request."""
+        response = await self.client.aio.models.embed_content(
+            model=model,
+            contents=texts,
+            config=EmbedContentConfig(
+                task_type="RETRIEVAL_DOCUMENT",
+                title=title,
+                output_dimensionality=_DIMENSIONS,
+            ),
+        )
+        if not response.embeddings:
+            raise ValueError("No response from Gemini.")
+        if len(response.embeddings) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(response.embeddings)}")
+        if not all(e.values for e in response.embeddings):
+            raise ValueError("No values in embedding.")
+        return [e.values for e in response.embeddings]
+
+    def _remember(self, key: str, embedding: list[float]) -> None:
+        """Add an embedding to the in-memory cache, evicting the least recently used one."""
+        self._cache[key] = embedding
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.max_memory_cache_size:
+            self._cache.popitem(last=False)
+
+    def __str__(self) -> str:
+        """Get a one-line summary of the cache usage."""
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0
+        return f"{self.hits} hits, {self.misses} misses ({hit_rate:.0%} hit rate)"
+
+
+embedding_service = EmbeddingService(genai.Client(api_key=settings.gemini_api_key))
+
+
+async def get_embeddings(batch: list[EmbeddingRequest]) -> list[list[float]]:
+    """
+    Get the embeddings of a batch of texts from the Gemini Embedding API, or the cache.
+
+    :param batch: The texts to embed.
+    :return: The embedding of each text, in the same order.
+    """
+    return await embedding_service.get_embeddings(batch)
 
 
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_fixed(1),
-    retry=retry_if_exception_type(ServerError),
-    reraise=True,
-)
 async def get_embedding(text: str, title: str | None = None) -> list[float]:
     """
-    Get an embedding from the Gemini Embedding API.
+    Get an embedding from the Gemini Embedding API, or the cache.
 
     :param text: The text to get an embedding for.
     :param title: Optional title information to improve the embedding.
     :return: An embedding from the Gemini Embedding API.
     """
-    response = await client.aio.models.embed_content(
-        model=model,
-        contents=text,
-        config=EmbedContentConfig(
-            task_type="RETRIEVAL_DOCUMENT",
-            title=title,
-            output_dimensionality=768,
-        ),
-    )
-    if not response.embeddings:
-        raise ValueError("No response from Gemini.")
-    if len(response.embeddings) != 1:
-        raise ValueError(f"Expected 1 embedding, got {len(response.embeddings)}")
-    embedding = response.embeddings[0]
-    if not embedding.values:
-        raise ValueError("No values in embedding.")
-    return embedding.values
+    [embedding] = await get_embeddings([EmbeddingRequest(text=text, title=title)])
+    return embedding
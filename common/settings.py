@@ -9,6 +9,8 @@ class Settings(BaseSettings):
 
     gemini_api_key: str = ""
     junjo_server_api_key: str = ""
+    # Start the navigation and button pressing calls while the overworld tool is being selected.
+    speculative_overworld_tools: bool = False
 
 
 settings = Settings()
@@ -0,0 +1,84 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from common.embedding_service import EmbeddingRequest, EmbeddingService
+
+
+class _StubModels:
+    """Stands in for the Gemini client's models, embedding each text as its length."""
+
+    def __init__(self, delay: float = 0) -> None:
+        self.delay = delay
+        self.requests: list[tuple[list[str], str | None]] = []
+
+    async def embed_content(self, *, model: str, contents: list[str], config: Any) -> Any:  # noqa: ANN401, ARG002
+        self.requests.append((contents, config.title))
+        await asyncio.sleep(self.delay)  # Let concurrent callers in while the request is in flight.
+        return SimpleNamespace(embeddings=[SimpleNamespace(values=[len(c), 1.0]) for c in contents])
+
+
+@pytest.mark.unit
+async def test_batch_is_fetched_once_per_title_and_cached() -> None:
+    """Test that a batch takes one request per title, and repeats come from the cache."""
+    models = _StubModels()
+    service = EmbeddingService(
+        SimpleNamespace(aio=SimpleNamespace(models=models)),
+        max_memory_cache_size=3,
+        max_db_cache_size=None,
+    )
+    batch = [
+        EmbeddingRequest(text="a"),
+        EmbeddingRequest(text="bb"),
+        EmbeddingRequest(text="ccc", title="title"),
+        EmbeddingRequest(text="a"),
+    ]
+
+    assert await service.get_embeddings(batch) == [[1, 1], [2, 1], [3, 1], [1, 1]]
+    assert sorted(models.requests, key=str) == [(["a", "bb"], None), (["ccc"], "title")]
+
+    assert await service.get_embeddings(batch[:3]) == [[1, 1], [2, 1], [3, 1]]
+    assert len(models.requests) == 2  # noqa: PLR2004
+
+    await service.get_embeddings([EmbeddingRequest(text="dddd")])  # Evicts "a".
+    await service.get_embeddings([EmbeddingRequest(text="a")])
+    assert models.requests[-1] == (["a"], None)
+
+
+@pytest.mark.unit
+async def test_concurrent_requests_share_a_fetch() -> None:
+    """Test that identical requests made at the same time only fetch the embedding once."""
+    models = _StubModels()
+    service = EmbeddingService(
+        SimpleNamespace(aio=SimpleNamespace(models=models)),
+        max_db_cache_size=None,
+    )
+    request = EmbeddingRequest(text="query")
+
+    results = await asyncio.gather(*[service.get_embeddings([request]) for _ in range(5)])
+    assert results == [[[5, 1]]] * 5
+    assert models.requests == [(["query"], None)]
+    assert str(service) == "4 hits, 1 misses (80% hit rate)"
+
+
+@pytest.mark.unit
+async def test_cancelled_fetch_is_taken_over_by_the_other_callers() -> None:
+    """Test that cancelling the caller that started a shared fetch doesn't cancel the others."""
+    models = _StubModels(delay=0.05)
+    service = EmbeddingService(
+        SimpleNamespace(aio=SimpleNamespace(models=models)),
+        max_db_cache_size=None,
+    )
+    request = EmbeddingRequest(text="query")
+
+    owner = asyncio.create_task(service.get_embeddings([request]))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.create_task(service.get_embeddings([request]))
+    await asyncio.sleep(0.01)
+    owner.cancel()
+
+    assert await waiter == [[5, 1]]
+    assert owner.cancelled()
+    assert len(models.requests) == 2  # noqa: PLR2004
@@ -0,0 +1,30 @@
+import pytest
+
+from common.enums import AsciiTile
+from common.tile_codes import ROW_SEPARATOR, TILE_CHARS, TILE_CODES, decode_tiles, encode_tiles
+
+
+@pytest.mark.unit
+def test_every_tile_has_a_unique_code() -> None:
+    """Test that every ASCII tile has its own code, and that none of them is the row separator."""
+    assert set(TILE_CODES) == set(AsciiTile)
+    assert len(set(TILE_CODES.values())) == len(TILE_CODES)
+    assert ROW_SEPARATOR not in TILE_CODES.values()
+    assert all(TILE_CHARS[code] == tile for tile, code in TILE_CODES.items())
+
+
+@pytest.mark.unit
+def test_encode_decode_round_trip() -> None:
+    """Test that encoding and decoding the tiles gives back the original string."""
+    text = "".join(AsciiTile) + "\n" + "".join(reversed(AsciiTile))
+    codes = encode_tiles(text)
+    assert len(codes) == len(text)
+    assert decode_tiles(codes) == text
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("text", ["a", "∙∙\r∙", "∙∙\xff"])
+def test_encode_unknown_tile(text: str) -> None:
+    """Test that characters that aren't tiles can't be encoded."""
+    with pytest.raises(ValueError, match="Unknown tile"):
+        encode_tiles(text)
@@ -0,0 +1,86 @@
+"""
+A compact encoding of ASCII tile maps, with one byte per tile.
+
+Each tile is stored as its code in `TILE_CODES`, and rows are separated by `ROW_SEPARATOR`, so a map
+of height h and width w takes h * (w + 1) - 1 bytes and can be viewed as a numpy array without a
+copy. The codes are persisted in the database, so new tiles must only ever be appended.
+"""
+
+import numpy as np
+
+from common.enums import AsciiTile
+
+ROW_SEPARATOR = 0xFF
+
+TILE_CODES = {
+    tile: code
+    for code, tile in enumerate(
+        [
+            AsciiTile.UNSEEN,
+            AsciiTile.WALL,
+            AsciiTile.WATER,
+            AsciiTile.GRASS,
+            AsciiTile.LEDGE_DOWN,
+            AsciiTile.LEDGE_LEFT,
+            AsciiTile.LEDGE_RIGHT,
+            AsciiTile.FREE,
+            AsciiTile.PLAYER,
+            AsciiTile.SPRITE,
+            AsciiTile.WARP,
+            AsciiTile.CUT_TREE,
+            AsciiTile.BOULDER_HOLE,
+            AsciiTile.PRESSURE_PLATE,
+            AsciiTile.PC_TILE,
+            AsciiTile.PIKACHU,
+            AsciiTile.SIGN,
+            AsciiTile.SPINNER_UP,
+            AsciiTile.SPINNER_DOWN,
+            AsciiTile.SPINNER_LEFT,
+            AsciiTile.SPINNER_RIGHT,
+            AsciiTile.SPINNER_STOP,
+        ],
+    )
+}
+
+# Indexing this with an array of codes gives an array of tile characters.
+TILE_CHARS = np.array(
+    [tile.value for tile in sorted(TILE_CODES, key=TILE_CODES.__getitem__)],
+    dtype=str,
+)
+
+
+def encode_tiles(text: str) -> bytes:
+    """
+    Encode a string of tile characters, with rows separated by newlines.
+
+    :param text: The tiles, in the same format as the ASCII map in the prompts.
+    :return: The encoded tiles.
+    """
+    # The tiles aren't all latin-1, so look up each character's code point instead.
+    code_points = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    indices = np.searchsorted(_SORTED_CODE_POINTS, code_points).clip(
+        max=_SORTED_CODE_POINTS.size - 1
+    )
+    is_known = _SORTED_CODE_POINTS[indices] == code_points
+    if not is_known.all():
+        raise ValueError(f"Unknown tile: {text[np.argmin(is_known)]!r}")
+    return _SORTED_CODES[indices].tobytes()
+
+
+def decode_tiles(codes: bytes) -> str:
+    """
+    Decode tiles back into a string of tile characters, with rows separated by newlines.
+
+    :param codes: The encoded tiles.
+    :return: The tiles, in the same format as the ASCII map in the prompts.
+    """
+    code_points = _CODE_POINTS[np.frombuffer(codes, dtype=np.uint8)]
+    return code_points.tobytes().decode("utf-32-le")
+
+
+_CODE_POINTS = np.zeros(0x100, dtype=np.uint32)
+_CODE_POINTS[list(TILE_CODES.values())] = [ord(tile.value) for tile in TILE_CODES]
+_CODE_POINTS[ROW_SEPARATOR] = ord("\n")
+_SORTED_CODES = np.array([*TILE_CODES.values(), ROW_SEPARATOR], dtype=np.uint8)
+_SORTED_CODES = _SORTED_CODES[np.argsort(_CODE_POINTS[_SORTED_CODES])]
+_SORTED_CODE_POINTS = _CODE_POINTS[_SORTED_CODES]
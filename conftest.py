@@ -0,0 +1,32 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from database.base import SQLAlchemyBase
+from database.db_config import db_sessionmaker
+
+# Import all models to ensure they are registered before the tables are created.
+from database.embedding_cache.model import EmbeddingCacheDBModel  # noqa: F401
+from database.llm_messages.model import LLMMessageDBModel  # noqa: F401
+from database.llm_response_cache.model import LLMResponseCacheDBModel  # noqa: F401
+from database.long_term_memory.model import LongTermMemoryDBModel  # noqa: F401
+from database.map_entity_memory.model import MapEntityMemoryDBModel  # noqa: F401
+from database.map_memory.model import MapMemoryDBModel  # noqa: F401
+from database.map_tile_delta.model import MapTileDeltaDBModel  # noqa: F401
+
+
+@pytest.fixture
+async def temporary_db(tmp_path: Path) -> AsyncIterator[None]:
+    """Point the sessions at a fresh database file with every table, for the duration of a test."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLAlchemyBase.metadata.create_all)
+    previous_bind = db_sessionmaker.kw["bind"]
+    db_sessionmaker.configure(bind=engine)
+    try:
+        yield
+    finally:
+        db_sessionmaker.configure(bind=previous_bind)
+        await engine.dispose()
@@ -1,9 +1,14 @@
 # ruff: noqa: F401
 
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
 import aiofiles.os
 from loguru import logger
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy import Connection, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from common.constants import DB_FILE_PATH, DB_URL
 from database.base import SQLAlchemyBase
@@ -16,6 +21,97 @@ _engine = create_async_engine(
 db_sessionmaker = async_sessionmaker(_engine, expire_on_commit=False)
 
 
+class _UnitOfWork:
+    """A session shared by every repository call in its context, used one call at a time."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.lock = asyncio.Lock()
+        self.independent_writes: list[Callable[[AsyncSession], Awaitable[None]]] = []
+
+
+_unit_of_work: ContextVar[_UnitOfWork | None] = ContextVar("unit_of_work", default=None)
+
+
+@asynccontextmanager
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    """
+    Get a session for a repository call. Inside a unit of work, this is the shared session and any
+    writes are left for the unit of work to commit. Otherwise, it's a new session that is committed
+    at the end of the block.
+    """
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is None:
+        async with db_sessionmaker() as session:
+            yield session
+            await session.commit()
+        return
+
+    # Concurrent repository calls, e.g. from `asyncio.gather`, take turns with the shared session.
+    async with unit_of_work.lock:
+        yield unit_of_work.session
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncIterator[None]:
+    """
+    Run every repository call in this context in a single transaction, e.g. for an agent iteration.
+    Reads see the writes made earlier in the unit of work. Everything is committed at the end, or
+    earlier with `commit_unit_of_work`, and rolled back if an exception is raised. Writes made with
+    `write_independently` are kept either way.
+    """
+    if _unit_of_work.get() is not None:
+        raise RuntimeError("A unit of work is already in progress.")
+    async with db_sessionmaker() as session:
+        current = _UnitOfWork(session)
+        token = _unit_of_work.set(current)
+        try:
+            yield
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
+        finally:
+            _unit_of_work.reset(token)
+            await _make_independent_writes(current.independent_writes)
+
+
+async def commit_unit_of_work() -> None:
+    """Commit the writes of the current unit of work so far, if there is one."""
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is not None:
+        async with unit_of_work.lock:
+            await unit_of_work.session.commit()
+            writes, unit_of_work.independent_writes = unit_of_work.independent_writes, []
+            await _make_independent_writes(writes)
+
+
+async def write_independently(write: Callable[[AsyncSession], Awaitable[None]]) -> None:
+    """
+    Make a write that must be kept even if the unit of work is rolled back, e.g. the record of an
+    LLM call that was paid for. It's made in its own session and committed. SQLite only allows one
+    writer at a time, and a unit of work holds on to the lock until it ends, so inside a unit of
+    work the write is made as soon as the unit of work is committed or rolled back.
+
+    :param write: Makes the write with the session that it's given.
+    """
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is None:
+        await _make_independent_writes([write])
+    else:
+        unit_of_work.independent_writes.append(write)
+
+
+async def _make_independent_writes(writes: list[Callable[[AsyncSession], Awaitable[None]]]) -> None:
+    """Make writes in a new session, and commit them."""
+    if not writes:
+        return
+    async with db_sessionmaker() as session:
+        for write in writes:
+            await write(session)
+        await session.commit()
+
+
 async def init_fresh_db() -> None:
     """Initialize a fresh database by deleting the database folder and recreating it."""
     logger.info(f"Initializing a fresh database at: {DB_URL}")
@@ -28,17 +124,49 @@ async def init_fresh_db() -> None:
         await aiofiles.os.rmdir(db_folder)
     await aiofiles.os.makedirs(db_folder)
 
+    await create_tables()
+    async with _engine.begin() as conn:
+        await conn.execute(text("PRAGMA foreign_keys=ON"))
+        await conn.execute(text("PRAGMA journal_mode=WAL"))
+        await conn.execute(text("PRAGMA synchronous = NORMAL"))
+
+    logger.info("Database initialized successfully.")
+
+
+async def create_tables() -> None:
+    """
+    Create any tables that don't exist yet, and add any columns that are missing from existing
+    ones, e.g. in a backup from before they were added.
+    """
     # Import all models here to ensure they are registered with the engine.
+    from database.embedding_cache.model import EmbeddingCacheDBModel
     from database.llm_messages.model import LLMMessageDBModel
+    from database.llm_response_cache.model import LLMResponseCacheDBModel
     from database.long_term_memory.model import LongTermMemoryDBModel
     from database.map_entity_memory.model import MapEntityMemoryDBModel
     from database.map_memory.model import MapMemoryDBModel
+    from database.map_tile_delta.model import MapTileDeltaDBModel
 
     async with _engine.begin() as conn:
         await conn.run_sync(SQLAlchemyBase.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
 
-        await conn.execute(text("PRAGMA foreign_keys=ON"))
-        await conn.execute(text("PRAGMA journal_mode=WAL"))
-        await conn.execute(text("PRAGMA synchronous = NORMAL"))
 
-    logger.info("Database initialized successfully.")
+def _add_missing_columns(conn: Connection) -> None:
+    """Add the columns that were added to the models after their tables were created."""
+    for table in SQLAlchemyBase.metadata.sorted_tables:
+        existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if column.server_default is None and not column.nullable:
+                raise ValueError(f"Can't add {table.name}.{column.name} without a server default.")
+            column_type = column.type.compile(conn.dialect)
+            default = getattr(column.server_default, "arg", "NULL")
+            conn.execute(
+                text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                    f" DEFAULT {default}",
+                ),
+            )
+            logger.info(f"Added the missing column {table.name}.{column.name}.")
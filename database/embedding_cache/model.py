@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from database.base import SQLAlchemyBase
+from database.types import Vector
+
+
+class EmbeddingCacheDBModel(SQLAlchemyBase):
+    """A table for embeddings that have already been fetched, keyed by a hash of their request."""
+
+    __tablename__ = "embedding_cache"
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    embedding: Mapped[list[float]] = mapped_column(Vector, nullable=False)
+    last_used_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
@@ -0,0 +1,59 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db_config import get_db_session, write_independently
+from database.embedding_cache.model import EmbeddingCacheDBModel
+
+
+async def get_cached_embeddings(keys: list[str]) -> dict[str, list[float]]:
+    """Get the cached embeddings for the given keys, and mark them as just used."""
+    async with get_db_session() as session:
+        query = select(EmbeddingCacheDBModel.key, EmbeddingCacheDBModel.embedding).where(
+            EmbeddingCacheDBModel.key.in_(keys),
+        )
+        result = await session.execute(query)
+        embeddings = {o[0]: o[1] for o in result.all()}
+
+    if embeddings:
+        used_at = datetime.now(UTC)
+
+        async def write(session: AsyncSession) -> None:
+            await session.execute(
+                update(EmbeddingCacheDBModel)
+                .where(EmbeddingCacheDBModel.key.in_(list(embeddings)))
+                .values(last_used_at=used_at),
+            )
+
+        await write_independently(write)
+
+    return embeddings
+
+
+async def create_cached_embeddings(embeddings: dict[str, list[float]], max_size: int) -> None:
+    """
+    Cache new embeddings, and evict the least recently used ones beyond the maximum size. They're
+    kept even if the unit of work is rolled back.
+    """
+    now = datetime.now(UTC)
+
+    async def write(session: AsyncSession) -> None:
+        session.add_all(
+            [
+                EmbeddingCacheDBModel(key=key, embedding=embedding, last_used_at=now)
+                for key, embedding in embeddings.items()
+            ],
+        )
+        await session.flush()
+
+        most_recent = (
+            select(EmbeddingCacheDBModel.key)
+            .order_by(EmbeddingCacheDBModel.last_used_at.desc())
+            .limit(max_size)
+        )
+        await session.execute(
+            delete(EmbeddingCacheDBModel).where(EmbeddingCacheDBModel.key.not_in(most_recent)),
+        )
+
+    await write_independently(write)
@@ -21,5 +21,7 @@ class LLMMessageDBModel(SQLAlchemyBase):
     prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
     thought_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
     response_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Prompt tokens read from a context cache. Also counted in `prompt_tokens`.
+    cached_prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
     cost: Mapped[float] = mapped_column(Float, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
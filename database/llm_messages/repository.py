@@ -1,33 +1,37 @@
 from datetime import UTC, datetime
 
 from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.db_config import db_sessionmaker
+from database.db_config import get_db_session, write_independently
 from database.llm_messages.model import LLMMessageDBModel
 from database.llm_messages.schemas import LLMMessageCreate
 
 
 async def create_llm_message(llm_message: LLMMessageCreate) -> None:
-    """Create a new LLM message."""
-    async with db_sessionmaker() as session:
-        db_obj = LLMMessageDBModel(
-            model=llm_message.model.model_id,
-            prompt_name=llm_message.prompt_name,
-            prompt=llm_message.prompt,
-            response=llm_message.response,
-            prompt_tokens=llm_message.prompt_tokens,
-            thought_tokens=llm_message.thought_tokens,
-            response_tokens=llm_message.response_tokens,
-            cost=llm_message.cost,
-            created_at=datetime.now(UTC),
+    """Create a new LLM message. It's kept even if the unit of work is rolled back."""
+
+    async def write(session: AsyncSession) -> None:
+        session.add(
+            LLMMessageDBModel(
+                model=llm_message.model.model_id,
+                prompt_name=llm_message.prompt_name,
+                prompt=llm_message.prompt,
+                response=llm_message.response,
+                prompt_tokens=llm_message.prompt_tokens,
+                thought_tokens=llm_message.thought_tokens,
+                response_tokens=llm_message.response_tokens,
+                cached_prompt_tokens=llm_message.cached_prompt_tokens,
+                cost=llm_message.cost,
+                created_at=datetime.now(UTC),
+            ),
         )
-        session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+
+    await write_independently(write)
 
 
 async def get_total_llm_cost() -> float:
     """Get the total cost of all LLM messages."""
-    async with db_sessionmaker() as session:
+    async with get_db_session() as session:
         result = await session.execute(select(func.sum(LLMMessageDBModel.cost)))
         return result.scalar() or 0
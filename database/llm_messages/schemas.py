@@ -13,13 +13,18 @@ class LLMMessageCreate(BaseModel):
     prompt_tokens: int
     thought_tokens: int
     response_tokens: int
+    cached_prompt_tokens: int = 0
 
     model_config = ConfigDict(from_attributes=True)
 
     @property
     def cost(self) -> float:
-        """Get the cost of the message. Thought tokens are counted as output tokens."""
+        """
+        Get the cost of the message. Thought tokens are counted as output tokens, and prompt tokens
+        read from a context cache are charged at the cached rate.
+        """
         return 1e-6 * (
-            self.prompt_tokens * self.model.cost_1m_input_tokens
+            (self.prompt_tokens - self.cached_prompt_tokens) * self.model.cost_1m_input_tokens
+            + self.cached_prompt_tokens * self.model.cost_1m_cached_input_tokens
             + (self.thought_tokens + self.response_tokens) * self.model.cost_1m_output_tokens
         )
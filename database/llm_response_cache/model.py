@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from database.base import SQLAlchemyBase
+
+
+class LLMResponseCacheDBModel(SQLAlchemyBase):
+    """A table for LLM responses that can be reused, keyed by a hash of their request."""
+
+    __tablename__ = "llm_response_cache"
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    prompt_name: Mapped[str] = mapped_column(String, nullable=False)
+    response: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
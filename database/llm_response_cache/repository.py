@@ -0,0 +1,58 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db_config import get_db_session, write_independently
+from database.llm_response_cache.model import LLMResponseCacheDBModel
+
+
+async def get_cached_llm_response(key: str, created_after: datetime) -> tuple[str, datetime] | None:
+    """
+    Get the cached response for the given key and the time it was cached, if it was cached after
+    the given time.
+    """
+    async with get_db_session() as session:
+        query = select(LLMResponseCacheDBModel.response, LLMResponseCacheDBModel.created_at).where(
+            LLMResponseCacheDBModel.key == key,
+            LLMResponseCacheDBModel.created_at > created_after.replace(tzinfo=None),
+        )
+        result = await session.execute(query)
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return row.response, row.created_at.replace(tzinfo=UTC)
+
+
+async def create_cached_llm_response(
+    key: str,
+    prompt_name: str,
+    response: str,
+    max_size: int,
+) -> None:
+    """
+    Cache a new response, and evict the oldest ones beyond the maximum size. It's kept even if the
+    unit of work is rolled back.
+    """
+
+    async def write(session: AsyncSession) -> None:
+        await session.merge(
+            LLMResponseCacheDBModel(
+                key=key,
+                prompt_name=prompt_name,
+                response=response,
+                created_at=datetime.now(UTC),
+            ),
+        )
+        await session.flush()
+
+        most_recent = (
+            select(LLMResponseCacheDBModel.key)
+            .order_by(LLMResponseCacheDBModel.created_at.desc())
+            .limit(max_size)
+        )
+        await session.execute(
+            delete(LLMResponseCacheDBModel).where(LLMResponseCacheDBModel.key.not_in(most_recent)),
+        )
+
+    await write_independently(write)
@@ -1,6 +1,6 @@
 from sqlalchemy import select, update
 
-from database.db_config import db_sessionmaker
+from database.db_config import get_db_session
 from database.long_term_memory.model import LongTermMemoryDBModel
 from database.long_term_memory.schemas import (
     LongTermMemoryCreate,
@@ -11,7 +11,7 @@ from database.long_term_memory.schemas import (
 
 async def create_long_term_memory(create_schema: LongTermMemoryCreate) -> None:
     """Create a new long-term memory. No need to return it because it's not used this way."""
-    async with db_sessionmaker() as session:
+    async with get_db_session() as session:
         db_obj = LongTermMemoryDBModel(
             title=create_schema.title,
             content=create_schema.content,
@@ -22,8 +22,7 @@ async def create_long_term_memory(create_schema: LongTermMemoryCreate) -> None:
             last_accessed_iteration=create_schema.iteration,
         )
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await session.flush()
 
 
 async def get_long_term_memories(
@@ -31,7 +30,7 @@ async def get_long_term_memories(
     iteration: int,
 ) -> list[LongTermMemoryRead]:
     """Get long-term memories by their titles."""
-    async with db_sessionmaker() as session:
+    async with get_db_session() as session:
         query = (
             update(LongTermMemoryDBModel)
             .where(LongTermMemoryDBModel.title.in_(titles))
@@ -40,14 +39,13 @@ async def get_long_term_memories(
         )
         result = await session.execute(query)
         db_objs = result.scalars().all()
-        await session.commit()
 
         return [LongTermMemoryRead.model_validate(o) for o in db_objs]
 
 
 async def update_long_term_memory(update_schema: LongTermMemoryUpdate) -> None:
     """Update a long-term memory with new content and importance."""
-    async with db_sessionmaker() as session:
+    async with get_db_session() as session:
         query = (
             update(LongTermMemoryDBModel)
             .where(LongTermMemoryDBModel.title == update_schema.title)
@@ -59,12 +57,11 @@ async def update_long_term_memory(update_schema: LongTermMemoryUpdate) -> None:
             )
         )
         await session.execute(query)
-        await session.commit()
 
 
 async def get_all_long_term_memory_titles() -> list[str]:
     """Get all long-term memory titles."""
-    async with db_sessionmaker() as session:
+    async with get_db_session() as session:
         query = select(LongTermMemoryDBModel.title)
         result = await session.execute(query)
         db_objs = result.scalars().all()
@@ -74,7 +71,7 @@ async def get_all_long_term_memory_titles() -> list[str]:
 
 async def get_all_long_term_memory_embeddings() -> dict[str, list[float]]:
     """Get all long-term memory embeddings."""
-    async with db_sessionmaker() as session:
+    async with get_db_session() as session:
         query = select(LongTermMemoryDBModel.title, LongTermMemoryDBModel.embedding)
         result = await session.execute(query)
         db_objs = result.all()
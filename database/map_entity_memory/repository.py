@@ -1,7 +1,7 @@
 from sqlalchemy import delete, select, update
 
 from common.enums import MapId
-from database.db_config import db_sessionmaker
+from database.db_config import get_db_session
 from database.map_entity_memory.model import MapEntityMemoryDBModel
 from database.map_entity_memory.schemas import (
     MapEntityMemoryCreate,
@@ -13,7 +13,7 @@ from database.map_entity_memory.schemas import (
 
 async def create_map_entity_memory(map_entity: MapEntityMemoryCreate) -> MapEntityMemoryRead:
     """Create a new warp memory."""
-    async with db_sessionmaker() as session:
+    async with get_db_session() as session:
         db_obj = MapEntityMemoryDBModel(
             map_id=map_entity.map_id,
             entity_id=map_entity.entity_id,
@@ -23,15 +23,14 @@ async def create_map_entity_memory(map_entity: MapEntityMemoryCreate) -> MapEnti
             update_iteration=map_entity.iteration,
         )
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await session.flush()
 
     return MapEntityMemoryRead.model_validate(db_obj)
 
 
 async def get_map_entity_memories_for_map(map_id: MapId) -> list[MapEntityMemoryRead]:
     """Get all map entity memories for a map."""
-    async with db_sessionmaker() as session:
+    async with get_db_session() as session:
         query = select(MapEntityMemoryDBModel).where(MapEntityMemoryDBModel.map_id == map_id)
         result = await session.execute(query)
         db_objs = result.scalars().all()
@@ -39,9 +38,18 @@ async def get_map_entity_memories_for_map(map_id: MapId) -> list[MapEntityMemory
     return [MapEntityMemoryRead.model_validate(d) for d in db_objs]
 
 
+async def get_all_map_entity_memories() -> list[MapEntityMemoryRead]:
+    """Get the map entity memories for every map."""
+    async with get_db_session() as session:
+        result = await session.execute(select(MapEntityMemoryDBModel))
+        db_objs = result.scalars().all()
+
+    return [MapEntityMemoryRead.model_validate(d) for d in db_objs]
+
+
 async def update_map_entity_memory(map_entity: MapEntityMemoryUpdate) -> MapEntityMemoryRead:
     """Update the description of a map entity memory."""
-    async with db_sessionmaker() as session:
+    async with get_db_session() as session:
         query = (
             update(MapEntityMemoryDBModel)
             .where(
@@ -65,18 +73,15 @@ async def update_map_entity_memory(map_entity: MapEntityMemoryUpdate) -> MapEnti
                 f" and entity_type: {map_entity.entity_type}",
             )
 
-        await session.commit()
-
         return MapEntityMemoryRead.model_validate(db_obj)
 
 
 async def delete_map_entity_memory(map_entity: MapEntityMemoryDelete) -> None:
     """Delete a map entity memory."""
-    async with db_sessionmaker() as session:
+    async with get_db_session() as session:
         query = delete(MapEntityMemoryDBModel).where(
             MapEntityMemoryDBModel.map_id == map_entity.map_id,
             MapEntityMemoryDBModel.entity_id == map_entity.entity_id,
             MapEntityMemoryDBModel.entity_type == map_entity.entity_type,
         )
         await session.execute(query)
-        await session.commit()
@@ -1,9 +1,10 @@
-from sqlalchemy import JSON, Integer, String
+from sqlalchemy import JSON, Integer
 from sqlalchemy.orm import Mapped, mapped_column
 
 from common.enums import BlockedDirection, MapId
 from common.schemas import Coords
 from database.base import SQLAlchemyBase
+from database.types import TileGrid
 
 
 class MapMemoryDBModel(SQLAlchemyBase):
@@ -12,7 +13,7 @@ class MapMemoryDBModel(SQLAlchemyBase):
     __tablename__ = "map_memory"
 
     map_id: Mapped[MapId] = mapped_column(Integer, primary_key=True, index=True)
-    tiles: Mapped[str] = mapped_column(String, nullable=False)
+    tiles: Mapped[bytes] = mapped_column(TileGrid, nullable=False)
     blockages: Mapped[dict[Coords, BlockedDirection]] = mapped_column(JSON, nullable=False)
     create_iteration: Mapped[int] = mapped_column(Integer, nullable=False)
     update_iteration: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -1,14 +1,14 @@
 from sqlalchemy import select, update
 
 from common.enums import MapId
-from database.db_config import db_sessionmaker
+from database.db_config import get_db_session
 from database.map_memory.model import MapMemoryDBModel
 from database.map_memory.schemas import MapMemoryCreateUpdate, MapMemoryRead
 
 
 async def create_map_memory(map_memory: MapMemoryCreateUpdate) -> MapMemoryRead:
     """Create a new map memory."""
-    async with db_sessionmaker() as session:
+    async with get_db_session() as session:
         db_obj = MapMemoryDBModel(
             map_id=map_memory.map_id,
             tiles=map_memory.tiles,
@@ -17,15 +17,14 @@ async def create_map_memory(map_memory: MapMemoryCreateUpdate) -> MapMemoryRead:
             update_iteration=map_memory.iteration,
         )
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await session.flush()
 
     return MapMemoryRead.model_validate(db_obj)
 
 
 async def get_map_memory(map_id: MapId) -> MapMemoryRead | None:
     """Get a map memory by map id."""
-    async with db_sessionmaker() as session:
+    async with get_db_session() as session:
         query = select(MapMemoryDBModel).where(MapMemoryDBModel.map_id == map_id)
         result = await session.execute(query)
         db_obj = result.scalar_one_or_none()
@@ -36,9 +35,18 @@ async def get_map_memory(map_id: MapId) -> MapMemoryRead | None:
     return MapMemoryRead.model_validate(db_obj)
 
 
+async def get_all_map_memories() -> list[MapMemoryRead]:
+    """Get the map memories for every visited map."""
+    async with get_db_session() as session:
+        result = await session.execute(select(MapMemoryDBModel))
+        db_objs = result.scalars().all()
+
+    return [MapMemoryRead.model_validate(d) for d in db_objs]
+
+
 async def get_visited_maps() -> list[MapId]:
     """Get all visited maps."""
-    async with db_sessionmaker() as session:
+    async with get_db_session() as session:
         query = select(MapMemoryDBModel.map_id)
         result = await session.execute(query)
         return [MapId(map_id) for map_id in result.scalars().all()]
@@ -46,7 +54,7 @@ async def get_visited_maps() -> list[MapId]:
 
 async def update_map_tiles(map_memory: MapMemoryCreateUpdate) -> MapMemoryRead:
     """Update the tiles of a map memory."""
-    async with db_sessionmaker() as session:
+    async with get_db_session() as session:
         query = (
             update(MapMemoryDBModel)
             .where(MapMemoryDBModel.map_id == map_memory.map_id)
@@ -63,6 +71,4 @@ async def update_map_tiles(map_memory: MapMemoryCreateUpdate) -> MapMemoryRead:
         if db_obj is None:
             raise ValueError(f"No map memory found for map_id {map_memory.map_id}")
 
-        await session.commit()
-
         return MapMemoryRead.model_validate(db_obj)
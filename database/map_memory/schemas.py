@@ -10,7 +10,7 @@ class MapMemoryCreateUpdate(BaseModel):
     """Create/update model for a map memory."""
 
     map_id: MapId
-    tiles: str
+    tiles: bytes
     blockages: dict[str, BlockedDirection]
     iteration: int
 
@@ -27,7 +27,7 @@ class MapMemoryRead(BaseModel):
     """Read model for a map memory."""
 
     map_id: MapId
-    tiles: str
+    tiles: bytes
     blockages: dict[Coords, BlockedDirection]
 
     model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,18 @@
+from sqlalchemy import JSON, Integer, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from common.enums import BlockedDirection, MapId
+from database.base import SQLAlchemyBase
+
+
+class MapTileDeltaDBModel(SQLAlchemyBase):
+    """A table for the tiles and blockages that changed on a map since its last full write."""
+
+    __tablename__ = "map_tile_delta"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    map_id: Mapped[MapId] = mapped_column(Integer, nullable=False, index=True)
+    positions: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    tiles: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    blockages: Mapped[dict[str, BlockedDirection]] = mapped_column(JSON, nullable=False)
+    iteration: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,37 @@
+from sqlalchemy import delete, select
+
+from common.enums import MapId
+from database.db_config import get_db_session
+from database.map_tile_delta.model import MapTileDeltaDBModel
+from database.map_tile_delta.schemas import MapTileDeltaCreate, MapTileDeltaRead
+
+
+async def create_map_tile_delta(map_tile_delta: MapTileDeltaCreate) -> None:
+    """Create a new map tile delta."""
+    async with get_db_session() as session:
+        db_obj = MapTileDeltaDBModel(
+            map_id=map_tile_delta.map_id,
+            positions=map_tile_delta.positions,
+            tiles=map_tile_delta.tiles,
+            blockages=map_tile_delta.blockages,
+            iteration=map_tile_delta.iteration,
+        )
+        session.add(db_obj)
+        await session.flush()
+
+
+async def get_all_map_tile_deltas() -> list[MapTileDeltaRead]:
+    """Get the map tile deltas for every map, in the order they were made."""
+    async with get_db_session() as session:
+        query = select(MapTileDeltaDBModel).order_by(MapTileDeltaDBModel.id)
+        result = await session.execute(query)
+        db_objs = result.scalars().all()
+
+    return [MapTileDeltaRead.model_validate(d) for d in db_objs]
+
+
+async def delete_map_tile_deltas(map_id: MapId) -> None:
+    """Delete the map tile deltas of a map, once they have been compacted into its map memory."""
+    async with get_db_session() as session:
+        query = delete(MapTileDeltaDBModel).where(MapTileDeltaDBModel.map_id == map_id)
+        await session.execute(query)
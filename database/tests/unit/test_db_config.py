@@ -0,0 +1,120 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from common.enums import MapEntityType, MapId
+from database.base import SQLAlchemyBase
+from database.db_config import (
+    _add_missing_columns,
+    commit_unit_of_work,
+    db_sessionmaker,
+    unit_of_work,
+)
+from database.llm_messages.model import LLMMessageDBModel  # noqa: F401
+from database.llm_messages.repository import create_llm_message, get_total_llm_cost
+from database.llm_messages.schemas import LLMMessageCreate
+from database.map_entity_memory.model import MapEntityMemoryDBModel  # noqa: F401
+from database.map_entity_memory.repository import (
+    create_map_entity_memory,
+    get_map_entity_memories_for_map,
+)
+from database.map_entity_memory.schemas import MapEntityMemoryCreate
+from llm.schemas import GEMINI_FLASH_2_5
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_unit_of_work_commits_writes_together() -> None:
+    """Test that writes in a unit of work are only visible outside of it once committed."""
+    async with unit_of_work():
+        await asyncio.gather(*[_create_sprite(i) for i in range(3)])
+        assert len(await get_map_entity_memories_for_map(MapId.PALLET_TOWN)) == 3  # noqa: PLR2004
+        assert await _count_committed() == 0
+
+        await commit_unit_of_work()
+        assert await _count_committed() == 3  # noqa: PLR2004
+        await _create_sprite(3)
+
+    assert await _count_committed() == 4  # noqa: PLR2004
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_unit_of_work_rolls_back_on_error() -> None:
+    """Test that a failed unit of work leaves nothing behind."""
+    with pytest.raises(ValueError, match="failed iteration"):
+        await _run_failed_iteration()
+
+    assert await _count_committed() == 0
+
+    await _create_sprite(1)  # Outside of a unit of work, each call commits on its own.
+    assert await _count_committed() == 1
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_llm_messages_survive_a_rollback() -> None:
+    """Test that the record of an LLM call is kept when its unit of work is rolled back."""
+    with pytest.raises(ValueError, match="failed iteration"):
+        await _run_failed_iteration(with_llm_call=True)
+
+    assert await _count_committed() == 0
+    assert await get_total_llm_cost() > 0
+
+
+@pytest.mark.unit
+async def test_missing_columns_are_added(tmp_path: Path) -> None:
+    """Test that a column added to a model after its table was created is added to the table."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLAlchemyBase.metadata.create_all)
+        await conn.execute(text("ALTER TABLE llm_message DROP COLUMN cached_prompt_tokens"))
+
+        await conn.run_sync(_add_missing_columns)
+        columns = await conn.run_sync(lambda c: inspect(c).get_columns("llm_message"))
+    await engine.dispose()
+
+    assert "cached_prompt_tokens" in {column["name"] for column in columns}
+
+
+async def _run_failed_iteration(*, with_llm_call: bool = False) -> None:
+    async with unit_of_work():
+        await _create_sprite(0)  # The unit of work holds the write lock from here on.
+        if with_llm_call:
+            await _create_llm_message()
+        raise ValueError("failed iteration")
+
+
+async def _create_sprite(entity_id: int) -> None:
+    await create_map_entity_memory(
+        MapEntityMemoryCreate(
+            map_id=MapId.PALLET_TOWN,
+            entity_id=entity_id,
+            entity_type=MapEntityType.SPRITE,
+            iteration=0,
+        ),
+    )
+
+
+async def _create_llm_message() -> None:
+    await create_llm_message(
+        LLMMessageCreate(
+            model=GEMINI_FLASH_2_5,
+            prompt_name="test",
+            prompt="prompt",
+            response="response",
+            prompt_tokens=1000,
+            thought_tokens=100,
+            response_tokens=100,
+        ),
+    )
+
+
+async def _count_committed() -> int:
+    """Count the committed entities, from a connection outside of any unit of work."""
+    async with db_sessionmaker() as session:
+        result = await session.execute(SQLAlchemyBase.metadata.tables["map_entity_memory"].select())
+        return len(result.all())
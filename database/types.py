@@ -3,6 +3,8 @@ import struct
 from sqlalchemy import LargeBinary, TypeDecorator
 from sqlalchemy.dialects.sqlite import dialect
 
+from common.tile_codes import encode_tiles
+
 
 class Vector(TypeDecorator):
     """SQLAlchemy type for storing a list of floats as a BLOB, and loading it back as a list."""
@@ -17,3 +19,23 @@ class Vector(TypeDecorator):
     def process_result_value(self, value: bytes, dialect: dialect) -> list[float]:  # noqa: ARG002
         """Convert bytes back to list of floats."""
         return list(struct.unpack(f"{len(value) // 4}f", value))
+
+
+class TileGrid(TypeDecorator):
+    """
+    SQLAlchemy type for storing encoded map tiles as a BLOB.
+
+    Maps used to be stored as text, one character per tile. Those rows are encoded when they're
+    loaded, and are rewritten as BLOBs the next time the map is updated.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: bytes, dialect: dialect) -> bytes:  # noqa: ARG002
+        """Store the encoded tiles as they are."""
+        return value
+
+    def process_result_value(self, value: bytes | str, dialect: dialect) -> bytes:  # noqa: ARG002
+        """Encode the tiles if they were stored as text."""
+        return encode_tiles(value) if isinstance(value, str) else value
@@ -0,0 +1,204 @@
+import asyncio
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Callable
+
+from loguru import logger
+from pydantic import BaseModel, ConfigDict
+
+from emulator.game_state import YellowLegacyGameState
+
+
+class AnimationWait(BaseModel):
+    """How long the screen has to stay still before an animation counts as finished."""
+
+    name: str
+    check_interval_frames: int  # How often to sample the screen while waiting.
+    stable_frames: int  # How long the screen has to stay unchanged.
+    timeout_frames: int  # Give up on animations that never settle, like a flickering sprite.
+
+    model_config = ConfigDict(frozen=True)
+
+
+# The game runs at about 60 frames per second. A walking step takes 16 frames and the screen is
+# still between steps, whereas text can pause for a while between lines and battle animations have
+# long pauses between their stages.
+OVERWORLD_ANIMATION = AnimationWait(
+    name="overworld",
+    check_interval_frames=2,
+    stable_frames=20,
+    timeout_frames=600,
+)
+DIALOG_ANIMATION = AnimationWait(
+    name="dialog",
+    check_interval_frames=2,
+    stable_frames=30,
+    timeout_frames=900,
+)
+BATTLE_ANIMATION = AnimationWait(
+    name="battle",
+    check_interval_frames=4,
+    stable_frames=45,
+    timeout_frames=1200,
+)
+# Strength boulders pause partway through being pushed, so the screen has to stay still for longer
+# than after a step.
+BOULDER_ANIMATION = AnimationWait(
+    name="boulder",
+    check_interval_frames=2,
+    stable_frames=40,
+    timeout_frames=600,
+)
+# Cutscenes can have long pauses between their steps, and missing one can cause weird downstream
+# issues, so this is about as long as two of the other waits.
+CUTSCENE_ANIMATION = AnimationWait(
+    name="cutscene",
+    check_interval_frames=4,
+    stable_frames=90,
+    timeout_frames=1800,
+)
+
+
+def get_animation_wait(game_state: YellowLegacyGameState) -> AnimationWait:
+    """
+    Get the animation thresholds for the current context of the game.
+
+    :param game_state: The current game state.
+    :return: The thresholds to wait with.
+    """
+    if game_state.battle.is_in_battle:
+        return BATTLE_ANIMATION
+    if game_state.is_text_on_screen():
+        return DIALOG_ANIMATION
+    return OVERWORLD_ANIMATION
+
+
+class AnimationWaitRecord(BaseModel):
+    """How long a single wait for an animation took."""
+
+    name: str
+    frames: int
+    seconds: float
+    timed_out: bool
+
+    model_config = ConfigDict(frozen=True)
+
+
+_MAX_RECORDS = 1000
+
+
+class AnimationWatcher:
+    """
+    Detects when the screen has settled, one frame at a time.
+
+    The emulator calls `on_frame` after every tick, from the emulator thread, and the watcher
+    samples the screen for each pending wait on that wait's interval. Each wait resolves once the
+    screen has stayed the same for the wait's number of stable frames, so waits are measured in
+    emulated frames and don't depend on how fast the emulator is running. The most recent waits are
+    kept in `records`, and the totals for each context are kept for the whole run.
+    """
+
+    def __init__(self) -> None:
+        self._frame = 0
+        self._pending: list[_PendingWait] = []
+        self._lock = threading.Lock()
+        self.records: deque[AnimationWaitRecord] = deque(maxlen=_MAX_RECORDS)
+        self.total_waits: Counter[str] = Counter()
+        self.total_seconds: Counter[str] = Counter()
+
+    async def wait(self, wait: AnimationWait) -> None:
+        """
+        Wait until the screen has been stable for long enough.
+
+        :param wait: The thresholds to use.
+        """
+        with self._lock:
+            pending = _PendingWait(wait, self._frame, asyncio.get_running_loop())
+            self._pending.append(pending)
+        start = time.perf_counter()
+        try:
+            await pending.event.wait()
+        finally:
+            with self._lock:
+                if pending in self._pending:
+                    self._pending.remove(pending)
+        record = AnimationWaitRecord(
+            name=wait.name,
+            frames=pending.end_frame - pending.start_frame,
+            seconds=time.perf_counter() - start,
+            timed_out=pending.timed_out,
+        )
+        self.records.append(record)
+        self.total_waits[record.name] += 1
+        self.total_seconds[record.name] += record.seconds
+        if record.timed_out:
+            logger.warning(f"Timed out waiting for a {wait.name} animation to finish.")
+
+    def on_frame(self, read_screen: Callable[[], bytes]) -> None:
+        """
+        Advance by one frame and resolve any waits whose screen has settled.
+
+        :param read_screen: Reads the screen contents, ignoring anything that should not block
+            progress. It's only called if a pending wait needs a sample on this frame.
+        """
+        with self._lock:
+            self._frame += 1
+            pending_waits = list(self._pending)
+        screen_hash = None
+        for pending in pending_waits:
+            elapsed = self._frame - pending.start_frame
+            if elapsed % pending.wait.check_interval_frames:
+                continue
+            if screen_hash is None:
+                screen_hash = hash(read_screen())
+            if screen_hash != pending.screen_hash:
+                pending.screen_hash = screen_hash
+                pending.stable_since = self._frame
+            if self._frame - pending.stable_since >= pending.wait.stable_frames:
+                self._resolve(pending)
+            elif elapsed >= pending.wait.timeout_frames:
+                pending.timed_out = True
+                self._resolve(pending)
+
+    def cancel_all(self) -> None:
+        """Release every pending wait, e.g. because the emulator has stopped."""
+        with self._lock:
+            pending_waits = list(self._pending)
+        for pending in pending_waits:
+            self._resolve(pending)
+
+    def __str__(self) -> str:
+        """Get a one-line summary of the time spent waiting in each context."""
+        return ", ".join(
+            f"{name}: {count} waits / {self.total_seconds[name]:.2f}s"
+            for name, count in self.total_waits.items()
+        )
+
+    def _resolve(self, pending: "_PendingWait") -> None:
+        """Release a wait, which may be awaited on a different thread's event loop."""
+        with self._lock:
+            if pending not in self._pending:
+                return
+            self._pending.remove(pending)
+            pending.end_frame = self._frame
+        pending.loop.call_soon_threadsafe(pending.event.set)
+
+
+class _PendingWait:
+    """The progress of a single wait that hasn't resolved yet."""
+
+    def __init__(
+        self,
+        wait: AnimationWait,
+        start_frame: int,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        self.wait = wait
+        self.start_frame = start_frame
+        self.end_frame = start_frame
+        self.stable_since = start_frame
+        self.screen_hash: int | None = None  # Set by the first sample.
+        self.timed_out = False
+        self.loop = loop
+        self.event = asyncio.Event()
@@ -1,17 +1,36 @@
 import asyncio
-import base64
 import io
-from contextlib import AbstractAsyncContextManager, suppress
-from copy import deepcopy
+import time
+from contextlib import AbstractAsyncContextManager
+from functools import partial
 from pathlib import Path
 
 from loguru import logger
-from PIL import Image
 from pyboy import PyBoy
 
 from common.constants import DEFAULT_ROM_PATH
 from common.enums import Button
+from emulator.animation import (
+    OVERWORLD_ANIMATION,
+    AnimationWait,
+    AnimationWatcher,
+    get_animation_wait,
+)
 from emulator.game_state import YellowLegacyGameState
+from emulator.input_sequence import (
+    InputSequence,
+    InputSequenceResult,
+    StopCondition,
+    is_walk_interrupted,
+)
+from emulator.parser_cache import ParserCache
+from emulator.runner import GAME_BOY_FPS, EmulatorRunner, FrameStats
+from emulator.save_state_history import SaveStateHistory
+from emulator.screenshot import Screenshot
+
+# When running faster than real time, only every few frames are rendered. This is shorter than the
+# shortest wait for animations, so a screenshot taken after waiting for animations is up to date.
+_MAX_RENDER_INTERVAL = 16
 
 
 class YellowLegacyEmulator(AbstractAsyncContextManager):
@@ -20,145 +39,288 @@ class YellowLegacyEmulator(AbstractAsyncContextManager):
     that the rest of the codebase doesn't need to worry about emulation or memory addresses.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         rom_path: str = DEFAULT_ROM_PATH,
-        save_state: str | None = None,
+        save_state: bytes | None = None,
         save_state_path: Path | None = None,
         *,
         mute_sound: bool = False,
         headless: bool = False,
+        speed: int = 1,
     ) -> None:
-        """Initialize the emulator."""
+        """
+        Initialize the emulator.
+
+        :param rom_path: The path to the ROM file.
+        :param save_state: A raw save state to load.
+        :param save_state_path: The path to a save state file to load.
+        :param mute_sound: Whether to mute the sound.
+        :param headless: Whether to run without a window.
+        :param speed: The emulation speed as a multiple of real time, or 0 to run as fast as
+            possible, e.g. for tests and offline runs. Above real time, only every few frames are
+            rendered and sound is only sampled on those frames.
+        """
         if save_state and save_state_path:
             raise ValueError("Cannot specify both save_state and save_state_path.")
+        if speed < 0:
+            raise ValueError("Emulation speed cannot be negative.")
 
         volume = 0 if mute_sound else 100
         window = "null" if headless else "SDL2"
         self._pyboy = PyBoy(rom_path, sound_volume=volume, window=window)
+        # The runner paces the frames itself. PyBoy's own limiter would sleep inside each tick,
+        # while the runner holds its lock.
+        self._pyboy.set_emulation_speed(0)
 
         # This load_state piece is technically blocking, but it's only done once at initialization,
         # so there's nothing for it to block.
         if save_state:
-            buffer = io.BytesIO(base64.b64decode(save_state))
-            buffer.seek(0)  # Pyboy requires this.
-            self._pyboy.load_state(buffer)
+            self._pyboy.load_state(io.BytesIO(save_state))
         elif save_state_path:
             with save_state_path.open("rb") as f:
                 self._pyboy.load_state(f)
 
         self._is_stopped = True
-        self._tick_task: asyncio.Task | None = None
-        self._button_lock = asyncio.Lock()
+        self._render_interval = min(speed, _MAX_RENDER_INTERVAL) if speed else _MAX_RENDER_INTERVAL
+        self._frames_until_render = 0
+        self._rendered_frames = 0
+        self._screenshot: Screenshot | None = None
+        self._runner = EmulatorRunner(
+            self._tick_frame,
+            on_exit=self._on_runner_exit,
+            fps=GAME_BOY_FPS * speed if speed else None,
+        )
+        self._parser_cache = ParserCache()
+        self._animation_watcher = AnimationWatcher()
+        self._input_sequence: InputSequence | None = None
+        self._save_states = SaveStateHistory()
 
     async def __aenter__(self) -> "YellowLegacyEmulator":
-        """Start the emulator's tick task when entering the context."""
+        """Start the emulator thread when entering the context."""
         self._is_stopped = False
-        self._tick_task = asyncio.create_task(self.async_tick_indefinitely())
-        await asyncio.sleep(1)  # Give the emulator time to load before continuing.
+        self._runner.start()
+        await self.wait_frames(60)  # Give the emulator time to load before continuing.
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # noqa: ANN001
-        """Stop the emulator and cancel the tick task when exiting the context."""
-        self.stop()
-        if self._tick_task:
-            self._tick_task.cancel()
-            with suppress(asyncio.CancelledError):
-                await self._tick_task
+        """Stop the emulator thread when exiting the context."""
+        await asyncio.to_thread(self.stop)
 
     def get_game_state(self) -> YellowLegacyGameState:
         """Get the current game state."""
         self._check_stopped()
-        return YellowLegacyGameState.from_memory(self._pyboy.memory)
-
-    async def async_tick_indefinitely(self) -> None:
-        """Tick the emulator indefinitely. Should be run on its own thread."""
-        while True:
-            self._check_stopped()
-            async with self._button_lock:
-                if not self._tick():
-                    self.stop()
-                    break
-            # Pass control back to the event loop. Making this time too large will cause audio to
-            # stutter, but making it too small can corrupt save states by not giving the emulator
-            # enough time to save the state. This value seems to work well.
-            await asyncio.sleep(0.002)
+        with self._runner.lock:
+            return self._read_game_state()
+
+    @property
+    def parser_cache(self) -> ParserCache:
+        """The cache of parsed game state sub-models, exposed for its hit/miss statistics."""
+        return self._parser_cache
+
+    @property
+    def animation_watcher(self) -> AnimationWatcher:
+        """The screen stability detector, exposed for its record of how long each wait took."""
+        return self._animation_watcher
+
+    async def wait_frames(self, frames: int) -> None:
+        """
+        Wait for a number of emulated frames, rather than wall-clock time, so that waits take as
+        long in the game at any emulation speed. The game runs at about 60 frames per second.
+
+        :param frames: The number of frames to wait for.
+        """
+        self._check_stopped()
+        await self._runner.wait_frames(frames)
+
+    def get_frame_stats(self) -> FrameStats:
+        """Get the emulated frame rate and the number of dropped frames."""
+        return self._runner.get_stats()
 
     def stop(self) -> None:
-        """Stop the emulator."""
+        """Stop the emulator, waiting for the emulator thread to finish its current frame."""
         self._is_stopped = True
-        self._pyboy.stop()
+        if self._runner.is_running:
+            self._runner.stop()  # The emulator thread stops PyBoy on its way out.
+        else:
+            self._on_runner_exit()
 
-    def get_screenshot(self) -> Image.Image:
-        """Get a screenshot of the current game screen."""
+    def get_screenshot(self) -> Screenshot:
+        """
+        Get a screenshot of the current game screen. The screen is only copied once per rendered
+        frame, so repeated calls on the same frame share the same screenshot and its PNG encoding.
+        """
         self._check_stopped()
-        img = deepcopy(self._pyboy.screen.image)
-        if not isinstance(img, Image.Image):
-            raise TypeError("No screenshot available")
-        return img
+        with self._runner.lock:
+            if self._screenshot is None or self._screenshot.frame != self._rendered_frames:
+                self._screenshot = Screenshot(self._rendered_frames, self._pyboy.screen.ndarray)
+            return self._screenshot
 
     async def press_button(
         self,
         button: Button,
         *,
         wait_for_animation: bool = True,
+        animation: AnimationWait | None = None,
     ) -> None:
         """
         Send a button press to the emulator and wait for any animations to finish.
 
         :param button: The button to press.
-        :param hold_frames: The number of frames to hold each button.
         :param wait_for_animation: Whether to wait for animations to finish. You usually want this,
             but you can skip it if you have bespoke handling for subsequent activity.
+        :param animation: The thresholds to wait for animations with. Defaults to the ones for the
+            current context of the game.
         """
         self._check_stopped()
         # If we're deferring animation handling, we want to exit as quickly as possible. Two frames
         # seems to be the minimum to guarantee that the button press is registered.
         hold_frames = 10 if wait_for_animation else 2
-        async with self._button_lock:
-            self._pyboy.button(button, hold_frames)
+        await self._runner.submit(partial(self._pyboy.button, button, hold_frames))
         if wait_for_animation:
-            await self.wait_for_animation_to_finish()
+            await self.wait_for_animation_to_finish(animation)
+
+    async def press_and_wait_frames(
+        self,
+        button: Button,
+        hold_frames: int = 10,
+        settle_frames: int = 20,
+    ) -> YellowLegacyGameState:
+        """
+        Press a button for an exact number of frames, and wait an exact number of frames after.
 
-    async def wait_for_animation_to_finish(self) -> None:
+        :param button: The button to press.
+        :param hold_frames: How long to hold the button for.
+        :param settle_frames: How long to wait after releasing the button.
+        :return: The game state once the frames have passed.
         """
-        Wait until all ongoing animations have finished.
+        result = await self.run_input_sequence(
+            [button],
+            hold_frames=hold_frames,
+            settle=settle_frames,
+            stop_condition=None,
+        )
+        return result.game_states[-1]
 
-        The various hyperparameters here are a bit wishy-washy. I determined emperically that they
-        work pretty well, but they're probably not optimal, especially since different scenarios
-        have different animation speeds.
+    async def run_input_sequence(
+        self,
+        buttons: list[Button],
+        *,
+        hold_frames: int = 10,
+        settle: AnimationWait | int = OVERWORLD_ANIMATION,
+        stop_condition: StopCondition | None = is_walk_interrupted,
+    ) -> InputSequenceResult:
+        """
+        Press a sequence of buttons in one go on the emulator thread, e.g. to walk along a path.
+
+        Each button is held and then settles before the next one is pressed, all counted in frames,
+        and the sequence stops early as soon as the stop condition trips.
+
+        :param buttons: The buttons to press, in order.
+        :param hold_frames: How long to hold each button for.
+        :param settle: How long to wait after each button, either as a number of frames, or as the
+            thresholds for the screen to be stable.
+        :param stop_condition: Checked with the game states before and after each step. Defaults to
+            stopping a walk once it's interrupted, e.g. by a map change, a battle, or a dialog box.
+        :return: The game state after each step that was run, and whether it stopped early.
+        """
+        self._check_stopped()
+        sequence = InputSequence(
+            buttons,
+            hold_frames=hold_frames,
+            settle=settle,
+            stop_condition=stop_condition,
+        )
+        await self._runner.submit(partial(self._start_input_sequence, sequence))
+        return await sequence.result
+
+    async def wait_for_animation_to_finish(self, animation: AnimationWait | None = None) -> None:
+        """
+        Wait until all ongoing animations have finished, i.e. the screen has stopped changing.
+
+        The screen is checked on the emulator's own frames, so this resolves as soon as the screen
+        has been still for long enough, rather than on a fixed polling schedule.
+
+        :param animation: The thresholds to wait with. Defaults to the ones for the current context
+            of the game, since different scenarios have different animation speeds.
         """
         logger.info("Checking for animations and waiting for them to finish.")
         self._check_stopped()
-        successes = 0
-        required_successes = 5
-        while successes < required_successes:
-            game_state = self.get_game_state()
-            await asyncio.sleep(0.15)
-            new_game_state = self.get_game_state()
-            # The blinking cursor should not block progress, so we ignore it.
-            if game_state.screen.tiles_without_cursor == new_game_state.screen.tiles_without_cursor:
-                successes += 1
-            else:
-                successes = 0
-
-    async def get_emulator_save_state(self) -> str:
-        """Get the current save state as a Base64 encoded string."""
+        animation = animation or get_animation_wait(self.get_game_state())
+        await self._animation_watcher.wait(animation)
         self._check_stopped()
+
+    @property
+    def save_states(self) -> SaveStateHistory:
+        """The most recent save states, along with their sizes and capture latencies."""
+        return self._save_states
+
+    async def capture_save_state(self) -> bytes:
+        """
+        Capture the current save state, and keep it in the save state history.
+
+        :return: The raw save state.
+        """
+        self._check_stopped()
+        start = time.perf_counter()
+        # Saved between two frames on the emulator thread, so the state is always consistent.
+        save_state = await self._runner.submit(self._save_state)
+        self._save_states.add(save_state, time.perf_counter() - start)
+        return save_state
+
+    def _save_state(self) -> bytes:
+        """Save the state to bytes. Called on the emulator thread."""
         with io.BytesIO() as f:
-            await asyncio.to_thread(self._pyboy.save_state, f)
-            return base64.b64encode(f.getvalue()).decode("utf-8")
+            self._pyboy.save_state(f)
+            return f.getvalue()
+
+    def _read_screen_tiles(self) -> bytes:
+        """Read the tiles on screen, with the blinking cursor blanked so that it doesn't count."""
+        return bytes(self._pyboy.memory[0xC3A0:0xC508]).translate(_CURSOR_TO_BLANK)
 
     def _check_stopped(self) -> None:
         if self._is_stopped:
             raise RuntimeError("Emulator is stopped.")
 
-    def _tick(self, count: int = 1) -> bool:
+    def _tick_frame(self) -> bool:
         """
-        Tick the emulator forward by `count` frames.
+        Tick the emulator forward by a frame. Called on the emulator thread.
 
-        :param count: Number of frames to tick forward.
         :return: Whether the game is still running.
         """
-        self._check_stopped()
-        return self._pyboy.tick(count, render=True, sound=True)
+        # Rendering and sound are skipped on intermediate frames when running faster than real time.
+        is_rendered = self._frames_until_render == 0
+        self._frames_until_render = (self._frames_until_render + 1) % self._render_interval
+        sequence = self._input_sequence
+        if sequence:
+            sequence.before_frame(self._pyboy.button)
+        if not self._pyboy.tick(1, render=is_rendered, sound=is_rendered):
+            return False
+        self._rendered_frames += is_rendered
+        self._animation_watcher.on_frame(self._read_screen_tiles)
+        if sequence and sequence.after_frame(self._read_screen_tiles, self._read_game_state):
+            self._input_sequence = None
+        return True
+
+    def _start_input_sequence(self, sequence: InputSequence) -> None:
+        """Start running an input sequence from the next frame. Called on the emulator thread."""
+        if self._input_sequence:
+            raise RuntimeError("Another input sequence is already running.")
+        sequence.start(self._read_game_state())
+        self._input_sequence = sequence
+
+    def _read_game_state(self) -> YellowLegacyGameState:
+        """Read the game state on the emulator thread, which already holds the runner's lock."""
+        return YellowLegacyGameState.from_memory(self._pyboy.memory, self._parser_cache)
+
+    def _on_runner_exit(self) -> None:
+        """Stop the emulator once its thread has exited, e.g. because the window was closed."""
+        self._is_stopped = True
+        self._animation_watcher.cancel_all()
+        if self._input_sequence:
+            self._input_sequence.finish(is_stopped_early=True)
+            self._input_sequence = None
+        self._pyboy.stop()
+
+
+_CURSOR_TO_BLANK = bytes.maketrans(b"\xee", b"\x7f")
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from functools import cached_property
 from typing import Self
 
 import numpy as np
@@ -8,6 +9,8 @@ from pydantic import BaseModel, ConfigDict
 from common.constants import PLAYER_OFFSET_X, PLAYER_OFFSET_Y, SCREEN_SHAPE
 from common.enums import AsciiTile, Badge, BattleType, BlockedDirection
 from common.schemas import Coords
+from emulator.memory import MemorySnapshot
+from emulator.parser_cache import ParserCache
 from emulator.parsers.battle import Battle, parse_battle_state
 from emulator.parsers.inventory import Inventory, parse_inventory
 from emulator.parsers.map import Map, parse_map_state
@@ -38,19 +41,42 @@ class YellowLegacyGameState(BaseModel):
     model_config = ConfigDict(frozen=True)
 
     @classmethod
-    def from_memory(cls, mem: PyBoyMemoryView) -> Self:
+    def from_memory(cls, mem: PyBoyMemoryView, cache: ParserCache | None = None) -> Self:
         """
-        Create a new game state from a snapshot of the memory.
+        Create a new game state from the live emulator memory.
 
         :param mem: The PyBoyMemoryView instance to create the game state from.
+        :param cache: An optional cache of previously parsed sub-models to reuse.
+        :return: A new game state.
+        """
+        return cls.from_snapshot(MemorySnapshot.from_memory(mem), cache)
+
+    @classmethod
+    def from_snapshot(cls, mem: MemorySnapshot, cache: ParserCache | None = None) -> Self:
+        """
+        Create a new game state from a snapshot of the memory.
+
+        :param mem: The memory snapshot to create the game state from.
+        :param cache: An optional cache of previously parsed sub-models to reuse. The party, PC,
+            inventory, and map are only re-parsed if the memory they come from has changed.
         :return: A new game state.
         """
+        if cache is None:
+            party = parse_party_pokemon(mem)
+            pc_pokemon = parse_pc_pokemon(mem)
+            inventory = parse_inventory(mem)
+            map_state = parse_map_state(mem)
+        else:
+            party = cache.get_or_parse("party", mem, parse_party_pokemon)
+            pc_pokemon = cache.get_or_parse("pc", mem, parse_pc_pokemon)
+            inventory = cache.get_or_parse("inventory", mem, parse_inventory)
+            map_state = cache.get_or_parse("map", mem, parse_map_state)
         return cls(
             player=parse_player(mem),
-            party=parse_party_pokemon(mem),
-            pc_pokemon=parse_pc_pokemon(mem),
-            inventory=parse_inventory(mem),
-            map=parse_map_state(mem),
+            party=party,
+            pc_pokemon=pc_pokemon,
+            inventory=inventory,
+            map=map_state,
             sprites=parse_sprites(mem),
             pikachu=parse_pikachu_sprite(mem),
             warps=parse_warps(mem),
@@ -192,7 +218,15 @@ class YellowLegacyGameState(BaseModel):
         """
         Get an ASCII representation of the current screen, including the onscreen sprites and warp
         points.
+
+        The result is cached, since the game state is a frozen snapshot and this is called several
+        times per iteration.
         """
+        return self._ascii_screen
+
+    @cached_property
+    def _ascii_screen(self) -> AsciiScreenWithEntities:
+        """The uncached implementation of `get_ascii_screen`."""
         blocks, blockages = self._get_background_blocks()
 
         on_screen_sprites = []
@@ -280,119 +314,125 @@ class YellowLegacyGameState(BaseModel):
         Get the background blocks on the screen without the entities. Note special cases where
         movement is blocked due to elevation differences.
 
+        Every block is classified at once by building a mask for each block type and picking the
+        first match in priority order.
+
         :return: A tuple of the blocks and blockages.
         """
-        tiles = np.array(self.screen.tiles)
-        # Each block on screen is a 2x2 square of tiles.
-        blocks = np.full(SCREEN_SHAPE, AsciiTile.WALL, dtype=AsciiTile)
-        blockages: defaultdict[Coords, BlockedDirection] = defaultdict(lambda: BlockedDirection(0))
-
-        for i in range(0, tiles.shape[0], 2):
-            for j in range(0, tiles.shape[1], 2):
-                b = tiles[i : i + 2, j : j + 2]
-                b_flat = tuple(b.flatten().tolist())
-                b_idx = (i // 2, j // 2)
-
-                if self.map.water_tile and np.isin(b, self.map.water_tile).any():
-                    blocks[b_idx] = AsciiTile.WATER
-                elif ledge_type := self._get_ledge_type(b):
-                    blocks[b_idx] = ledge_type
-                elif self.map.grass_tile and b[1, 0] == self.map.grass_tile:
-                    # In engine/battle/wild_encounters.asm, grass tiles only check the bottom left.
-                    blocks[b_idx] = AsciiTile.GRASS
-                elif self.map.cut_tree_tiles and b_flat == self.map.cut_tree_tiles:
-                    blocks[b_idx] = AsciiTile.CUT_TREE
-                elif self.map.boulder_hole_tiles and b_flat == self.map.boulder_hole_tiles:
-                    blocks[b_idx] = AsciiTile.BOULDER_HOLE
-                elif self.map.pressure_plate_tiles and b_flat == self.map.pressure_plate_tiles:
-                    blocks[b_idx] = AsciiTile.PRESSURE_PLATE
-                elif self.map.pc_tiles and b_flat == self.map.pc_tiles:
-                    blocks[b_idx] = AsciiTile.PC_TILE
-                elif spinner_type := self._get_spinner_type(b_flat):
-                    blocks[b_idx] = spinner_type
-                elif b[1, 0] in self.map.walkable_tiles:  # Same bottom-left logic applies here.
-                    blocks[b_idx] = AsciiTile.FREE
-
-                blockages = self._get_blockage(i, j, tiles, blockages)
-
-        # Remove the default behaviour so we can query blockages without adding new ones.
-        return np.array(blocks), dict(blockages)
-
-    def _get_ledge_type(self, block: np.ndarray) -> AsciiTile | None:
+        tiles = np.array(self.screen.tiles, dtype=np.uint8)
+        # Each block on screen is a 2x2 square of tiles, so this has shape (9, 10, 2, 2).
+        blocks = tiles.reshape(SCREEN_SHAPE[0], 2, SCREEN_SHAPE[1], 2).swapaxes(1, 2)
+        top_left = blocks[..., 0, 0].astype(np.uint32)
+        top_right = blocks[..., 0, 1].astype(np.uint32)
+        # Comparisons, as elsewhere in Pokemon Yellow, are mostly done on the bottom-left tile.
+        bottom_left = blocks[..., 1, 0].astype(np.uint32)
+        bottom_right = blocks[..., 1, 1].astype(np.uint32)
+        flat = (top_left << 24) | (top_right << 16) | (bottom_left << 8) | bottom_right
+
+        def is_ledge(ledge_tiles: list[tuple[int, int]], *edges: np.ndarray) -> np.ndarray | None:
+            if not ledge_tiles:
+                return None
+            encoded = np.array([(a << 8) | b for a, b in ledge_tiles], dtype=np.uint32)
+            return np.logical_or.reduce([(e[..., None] == encoded).any(axis=-1) for e in edges])
+
+        def matches(flat_tiles: tuple[int, int, int, int] | None) -> np.ndarray | None:
+            return None if flat_tiles is None else flat == _encode_flat_block(flat_tiles)
+
+        water_tile = self.map.water_tile
+        grass_tile = self.map.grass_tile
+        spinners = self.map.spinner_tiles
+        masks = [
+            # Water if any of the four tiles is water.
+            (blocks == water_tile).any(axis=(2, 3)) if water_tile else None,
+            is_ledge(
+                self.map.ledge_tiles_down,
+                (top_left << 8) | bottom_left,
+                (top_right << 8) | bottom_right,
+            ),
+            is_ledge(
+                self.map.ledge_tiles_left,
+                (top_left << 8) | top_right,
+                (bottom_left << 8) | bottom_right,
+            ),
+            is_ledge(
+                self.map.ledge_tiles_right,
+                (top_left << 8) | top_right,
+                (bottom_left << 8) | bottom_right,
+            ),
+            # In engine/battle/wild_encounters.asm, grass tiles only check the bottom left.
+            bottom_left == grass_tile if grass_tile else None,
+            matches(self.map.cut_tree_tiles),
+            matches(self.map.boulder_hole_tiles),
+            matches(self.map.pressure_plate_tiles),
+            matches(self.map.pc_tiles),
+            matches(spinners and spinners.up),
+            matches(spinners and spinners.down),
+            matches(spinners and spinners.left),
+            matches(spinners and spinners.right),
+            matches(spinners and spinners.stop),
+            self.map.walkable_tile_mask[bottom_left],
+        ]
+        # Apply the masks from lowest to highest priority so that the first match wins.
+        tile_indices = np.full(SCREEN_SHAPE, len(masks))
+        for i in range(len(masks) - 1, -1, -1):
+            if masks[i] is not None:
+                tile_indices[masks[i]] = i
+        return _BACKGROUND_TILES[tile_indices], self._get_blockages(bottom_left)
+
+    def _get_blockages(self, bottom_left: np.ndarray) -> dict[Coords, BlockedDirection]:
         """
-        Check if the block is a ledge.
-
-        A tile is defined as a ledge if at least one row/column follows the pattern of a ledge,
-        depending on the orientation of the ledge.
+        Get the blockages on screen by checking if the bottom-left tiles of adjacent blocks form a
+        collision pair.
 
-        :param block: The block to check, which is a 2x2 array of tile values.
-        :return: The type of ledge, or None if the block is not a ledge.
+        :param bottom_left: The bottom-left tile of each block on screen.
+        :return: The blocked directions, keyed by screen coordinates.
         """
-        top = tuple(block[0, :].tolist())
-        bottom = tuple(block[1, :].tolist())
-        left = tuple(block[:, 0].tolist())
-        right = tuple(block[:, 1].tolist())
-
-        if left in self.map.ledge_tiles_down or right in self.map.ledge_tiles_down:
-            return AsciiTile.LEDGE_DOWN
-        if top in self.map.ledge_tiles_left or bottom in self.map.ledge_tiles_left:
-            return AsciiTile.LEDGE_LEFT
-        if top in self.map.ledge_tiles_right or bottom in self.map.ledge_tiles_right:
-            return AsciiTile.LEDGE_RIGHT
-        return None
-
-    def _get_spinner_type(self, flat_block: tuple[int, int, int, int]) -> AsciiTile | None:
-        """Get the type of spinner for a given block."""
-        if self.map.spinner_tiles is None:
-            return None
-        tile = None
-        if flat_block == self.map.spinner_tiles.up:
-            tile = AsciiTile.SPINNER_UP
-        elif flat_block == self.map.spinner_tiles.down:
-            tile = AsciiTile.SPINNER_DOWN
-        elif flat_block == self.map.spinner_tiles.left:
-            tile = AsciiTile.SPINNER_LEFT
-        elif flat_block == self.map.spinner_tiles.right:
-            tile = AsciiTile.SPINNER_RIGHT
-        elif flat_block == self.map.spinner_tiles.stop:
-            tile = AsciiTile.SPINNER_STOP
-        return tile
-
-    def _get_blockage(
-        self,
-        i: int,
-        j: int,
-        tiles: np.ndarray,
-        blockages: defaultdict[Coords, BlockedDirection],
-    ) -> defaultdict[Coords, BlockedDirection]:
-        """
-        Get the blockage for a given set of coordinates by checking if the tiles in the bottom-left
-        corner of this block and the one above it are in a collision pair.
-
-        Comparisons for collisions, as elsewhere in Pokemon Yellow, are done using the bottom-left
-        tile of each block.
+        collisions = self.map.collision_pair_matrix
+        # Each block is compared to the one above it and the one to its left.
+        blocked_up = np.zeros(SCREEN_SHAPE, dtype=bool)
+        blocked_up[1:] = collisions[bottom_left[1:], bottom_left[:-1]]
+        blocked_left = np.zeros(SCREEN_SHAPE, dtype=bool)
+        blocked_left[:, 1:] = collisions[bottom_left[:, 1:], bottom_left[:, :-1]]
+
+        # Filling the dict in row-major order keeps the same key order as a cell-by-cell scan.
+        blockages: defaultdict[Coords, BlockedDirection] = defaultdict(lambda: BlockedDirection(0))
+        for row, col in np.argwhere(blocked_up | blocked_left).tolist():
+            if blocked_up[row, col]:
+                blockages[Coords(row=row, col=col)] |= BlockedDirection.UP
+                blockages[Coords(row=row - 1, col=col)] |= BlockedDirection.DOWN
+            if blocked_left[row, col]:
+                blockages[Coords(row=row, col=col)] |= BlockedDirection.LEFT
+                blockages[Coords(row=row, col=col - 1)] |= BlockedDirection.RIGHT
 
-        :param i: The tile row index of the upper-left corner of the block.
-        :param j: The tile column index of the upper-left corner of the block.
-        :param tiles: The tiles array.
-        :param blockages: The blockages dictionary to update.
-        :return: The updated blockages dictionary.
-        """
-        bi, bj = i // 2, j // 2  # Block indices, as opposed to tile indices.
-        block_tile = tiles[i + 1, j]  # The bottom-left tile of the block is the one used to check.
-
-        if i - 2 >= 0:
-            block_above_tile = tiles[i - 1, j]
-            pair = {block_tile, block_above_tile}
-            if pair in self.map.collision_pairs:
-                blockages[Coords(row=bi, col=bj)] |= BlockedDirection.UP
-                blockages[Coords(row=bi - 1, col=bj)] |= BlockedDirection.DOWN
-
-        if j - 2 >= 0:
-            block_left_tile = tiles[i + 1, j - 2]
-            pair = {block_left_tile, block_tile}
-            if pair in self.map.collision_pairs:
-                blockages[Coords(row=bi, col=bj)] |= BlockedDirection.LEFT
-                blockages[Coords(row=bi, col=bj - 1)] |= BlockedDirection.RIGHT
-
-        return blockages
+        # Remove the default behaviour so we can query blockages without adding new ones.
+        return dict(blockages)
+
+
+def _encode_flat_block(flat_tiles: tuple[int, int, int, int]) -> int:
+    """Pack a flattened 2x2 block of tiles into a single integer."""
+    top_left, top_right, bottom_left, bottom_right = flat_tiles
+    return (top_left << 24) | (top_right << 16) | (bottom_left << 8) | bottom_right
+
+
+# The block type for each mask in `_get_background_blocks`, in priority order, with walls last.
+_BACKGROUND_TILES = np.array(
+    [
+        AsciiTile.WATER,
+        AsciiTile.LEDGE_DOWN,
+        AsciiTile.LEDGE_LEFT,
+        AsciiTile.LEDGE_RIGHT,
+        AsciiTile.GRASS,
+        AsciiTile.CUT_TREE,
+        AsciiTile.BOULDER_HOLE,
+        AsciiTile.PRESSURE_PLATE,
+        AsciiTile.PC_TILE,
+        AsciiTile.SPINNER_UP,
+        AsciiTile.SPINNER_DOWN,
+        AsciiTile.SPINNER_LEFT,
+        AsciiTile.SPINNER_RIGHT,
+        AsciiTile.SPINNER_STOP,
+        AsciiTile.FREE,
+        AsciiTile.WALL,
+    ],
+    dtype=object,
+)
@@ -0,0 +1,160 @@
+import asyncio
+from collections.abc import Callable
+
+from pydantic import BaseModel, ConfigDict
+
+from common.enums import Button
+from emulator.animation import AnimationWait
+from emulator.game_state import YellowLegacyGameState
+
+# Called with the game states before and after each step, and returns whether to stop early.
+StopCondition = Callable[[YellowLegacyGameState, YellowLegacyGameState], bool]
+
+
+def is_walk_interrupted(previous: YellowLegacyGameState, current: YellowLegacyGameState) -> bool:
+    """
+    Check if a step of a walk was interrupted, because the player didn't move, the map changed, a
+    battle started, or some text came up.
+
+    :param previous: The game state before the step.
+    :param current: The game state after the step.
+    :return: Whether the rest of the walk should be skipped.
+    """
+    return (
+        current.player.coords == previous.player.coords
+        or current.map.id != previous.map.id
+        or current.battle.is_in_battle
+        or current.is_text_on_screen()
+    )
+
+
+class InputSequenceResult(BaseModel):
+    """The outcome of running a sequence of button presses."""
+
+    game_states: list[YellowLegacyGameState]  # The game state after each step that was run.
+    is_stopped_early: bool  # Whether the stop condition tripped before the last step.
+
+    model_config = ConfigDict(frozen=True)
+
+
+class InputSequence:
+    """
+    A sequence of button presses, run frame by frame on the emulator thread.
+
+    Each step presses its button, holds it for a fixed number of frames, and then settles, either
+    for a fixed number of frames or until the screen is stable. The game state is read after each
+    step and checked against the stop condition, so a whole path runs without waiting on the event
+    loop between steps.
+    """
+
+    def __init__(
+        self,
+        buttons: list[Button],
+        *,
+        hold_frames: int,
+        settle: AnimationWait | int,
+        stop_condition: StopCondition | None,
+    ) -> None:
+        """
+        Initialize the sequence.
+
+        :param buttons: The buttons to press, one per step.
+        :param hold_frames: How long to hold each button for.
+        :param settle: How long to wait after releasing each button, either as a number of frames,
+            or as the thresholds for the screen to be stable.
+        :param stop_condition: Checked after each step, to stop the sequence early.
+        """
+        if not buttons:
+            raise ValueError("An input sequence needs at least one button.")
+        self._buttons = buttons
+        self._hold_frames = hold_frames
+        self._settle = settle
+        self._stop_condition = stop_condition
+        self._game_states: list[YellowLegacyGameState] = []
+        self._step_frame = 0
+        self._stable_since = 0
+        self._screen_hash: int | None = None
+        self._loop = asyncio.get_running_loop()
+        self.result: asyncio.Future[InputSequenceResult] = self._loop.create_future()
+
+    def start(self, game_state: YellowLegacyGameState) -> None:
+        """
+        Start the sequence on the emulator thread.
+
+        :param game_state: The game state before the first step.
+        """
+        self._game_states = [game_state]
+
+    def before_frame(self, press: Callable[[Button, int], None]) -> None:
+        """
+        Press the button for the current step if it's just starting.
+
+        :param press: Presses a button for a number of frames.
+        """
+        if self._step_frame == 0:
+            press(self._buttons[len(self._game_states) - 1], self._hold_frames)
+
+    def after_frame(
+        self,
+        read_screen: Callable[[], bytes],
+        read_game_state: Callable[[], YellowLegacyGameState],
+    ) -> bool:
+        """
+        Advance by one frame, and finish the current step once it has settled.
+
+        :param read_screen: Reads the screen contents, to check whether they are stable.
+        :param read_game_state: Reads the game state at the end of a step.
+        :return: Whether the sequence is finished.
+        """
+        self._step_frame += 1
+        if not self._is_step_settled(read_screen):
+            return False
+
+        game_state = read_game_state()
+        previous = self._game_states[-1]
+        self._game_states.append(game_state)
+        is_last_step = len(self._game_states) > len(self._buttons)
+        is_stopped_early = not is_last_step and bool(
+            self._stop_condition and self._stop_condition(previous, game_state),
+        )
+        if is_last_step or is_stopped_early:
+            self.finish(is_stopped_early=is_stopped_early)
+            return True
+
+        self._step_frame = 0
+        self._screen_hash = None
+        return False
+
+    def finish(self, *, is_stopped_early: bool) -> None:
+        """
+        Pass the result back to the event loop that is awaiting it.
+
+        :param is_stopped_early: Whether the sequence stopped before its last step.
+        """
+        result = InputSequenceResult(
+            game_states=self._game_states[1:],
+            is_stopped_early=is_stopped_early,
+        )
+        self._loop.call_soon_threadsafe(self._set_result, result)
+
+    def _is_step_settled(self, read_screen: Callable[[], bytes]) -> bool:
+        """Check if the current step has finished holding its button and settling."""
+        settle_frame = self._step_frame - self._hold_frames
+        if settle_frame <= 0:
+            return False
+        if isinstance(self._settle, int):
+            return settle_frame >= self._settle
+        if settle_frame % self._settle.check_interval_frames:
+            return False
+        screen_hash = hash(read_screen())
+        if screen_hash != self._screen_hash:
+            self._screen_hash = screen_hash
+            self._stable_since = settle_frame
+        return (
+            settle_frame - self._stable_since >= self._settle.stable_frames
+            or settle_frame >= self._settle.timeout_frames
+        )
+
+    def _set_result(self, result: InputSequenceResult) -> None:
+        if not self.result.done():
+            self.result.set_result(result)
@@ -0,0 +1,107 @@
+from typing import Self
+
+from pyboy import PyBoyMemoryView
+
+
+class MemorySnapshot(bytes):
+    """
+    A frozen copy of the parts of the Game Boy memory that the parsers read.
+
+    The snapshot is addressed exactly like the PyBoyMemoryView (i.e. `snapshot[0xD3B4]`), but every
+    read is a plain `bytes` lookup instead of a call into the emulator. Addresses outside of the
+    captured regions read as zero. The walkable tile list lives in a switchable ROM bank, so it is
+    captured separately in `walkable_tiles`.
+    """
+
+    walkable_tiles: bytes
+
+    @classmethod
+    def from_memory(cls, mem: PyBoyMemoryView) -> Self:
+        """
+        Copy the relevant regions of the memory into a new snapshot.
+
+        :param mem: The PyBoyMemoryView instance to take the snapshot from.
+        :return: A new memory snapshot.
+        """
+        buffer = bytearray(_ADDRESS_SPACE_SIZE)
+        for start, stop in _get_regions(mem):
+            if stop > start:  # PyBoy rejects empty slices.
+                buffer[start:stop] = mem[start:stop]
+        snapshot = cls(buffer)
+        snapshot.walkable_tiles = _read_walkable_tiles(mem, buffer)
+        return snapshot
+
+
+def _get_regions(mem: PyBoyMemoryView) -> list[tuple[int, int]]:
+    """
+    Get the (start, stop) address ranges to copy.
+
+    PyBoy hands slices back one byte at a time, so the cost of a snapshot scales with the number of
+    bytes copied. Variable-length lists are only copied up to their current length.
+    """
+    num_party = min(mem[0xD162], _MAX_PARTY_SIZE)
+    num_pc = min(mem[0xDA7F], _MAX_PC_BOX_SIZE)
+    num_items = min(mem[0xD31C], _MAX_BAG_SIZE)
+    num_warps = min(mem[0xD3FB], _MAX_WARPS)
+    num_signs = min(mem[0xD4FD], _MAX_SIGNS)
+    num_enemies = min(mem[0xD89B], _MAX_PARTY_SIZE)
+    return [
+        *_FIXED_REGIONS,
+        (0xD162, 0xD16A + 0x2C * num_party),  # Party pokemon.
+        (0xD2B4, 0xD2B4 + 0xB * num_party),  # Party nicknames.
+        (0xD31C, 0xD31D + 2 * num_items),  # Inventory.
+        (0xD3FB, 0xD3FC + 4 * num_warps),  # Warps.
+        (0xD4FD, 0xD4FE + 2 * num_signs),  # Signs.
+        (0xD89B, 0xD8A4 + 0x2C * num_enemies),  # Enemy trainer party.
+        (0xDA7F, 0xDA95 + 0x21 * num_pc),  # PC pokemon.
+        (0xDE05, 0xDE05 + 0xB * num_pc),  # PC nicknames.
+    ]
+
+
+def _read_walkable_tiles(mem: PyBoyMemoryView, buffer: bytearray) -> bytes:
+    """
+    Read the 0xFF-terminated walkable tile list for the current tileset from ROM.
+
+    The terminator is not included in the output.
+    """
+    walkable_tile_ptr = buffer[0xD57D] | (buffer[0xD57E] << 8)
+    tile_bank, tile_offset = divmod(walkable_tile_ptr, 0x4000)
+    # PyBoy refuses to read a slice that touches the end of the bank.
+    stop = min(tile_offset + _MAX_WALKABLE_TILES, 0x3FFF)
+    if stop <= tile_offset:
+        return b""
+    tiles = bytes(mem[tile_bank, tile_offset:stop])
+    terminator_index = tiles.find(_WALKABLE_TILES_TERMINATOR)
+    return tiles if terminator_index == -1 else tiles[:terminator_index]
+
+
+_ADDRESS_SPACE_SIZE = 0x10000
+_MAX_WALKABLE_TILES = 0x180
+_WALKABLE_TILES_TERMINATOR = 0xFF
+_MAX_PARTY_SIZE = 6
+_MAX_PC_BOX_SIZE = 20
+_MAX_BAG_SIZE = 20
+_MAX_WARPS = 32
+_MAX_SIGNS = 16
+
+# Keep these in sync with the addresses that the parsers read.
+_FIXED_REGIONS = [
+    (0xC100, 0xC1F3),  # Sprite picture IDs and render flags, including pikachu.
+    (0xC204, 0xC2F6),  # Sprite coordinates and movement, including pikachu.
+    (0xC3A0, 0xC508),  # Screen tiles.
+    (0xCC26, 0xCC37),  # Menu and cursor state.
+    (0xCFE4, 0xCFF5),  # Enemy pokemon in battle.
+    (0xD008, 0xD030),  # Player pokemon in battle.
+    (0xD057, 0xD058),  # Battle type.
+    (0xD157, 0xD162),  # Player name.
+    (0xD2F6, 0xD31C),  # Pokedex.
+    (0xD394, 0xD397),  # Money.
+    (0xD3A3, 0xD3A4),  # Badges.
+    (0xD3AB, 0xD3B5),  # Map ID, player coordinates, and tileset.
+    (0xD3BE, 0xD3E0),  # Map connections.
+    (0xD571, 0xD578),  # Map size and player direction.
+    (0xD57D, 0xD57F),  # Walkable tile pointer.
+    (0xD6FF, 0xD700),  # Walk/bike/surf state.
+    (0xD745, 0xD746),  # Champion flag.
+    (0xDA40, 0xDA44),  # Play time.
+]
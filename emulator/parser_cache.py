@@ -0,0 +1,86 @@
+from collections import Counter
+from collections.abc import Callable
+from typing import TypeVar
+
+from pydantic import BaseModel
+
+from emulator.memory import MemorySnapshot
+
+ParsedModel = TypeVar("ParsedModel", bound=BaseModel | list)
+
+
+class ParserCache:
+    """
+    Reuses parsed sub-models when the memory they were parsed from hasn't changed.
+
+    Each cached parser is keyed by the exact bytes that it reads, so a hit is guaranteed to produce
+    the same model that a fresh parse would. Only the most recent result of each parser is kept,
+    which is all that's needed for consecutive snapshots of a slowly-changing game state.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[bytes, object]] = {}
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    def get_or_parse(
+        self,
+        name: str,
+        mem: MemorySnapshot,
+        parse: Callable[[MemorySnapshot], ParsedModel],
+    ) -> ParsedModel:
+        """
+        Get the cached result of a parser, or run it if its source bytes have changed.
+
+        :param name: The name of the parser. Must be one of the keys of `_SOURCE_BYTE_GETTERS`.
+        :param mem: The memory snapshot to parse.
+        :param parse: The parser to run on a cache miss. Its output must be immutable.
+        :return: The parsed model.
+        """
+        key = _SOURCE_BYTE_GETTERS[name](mem)
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == key:
+            self.hits[name] += 1
+            return entry[1]  # type: ignore -- The parser name always maps to the same type.
+        self.misses[name] += 1
+        value = parse(mem)
+        self._entries[name] = (key, value)
+        return value
+
+    def __str__(self) -> str:
+        """Get a one-line summary of the hit rate of each parser."""
+        return ", ".join(
+            f"{name}: {self.hits[name]} hits / {self.misses[name]} misses"
+            for name in _SOURCE_BYTE_GETTERS
+        )
+
+
+def _get_party_bytes(mem: MemorySnapshot) -> bytes:
+    num_party = mem[0xD162]
+    return mem[0xD162 : 0xD16A + 0x2C * num_party] + mem[0xD2B4 : 0xD2B4 + 0xB * num_party]
+
+
+def _get_pc_bytes(mem: MemorySnapshot) -> bytes:
+    num_pc = mem[0xDA7F]
+    return mem[0xDA7F : 0xDA95 + 0x21 * num_pc] + mem[0xDE05 : 0xDE05 + 0xB * num_pc]
+
+
+def _get_inventory_bytes(mem: MemorySnapshot) -> bytes:
+    return mem[0xD31C : 0xD31D + 2 * mem[0xD31C]]
+
+
+def _get_map_bytes(mem: MemorySnapshot) -> bytes:
+    # Map ID, tileset, connections, size, and the walkable tiles that the tileset points to.
+    return (
+        bytes((mem[0xD3AB], mem[0xD3B4], mem[0xD3BE], mem[0xD3C9], mem[0xD3D4], mem[0xD3DF]))
+        + mem[0xD571:0xD573]
+        + mem.walkable_tiles
+    )
+
+
+_SOURCE_BYTE_GETTERS: dict[str, Callable[[MemorySnapshot], bytes]] = {
+    "party": _get_party_bytes,
+    "pc": _get_pc_bytes,
+    "inventory": _get_inventory_bytes,
+    "map": _get_map_bytes,
+}
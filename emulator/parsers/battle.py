@@ -1,7 +1,7 @@
-from pyboy import PyBoyMemoryView
 from pydantic import BaseModel, ConfigDict, Field
 
 from common.enums import BattleType
+from emulator.memory import MemorySnapshot
 from emulator.parsers.pokemon import (
     EnemyPokemon,
     Pokemon,
@@ -26,11 +26,11 @@ class Battle(BaseModel):
     model_config = ConfigDict(frozen=True)
 
 
-def parse_battle_state(mem: PyBoyMemoryView) -> Battle:
+def parse_battle_state(mem: MemorySnapshot) -> Battle:
     """
     Create a new battle state from a snapshot of the memory.
 
-    :param mem: The PyBoyMemoryView instance to create the battle state from.
+    :param mem: The memory snapshot to create the battle state from.
     :return: A new battle state.
     """
     is_battle_flag = mem[0xD057]
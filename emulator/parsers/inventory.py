@@ -1,7 +1,7 @@
-from pyboy import PyBoyMemoryView
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from common.enums import PokeballItem
+from emulator.memory import MemorySnapshot
 
 
 class InventoryItem(BaseModel):
@@ -10,14 +10,18 @@ class InventoryItem(BaseModel):
     name: str
     quantity: int
 
+    model_config = ConfigDict(frozen=True)
+
 
 class Inventory(BaseModel):
     """The items in the player's inventory."""
 
     items: list[InventoryItem]
 
+    model_config = ConfigDict(frozen=True)
+
 
-def parse_inventory(mem: PyBoyMemoryView) -> Inventory:
+def parse_inventory(mem: MemorySnapshot) -> Inventory:
     """Parse the inventory from the memory."""
     num_items = mem[0xD31C]
     base_address = 0xD31D
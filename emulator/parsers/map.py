@@ -1,9 +1,11 @@
+import functools
 from enum import IntEnum
 
-from pyboy import PyBoyMemoryView
+import numpy as np
 from pydantic import BaseModel, ConfigDict
 
 from common.enums import MapId
+from emulator.memory import MemorySnapshot
 
 
 class SpinnerTileIds(BaseModel):
@@ -46,14 +48,46 @@ class Map(BaseModel):
 
     model_config = ConfigDict(frozen=True)
 
+    @property
+    def walkable_tile_mask(self) -> np.ndarray:
+        """A boolean lookup table over all 256 tile IDs that is True for walkable tiles."""
+        return _get_walkable_tile_mask(tuple(self.walkable_tiles))
 
-def parse_map_state(mem: PyBoyMemoryView) -> Map:
+    @property
+    def collision_pair_matrix(self) -> np.ndarray:
+        """A symmetric 256x256 boolean lookup table that is True for each collision pair."""
+        return _get_collision_pair_matrix(tuple(self.collision_pairs))
+
+
+# The lookup tables are cached by their inputs rather than on the model, because pydantic compares
+# a model's `__dict__` for equality, and arrays in it can't be compared that way. There are only a
+# few distinct inputs, one per tileset. The tables are shared, so they're read-only.
+@functools.cache
+def _get_walkable_tile_mask(walkable_tiles: tuple[int, ...]) -> np.ndarray:
+    mask = np.zeros(0x100, dtype=bool)
+    mask[list(walkable_tiles)] = True
+    mask.setflags(write=False)
+    return mask
+
+
+@functools.cache
+def _get_collision_pair_matrix(collision_pairs: tuple[frozenset[int], ...]) -> np.ndarray:
+    matrix = np.zeros((0x100, 0x100), dtype=bool)
+    for pair in collision_pairs:
+        # Indexing from both ends also handles a pair of identical tiles, which is a singleton.
+        tiles = list(pair)
+        matrix[tiles[0], tiles[-1]] = matrix[tiles[-1], tiles[0]] = True
+    matrix.setflags(write=False)
+    return matrix
+
+
+def parse_map_state(mem: MemorySnapshot) -> Map:
     """
     Parse the current map from a snapshot of the memory.
 
     Tileset values all come from data/tilesets in the decompiled ROM.
 
-    :param mem: The PyBoyMemoryView instance to create the map from.
+    :param mem: The memory snapshot to create the map from.
     :return: A new map.
     """
     tileset_id = _Tileset(mem[0xD3B4])
@@ -75,17 +109,9 @@ def parse_map_state(mem: PyBoyMemoryView) -> Map:
     pressure_plate_tiles = (0x2B, 0x2C, 0x2D, 0x2E) if tileset_id == _Tileset.CAVERN else None
     pc_tiles = (0x42, 0x46, 0x52, 0x56) if tileset_id == _Tileset.POKECENTER else None
 
-    walkable_tile_ptr = mem[0xD57D] | (mem[0xD57E] << 8)
-    tile_bank, tile_offset = divmod(walkable_tile_ptr, 0x4000)
-
-    walkable_tiles = []
-    max_tiles = 0x180
+    # The walkable tiles live in ROM, so the snapshot reads them up front.
+    walkable_tiles = list(mem.walkable_tiles)
     terminator = 0xFF
-    for i in range(max_tiles):
-        tile = mem[tile_bank, tile_offset + i]
-        if tile == terminator:
-            break
-        walkable_tiles.append(tile)
 
     # This is a list of tile pairs that are considered to be colliding, even though both tiles are
     # walkable. It's used to represent elevation differences.
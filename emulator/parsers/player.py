@@ -1,8 +1,8 @@
-from pyboy import PyBoyMemoryView
 from pydantic import BaseModel, ConfigDict
 
 from common.enums import Badge, FacingDirection
 from common.schemas import Coords
+from emulator.memory import MemorySnapshot
 from emulator.parsers.utils import get_text_from_byte_array
 
 _BIKING_STATE = 1
@@ -27,11 +27,11 @@ class Player(BaseModel):
     model_config = ConfigDict(frozen=True)
 
 
-def parse_player(mem: PyBoyMemoryView) -> Player:
+def parse_player(mem: MemorySnapshot) -> Player:
     """
     Create a new player state from a snapshot of the memory.
 
-    :param mem: The PyBoyMemoryView instance to create the player state from.
+    :param mem: The memory snapshot to create the player state from.
     :return: A new player state.
     """
     name = get_text_from_byte_array(mem[0xD157 : 0xD157 + 0xB])
@@ -50,8 +50,8 @@ def parse_player(mem: PyBoyMemoryView) -> Player:
     play_time_seconds += (play_time_hours * 3600) + (play_time_minutes * 60)
 
     # Pokemon seen and caught are represented as one bit each in the following bytes.
-    pokedex_caught = sum(mem[i].bit_count() for i in range(0xD2F6, 0xD309))
-    pokedex_seen = sum(mem[i].bit_count() for i in range(0xD309, 0xD31C))
+    pokedex_caught = int.from_bytes(mem[0xD2F6:0xD309]).bit_count()
+    pokedex_seen = int.from_bytes(mem[0xD309:0xD31C]).bit_count()
 
     return Player(
         name=name,
@@ -68,11 +68,11 @@ def parse_player(mem: PyBoyMemoryView) -> Player:
     )
 
 
-def _read_money(mem: PyBoyMemoryView) -> int:
+def _read_money(mem: MemorySnapshot) -> int:
     """
     Read the player's money from the binary coded decimal format.
 
-    :param mem: The PyBoyMemoryView instance to read the money from.
+    :param mem: The memory snapshot to read the money from.
     :return: The player's money.
     """
     m1 = mem[0xD394]
@@ -88,7 +88,7 @@ def _read_money(mem: PyBoyMemoryView) -> int:
     )
 
 
-def _read_badges(mem: PyBoyMemoryView) -> list[Badge]:
+def _read_badges(mem: MemorySnapshot) -> list[Badge]:
     """Read the player's badges from the memory."""
     badge_byte = mem[0xD3A3]
     badges = []
@@ -98,7 +98,7 @@ def _read_badges(mem: PyBoyMemoryView) -> list[Badge]:
     return badges
 
 
-def _read_level_cap(mem: PyBoyMemoryView, num_badges: int) -> int:
+def _read_level_cap(mem: MemorySnapshot, num_badges: int) -> int:
     """Read the player's level cap from the memory."""
     champion_byte = mem[0xD745]
     if champion_byte:
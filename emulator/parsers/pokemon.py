@@ -1,8 +1,8 @@
 import math
 
-from pyboy import PyBoyMemoryView
 from pydantic import BaseModel, ConfigDict
 
+from emulator.memory import MemorySnapshot
 from emulator.parsers.utils import get_text_from_byte_array
 
 
@@ -40,7 +40,7 @@ class EnemyPokemon(BaseModel):
     status: str | None
 
 
-def parse_party_pokemon(mem: PyBoyMemoryView) -> list[Pokemon]:
+def parse_party_pokemon(mem: MemorySnapshot) -> list[Pokemon]:
     """Parse the player's pokemon from the memory."""
     party = []
     for i in range(mem[0xD162]):
@@ -50,7 +50,7 @@ def parse_party_pokemon(mem: PyBoyMemoryView) -> list[Pokemon]:
     return party
 
 
-def parse_pc_pokemon(mem: PyBoyMemoryView) -> list[Pokemon]:
+def parse_pc_pokemon(mem: MemorySnapshot) -> list[Pokemon]:
     """Parse the pokemon in the active PC box from the memory."""
     pc = []
     for i in range(mem[0xDA7F]):
@@ -60,7 +60,7 @@ def parse_pc_pokemon(mem: PyBoyMemoryView) -> list[Pokemon]:
     return pc
 
 
-def parse_player_battle_pokemon(mem: PyBoyMemoryView) -> Pokemon | None:
+def parse_player_battle_pokemon(mem: MemorySnapshot) -> Pokemon | None:
     """Parse the player's active battling pokemon from the memory."""
     species_id = mem[0xD013]
     if species_id == 0:
@@ -99,7 +99,7 @@ def parse_player_battle_pokemon(mem: PyBoyMemoryView) -> Pokemon | None:
     )
 
 
-def parse_enemy_battle_pokemon(mem: PyBoyMemoryView) -> EnemyPokemon | None:
+def parse_enemy_battle_pokemon(mem: MemorySnapshot) -> EnemyPokemon | None:
     """Parse the enemy's pokemon from the memory."""
     species_id = mem[0xCFE4]
     if species_id == 0:
@@ -122,7 +122,7 @@ def parse_enemy_battle_pokemon(mem: PyBoyMemoryView) -> EnemyPokemon | None:
     )
 
 
-def _parse_party_pokemon(mem: PyBoyMemoryView, index: int) -> Pokemon | None:
+def _parse_party_pokemon(mem: MemorySnapshot, index: int) -> Pokemon | None:
     """Parse a single party pokemon from the memory."""
     increment = index * 0x2C
     species_id = mem[0xD16A + increment]
@@ -162,7 +162,7 @@ def _parse_party_pokemon(mem: PyBoyMemoryView, index: int) -> Pokemon | None:
     )
 
 
-def _parse_pc_pokemon(mem: PyBoyMemoryView, index: int) -> Pokemon | None:
+def _parse_pc_pokemon(mem: MemorySnapshot, index: int) -> Pokemon | None:
     """Parse a single pokemon in the active PC box from the memory."""
     increment = index * 0x21
     species_id = mem[0xDA95 + increment]
@@ -1,7 +1,9 @@
-from pyboy import PyBoyMemoryView
+from functools import cached_property
+
 from pydantic import BaseModel, ConfigDict, computed_field
 
 from common.constants import PLAYER_OFFSET_X, PLAYER_OFFSET_Y, SCREEN_HEIGHT, SCREEN_WIDTH
+from emulator.memory import MemorySnapshot
 from emulator.parsers.utils import INT_TO_CHAR_MAP
 
 
@@ -17,10 +19,11 @@ class Screen(BaseModel):
     menu_item_index: int
     list_scroll_offset: int
 
+    # The screen is frozen, so the computed fields below are only worked out once per snapshot.
     model_config = ConfigDict(frozen=True)
 
     @computed_field
-    @property
+    @cached_property
     def is_dialog_box_on_screen(self) -> int:
         """Check if the dialog box is on the screen by checking for the correct border tiles."""
         top_left, top_right, bottom_left, bottom_right = 0x79, 0x7B, 0x7D, 0x7E
@@ -35,25 +38,28 @@ class Screen(BaseModel):
         )
 
     @computed_field
-    @property
+    @cached_property
     def text(self) -> str:
         """The tiles on screen converted to text if possible."""
         return "\n".join("".join(INT_TO_CHAR_MAP.get(t, " ") for t in row) for row in self.tiles)
 
     @computed_field
-    @property
-    def tiles_without_cursor(self) -> list[list[int]]:
-        """The tiles on screen without the blinking cursor."""
+    @cached_property
+    def tiles_without_cursor(self) -> tuple[tuple[int, ...], ...]:
+        """
+        The tiles on screen without the blinking cursor. A tuple, since the cached value is shared
+        by every caller.
+        """
         cursor = 0xEE
         blank = 0x7F
-        return [[t if t != cursor else blank for t in row] for row in self.tiles]
+        return tuple(tuple(t if t != cursor else blank for t in row) for row in self.tiles)
 
 
-def parse_screen(mem: PyBoyMemoryView) -> Screen:
+def parse_screen(mem: MemorySnapshot) -> Screen:
     """
     Create a new screen state from a snapshot of the memory.
 
-    :param mem: The PyBoyMemoryView instance to create the screen state from.
+    :param mem: The memory snapshot to create the screen state from.
     :return: A new screen state.
     """
     player_y = mem[0xD3AE]
@@ -67,7 +73,7 @@ def parse_screen(mem: PyBoyMemoryView) -> Screen:
     flat_tiles = mem[0xC3A0:0xC508]
     w = SCREEN_WIDTH * 2  # Convert blocks to 2x2 tiles.
     h = SCREEN_HEIGHT * 2
-    tiles = [[flat_tiles[i * w + j] for j in range(w)] for i in range(h)]
+    tiles = [list(flat_tiles[i * w : (i + 1) * w]) for i in range(h)]
 
     return Screen(
         top=top,
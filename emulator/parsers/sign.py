@@ -1,7 +1,7 @@
-from pyboy import PyBoyMemoryView
 from pydantic import BaseModel, ConfigDict
 
 from common.schemas import Coords
+from emulator.memory import MemorySnapshot
 
 
 class Sign(BaseModel):
@@ -13,11 +13,11 @@ class Sign(BaseModel):
     model_config = ConfigDict(frozen=True)
 
 
-def parse_signs(mem: PyBoyMemoryView) -> dict[int, Sign]:
+def parse_signs(mem: MemorySnapshot) -> dict[int, Sign]:
     """
     Parse the list of signs on the current map from a snapshot of the memory.
 
-    :param mem: The PyBoyMemoryView instance to create the signs from.
+    :param mem: The memory snapshot to create the signs from.
     :return: A dictionary of signs, keyed by index.
     """
     num_signs = mem[0xD4FD]
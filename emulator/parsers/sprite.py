@@ -1,8 +1,8 @@
-from pyboy import PyBoyMemoryView
 from pydantic import BaseModel, ConfigDict
 
 from common.enums import SpriteLabel
 from common.schemas import Coords
+from emulator.memory import MemorySnapshot
 
 _RANDOM_MOVEMENT = 0xFE
 _NOT_RENDERED = 0xFF
@@ -20,11 +20,11 @@ class Sprite(BaseModel):
     model_config = ConfigDict(frozen=True)
 
 
-def parse_sprites(mem: PyBoyMemoryView) -> dict[int, Sprite]:
+def parse_sprites(mem: MemorySnapshot) -> dict[int, Sprite]:
     """
     Parse the list of sprites on the current map from a snapshot of the memory.
 
-    :param mem: The PyBoyMemoryView instance to create the sprites from.
+    :param mem: The memory snapshot to create the sprites from.
     :return: A dictionary of normal sprites, keyed by index.
     """
     sprites = {}
@@ -44,11 +44,11 @@ def parse_sprites(mem: PyBoyMemoryView) -> dict[int, Sprite]:
     return sprites
 
 
-def parse_pikachu_sprite(mem: PyBoyMemoryView) -> Sprite:
+def parse_pikachu_sprite(mem: MemorySnapshot) -> Sprite:
     """
     Parse the pikachu sprite from a snapshot of the memory.
 
-    :param mem: The PyBoyMemoryView instance to create the pikachu sprite from.
+    :param mem: The memory snapshot to create the pikachu sprite from.
     :return: The pikachu sprite.
     """
     return Sprite(
@@ -94,14 +94,14 @@ INT_TO_CHAR_MAP = {
     0xFE: "8",
     0xFF: "9",
 }
-_NAME_TERMINATOR = 0x50
+_NAME_TERMINATOR = b"\x50"
+# Unknown bytes are dropped from names, so every byte needs an entry for `str.translate`.
+_NAME_TRANSLATION_TABLE = {i: INT_TO_CHAR_MAP.get(i, "") for i in range(0x100)}
 
 
-def get_text_from_byte_array(arr: list[int]) -> str:
+def get_text_from_byte_array(arr: bytes) -> str:
     """Get a name from a list of bytes."""
-    name_chars = []
-    for letter in arr:
-        if letter == _NAME_TERMINATOR:
-            break
-        name_chars.append(INT_TO_CHAR_MAP.get(letter, ""))
-    return "".join(name_chars).strip()
+    name, _, _ = arr.partition(_NAME_TERMINATOR)
+    # Latin-1 maps each byte to the code point with the same value, so the translation table can be
+    # keyed directly by the byte values.
+    return name.decode("latin-1").translate(_NAME_TRANSLATION_TABLE).strip()
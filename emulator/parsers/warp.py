@@ -1,8 +1,8 @@
-from pyboy import PyBoyMemoryView
 from pydantic import BaseModel, ConfigDict
 
 from common.enums import MapId, WarpType
 from common.schemas import Coords
+from emulator.memory import MemorySnapshot
 
 
 class Warp(BaseModel):
@@ -21,11 +21,11 @@ class Warp(BaseModel):
     model_config = ConfigDict(frozen=True)
 
 
-def parse_warps(mem: PyBoyMemoryView) -> dict[int, Warp]:
+def parse_warps(mem: MemorySnapshot) -> dict[int, Warp]:
     """
     Parse the list of warps on the current map from a snapshot of the memory.
 
-    :param mem: The PyBoyMemoryView instance to create the warps from.
+    :param mem: The memory snapshot to create the warps from.
     :return: A dictionary of warps, keyed by index.
     """
     num_warps = mem[0xD3FB]
@@ -0,0 +1,203 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import TypeVar
+
+from loguru import logger
+from pydantic import BaseModel, ConfigDict
+
+CommandResult = TypeVar("CommandResult")
+
+# The Game Boy runs at about 59.73 frames per second.
+GAME_BOY_FPS = 59.73
+
+# The number of recent frames to measure the emulated frame rate over.
+_FPS_WINDOW = 120
+
+
+class FrameStats(BaseModel):
+    """A snapshot of how well the emulator is keeping up with real time."""
+
+    frames: int
+    dropped_frames: int  # Frames that ran more than a frame late, e.g. because the host stalled.
+    fps: float  # The emulated frame rate over the last couple of seconds.
+
+    model_config = ConfigDict(frozen=True)
+
+    def __str__(self) -> str:
+        """Get a one-line summary of the frame stats."""
+        return f"{self.fps:.1f} fps, {self.frames} frames, {self.dropped_frames} dropped"
+
+
+class EmulatorRunner:
+    """
+    Runs the emulator on its own OS thread, so that emulation keeps pace with real time however busy
+    the event loop is.
+
+    Every frame is ticked against a fixed clock, unless it's running as fast as possible, and
+    anything else that needs the emulator, like a button press or a save state, is queued as a
+    command and run on the emulator thread between two frames. Commands are awaited from the event
+    loop. Synchronous reads from other threads should hold `lock`, which is held for each frame and
+    each command, so that they never see a half emulated frame.
+    """
+
+    def __init__(
+        self,
+        tick: Callable[[], bool],
+        on_exit: Callable[[], None],
+        fps: float | None = GAME_BOY_FPS,
+    ) -> None:
+        """
+        Initialize the runner.
+
+        :param tick: Emulates a single frame, and returns whether the game is still running.
+        :param on_exit: Called on the emulator thread once it has stopped ticking.
+        :param fps: The frame rate to pace the emulator to, or `None` to run as fast as possible.
+        """
+        self.lock = threading.Lock()
+        self._tick = tick
+        self._on_exit = on_exit
+        self._frame_seconds = 1 / fps if fps else None
+        self._commands: queue.SimpleQueue[tuple[Callable[[], object], Future]] = queue.SimpleQueue()
+        self._commands_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._is_running = False
+        self._thread: threading.Thread | None = None
+        self._frame_waits: list[tuple[int, Future]] = []
+        self._frames = 0
+        self._dropped_frames = 0
+        self._frame_times: deque[float] = deque(maxlen=_FPS_WINDOW)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the emulator thread is running."""
+        return self._is_running
+
+    def start(self) -> None:
+        """Start ticking the emulator on its own thread."""
+        if self._thread:
+            raise RuntimeError("The emulator thread has already been started.")
+        self._is_running = True
+        self._thread = threading.Thread(target=self._run, name="emulator", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the emulator thread, and wait for it to finish its current frame."""
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    async def submit(self, command: Callable[[], CommandResult]) -> CommandResult:
+        """
+        Run a command on the emulator thread between two frames.
+
+        :param command: The command to run.
+        :return: The result of the command.
+        """
+        future: Future[CommandResult] = Future()
+        with self._commands_lock:
+            if not self._is_running:
+                raise RuntimeError("Emulator is stopped.")
+            self._commands.put((command, future))
+        return await asyncio.wrap_future(future)
+
+    async def wait_frames(self, frames: int) -> None:
+        """
+        Wait until the emulator has run for a number of frames, however fast it's running.
+
+        :param frames: The number of frames to wait for.
+        """
+        future: Future[None] = Future()
+        with self._commands_lock:
+            if not self._is_running:
+                raise RuntimeError("Emulator is stopped.")
+            self._frame_waits.append((self._frames + frames, future))
+        await asyncio.wrap_future(future)
+
+    def get_stats(self) -> FrameStats:
+        """Get a snapshot of the frame stats."""
+        frame_times = list(self._frame_times)
+        fps = 0.0
+        if len(frame_times) > 1 and frame_times[-1] > frame_times[0]:
+            fps = (len(frame_times) - 1) / (frame_times[-1] - frame_times[0])
+        return FrameStats(frames=self._frames, dropped_frames=self._dropped_frames, fps=fps)
+
+    def _run(self) -> None:
+        """Tick the emulator and run commands until stopped."""
+        next_frame = time.perf_counter()
+        try:
+            while not self._stop_event.is_set():
+                self._run_commands()
+                with self.lock:
+                    if not self._tick():
+                        break
+                now = time.perf_counter()
+                self._frames += 1
+                self._frame_times.append(now)
+                if self._frame_waits:
+                    self._finish_frame_waits()
+
+                if self._frame_seconds is None:
+                    # Nothing to pace against, but give other threads a chance to take the lock.
+                    time.sleep(0)
+                    continue
+                next_frame += self._frame_seconds
+                delay = next_frame - now
+                if delay > 0:
+                    self._stop_event.wait(delay)
+                elif -delay > self._frame_seconds:
+                    # Don't try to catch up by running frames back to back, since that would speed
+                    # up the game for the player. Count the frames as dropped and start afresh.
+                    self._dropped_frames += int(-delay / self._frame_seconds)
+                    next_frame = now
+        except Exception:  # noqa: BLE001
+            logger.exception("The emulator thread crashed.")
+        finally:
+            with self._commands_lock:
+                self._is_running = False
+            self._fail_commands()
+            self._on_exit()
+
+    def _run_commands(self) -> None:
+        """Run every queued command, passing their results back to whoever is awaiting them."""
+        while True:
+            try:
+                command, future = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                with self.lock:
+                    result = command()
+            except Exception as e:  # noqa: BLE001
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def _finish_frame_waits(self) -> None:
+        """Resolve every frame wait that has reached its frame."""
+        with self._commands_lock:
+            finished = [future for frame, future in self._frame_waits if frame <= self._frames]
+            self._frame_waits = [(f, future) for f, future in self._frame_waits if f > self._frames]
+        for future in finished:
+            if future.set_running_or_notify_cancel():
+                future.set_result(None)
+
+    def _fail_commands(self) -> None:
+        """Fail every command and frame wait that was queued after the last frame."""
+        with self._commands_lock:
+            futures = [future for _, future in self._frame_waits]
+            self._frame_waits = []
+        while True:
+            try:
+                futures.append(self._commands.get_nowait()[1])
+            except queue.Empty:
+                break
+        for future in futures:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError("Emulator is stopped."))
@@ -0,0 +1,52 @@
+from collections import deque
+
+# Each save state is a couple of hundred KB, so only the most recent few are kept in memory.
+_MAX_SAVE_STATES = 8
+
+
+class SaveStateHistory:
+    """
+    A bounded ring buffer of the most recent raw save states, along with how big they were and how
+    long they took to capture.
+    """
+
+    def __init__(self, max_states: int = _MAX_SAVE_STATES) -> None:
+        """
+        Initialize the history.
+
+        :param max_states: The number of save states to keep.
+        """
+        self._states: deque[bytes] = deque(maxlen=max_states)
+        self.captures = 0
+        self.total_bytes = 0
+        self.total_seconds = 0.0
+
+    @property
+    def latest(self) -> bytes | None:
+        """The most recent save state, if any have been captured."""
+        return self._states[-1] if self._states else None
+
+    def add(self, save_state: bytes, seconds: float) -> None:
+        """
+        Add a newly captured save state.
+
+        :param save_state: The raw save state.
+        :param seconds: How long it took to capture, from being requested to being available.
+        """
+        self._states.append(save_state)
+        self.captures += 1
+        self.total_bytes += len(save_state)
+        self.total_seconds += seconds
+
+    def __len__(self) -> int:
+        """Get the number of save states currently kept."""
+        return len(self._states)
+
+    def __str__(self) -> str:
+        """Get a one-line summary of the size and latency of the captures."""
+        if not self.captures:
+            return "no captures"
+        return (
+            f"{self.captures} captures, {self.total_bytes / self.captures / 1024:.1f} KB and"
+            f" {self.total_seconds / self.captures * 1e3:.2f} ms per capture"
+        )
@@ -0,0 +1,37 @@
+import io
+from functools import cached_property
+
+import numpy as np
+from PIL import Image
+
+
+class Screenshot:
+    """
+    An immutable copy of the game screen at a given frame.
+
+    The pixels are copied once, and the Pillow image and the PNG encoding are only made when they
+    are first needed, then shared by everything that uses this screenshot.
+    """
+
+    def __init__(self, frame: int, pixels: np.ndarray) -> None:
+        """
+        Initialize the screenshot.
+
+        :param frame: The rendered frame that the screenshot was taken on.
+        :param pixels: The pixels of the screen. Copied, so the caller can reuse its buffer.
+        """
+        self.frame = frame
+        self.pixels = pixels.copy()
+        self.pixels.flags.writeable = False
+
+    @cached_property
+    def image(self) -> Image.Image:
+        """The screenshot as a Pillow image, which shares the read-only pixel buffer."""
+        return Image.fromarray(self.pixels)
+
+    @cached_property
+    def png(self) -> bytes:
+        """The screenshot encoded as a PNG, ready to send to the LLM without re-encoding."""
+        with io.BytesIO() as f:
+            self.image.save(f, format="PNG")
+            return f.getvalue()
@@ -6,13 +6,19 @@ because if we ever need to change the characters used, we'll have to update the
 far more readable.
 """
 
+from collections import defaultdict
 from pathlib import Path
 
+import numpy as np
 import pytest
 
-from common.enums import BlockedDirection
+from common.constants import SCREEN_SHAPE
+from common.enums import AsciiTile, BlockedDirection
 from common.schemas import Coords
 from emulator.emulator import YellowLegacyEmulator
+from emulator.game_state import YellowLegacyGameState
+
+_SAVE_FILES = sorted((Path(__file__).parent / "saves").glob("*.state"))
 
 
 @pytest.mark.integration
@@ -332,6 +338,25 @@ async def test_get_ascii_screen_victory_road_pressure_plate() -> None:
     )
 
 
+@pytest.mark.integration
+@pytest.mark.parametrize("save_file", _SAVE_FILES, ids=lambda p: p.stem)
+async def test_background_blocks_match_reference(save_file: Path) -> None:
+    """Test that the vectorized block classification matches a block-by-block scan."""
+    async with YellowLegacyEmulator(
+        save_state_path=save_file,
+        mute_sound=True,
+        headless=True,
+        speed=0,
+    ) as emulator:
+        game_state = emulator.get_game_state()
+
+    blocks, blockages = game_state._get_background_blocks()
+    expected_blocks, expected_blockages = _get_reference_background_blocks(game_state)
+
+    assert blocks.tolist() == expected_blocks.tolist()
+    assert list(blockages.items()) == list(expected_blockages.items())
+
+
 @pytest.mark.integration
 async def _helper_test_expected_screen(
     state_filename: str,
@@ -350,6 +375,7 @@ async def _helper_test_expected_screen(
         save_state_path=save_file,
         mute_sound=True,
         headless=True,
+        speed=0,
     ) as emulator:
         game_state = emulator.get_game_state()
 
@@ -357,3 +383,64 @@ async def _helper_test_expected_screen(
 
     assert str(screen).split("\n") == expected_screen
     assert screen.blockages == expected_blockages
+
+
+def _get_reference_background_blocks(  # noqa: PLR0912
+    game_state: YellowLegacyGameState,
+) -> tuple[np.ndarray, dict[Coords, BlockedDirection]]:
+    """The original block-by-block implementation of `_get_background_blocks`, kept for parity."""
+    game_map = game_state.map
+    tiles = np.array(game_state.screen.tiles)
+    blocks = np.full(SCREEN_SHAPE, AsciiTile.WALL, dtype=AsciiTile)
+    blockages: defaultdict[Coords, BlockedDirection] = defaultdict(lambda: BlockedDirection(0))
+
+    for i in range(0, tiles.shape[0], 2):
+        for j in range(0, tiles.shape[1], 2):
+            b = tiles[i : i + 2, j : j + 2]
+            b_flat = tuple(b.flatten().tolist())
+            b_idx = (i // 2, j // 2)
+            top, bottom = tuple(b[0, :].tolist()), tuple(b[1, :].tolist())
+            left, right = tuple(b[:, 0].tolist()), tuple(b[:, 1].tolist())
+            spinners = game_map.spinner_tiles
+
+            if game_map.water_tile and np.isin(b, game_map.water_tile).any():
+                blocks[b_idx] = AsciiTile.WATER
+            elif left in game_map.ledge_tiles_down or right in game_map.ledge_tiles_down:
+                blocks[b_idx] = AsciiTile.LEDGE_DOWN
+            elif top in game_map.ledge_tiles_left or bottom in game_map.ledge_tiles_left:
+                blocks[b_idx] = AsciiTile.LEDGE_LEFT
+            elif top in game_map.ledge_tiles_right or bottom in game_map.ledge_tiles_right:
+                blocks[b_idx] = AsciiTile.LEDGE_RIGHT
+            elif game_map.grass_tile and b[1, 0] == game_map.grass_tile:
+                blocks[b_idx] = AsciiTile.GRASS
+            elif game_map.cut_tree_tiles and b_flat == game_map.cut_tree_tiles:
+                blocks[b_idx] = AsciiTile.CUT_TREE
+            elif game_map.boulder_hole_tiles and b_flat == game_map.boulder_hole_tiles:
+                blocks[b_idx] = AsciiTile.BOULDER_HOLE
+            elif game_map.pressure_plate_tiles and b_flat == game_map.pressure_plate_tiles:
+                blocks[b_idx] = AsciiTile.PRESSURE_PLATE
+            elif game_map.pc_tiles and b_flat == game_map.pc_tiles:
+                blocks[b_idx] = AsciiTile.PC_TILE
+            elif spinners and b_flat == spinners.up:
+                blocks[b_idx] = AsciiTile.SPINNER_UP
+            elif spinners and b_flat == spinners.down:
+                blocks[b_idx] = AsciiTile.SPINNER_DOWN
+            elif spinners and b_flat == spinners.left:
+                blocks[b_idx] = AsciiTile.SPINNER_LEFT
+            elif spinners and b_flat == spinners.right:
+                blocks[b_idx] = AsciiTile.SPINNER_RIGHT
+            elif spinners and b_flat == spinners.stop:
+                blocks[b_idx] = AsciiTile.SPINNER_STOP
+            elif b[1, 0] in game_map.walkable_tiles:
+                blocks[b_idx] = AsciiTile.FREE
+
+            bi, bj = b_idx
+            block_tile = tiles[i + 1, j]
+            if i - 2 >= 0 and {block_tile, tiles[i - 1, j]} in game_map.collision_pairs:
+                blockages[Coords(row=bi, col=bj)] |= BlockedDirection.UP
+                blockages[Coords(row=bi - 1, col=bj)] |= BlockedDirection.DOWN
+            if j - 2 >= 0 and {tiles[i + 1, j - 2], block_tile} in game_map.collision_pairs:
+                blockages[Coords(row=bi, col=bj)] |= BlockedDirection.LEFT
+                blockages[Coords(row=bi, col=bj - 1)] |= BlockedDirection.RIGHT
+
+    return np.array(blocks), dict(blockages)
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+import pytest
+
+from emulator.emulator import YellowLegacyEmulator
+from emulator.memory import MemorySnapshot, _get_regions
+
+_SAVE_FILES = sorted((Path(__file__).parent / "saves").glob("*.state"))
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("save_file", _SAVE_FILES, ids=lambda p: p.stem)
+async def test_memory_snapshot_matches_live_memory(save_file: Path) -> None:
+    """Test that the snapshot holds the same bytes as the live memory for every copied region."""
+    async with YellowLegacyEmulator(
+        save_state_path=save_file,
+        mute_sound=True,
+        headless=True,
+        speed=0,
+    ) as emulator:
+        mem = emulator._pyboy.memory
+        snapshot = MemorySnapshot.from_memory(mem)
+
+        for start, stop in _get_regions(mem):
+            for addr in range(start, stop):
+                assert snapshot[addr] == mem[addr], hex(addr)
+
+        walkable_tile_ptr = mem[0xD57D] | (mem[0xD57E] << 8)
+        tile_bank, tile_offset = divmod(walkable_tile_ptr, 0x4000)
+        expected_walkable_tiles = []
+        for i in range(0x180):
+            tile = mem[tile_bank, tile_offset + i]
+            if tile == 0xFF:  # noqa: PLR2004
+                break
+            expected_walkable_tiles.append(tile)
+        assert list(snapshot.walkable_tiles) == expected_walkable_tiles
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from emulator.animation import AnimationWait, AnimationWatcher
+
+_WAIT = AnimationWait(name="test", check_interval_frames=2, stable_frames=10, timeout_frames=100)
+
+
+@pytest.mark.unit
+async def test_wait_resolves_once_screen_is_stable() -> None:
+    """Test that a wait only resolves after the screen has stopped changing for long enough."""
+    watcher = AnimationWatcher()
+    frame = 0
+
+    def read_screen() -> bytes:
+        return bytes([min(frame, 21)])  # The screen stops changing after frame 21.
+
+    wait_task = asyncio.create_task(watcher.wait(_WAIT))
+    await asyncio.sleep(0)  # Let the wait register itself.
+    while not wait_task.done():
+        frame += 1
+        watcher.on_frame(read_screen)
+        await asyncio.sleep(0)
+
+    await wait_task
+    # The change is first seen on frame 22, then the screen has to stay still for 10 frames.
+    assert [r.frames for r in watcher.records] == [32]
+    assert not watcher.records[0].timed_out
+    assert watcher.total_waits["test"] == 1
+
+
+@pytest.mark.unit
+async def test_wait_times_out_on_a_screen_that_never_settles() -> None:
+    """Test that a flickering screen doesn't block forever."""
+    watcher = AnimationWatcher()
+    frame = 0
+
+    def read_screen() -> bytes:
+        return frame.to_bytes(2)
+
+    wait_task = asyncio.create_task(watcher.wait(_WAIT))
+    await asyncio.sleep(0)
+    while not wait_task.done():
+        frame += 1
+        watcher.on_frame(read_screen)
+        await asyncio.sleep(0)
+
+    assert [(r.frames, r.timed_out) for r in watcher.records] == [(100, True)]
+
+
+@pytest.mark.unit
+async def test_cancel_all_releases_pending_waits() -> None:
+    """Test that stopping the emulator doesn't leave anything waiting forever."""
+    watcher = AnimationWatcher()
+    wait_task = asyncio.create_task(watcher.wait(_WAIT))
+    await asyncio.sleep(0)
+    watcher.cancel_all()
+    await asyncio.wait_for(wait_task, timeout=1)
+    assert [r.frames for r in watcher.records] == [0]
@@ -0,0 +1,70 @@
+import pytest
+
+from common.enums import Button
+from emulator.animation import AnimationWait
+from emulator.game_state import YellowLegacyGameState
+from emulator.input_sequence import InputSequence, is_walk_interrupted
+from emulator.memory import MemorySnapshot
+
+
+@pytest.mark.unit
+async def test_walk_stops_as_soon_as_player_stops_moving() -> None:
+    """Test that a walk stops early, without pressing the rest of its buttons."""
+    presses: list[tuple[Button, int]] = []
+    sequence = InputSequence(
+        [Button.RIGHT] * 4,
+        hold_frames=2,
+        settle=3,
+        stop_condition=is_walk_interrupted,
+    )
+    sequence.start(_get_game_state(col=0))
+
+    def read_game_state() -> YellowLegacyGameState:
+        return _get_game_state(col=min(len(presses), 2))  # The player is blocked after 2 steps.
+
+    frames = 0
+    is_finished = False
+    while not is_finished:
+        frames += 1
+        sequence.before_frame(lambda button, hold: presses.append((button, hold)))
+        is_finished = sequence.after_frame(lambda: b"", read_game_state)
+
+    result = await sequence.result
+    assert presses == [(Button.RIGHT, 2)] * 3
+    assert [s.player.coords.col for s in result.game_states] == [1, 2, 2]
+    assert result.is_stopped_early
+    assert frames == 3 * (2 + 3)
+
+
+@pytest.mark.unit
+async def test_step_settles_once_screen_is_stable() -> None:
+    """Test that a step waits for the screen to stop changing after the button is released."""
+    settle = AnimationWait(name="test", check_interval_frames=1, stable_frames=5, timeout_frames=50)
+    sequence = InputSequence([Button.A], hold_frames=2, settle=settle, stop_condition=None)
+    sequence.start(_get_game_state(col=0))
+
+    frames = 0
+
+    def read_screen() -> bytes:
+        return bytes([min(frames, 10)])  # The screen stops changing after frame 10.
+
+    is_finished = False
+    while not is_finished:
+        frames += 1
+        sequence.before_frame(lambda _button, _hold: None)
+        is_finished = sequence.after_frame(read_screen, lambda: _get_game_state(col=0))
+
+    result = await sequence.result
+    assert not result.is_stopped_early
+    assert len(result.game_states) == 1
+    assert frames == 10 + 5
+
+
+def _get_game_state(col: int) -> YellowLegacyGameState:
+    buffer = bytearray(0x10000)
+    for addr in (0xD3BE, 0xD3C9, 0xD3D4, 0xD3DF):  # No map connections.
+        buffer[addr] = 0xFF
+    buffer[0xD3AF] = col
+    snapshot = MemorySnapshot(buffer)
+    snapshot.walkable_tiles = b""
+    return YellowLegacyGameState.from_snapshot(snapshot)
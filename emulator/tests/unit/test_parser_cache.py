@@ -0,0 +1,66 @@
+import pytest
+
+from emulator.memory import MemorySnapshot
+from emulator.parser_cache import ParserCache
+from emulator.parsers.inventory import parse_inventory
+from emulator.parsers.map import parse_map_state
+
+
+@pytest.mark.unit
+def test_parser_cache_reuses_model_until_source_bytes_change() -> None:
+    """Test that a parser is only re-run when the bytes it reads have changed."""
+    cache = ParserCache()
+    buffer = _get_empty_memory()
+    buffer[0xD31C] = 1  # One item in the bag.
+    buffer[0xD31D] = 0x04  # Poke Ball.
+    buffer[0xD31E] = 5
+
+    first = cache.get_or_parse("inventory", _to_snapshot(buffer), parse_inventory)
+    buffer[0xD3AE] += 1  # The player moving should not invalidate the inventory.
+    second = cache.get_or_parse("inventory", _to_snapshot(buffer), parse_inventory)
+    assert second is first
+    assert cache.hits["inventory"] == 1
+    assert cache.misses["inventory"] == 1
+
+    buffer[0xD31E] = 4  # Threw a Poke Ball.
+    third = cache.get_or_parse("inventory", _to_snapshot(buffer), parse_inventory)
+    assert third is not first
+    assert third.items[0].quantity == 4  # noqa: PLR2004
+    assert cache.misses["inventory"] == 2  # noqa: PLR2004
+
+
+@pytest.mark.unit
+def test_parser_cache_keys_map_on_walkable_tiles() -> None:
+    """Test that the map is re-parsed when only the walkable tiles in ROM differ."""
+    cache = ParserCache()
+    buffer = _get_empty_memory()
+
+    first = cache.get_or_parse("map", _to_snapshot(buffer, b"\x01"), parse_map_state)
+    second = cache.get_or_parse("map", _to_snapshot(buffer, b"\x01\x02"), parse_map_state)
+    assert second is not first
+    assert second.walkable_tiles == [1, 2]
+    assert cache.hits["map"] == 0
+
+
+@pytest.mark.unit
+def test_maps_with_lookup_tables_can_be_compared() -> None:
+    """Test that equal maps stay equal once their lookup tables have been computed."""
+    first = parse_map_state(_to_snapshot(_get_empty_memory(), b"\x01"))
+    second = parse_map_state(_to_snapshot(_get_empty_memory(), b"\x01"))
+    for map_state in (first, second):
+        assert map_state.walkable_tile_mask[1]
+        assert not map_state.collision_pair_matrix.any()
+    assert first == second
+
+
+def _get_empty_memory() -> bytearray:
+    buffer = bytearray(0x10000)
+    for addr in (0xD3BE, 0xD3C9, 0xD3D4, 0xD3DF):  # No map connections.
+        buffer[addr] = 0xFF
+    return buffer
+
+
+def _to_snapshot(buffer: bytearray, walkable_tiles: bytes = b"") -> MemorySnapshot:
+    snapshot = MemorySnapshot(buffer)
+    snapshot.walkable_tiles = walkable_tiles
+    return snapshot
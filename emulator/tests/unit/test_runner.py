@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from emulator.runner import EmulatorRunner
+
+
+@pytest.mark.unit
+async def test_runner_keeps_ticking_while_event_loop_is_blocked() -> None:
+    """Test that frames keep being emulated while the event loop is busy, and commands still run."""
+    ticks = []
+
+    def tick() -> bool:
+        ticks.append(time.perf_counter())
+        return True
+
+    exited = threading.Event()
+    runner = EmulatorRunner(tick, on_exit=exited.set, fps=200)
+    runner.start()
+    try:
+        # Block the event loop, like a slow synchronous call would.
+        time.sleep(0.2)  # noqa: ASYNC251
+        assert len(ticks) > 20  # noqa: PLR2004
+
+        thread_name = await runner.submit(lambda: threading.current_thread().name)
+        assert thread_name == "emulator"
+        with pytest.raises(ValueError, match="bad command"):
+            await runner.submit(lambda: int("bad command"))
+    finally:
+        runner.stop()
+
+    assert exited.is_set()
+    assert runner.get_stats().frames == len(ticks)
+    with pytest.raises(RuntimeError, match="stopped"):
+        await runner.submit(lambda: None)
+
+
+@pytest.mark.unit
+async def test_runner_stops_when_game_exits() -> None:
+    """Test that the runner stops on its own once the game stops running."""
+    exited = threading.Event()
+    runner = EmulatorRunner(lambda: False, on_exit=exited.set)
+    runner.start()
+    await asyncio.to_thread(exited.wait, 1)
+    assert not runner.is_running
+    with pytest.raises(RuntimeError, match="stopped"):
+        await runner.submit(lambda: None)
+
+
+@pytest.mark.unit
+async def test_wait_frames_counts_frames_at_unlimited_speed() -> None:
+    """Test that frame waits resolve on emulated frames, without pacing to real time."""
+    runner = EmulatorRunner(lambda: True, on_exit=lambda: None, fps=None)
+    runner.start()
+    try:
+        start = runner.get_stats().frames
+        await asyncio.wait_for(runner.wait_frames(600), timeout=5)  # 10 seconds of game time.
+        assert runner.get_stats().frames >= start + 600
+    finally:
+        runner.stop()
@@ -0,0 +1,18 @@
+import pytest
+
+from emulator.save_state_history import SaveStateHistory
+
+
+@pytest.mark.unit
+def test_history_keeps_only_the_latest_states() -> None:
+    """Test that the history is bounded, while the stats cover every capture."""
+    history = SaveStateHistory(max_states=2)
+    assert history.latest is None
+    assert str(history) == "no captures"
+
+    for i in range(3):
+        history.add(bytes([i]) * 1024, seconds=0.002)
+
+    assert len(history) == 2  # noqa: PLR2004
+    assert history.latest == b"\x02" * 1024
+    assert str(history) == "3 captures, 1.0 KB and 2.00 ms per capture"
@@ -0,0 +1,23 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from emulator.screenshot import Screenshot
+
+
+@pytest.mark.unit
+def test_screenshot_is_an_immutable_copy() -> None:
+    """Test that the screenshot doesn't change with the emulator's buffer, and can't be changed."""
+    buffer = np.zeros((144, 160, 4), dtype=np.uint8)
+    screenshot = Screenshot(frame=1, pixels=buffer)
+    buffer[:] = 255
+    assert not screenshot.pixels.any()
+    with pytest.raises(ValueError, match="read-only"):
+        screenshot.pixels[0, 0, 0] = 1
+
+    decoded = Image.open(io.BytesIO(screenshot.png))
+    assert decoded.size == (160, 144)
+    assert np.array_equal(np.asarray(decoded), screenshot.pixels)
+    assert screenshot.png is screenshot.png  # Only encoded once.
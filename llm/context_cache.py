@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
+from datetime import UTC, datetime, timedelta
+
+from google import genai
+from google.genai.errors import APIError
+from google.genai.types import CreateCachedContentConfig, UpdateCachedContentConfig
+from loguru import logger
+
+_TTL = timedelta(minutes=10)
+# A cache this close to expiring has its TTL extended before it's used, so it can't expire while a
+# request that uses it is in flight.
+_MIN_REMAINING_TTL = timedelta(minutes=2)
+_MAX_CACHES = 4
+_BAD_REQUEST = 400
+
+
+class _CachedPrefix:
+    """A context cache on the Gemini side, and when it expires."""
+
+    def __init__(self, name: str, expires_at: datetime) -> None:
+        self.name = name
+        self.expires_at = expires_at
+
+
+class ContextCache:
+    """
+    Explicit Gemini context caches of the stable prefixes of prompts, for one model.
+
+    The system prompt and the prompt prefix (the summary memory, long-term memory and goals) only
+    change every few iterations, but are sent with every request. Caching them means the tokens are
+    only processed once, and billed at the cached rate after that. The caches are kept alive by
+    extending their TTL while they're in use, and the least recently used ones are deleted once
+    there are more than `max_caches`, since the prefix they hold is outdated.
+
+    A prefix that can't be cached, e.g. because it's shorter than the minimum cache size, is
+    remembered so that it isn't retried, and the caller falls back to sending it uncached.
+    """
+
+    def __init__(
+        self,
+        client: genai.Client,
+        model_id: str,
+        *,
+        ttl: timedelta = _TTL,
+        max_caches: int = _MAX_CACHES,
+    ) -> None:
+        """
+        Initialize the context cache.
+
+        :param client: The Gemini client, or anything with the same `aio.caches`.
+        :param model_id: The model that the caches are for.
+        :param ttl: How long a cache lives after it's created or last extended.
+        :param max_caches: The number of caches to keep alive at once.
+        """
+        self.client = client
+        self.model_id = model_id
+        self.ttl = ttl
+        self.max_caches = max_caches
+        self.hits = 0
+        self.creations = 0
+        self._caches: OrderedDict[str, _CachedPrefix] = OrderedDict()
+        self._uncacheable: set[str] = set()
+        self._lock = asyncio.Lock()  # So that concurrent requests don't create the same cache.
+
+    async def get(self, system_prompt: str, prompt_prefix: str) -> str | None:
+        """
+        Get the name of a cache holding a system prompt and prompt prefix, creating it if needed.
+
+        :param system_prompt: The system prompt to cache.
+        :param prompt_prefix: The start of the prompt to cache.
+        :return: The name of the cache, or None if it can't be cached.
+        """
+        key = _get_key(system_prompt, prompt_prefix)
+        if key in self._uncacheable:
+            return None
+
+        async with self._lock:
+            cached = self._caches.get(key)
+            now = datetime.now(UTC)
+            if cached is not None and cached.expires_at - now < _MIN_REMAINING_TTL:
+                try:
+                    await self.client.aio.caches.update(
+                        name=cached.name,
+                        config=UpdateCachedContentConfig(ttl=_to_duration(self.ttl)),
+                    )
+                    cached.expires_at = now + self.ttl
+                except APIError as e:
+                    logger.warning(f"Failed to extend context cache {cached.name}. {e}")
+                    del self._caches[key]
+                    cached = None
+
+            if cached is None:
+                try:
+                    cached = await self._create(system_prompt, prompt_prefix)
+                except APIError as e:
+                    logger.warning(f"Failed to cache a prompt prefix. Sending it uncached. {e}")
+                    if e.code == _BAD_REQUEST:  # e.g. too short to cache, so don't try again.
+                        self._uncacheable.add(key)
+                    return None
+                self._caches[key] = cached
+            else:
+                self.hits += 1
+            self._caches.move_to_end(key)
+            await self._evict()
+            return cached.name
+
+    def invalidate(self, name: str) -> None:
+        """
+        Forget a cache that couldn't be used, e.g. because it expired early, so it's recreated.
+
+        :param name: The name of the cache.
+        """
+        for key, cached in list(self._caches.items()):
+            if cached.name == name:
+                del self._caches[key]
+
+    async def _create(self, system_prompt: str, prompt_prefix: str) -> _CachedPrefix:
+        """Create a cache holding a system prompt and prompt prefix."""
+        cache = await self.client.aio.caches.create(
+            model=self.model_id,
+            config=CreateCachedContentConfig(
+                system_instruction=system_prompt,
+                contents=[prompt_prefix],
+                ttl=_to_duration(self.ttl),
+            ),
+        )
+        if not cache.name:
+            raise ValueError("No cache name from Gemini.")
+        self.creations += 1
+        return _CachedPrefix(
+            name=cache.name,
+            expires_at=cache.expire_time or datetime.now(UTC) + self.ttl,
+        )
+
+    async def _evict(self) -> None:
+        """Delete the least recently used caches, so we don't pay to store outdated prefixes."""
+        while len(self._caches) > self.max_caches:
+            _, cached = self._caches.popitem(last=False)
+            try:
+                await self.client.aio.caches.delete(name=cached.name)
+            except APIError as e:
+                logger.warning(f"Failed to delete context cache {cached.name}. {e}")
+
+    def __str__(self) -> str:
+        """Get a one-line summary of the cache usage."""
+        return f"{self.hits} hits, {self.creations} caches created"
+
+
+def _get_key(system_prompt: str, prompt_prefix: str) -> str:
+    """Get a hash of everything that's cached."""
+    return hashlib.sha256(f"{system_prompt}\0{prompt_prefix}".encode()).hexdigest()
+
+
+def _to_duration(ttl: timedelta) -> str:
+    """Format a TTL the way the Gemini API expects it."""
+    return f"{int(ttl.total_seconds())}s"
@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+from PIL.Image import Image
+from pydantic import BaseModel
+
+from database.llm_response_cache.repository import (
+    create_cached_llm_response,
+    get_cached_llm_response,
+)
+from llm.schemas import LLMMessage
+
+_MAX_MEMORY_CACHE_SIZE = 256
+_MAX_DB_CACHE_SIZE = 10_000
+
+# The prompts whose responses are worth reusing, and for how long. Only prompts that are asked the
+# same question about the same screen more than once, and whose answer doesn't depend on the rest
+# of the agent's state, belong here. They pass a cache key of the inputs that the answer depends
+# on, since their prompts also include the agent's state, which changes every iteration.
+CACHEABLE_PROMPTS = {
+    "update_sprites": timedelta(days=1),
+    "update_signs": timedelta(days=1),
+}
+
+
+class _AbandonedFetchError(Exception):
+    """The fetch that a request was waiting on was cancelled by the caller that started it."""
+
+
+class ResponseCache:
+    """
+    A cache in front of the LLM, for the prompts that opt in to it.
+
+    Responses are cached by a hash of everything that determines them, in memory with LRU eviction
+    and in the DB so they survive restarts and can be replayed. Each prompt has its own TTL, so an
+    answer doesn't outlive the game state it was about. Identical requests that are made at the same
+    time share a single call to the LLM, whether or not their prompt opted in to caching.
+    """
+
+    def __init__(
+        self,
+        ttls: dict[str, timedelta] = CACHEABLE_PROMPTS,
+        *,
+        max_memory_cache_size: int = _MAX_MEMORY_CACHE_SIZE,
+        max_db_cache_size: int | None = _MAX_DB_CACHE_SIZE,
+    ) -> None:
+        """
+        Initialize the response cache.
+
+        :param ttls: How long to cache the responses to each prompt name. Prompts that aren't in
+            here aren't cached.
+        :param max_memory_cache_size: The number of responses to keep in memory.
+        :param max_db_cache_size: The number of responses to keep in the DB, or None to not use
+            the DB at all.
+        """
+        self.ttls = ttls
+        self.max_memory_cache_size = max_memory_cache_size
+        self.max_db_cache_size = max_db_cache_size
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._cache: OrderedDict[str, tuple[str, datetime]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Future[str]] = {}
+
+    async def get_response(
+        self,
+        key: str,
+        prompt_name: str,
+        fetch: Callable[[], Awaitable[str]],
+    ) -> str:
+        """
+        Get the response to a request, from the cache or by fetching it.
+
+        :param key: The hash of the request, from `get_request_key`.
+        :param prompt_name: The name of the prompt, which decides whether and how long to cache.
+        :param fetch: Gets the response from the LLM, if it isn't cached.
+        :return: The response to the request.
+        """
+        if key in self._in_flight:  # Someone else is already asking the same thing.
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(self._in_flight[key])
+            except _AbandonedFetchError:
+                return await self.get_response(key, prompt_name, fetch)
+
+        ttl = self.ttls.get(prompt_name)
+        if ttl is not None and (response := self._get_from_memory(key)) is not None:
+            self.hits += 1
+            return response
+
+        future = self._in_flight[key] = asyncio.get_running_loop().create_future()
+        try:
+            response = await self._fetch(key, prompt_name, ttl, fetch)
+        except BaseException as e:
+            # Only this caller was cancelled, so the others waiting on the fetch take it over.
+            future.set_exception(e if isinstance(e, Exception) else _AbandonedFetchError())
+            future.exception()  # Mark it as retrieved, in case nobody else is waiting.
+            raise
+        finally:
+            del self._in_flight[key]
+        future.set_result(response)
+        return response
+
+    async def _fetch(
+        self,
+        key: str,
+        prompt_name: str,
+        ttl: timedelta | None,
+        fetch: Callable[[], Awaitable[str]],
+    ) -> str:
+        """Get a response that isn't in memory, from the DB or from the LLM."""
+        if ttl is None:
+            return await fetch()
+
+        now = datetime.now(UTC)
+        cached = None
+        if self.max_db_cache_size is not None:
+            cached = await get_cached_llm_response(key, created_after=now - ttl)
+        if cached is not None:
+            self.hits += 1
+            response, created_at = cached
+        else:
+            response = await fetch()
+            self.misses += 1
+            created_at = now
+            if self.max_db_cache_size is not None:
+                await create_cached_llm_response(key, prompt_name, response, self.max_db_cache_size)
+        self._remember(key, response, created_at + ttl)
+        return response
+
+    def _get_from_memory(self, key: str) -> str | None:
+        """Get a response from the in-memory cache, if it's there and hasn't expired."""
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        response, expires_at = cached
+        if expires_at < datetime.now(UTC):
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return response
+
+    def _remember(self, key: str, response: str, expires_at: datetime) -> None:
+        """Add a response to the in-memory cache, evicting the least recently used one."""
+        self._cache[key] = (response, expires_at)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.max_memory_cache_size:
+            self._cache.popitem(last=False)
+
+    def __str__(self) -> str:
+        """Get a one-line summary of the cache usage."""
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0
+        return (
+            f"{self.hits} hits, {self.misses} misses ({hit_rate:.0%} hit rate),"
+            f" {self.coalesced} coalesced"
+        )
+
+
+def get_request_key(  # noqa: PLR0913
+    model_id: str,
+    messages: list[LLMMessage],
+    schema: type[BaseModel] | None,
+    system_prompt: str,
+    temperature: float,
+    thinking_tokens: int | None,
+) -> str:
+    """
+    Get a hash of everything that determines the response to a request.
+
+    :param model_id: The model that the request is for.
+    :param messages: The parts of the request that the response depends on, e.g. its prompt
+        prefix and messages. Images are hashed by their pixels or PNG bytes.
+    :param schema: The schema of the response.
+    :param system_prompt: The system prompt of the request.
+    :param temperature: The temperature of the request.
+    :param thinking_tokens: The thinking budget of the request.
+    :return: The hash of the request.
+    """
+    digest = hashlib.sha256()
+    schema_json = json.dumps(schema.model_json_schema(), sort_keys=True) if schema else ""
+    for part in (model_id, system_prompt, schema_json):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    digest.update(f"{temperature}\0{thinking_tokens}\0".encode())
+    for message in messages:
+        if isinstance(message, Image):
+            digest.update(f"{message.mode}{message.size}".encode())
+            digest.update(hashlib.sha256(message.tobytes()).digest())
+        elif isinstance(message, bytes):
+            digest.update(hashlib.sha256(message).digest())
+        else:
+            digest.update(message.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+llm_response_cache = ResponseCache()
@@ -0,0 +1,235 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+import numpy as np
+
+_LATENCY_WINDOW = 100
+_MIN_LATENCY_SAMPLES = 20
+_LATENCY_PERCENTILE = 95
+# A request is given this many times the p95 latency of its prompt before it times out.
+_TIMEOUT_MULTIPLIER = 2
+
+
+class TokenBucket:
+    """
+    A rate limiter that lets through a number of tokens per minute. Requests take their estimated
+    tokens up front, and settle the difference once their actual usage is known, so the bucket can
+    go into debt that later requests wait to pay off.
+    """
+
+    def __init__(self, tokens_per_minute: int) -> None:
+        """
+        Initialize the token bucket, full.
+
+        :param tokens_per_minute: The number of tokens to let through per minute.
+        """
+        self.capacity = tokens_per_minute
+        self.tokens = float(tokens_per_minute)
+        self._rate = tokens_per_minute / 60
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()  # So that requests take their turns in order.
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until there are enough tokens in the bucket, and take them.
+
+        :param tokens: The number of tokens to take. Capped at the capacity of the bucket.
+        """
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) / self._rate)
+                self._refill()
+            self.tokens -= tokens
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """
+        Correct an estimate that was taken from the bucket, once the actual usage is known.
+
+        :param estimated: The number of tokens that were taken.
+        :param actual: The number of tokens that were used.
+        """
+        self.tokens = min(self.tokens + estimated - actual, self.capacity)
+
+    def has_tokens(self, tokens: int) -> bool:
+        """Whether the tokens can be taken without waiting."""
+        self._refill()
+        return self.tokens >= min(tokens, self.capacity)
+
+    def _refill(self) -> None:
+        """Add the tokens that have accumulated since the last refill."""
+        now = time.monotonic()
+        self.tokens = min(self.tokens + (now - self._updated_at) * self._rate, self.capacity)
+        self._updated_at = now
+
+
+class ModelLimiter:
+    """The limits on the requests to one model, shared by every service that uses the model."""
+
+    def __init__(self, max_concurrent_requests: int, tokens_per_minute: int) -> None:
+        """
+        Initialize the limiter.
+
+        :param max_concurrent_requests: The number of requests that can be in flight at once.
+        :param tokens_per_minute: The number of tokens that can be used per minute.
+        """
+        self.bucket = TokenBucket(tokens_per_minute)
+        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+    @asynccontextmanager
+    async def reserve(self, tokens: int) -> AsyncIterator[None]:
+        """
+        Wait for a free request slot and enough tokens, and hold the slot for the block.
+
+        :param tokens: The estimated number of tokens that the request will use.
+        """
+        async with self._semaphore:
+            await self.bucket.acquire(tokens)
+            yield
+
+    def has_capacity(self, tokens: int) -> bool:
+        """
+        Whether a request could be sent right away, e.g. to decide whether to hedge.
+
+        :param tokens: The estimated number of tokens that the request will use.
+        :return: True if there is a free slot and enough tokens.
+        """
+        return not self._semaphore.locked() and self.bucket.has_tokens(tokens)
+
+
+class LatencyTracker:
+    """
+    The recent latencies of the requests for each prompt, used to time out and hedge the requests
+    that take much longer than usual.
+    """
+
+    def __init__(
+        self,
+        default_timeout: float,
+        min_timeout: float,
+        window: int = _LATENCY_WINDOW,
+        min_samples: int = _MIN_LATENCY_SAMPLES,
+    ) -> None:
+        """
+        Initialize the latency tracker.
+
+        :param default_timeout: The timeout until a prompt has enough samples, and the maximum.
+        :param min_timeout: The minimum timeout, however fast a prompt usually is.
+        :param window: The number of recent latencies to keep for each prompt.
+        :param min_samples: The number of latencies needed before adapting to them.
+        """
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.window = window
+        self.min_samples = min_samples
+        self._latencies: dict[str, deque[float]] = {}
+
+    def record(self, prompt_name: str, seconds: float) -> None:
+        """
+        Record the latency of a request. A request that timed out should record its timeout, so the
+        timeout grows when it's too short.
+
+        :param prompt_name: The name of the prompt of the request.
+        :param seconds: The latency of the request.
+        """
+        if prompt_name not in self._latencies:
+            self._latencies[prompt_name] = deque(maxlen=self.window)
+        self._latencies[prompt_name].append(seconds)
+
+    @contextmanager
+    def measure(self, prompt_name: str) -> Iterator[None]:
+        """
+        Record the time that the caller waits in the context, e.g. for a request and its hedge,
+        measured from the start of the first one. A request that times out records the time until
+        it did.
+
+        :param prompt_name: The name of the prompt of the request.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except TimeoutError:
+            self.record(prompt_name, time.perf_counter() - start)
+            raise
+        self.record(prompt_name, time.perf_counter() - start)
+
+    def get_p95(self, prompt_name: str) -> float | None:
+        """
+        Get the 95th percentile latency of a prompt.
+
+        :param prompt_name: The name of the prompt.
+        :return: The latency, or None if there aren't enough samples yet.
+        """
+        latencies = self._latencies.get(prompt_name, ())
+        if len(latencies) < self.min_samples:
+            return None
+        return float(np.percentile(latencies, _LATENCY_PERCENTILE))
+
+    def get_timeout(self, prompt_name: str) -> float:
+        """
+        Get the timeout of a request, from the recent latencies of its prompt.
+
+        :param prompt_name: The name of the prompt.
+        :return: The timeout in seconds.
+        """
+        p95 = self.get_p95(prompt_name)
+        if p95 is None:
+            return self.default_timeout
+        return min(max(_TIMEOUT_MULTIPLIER * p95, self.min_timeout), self.default_timeout)
+
+    def __str__(self) -> str:
+        """Get a one-line summary of the p95 latency of each prompt."""
+        p95s = {name: self.get_p95(name) for name in sorted(self._latencies)}
+        return ", ".join(f"{name}: {p95:.1f}s" for name, p95 in p95s.items() if p95 is not None)
+
+
+async def hedge[T](
+    request: Callable[[], Awaitable[T]],
+    delay: float | None,
+    can_hedge: Callable[[], bool],
+    discard: Callable[[T], Awaitable[None]] | None = None,
+) -> T:
+    """
+    Make a request, and if it hasn't finished after a delay, make the same request again and take
+    whichever finishes first. The other one is cancelled, as are both if this is.
+
+    :param request: Makes the request.
+    :param delay: The number of seconds to wait before hedging, or None to never hedge.
+    :param can_hedge: Whether there's spare capacity for a second request, once the delay is up.
+    :param discard: Cleans up the response of a request that lost the race but finished anyway, e.g.
+        to release what it holds.
+    :return: The first successful response.
+    """
+    tasks = [asyncio.ensure_future(request())]
+    winner = None
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done and can_hedge():
+            tasks.append(asyncio.ensure_future(request()))
+
+        pending = set(tasks)
+        errors = []
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    winner = task
+                    return task.result()
+                errors.append(task.exception())
+        raise errors[0]
+    finally:
+        for task in tasks:
+            task.cancel()  # Does nothing to the ones that have finished.
+        if discard is not None:
+            for task in tasks:
+                if task is not winner and _has_result(task):
+                    await discard(task.result())
+
+
+def _has_result(task: asyncio.Future[object]) -> bool:
+    """Whether a task finished successfully."""
+    return task.done() and not task.cancelled() and task.exception() is None
@@ -1,26 +1,43 @@
+from PIL.Image import Image
 from pydantic import BaseModel
 
+# A message to the LLM. Bytes are PNG images, which are sent without being re-encoded.
+type LLMMessage = str | Image | bytes
+
 
 class GeminiModel(BaseModel):
     """Model for the Gemini model."""
 
     model_id: str
     cost_1m_input_tokens: float
+    cost_1m_cached_input_tokens: float  # Input tokens read from a context cache.
     cost_1m_output_tokens: float
+    # The limits of the model's quota, shared by every request to it.
+    max_concurrent_requests: int
+    tokens_per_minute: int
 
 
 GEMINI_PRO_2_5 = GeminiModel(
     model_id="gemini-2.5-pro",
     cost_1m_input_tokens=1.25,
+    cost_1m_cached_input_tokens=0.31,
     cost_1m_output_tokens=10,
+    max_concurrent_requests=8,
+    tokens_per_minute=2_000_000,
 )
 GEMINI_FLASH_2_5 = GeminiModel(
     model_id="gemini-2.5-flash",
     cost_1m_input_tokens=0.3,
+    cost_1m_cached_input_tokens=0.075,
     cost_1m_output_tokens=2.5,
+    max_concurrent_requests=16,
+    tokens_per_minute=1_000_000,
 )
 GEMINI_FLASH_LITE_2_5 = GeminiModel(
     model_id="gemini-2.5-flash-lite",
     cost_1m_input_tokens=0.1,
+    cost_1m_cached_input_tokens=0.025,
     cost_1m_output_tokens=0.4,
+    max_concurrent_requests=16,
+    tokens_per_minute=4_000_000,
 )
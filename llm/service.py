@@ -1,29 +1,43 @@
 import asyncio
+import functools
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
 from typing import TypeVar
 
 from google import genai
-from google.genai.errors import ServerError
+from google.genai.errors import ClientError, ServerError
 from google.genai.types import (
     GenerateContentConfig,
     GenerateContentResponse,
+    GenerateContentResponseUsageMetadata,
     HarmBlockThreshold,
     HarmCategory,
+    Part,
     SafetySetting,
     ThinkingConfig,
 )
+from loguru import logger
 from PIL.Image import Image
 from pydantic import BaseModel
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 
 from common.prompts import SYSTEM_PROMPT
 from common.settings import settings
 from database.llm_messages.repository import create_llm_message
 from database.llm_messages.schemas import LLMMessageCreate
-from llm.schemas import GeminiModel
+from llm.context_cache import ContextCache
+from llm.response_cache import ResponseCache, get_request_key, llm_response_cache
+from llm.scheduling import LatencyTracker, ModelLimiter, hedge
+from llm.schemas import GeminiModel, LLMMessage
+from llm.streaming import StreamedResponse
 
 PydanticModel = TypeVar("PydanticModel", bound=BaseModel)
 
 TIMEOUT = 60
+MIN_TIMEOUT = 10
+# Images of up to 384x384 pixels, like the Game Boy screen, are billed as this many tokens.
+_IMAGE_TOKENS = 258
+_CHARS_PER_TOKEN = 4
 SAFETY_SETTINGS = [
     SafetySetting(category=cat, threshold=HarmBlockThreshold.BLOCK_NONE)
     for cat in HarmCategory
@@ -32,138 +46,577 @@ SAFETY_SETTINGS = [
 MIN_THINKING_TOKENS = 512  # This is the minimum allowed for the 2.5 models.
 DEFAULT_TEMPERATURE = 1  # This noise is necessary for creativity and not getting stuck in loops.
 
+# The calls on the critical path of an iteration, which are worth a second request when slow.
+HEDGED_PROMPTS = {
+    "press_buttons",
+    "select_overworld_tool",
+    "make_battle_decision",
+    "determine_battle_args",
+}
+
+# One per model, shared by every service that uses the model, since they share prompt prefixes and
+# the model's quota.
+context_caches: dict[str, ContextCache] = {}
+model_limiters: dict[str, ModelLimiter] = {}
+latency_tracker = LatencyTracker(default_timeout=TIMEOUT, min_timeout=MIN_TIMEOUT)
+
+_retry_request = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=0.5, max=4),
+    # The experimental models are unstable, and a timed out request is usually just unlucky.
+    retry=retry_if_exception_type((ServerError, TimeoutError)),
+    reraise=True,
+)
+
+
+@functools.cache
+def _get_shared_client() -> genai.Client:
+    """Get the client shared by every service, so that they share its connection pool."""
+    return genai.Client(api_key=settings.gemini_api_key)
+
 
 class GeminiLLMService:
     """Wrapper for the Gemini LLM API."""
 
-    def __init__(self, model: GeminiModel) -> None:
-        self.client = genai.Client(api_key=settings.gemini_api_key)
+    def __init__(
+        self,
+        model: GeminiModel,
+        client: genai.Client | None = None,
+        response_cache: ResponseCache | None = llm_response_cache,
+    ) -> None:
+        """
+        Initialize the LLM service.
+
+        :param model: The Gemini model to use.
+        :param client: The Gemini client, or anything with the same `aio.models` and `aio.caches`,
+            e.g. a fake one for testing offline. The real one is used by default.
+        :param response_cache: The cache to put in front of the LLM, or None to not cache.
+        """
         self.model = model
+        self.response_cache = response_cache
+        self.latency_tracker = latency_tracker
+        self.hedged_prompts = HEDGED_PROMPTS
+        if client is not None:  # Nothing is shared with another client, e.g. a fake one.
+            self.client = client
+            self.context_cache = ContextCache(client, model.model_id)
+            self.limiter = ModelLimiter(model.max_concurrent_requests, model.tokens_per_minute)
+            return
+        self.client = _get_shared_client()
+        if model.model_id not in context_caches:
+            context_caches[model.model_id] = ContextCache(self.client, model.model_id)
+            model_limiters[model.model_id] = ModelLimiter(
+                model.max_concurrent_requests,
+                model.tokens_per_minute,
+            )
+        self.context_cache = context_caches[model.model_id]
+        self.limiter = model_limiters[model.model_id]
 
-    async def get_llm_response(
+    async def get_llm_response(  # noqa: PLR0913
         self,
-        messages: str | list[str | Image],
+        messages: str | list[LLMMessage],
         prompt_name: str,
         system_prompt: str = SYSTEM_PROMPT,
+        prompt_prefix: str | None = None,
         temperature: float = DEFAULT_TEMPERATURE,
         thinking_tokens: int = MIN_THINKING_TOKENS,
+        cache_key: list[LLMMessage] | None = None,
     ) -> str:
         """
         Get a response from the Gemini LLM as a string.
 
-        :param messages: The messages to send to the Gemini LLM.
+        :param messages: The messages to send to the Gemini LLM. Images can be Pillow images, or
+            PNG bytes which are sent as is.
         :param prompt_name: The name of the prompt to use as a label in the database.
         :param system_prompt: The system prompt to send to the Gemini LLM.
+        :param prompt_prefix: The stable start of the prompt, which is sent before the messages and
+            cached along with the system prompt when possible.
         :param temperature: The temperature to use for the response.
         :param thinking_tokens: The number of tokens to use for the thinking.
+        :param cache_key: The inputs that the response depends on, to key the response cache on
+            instead of the messages and prompt prefix, for prompts that include context which
+            doesn't change the answer.
         :return: A string from the Gemini LLM.
         """
-        response = await self._get_llm_response(
+        return await self._get_cached_llm_response(
             messages=messages,
             schema=None,
             prompt_name=prompt_name,
             system_prompt=system_prompt,
+            prompt_prefix=prompt_prefix,
             temperature=temperature,
             thinking_tokens=thinking_tokens,
+            cache_key=cache_key,
         )
-        if not response.text:
-            raise ValueError("No response from Gemini.")
-        return response.text
 
     async def get_llm_response_pydantic(  # noqa: PLR0913
         self,
-        messages: str | list[str | Image],
+        messages: str | list[LLMMessage],
         schema: type[PydanticModel],
         prompt_name: str,
         system_prompt: str = SYSTEM_PROMPT,
+        prompt_prefix: str | None = None,
         temperature: float = DEFAULT_TEMPERATURE,
         thinking_tokens: int = MIN_THINKING_TOKENS,
+        cache_key: list[LLMMessage] | None = None,
     ) -> PydanticModel:
         """
         Get a Pydantic model from the Gemini LLM, parsed from a JSON response.
 
-        :param messages: The messages to send to the Gemini LLM.
+        :param messages: The messages to send to the Gemini LLM. Images can be Pillow images, or
+            PNG bytes which are sent as is.
         :param schema: The schema to use for the response.
         :param prompt_name: The name of the prompt to use as a label in the database.
         :param system_prompt: The system prompt to send to the Gemini LLM.
+        :param prompt_prefix: The stable start of the prompt, which is sent before the messages and
+            cached along with the system prompt when possible.
         :param temperature: The temperature to use for the response.
         :param thinking_tokens: The number of tokens to use for the thinking. None is for
             non-thinking models.
+        :param cache_key: The inputs that the response depends on, to key the response cache on
+            instead of the messages and prompt prefix, for prompts that include context which
+            doesn't change the answer.
         :return: A Pydantic model from the Gemini LLM.
         """
-        response = await self._get_llm_response(
+        response = await self._get_cached_llm_response(
+            messages=messages,
+            schema=schema,
+            prompt_name=prompt_name,
+            system_prompt=system_prompt,
+            prompt_prefix=prompt_prefix,
+            temperature=temperature,
+            thinking_tokens=thinking_tokens,
+            cache_key=cache_key,
+        )
+        return schema.model_validate_json(response)
+
+    async def _get_cached_llm_response(  # noqa: PLR0913
+        self,
+        messages: str | list[LLMMessage],
+        schema: type[PydanticModel] | None,
+        prompt_name: str,
+        system_prompt: str,
+        prompt_prefix: str | None,
+        temperature: float,
+        thinking_tokens: int | None,
+        cache_key: list[LLMMessage] | None,
+    ) -> str:
+        """
+        Get the text of a response from the response cache, or from the Gemini LLM. The parameters
+        are the same as for `get_llm_response_pydantic`.
+        """
+        fetch = functools.partial(
+            self._get_llm_response,
             messages=messages,
             schema=schema,
             prompt_name=prompt_name,
             system_prompt=system_prompt,
+            prompt_prefix=prompt_prefix,
             temperature=temperature,
             thinking_tokens=thinking_tokens,
         )
-        return schema.model_validate(response.parsed)
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_fixed(1),
-        retry=retry_if_exception_type(ServerError),  # The experimental models are unstable.
-        reraise=True,
-    )
+        if self.response_cache is None:
+            return await fetch()
+        if cache_key is None:
+            cache_key = [
+                prompt_prefix or "",
+                *([messages] if isinstance(messages, str) else messages),
+            ]
+        key = get_request_key(
+            model_id=self.model.model_id,
+            messages=cache_key,
+            schema=schema,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            thinking_tokens=thinking_tokens,
+        )
+        return await self.response_cache.get_response(key, prompt_name, fetch)
+
+    @_retry_request
     async def _get_llm_response(  # noqa: PLR0913
         self,
-        messages: str | list[str | Image],
+        messages: str | list[LLMMessage],
         schema: type[PydanticModel] | None,
         prompt_name: str,
         system_prompt: str,
+        prompt_prefix: str | None,
         temperature: float,
         thinking_tokens: int | None,
-    ) -> GenerateContentResponse:
+    ) -> str:
         """
-        Get a response from the Gemini LLM.
+        Get the text of a response from the Gemini LLM.
 
-        :param messages: The messages to send to the Gemini LLM.
+        :param messages: The messages to send to the Gemini LLM. Images can be Pillow images, or
+            PNG bytes which are sent as is.
         :param schema: The schema to use for the response.
         :param prompt_name: The name of the prompt to use as a label in the database.
         :param system_prompt: The system prompt to send to the Gemini LLM.
+        :param prompt_prefix: The stable start of the prompt, which is sent before the messages and
+            cached along with the system prompt when possible.
         :param temperature: The temperature to use for the response.
         :param thinking_tokens: The number of tokens to use for the thinking. None is for
             non-thinking models.
-        :return: A response from the Gemini LLM.
+        :return: The text of a response from the Gemini LLM.
         """
         if isinstance(messages, str):
             messages = [messages]
+        contents, config = await self._build_request(
+            messages,
+            schema,
+            system_prompt,
+            prompt_prefix,
+            temperature,
+            thinking_tokens,
+        )
+        try:
+            response = await self._generate_content(contents, config, prompt_name)
+        except ClientError as e:
+            if config.cached_content is None:
+                raise
+            contents, config = self._uncache_request(
+                contents,
+                config,
+                system_prompt,
+                prompt_prefix,
+                e,
+            )
+            response = await self._generate_content(contents, config, prompt_name)
+        if not response.text or not response.usage_metadata:
+            raise ValueError("No response from Gemini.")
+        await self._create_llm_message(
+            messages,
+            prompt_name,
+            prompt_prefix,
+            response.text,
+            response.usage_metadata,
+        )
+        if schema and not isinstance(response.parsed, schema):
+            raise ValueError(f"Failed to parse response from Gemini. Got {response.text}")
+        return response.text
+
+    async def stream_llm_response_pydantic(  # noqa: PLR0913
+        self,
+        messages: str | list[LLMMessage],
+        schema: type[PydanticModel],
+        prompt_name: str,
+        system_prompt: str = SYSTEM_PROMPT,
+        prompt_prefix: str | None = None,
+        temperature: float = DEFAULT_TEMPERATURE,
+        thinking_tokens: int = MIN_THINKING_TOKENS,
+    ) -> StreamedResponse[PydanticModel]:
+        """
+        Start streaming a Pydantic model from the Gemini LLM. The JSON is parsed as it arrives, so
+        each field can be awaited and acted on as soon as it's complete. The response isn't cached,
+        and it's only retried until its first chunk arrives, since the caller may act on any part
+        of it after that.
+
+        :param messages: The messages to send to the Gemini LLM. Images can be Pillow images, or
+            PNG bytes which are sent as is.
+        :param schema: The schema to use for the response.
+        :param prompt_name: The name of the prompt to use as a label in the database.
+        :param system_prompt: The system prompt to send to the Gemini LLM.
+        :param prompt_prefix: The stable start of the prompt, which is sent before the messages and
+            cached along with the system prompt when possible.
+        :param temperature: The temperature to use for the response.
+        :param thinking_tokens: The number of tokens to use for the thinking.
+        :return: The response, whose fields and result can be awaited.
+        """
+        streamed = StreamedResponse(schema)
+        streamed.task = asyncio.create_task(
+            self._stream_llm_response(
+                streamed,
+                [messages] if isinstance(messages, str) else messages,
+                prompt_name,
+                system_prompt,
+                prompt_prefix,
+                temperature,
+                thinking_tokens,
+            ),
+        )
+        return streamed
+
+    async def _stream_llm_response(  # noqa: PLR0913
+        self,
+        streamed: StreamedResponse,
+        messages: list[LLMMessage],
+        prompt_name: str,
+        system_prompt: str,
+        prompt_prefix: str | None,
+        temperature: float,
+        thinking_tokens: int | None,
+    ) -> None:
+        """Stream a response from the Gemini LLM into `streamed`, and record it once it's done."""
+        try:
+            contents, config = await self._build_request(
+                messages,
+                streamed.schema,
+                system_prompt,
+                prompt_prefix,
+                temperature,
+                thinking_tokens,
+            )
+            try:
+                usage_metadata = await self._read_stream(streamed, contents, config, prompt_name)
+            except ClientError as e:
+                if config.cached_content is None or streamed.text:
+                    raise
+                contents, config = self._uncache_request(
+                    contents,
+                    config,
+                    system_prompt,
+                    prompt_prefix,
+                    e,
+                )
+                usage_metadata = await self._read_stream(streamed, contents, config, prompt_name)
+            await self._create_llm_message(
+                messages,
+                prompt_name,
+                prompt_prefix,
+                streamed.text,
+                usage_metadata,
+            )
+        except Exception as e:  # noqa: BLE001 -- The caller gets it from the streamed response.
+            streamed.fail(e)
+            return
+        streamed.finish()
+
+    async def _read_stream(
+        self,
+        streamed: StreamedResponse,
+        contents: list[str | Image | Part],
+        config: GenerateContentConfig,
+        prompt_name: str,
+    ) -> GenerateContentResponseUsageMetadata:
+        """Feed the chunks of a streamed response into `streamed`, and get the token usage."""
+        estimated_tokens = _estimate_tokens(contents, config)
+        stack, chunks, chunk = await self._start_stream(
+            contents,
+            config,
+            prompt_name,
+            estimated_tokens,
+        )
+        async with stack:
+            usage_metadata = None
+            while chunk is not None:
+                if chunk.text:
+                    streamed.feed(chunk.text)
+                usage_metadata = chunk.usage_metadata or usage_metadata
+                chunk = await asyncio.wait_for(anext(chunks, None), timeout=TIMEOUT)
+        if not streamed.text or not usage_metadata:
+            raise ValueError("No response from Gemini.")
+        self.limiter.bucket.settle(estimated_tokens, usage_metadata.total_token_count or 0)
+        return usage_metadata
+
+    @_retry_request
+    async def _start_stream(
+        self,
+        contents: list[str | Image | Part],
+        config: GenerateContentConfig,
+        prompt_name: str,
+        estimated_tokens: int,
+    ) -> tuple[
+        AsyncExitStack,
+        AsyncIterator[GenerateContentResponse],
+        GenerateContentResponse | None,
+    ]:
+        """
+        Start streaming a response, and wait for its first chunk. Until then, a slow stream on the
+        critical path is hedged like a request in `_generate_content`. The time to the first chunk
+        is the latency recorded for streamed prompts.
+        """
+        open_stream = functools.partial(
+            self._open_stream,
+            contents,
+            config,
+            prompt_name,
+            estimated_tokens,
+        )
+        with self.latency_tracker.measure(prompt_name):
+            if prompt_name not in self.hedged_prompts:
+                return await open_stream()
+            return await hedge(
+                open_stream,
+                delay=self.latency_tracker.get_p95(prompt_name),
+                can_hedge=functools.partial(self.limiter.has_capacity, estimated_tokens),
+                discard=lambda opened: opened[0].aclose(),
+            )
+
+    async def _open_stream(
+        self,
+        contents: list[str | Image | Part],
+        config: GenerateContentConfig,
+        prompt_name: str,
+        estimated_tokens: int,
+    ) -> tuple[
+        AsyncExitStack,
+        AsyncIterator[GenerateContentResponse],
+        GenerateContentResponse | None,
+    ]:
+        """
+        Start a single stream within the model's limits, and wait for its first chunk with a
+        timeout adapted to the prompt's recent latency. The stack holds the request's slot and the
+        stream until it's closed.
+        """
+        stack = AsyncExitStack()
+        try:
+            await stack.enter_async_context(self.limiter.reserve(estimated_tokens))
+            async with asyncio.timeout(self.latency_tracker.get_timeout(prompt_name)):
+                chunks = await self.client.aio.models.generate_content_stream(
+                    model=self.model.model_id,
+                    contents=contents,  # type: ignore -- This is a Gemini API issue.
+                    config=config,
+                )
+                # The stream is an async generator, which holds its connection until it's closed.
+                stack.push_async_callback(chunks.aclose)  # type: ignore[attr-defined]
+                chunk = await anext(chunks, None)
+        except BaseException:
+            await stack.aclose()
+            raise
+        return stack, chunks, chunk
+
+    async def _build_request(  # noqa: PLR0913
+        self,
+        messages: list[LLMMessage],
+        schema: type[BaseModel] | None,
+        system_prompt: str,
+        prompt_prefix: str | None,
+        temperature: float,
+        thinking_tokens: int | None,
+    ) -> tuple[list[str | Image | Part], GenerateContentConfig]:
+        """Get the contents and config of a request, with the prompt prefix cached if possible."""
+        contents: list[str | Image | Part] = [
+            Part.from_bytes(data=m, mime_type="image/png") if isinstance(m, bytes) else m
+            for m in messages
+        ]
+        cached_content = None
+        if prompt_prefix:
+            cached_content = await self.context_cache.get(system_prompt, prompt_prefix)
+            if cached_content is None:
+                contents.insert(0, prompt_prefix)
         thinking_config = (
             ThinkingConfig(thinking_budget=thinking_tokens) if thinking_tokens is not None else None
         )
-        content_config = GenerateContentConfig(
-            system_instruction=system_prompt,
+        config = GenerateContentConfig(
+            # The system prompt is part of the cache, and the API rejects it being sent twice.
+            system_instruction=system_prompt if cached_content is None else None,
+            cached_content=cached_content,
             temperature=temperature,
             safety_settings=SAFETY_SETTINGS,
             thinking_config=thinking_config,
         )
         if schema:
-            content_config.response_mime_type = "application/json"
-            content_config.response_schema = schema
-        response = await asyncio.wait_for(
-            self.client.aio.models.generate_content(
-                model=self.model.model_id,
-                contents=messages,  # type: ignore -- This is a Gemini API issue.
-                config=content_config,
-            ),
-            timeout=TIMEOUT,
+            config.response_mime_type = "application/json"
+            config.response_schema = schema
+        return contents, config
+
+    def _uncache_request(
+        self,
+        contents: list[str | Image | Part],
+        config: GenerateContentConfig,
+        system_prompt: str,
+        prompt_prefix: str | None,
+        error: ClientError,
+    ) -> tuple[list[str | Image | Part], GenerateContentConfig]:
+        """
+        Get a request that sends the prompt prefix itself, after its context cache failed. The
+        cache can expire or be deleted under us, so this falls back to sending it uncached.
+        """
+        if config.cached_content is None or prompt_prefix is None:
+            raise ValueError("The request doesn't use a context cache.")
+        logger.warning(
+            f"Failed to use context cache {config.cached_content}. Sending uncached. {error}"
         )
-        if not response.text or not response.usage_metadata:
-            raise ValueError("No response from Gemini.")
-        message_str = "\n\n".join("<IMAGE>" if isinstance(m, Image) else m for m in messages)
+        self.context_cache.invalidate(config.cached_content)
+        uncached_config = config.model_copy(
+            update={"system_instruction": system_prompt, "cached_content": None},
+        )
+        return [prompt_prefix, *contents], uncached_config
+
+    async def _create_llm_message(
+        self,
+        messages: list[LLMMessage],
+        prompt_name: str,
+        prompt_prefix: str | None,
+        response_text: str,
+        usage_metadata: GenerateContentResponseUsageMetadata,
+    ) -> None:
+        """Record a request and its response in the database."""
+        sent_messages = [prompt_prefix, *messages] if prompt_prefix else messages
+        message_str = "\n\n".join(m if isinstance(m, str) else "<IMAGE>" for m in sent_messages)
         await create_llm_message(
             LLMMessageCreate(
                 model=self.model,
                 prompt_name=prompt_name,
                 prompt=message_str,
-                response=response.text,
-                prompt_tokens=response.usage_metadata.prompt_token_count or 0,
-                thought_tokens=response.usage_metadata.thoughts_token_count or 0,
-                response_tokens=response.usage_metadata.candidates_token_count or 0,
+                response=response_text,
+                prompt_tokens=usage_metadata.prompt_token_count or 0,
+                thought_tokens=usage_metadata.thoughts_token_count or 0,
+                response_tokens=usage_metadata.candidates_token_count or 0,
+                cached_prompt_tokens=usage_metadata.cached_content_token_count or 0,
             ),
         )
-        if schema and not isinstance(response.parsed, schema):
-            raise ValueError(f"Failed to parse response from Gemini. Got {response.text}")
+
+    async def _generate_content(
+        self,
+        contents: list[str | Image | Part],
+        config: GenerateContentConfig,
+        prompt_name: str,
+    ) -> GenerateContentResponse:
+        """
+        Send a request to the Gemini LLM, within the model's limits and with a timeout adapted to
+        the prompt's recent latency. A slow request on the critical path is hedged with a second
+        one, if there's spare capacity for it. The latency recorded is the time the caller waited,
+        from the start of the first request.
+        """
+        estimated_tokens = _estimate_tokens(contents, config)
+        request = functools.partial(self._send, contents, config, prompt_name, estimated_tokens)
+        with self.latency_tracker.measure(prompt_name):
+            if prompt_name not in self.hedged_prompts:
+                return await request()
+            return await hedge(
+                request,
+                delay=self.latency_tracker.get_p95(prompt_name),
+                can_hedge=functools.partial(self.limiter.has_capacity, estimated_tokens),
+            )
+
+    async def _send(
+        self,
+        contents: list[str | Image | Part],
+        config: GenerateContentConfig,
+        prompt_name: str,
+        estimated_tokens: int,
+    ) -> GenerateContentResponse:
+        """Send a single request to the Gemini LLM, and settle its token usage."""
+        async with self.limiter.reserve(estimated_tokens):
+            response = await asyncio.wait_for(
+                self.client.aio.models.generate_content(
+                    model=self.model.model_id,
+                    contents=contents,  # type: ignore -- This is a Gemini API issue.
+                    config=config,
+                ),
+                timeout=self.latency_tracker.get_timeout(prompt_name),
+            )
+        total_tokens = response.usage_metadata.total_token_count if response.usage_metadata else 0
+        self.limiter.bucket.settle(estimated_tokens, total_tokens or 0)
         return response
+
+
+def estimate_tokens(
+    messages: list[LLMMessage] | list[str | Image | Part],
+    thinking_tokens: int | None = MIN_THINKING_TOKENS,
+) -> int:
+    """
+    Estimate the tokens that a request will use, before it's sent.
+
+    :param messages: The messages of the request. Anything that isn't text counts as an image.
+    :param thinking_tokens: The thinking budget of the request.
+    :return: The estimated number of tokens.
+    """
+    text_chars = sum(len(m) for m in messages if isinstance(m, str))
+    images = sum(1 for m in messages if not isinstance(m, str))
+    return text_chars // _CHARS_PER_TOKEN + images * _IMAGE_TOKENS + (thinking_tokens or 0)
+
+
+def _estimate_tokens(contents: list[str | Image | Part], config: GenerateContentConfig) -> int:
+    """Estimate the tokens that a built request will use, before it's sent."""
+    thinking = config.thinking_config.thinking_budget if config.thinking_config else None
+    return estimate_tokens(contents, thinking)
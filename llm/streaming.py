@@ -0,0 +1,192 @@
+import asyncio
+import json
+import time
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+_WHITESPACE = " \t\n\r"
+_FIELD_DEPTH = 1  # The depth of the top-level fields, inside the outermost braces.
+
+
+class JsonFieldParser:
+    """
+    Parses the top-level fields of a JSON object as its text streams in, so that each field can be
+    used as soon as its value is complete, without waiting for the rest of the object.
+
+    Strings, arrays and objects are complete as soon as they're closed. Numbers, booleans and null
+    are complete at the comma or brace after them.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key_start: int | None = None
+        self._key: str | None = None
+        self._value_start: int | None = None
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """
+        Add the next chunk of the text.
+
+        :param chunk: The next chunk of the JSON text.
+        :return: The fields that were completed by this chunk, as (name, value) pairs.
+        """
+        self.text += chunk
+        completed = []
+        for i in range(self._pos, len(self.text)):
+            field = self._feed_string_char(i) if self._in_string else self._feed_char(i)
+            if field is not None:
+                completed.append(field)
+        self._pos = len(self.text)
+        return completed
+
+    def _feed_string_char(self, i: int) -> tuple[str, Any] | None:
+        """Handle a character inside a string, and get the field that it completes, if any."""
+        char = self.text[i]
+        if self._escaped:
+            self._escaped = False
+        elif char == "\\":
+            self._escaped = True
+        elif char == '"':
+            self._in_string = False
+            if self._depth == _FIELD_DEPTH and self._key_start is not None:
+                self._key = json.loads(self.text[self._key_start : i + 1])
+                self._key_start = None
+            elif self._depth == _FIELD_DEPTH and self._value_start is not None:
+                return self._complete(i + 1)
+        return None
+
+    def _feed_char(self, i: int) -> tuple[str, Any] | None:
+        """Handle a character outside of strings, and get the field that it completes, if any."""
+        char = self.text[i]
+        if char == '"':
+            self._in_string = True
+            if self._depth == _FIELD_DEPTH and self._key is None:
+                self._key_start = i
+            elif self._depth == _FIELD_DEPTH and self._value_start is None:
+                self._value_start = i
+        elif char in "{[":
+            self._depth += 1
+            if self._depth == _FIELD_DEPTH + 1 and self._value_start is None:
+                self._value_start = i
+        elif char in "}]":
+            self._depth -= 1
+            if self._value_start is not None and self._depth == _FIELD_DEPTH:
+                return self._complete(i + 1)
+            if self._value_start is not None and self._depth == 0:
+                return self._complete(i)  # A scalar ended by the closing brace.
+        elif self._depth == _FIELD_DEPTH and self._value_start is not None and char == ",":
+            return self._complete(i)  # A scalar ended by a comma.
+        elif (
+            self._depth == _FIELD_DEPTH
+            and self._key is not None
+            and self._value_start is None
+            and char not in f"{_WHITESPACE}:"
+        ):
+            self._value_start = i  # The start of a scalar.
+        return None
+
+    def _complete(self, end: int) -> tuple[str, Any]:
+        """Parse the value that ends at the given position, and start looking for the next key."""
+        if self._key is None or self._value_start is None:
+            raise ValueError(f"Found the end of a value without a key in: {self.text}")
+        field = self._key, json.loads(self.text[self._value_start : end])
+        self._key = None
+        self._value_start = None
+        return field
+
+
+class StreamedResponse[PydanticModel: BaseModel]:
+    """
+    A Pydantic model from the LLM that is still arriving. Each field can be awaited on its own, and
+    is available as soon as it's complete, while the rest of the response is still streaming.
+    """
+
+    def __init__(self, schema: type[PydanticModel]) -> None:
+        """
+        Initialize the streamed response.
+
+        :param schema: The schema of the response.
+        """
+        self.schema = schema
+        self.started_at = time.perf_counter()
+        self.field_latencies: dict[str, float] = {}  # Seconds from the start to each field.
+        self._parser = JsonFieldParser()
+        loop = asyncio.get_running_loop()
+        self._fields: dict[str, asyncio.Future[Any]] = {
+            name: loop.create_future() for name in schema.model_fields
+        }
+        self._result: asyncio.Future[PydanticModel] = loop.create_future()
+        self.task: asyncio.Task[None] | None = None  # Keeps the task that streams into this alive.
+
+    @property
+    def text(self) -> str:
+        """The text of the response so far."""
+        return self._parser.text
+
+    @property
+    def elapsed(self) -> float:
+        """The number of seconds since the request was made."""
+        return time.perf_counter() - self.started_at
+
+    async def field(self, name: str) -> Any:  # noqa: ANN401
+        """
+        Wait for a field of the response to be complete.
+
+        :param name: The name of the field.
+        :return: The validated value of the field.
+        """
+        return await asyncio.shield(self._fields[name])
+
+    async def result(self) -> PydanticModel:
+        """
+        Wait for the whole response.
+
+        :return: The validated response.
+        """
+        return await asyncio.shield(self._result)
+
+    def feed(self, chunk: str) -> None:
+        """
+        Add the next chunk of the response text, and resolve the fields that it completes.
+
+        :param chunk: The next chunk of the JSON text.
+        """
+        for name, value in self._parser.feed(chunk):
+            future = self._fields.get(name)
+            if future is None or future.done():
+                continue
+            self.field_latencies[name] = self.elapsed
+            try:
+                annotation = self.schema.model_fields[name].annotation
+                future.set_result(TypeAdapter(annotation).validate_python(value))
+            except ValueError as e:
+                future.set_exception(e)
+                future.exception()  # Mark it as retrieved, in case nobody is waiting for it.
+
+    def finish(self) -> None:
+        """Validate the whole response, once all of it has arrived."""
+        try:
+            result = self.schema.model_validate_json(self.text)
+        except ValueError as e:
+            self.fail(e)
+            return
+        self._result.set_result(result)
+        for name, future in self._fields.items():  # In case a field wasn't parsed on the way.
+            if not future.done():
+                future.set_result(getattr(result, name))
+
+    def fail(self, error: Exception) -> None:
+        """
+        Fail everything that is still waiting for the response.
+
+        :param error: The reason that the response failed.
+        """
+        for future in [*self._fields.values(), self._result]:
+            if not future.done():
+                future.set_exception(error)
+                future.exception()  # Mark it as retrieved, in case nobody is waiting for it.
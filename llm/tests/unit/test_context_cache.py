@@ -0,0 +1,79 @@
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from google.genai.errors import ClientError
+
+from llm.context_cache import ContextCache
+
+
+class _StubCaches:
+    """Stands in for the Gemini client's caches, refusing prefixes that are too short."""
+
+    def __init__(self, ttl: timedelta) -> None:
+        self.ttl = ttl
+        self.created: list[str] = []
+        self.updated: list[str] = []
+        self.deleted: list[str] = []
+
+    async def create(self, *, model: str, config: Any) -> Any:  # noqa: ANN401, ARG002
+        [prefix] = config.contents
+        if len(prefix) < 3:  # noqa: PLR2004
+            raise ClientError(400, {"error": {"message": "Cached content is too small."}})
+        name = f"cachedContents/{len(self.created)}"
+        self.created.append(name)
+        return SimpleNamespace(name=name, expire_time=datetime.now(UTC) + self.ttl)
+
+    async def update(self, *, name: str, config: Any) -> Any:  # noqa: ANN401, ARG002
+        self.updated.append(name)
+
+    async def delete(self, *, name: str) -> None:
+        self.deleted.append(name)
+
+
+def _get_context_cache(ttl: timedelta = timedelta(minutes=10)) -> tuple[ContextCache, _StubCaches]:
+    caches = _StubCaches(ttl)
+    client = SimpleNamespace(aio=SimpleNamespace(caches=caches))
+    return ContextCache(client, "model", ttl=ttl, max_caches=2), caches  # type: ignore[arg-type]
+
+
+@pytest.mark.unit
+async def test_prefix_is_cached_once_and_outdated_caches_are_deleted() -> None:
+    """Test that a prefix is reused until it's one of the least recently used, then deleted."""
+    context_cache, caches = _get_context_cache()
+
+    first = await context_cache.get("system", "goals 1")
+    assert await context_cache.get("system", "goals 1") == first
+    assert caches.created == [first]
+    assert context_cache.hits == 1
+
+    second = await context_cache.get("system", "goals 2")
+    assert await context_cache.get("other system", "goals 2") not in {first, second}
+    assert caches.deleted == [first]
+
+
+@pytest.mark.unit
+async def test_cache_near_expiry_is_extended() -> None:
+    """Test that a cache about to expire has its TTL extended instead of being recreated."""
+    context_cache, caches = _get_context_cache(ttl=timedelta(minutes=1))
+
+    name = await context_cache.get("system", "goals")
+    assert await context_cache.get("system", "goals") == name
+    assert caches.updated == [name]
+    assert caches.created == [name]
+
+
+@pytest.mark.unit
+async def test_uncacheable_prefix_falls_back() -> None:
+    """Test that a prefix the API refuses to cache isn't retried, and that invalidation works."""
+    context_cache, caches = _get_context_cache()
+
+    assert await context_cache.get("system", "") is None
+    assert await context_cache.get("system", "") is None
+    assert caches.created == []
+
+    name = await context_cache.get("system", "goals")
+    assert name is not None
+    context_cache.invalidate(name)
+    assert await context_cache.get("system", "goals") != name
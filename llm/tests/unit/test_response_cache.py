@@ -0,0 +1,145 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from llm.response_cache import ResponseCache
+from llm.schemas import GEMINI_FLASH_LITE_2_5
+from llm.service import GeminiLLMService
+
+
+class _FakeModels:
+    """Stands in for the Gemini client's models, answering each prompt with its request count."""
+
+    def __init__(self, delay: float = 0) -> None:
+        self.delay = delay
+        self.requests: list[list[Any]] = []
+
+    async def generate_content(self, *, model: str, contents: list[Any], config: Any) -> Any:  # noqa: ANN401, ARG002
+        self.requests.append(contents)
+        count = len(self.requests)
+        await asyncio.sleep(self.delay)  # Let concurrent callers in while the request is in flight.
+        return SimpleNamespace(
+            text=f"{contents[-1]} {count}",
+            parsed=None,
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=10,
+                thoughts_token_count=0,
+                candidates_token_count=2,
+                cached_content_token_count=0,
+                total_token_count=12,
+            ),
+        )
+
+
+def _get_llm_service(
+    response_cache: ResponseCache,
+    delay: float = 0,
+) -> tuple[GeminiLLMService, _FakeModels]:
+    models = _FakeModels(delay)
+    client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    llm_service = GeminiLLMService(GEMINI_FLASH_LITE_2_5, client, response_cache)  # type: ignore[arg-type]
+    return llm_service, models
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_only_opted_in_prompts_are_cached() -> None:
+    """Test that opted-in prompts are answered once, and other prompts every time."""
+    response_cache = ResponseCache({"cached": timedelta(hours=1)})
+    llm_service, models = _get_llm_service(response_cache)
+
+    for _ in range(2):
+        assert await llm_service.get_llm_response("hi", prompt_name="cached") == "hi 1"
+    assert await llm_service.get_llm_response("hi", prompt_name="uncached") == "hi 2"
+    assert await llm_service.get_llm_response("hi", prompt_name="uncached") == "hi 3"
+    assert await llm_service.get_llm_response("hi!", prompt_name="cached") == "hi! 4"
+    assert (response_cache.hits, response_cache.misses) == (1, 2)
+
+    # A fresh cache, like after a restart, finds the response in the DB.
+    llm_service, models = _get_llm_service(ResponseCache({"cached": timedelta(hours=1)}))
+    assert await llm_service.get_llm_response("hi", prompt_name="cached") == "hi 1"
+    assert models.requests == []
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_expired_responses_are_fetched_again() -> None:
+    """Test that a response isn't reused once its TTL has passed."""
+    llm_service, models = _get_llm_service(ResponseCache({"cached": timedelta(0)}))
+
+    await llm_service.get_llm_response("hi", prompt_name="cached")
+    await llm_service.get_llm_response("hi", prompt_name="cached")
+    assert len(models.requests) == 2  # noqa: PLR2004
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_responses_from_the_db_expire_from_when_they_were_cached() -> None:
+    """Test that a response found in the DB is only reused for the rest of its TTL."""
+    ttls = {"cached": timedelta(seconds=0.2)}
+    llm_service, _ = _get_llm_service(ResponseCache(ttls))
+    await llm_service.get_llm_response("hi", prompt_name="cached")
+    await asyncio.sleep(0.1)
+
+    # A fresh cache, like after a restart, finds the response in the DB.
+    llm_service, models = _get_llm_service(ResponseCache(ttls))
+    await llm_service.get_llm_response("hi", prompt_name="cached")
+    assert models.requests == []
+
+    await asyncio.sleep(0.15)  # Expired, though not for as long as the TTL since the DB hit.
+    await llm_service.get_llm_response("hi", prompt_name="cached")
+    assert len(models.requests) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_requests_are_cached_by_their_cache_key() -> None:
+    """Test that requests are cached by their cache key, ignoring the rest of the prompt."""
+    response_cache = ResponseCache({"cached": timedelta(hours=1)})
+    llm_service, models = _get_llm_service(response_cache)
+
+    for i in range(2):
+        response = await llm_service.get_llm_response(
+            f"iteration {i}: hi",
+            prompt_name="cached",
+            cache_key=["hi"],
+        )
+        assert response == "iteration 0: hi 1"
+    assert await llm_service.get_llm_response("hi", prompt_name="cached") == "hi 2"
+    assert len(models.requests) == 2  # noqa: PLR2004
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_concurrent_identical_requests_are_coalesced() -> None:
+    """Test that identical requests made at the same time share one call, even if uncached."""
+    response_cache = ResponseCache({}, max_db_cache_size=None)
+    llm_service, models = _get_llm_service(response_cache)
+
+    responses = await asyncio.gather(
+        *[llm_service.get_llm_response("hi", prompt_name="uncached") for _ in range(3)],
+        llm_service.get_llm_response("hi", prompt_name="uncached", temperature=0),
+    )
+    assert responses == ["hi 1", "hi 1", "hi 1", "hi 2"]
+    assert len(models.requests) == 2  # noqa: PLR2004
+    assert response_cache.coalesced == 2  # noqa: PLR2004
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_cancelled_request_is_taken_over_by_the_coalesced_ones() -> None:
+    """Test that cancelling the request that others are waiting on doesn't cancel them."""
+    llm_service, models = _get_llm_service(ResponseCache({}, max_db_cache_size=None), delay=0.05)
+
+    first = asyncio.create_task(llm_service.get_llm_response("hi", prompt_name="uncached"))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(llm_service.get_llm_response("hi", prompt_name="uncached"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "hi 2"
+    assert first.cancelled()
+    assert len(models.requests) == 2  # noqa: PLR2004
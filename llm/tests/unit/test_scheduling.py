@@ -0,0 +1,170 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from google.genai.types import GenerateContentConfig
+from pydantic import BaseModel
+
+from llm.scheduling import LatencyTracker, TokenBucket, hedge
+from llm.schemas import GEMINI_FLASH_LITE_2_5
+from llm.service import GeminiLLMService
+
+
+class _Response(BaseModel):
+    thoughts: str
+
+
+class _StallingModels:
+    """Stands in for the Gemini client's models, with first streams that never start."""
+
+    def __init__(self, stalled_streams: int = 1) -> None:
+        self.stalled_streams = stalled_streams
+        self.streams = 0
+        self.closed = 0
+
+    async def generate_content_stream(self, **_: Any) -> AsyncIterator[Any]:  # noqa: ANN401
+        self.streams += 1
+        stalls = self.streams <= self.stalled_streams
+
+        async def stream() -> AsyncIterator[Any]:
+            try:
+                if stalls:
+                    await asyncio.Event().wait()
+                yield SimpleNamespace(
+                    text='{"thoughts": "Hi."}',
+                    usage_metadata=SimpleNamespace(
+                        prompt_token_count=10,
+                        thoughts_token_count=0,
+                        candidates_token_count=5,
+                        cached_content_token_count=0,
+                        total_token_count=15,
+                    ),
+                )
+            finally:
+                self.closed += 1
+
+        return stream()
+
+
+@pytest.mark.unit
+async def test_token_bucket_waits_for_tokens_and_settles_debt() -> None:
+    """Test that the bucket only lets through its rate, counting the actual usage of requests."""
+    bucket = TokenBucket(tokens_per_minute=6_000)  # 100 tokens a second.
+    await bucket.acquire(100)
+    bucket.settle(estimated=100, actual=6_000)  # The request used the whole bucket.
+    assert not bucket.has_tokens(1)
+
+    start = time.perf_counter()
+    await bucket.acquire(5)
+    assert time.perf_counter() - start >= 0.04  # noqa: PLR2004
+
+
+@pytest.mark.unit
+def test_timeout_adapts_to_the_p95_latency() -> None:
+    """Test that the timeout is the default until there are enough samples, then follows p95."""
+    tracker = LatencyTracker(default_timeout=60, min_timeout=1, min_samples=20)
+    for _ in range(19):
+        tracker.record("prompt", 2)
+    assert tracker.get_timeout("prompt") == 60  # noqa: PLR2004
+    assert tracker.get_p95("prompt") is None
+
+    tracker.record("prompt", 2)
+    assert tracker.get_timeout("prompt") == 4  # noqa: PLR2004
+    assert tracker.get_timeout("other prompt") == 60  # noqa: PLR2004
+
+    for _ in range(20):
+        tracker.record("prompt", 100)
+    assert tracker.get_timeout("prompt") == 60  # noqa: PLR2004
+
+
+@pytest.mark.unit
+async def test_slow_request_is_hedged() -> None:
+    """Test that a slow request is raced against a second one, and the loser is cancelled."""
+    delays = [1.0, 0.01]
+    cancelled = []
+
+    async def request() -> float:
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    assert await hedge(request, delay=0.01, can_hedge=lambda: True) == 0.01  # noqa: PLR2004
+    await asyncio.sleep(0)  # Let the cancelled request run its cancellation.
+    assert cancelled == [1.0]
+
+
+@pytest.mark.unit
+async def test_request_is_not_hedged_without_capacity() -> None:
+    """Test that there's no second request when it would go over the limits."""
+    calls = []
+
+    async def request() -> int:
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return len(calls)
+
+    assert await hedge(request, delay=0.01, can_hedge=lambda: False) == 1
+    assert await hedge(request, delay=None, can_hedge=lambda: True) == 2  # noqa: PLR2004
+
+
+@pytest.mark.unit
+async def test_request_is_cancelled_with_the_hedge() -> None:
+    """Test that cancelling a hedge during its delay cancels the request, freeing its slot."""
+    cancelled = []
+
+    async def request() -> None:
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    task = asyncio.create_task(hedge(request, delay=1, can_hedge=lambda: True))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert cancelled == [True]
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_stream_is_hedged_before_its_first_chunk() -> None:
+    """Test that a stream that's slow to start is raced against a second one."""
+    models = _StallingModels()
+    client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    llm_service = GeminiLLMService(GEMINI_FLASH_LITE_2_5, client, None)  # type: ignore[arg-type]
+    # With a window of one, the p95 is the latency of the last call.
+    tracker = LatencyTracker(default_timeout=1, min_timeout=1, window=1, min_samples=1)
+    llm_service.latency_tracker = tracker
+    tracker.record("press_buttons", 0.05)
+
+    response = await llm_service.stream_llm_response_pydantic("hi", _Response, "press_buttons")
+    assert await response.result() == _Response(thoughts="Hi.")
+    assert models.streams == 2  # noqa: PLR2004
+    assert models.closed == 2  # noqa: PLR2004
+    # The caller waited for the hedge delay too, not just for the stream that won.
+    assert tracker.get_p95("press_buttons") >= 0.05  # noqa: PLR2004
+    assert llm_service.limiter.has_capacity(0)
+
+
+@pytest.mark.unit
+async def test_opened_stream_is_closed_with_its_stack() -> None:
+    """Test that closing the stack of an opened stream closes the stream, not just its slot."""
+    models = _StallingModels(stalled_streams=0)
+    client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    llm_service = GeminiLLMService(GEMINI_FLASH_LITE_2_5, client, None)  # type: ignore[arg-type]
+
+    stack, _, chunk = await llm_service._open_stream(["hi"], GenerateContentConfig(), "test", 0)
+    assert chunk is not None
+    assert models.closed == 0
+
+    await stack.aclose()
+    assert models.closed == 1
@@ -0,0 +1,124 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from google.genai.errors import ServerError
+from pydantic import BaseModel
+from tenacity import wait_none
+
+from common.enums import Button
+from llm.schemas import GEMINI_FLASH_LITE_2_5
+from llm.service import GeminiLLMService
+from llm.streaming import JsonFieldParser
+
+
+class _Response(BaseModel):
+    thoughts: str
+    buttons: Button | list[Button]
+
+
+class _FakeModels:
+    """Stands in for the Gemini client's models, streaming a response that stalls before its end."""
+
+    def __init__(self, chunks: list[str], failures: int = 0) -> None:
+        self.chunks = chunks
+        self.failures = failures
+        self.release = asyncio.Event()
+
+    async def generate_content_stream(self, **_: Any) -> AsyncIterator[Any]:  # noqa: ANN401
+        if self.failures:
+            self.failures -= 1
+            raise ServerError(503, {"error": {"message": "The model is overloaded."}})
+
+        async def stream() -> AsyncIterator[Any]:
+            for chunk in self.chunks[:-1]:
+                yield SimpleNamespace(text=chunk, usage_metadata=None)
+            await self.release.wait()
+            yield SimpleNamespace(
+                text=self.chunks[-1],
+                usage_metadata=SimpleNamespace(
+                    prompt_token_count=10,
+                    thoughts_token_count=0,
+                    candidates_token_count=5,
+                    cached_content_token_count=0,
+                    total_token_count=15,
+                ),
+            )
+
+        return stream()
+
+
+@pytest.mark.unit
+def test_fields_are_parsed_as_soon_as_they_are_complete() -> None:
+    """Test that each field is parsed on the character that completes it, however it's chunked."""
+    value = {
+        "text": 'a "quoted", {bracketed} string \\ ',
+        "list": [1, [2, {"3": "]"}]],
+        "object": {"a": None},
+        "number": -1.5,
+        "flag": True,
+    }
+    text = json.dumps(value, indent=2)
+    parser = JsonFieldParser()
+    completed_at = {}
+    for i, char in enumerate(text):
+        for name, field in parser.feed(char):
+            assert field == value[name]
+            completed_at[name] = i
+
+    assert list(completed_at) == list(value)
+    assert text[completed_at["text"]] == '"'
+    assert text[completed_at["list"]] == "]"
+    assert text[completed_at["object"]] == "}"
+    assert text[completed_at["number"]] == ","
+    assert completed_at["flag"] == len(text) - 1
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_streamed_field_is_available_before_the_response_ends() -> None:
+    """Test that a field can be acted on while the rest of the response is still streaming."""
+    models = _FakeModels(['{"thoughts": "Go up', '.", "buttons": ["up",', ' "a"]', "}"])
+    client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    llm_service = GeminiLLMService(GEMINI_FLASH_LITE_2_5, client, None)  # type: ignore[arg-type]
+
+    response = await llm_service.stream_llm_response_pydantic("hi", _Response, "test")
+    assert await response.field("thoughts") == "Go up."
+    assert await response.field("buttons") == [Button.UP, Button.A]
+    assert "buttons" in response.field_latencies
+
+    models.release.set()
+    assert await response.result() == _Response(thoughts="Go up.", buttons=["up", "a"])
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_streamed_fields_fail_with_the_response() -> None:
+    """Test that a response that ends early fails the fields that are still waiting."""
+    models = _FakeModels(['{"thoughts": "Hm', ""])
+    client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    llm_service = GeminiLLMService(GEMINI_FLASH_LITE_2_5, client, None)  # type: ignore[arg-type]
+    models.release.set()
+
+    response = await llm_service.stream_llm_response_pydantic("hi", _Response, "test")
+    with pytest.raises(ValueError, match="JSON"):
+        await response.field("buttons")
+    with pytest.raises(ValueError, match="JSON"):
+        await response.result()
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_stream_is_retried_until_it_starts(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a stream that fails to start is retried, like a request that isn't streamed."""
+    monkeypatch.setattr(GeminiLLMService._start_stream.retry, "wait", wait_none())  # type: ignore[attr-defined]
+    models = _FakeModels(['{"buttons": "a", "thoughts": "Hi."}', ""], failures=2)
+    client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    llm_service = GeminiLLMService(GEMINI_FLASH_LITE_2_5, client, None)  # type: ignore[arg-type]
+    models.release.set()
+
+    response = await llm_service.stream_llm_response_pydantic("hi", _Response, "test")
+    assert await response.result() == _Response(thoughts="Hi.", buttons=Button.A)
@@ -8,11 +8,17 @@ from loguru import logger
 
 from agent.app import build_agent_workflow
 from agent.state import AgentState
+from agent.subflows.overworld_handler.speculation import speculative_calls
 from common.backup_service import create_backup, get_output_folder, load_backup, load_latest_backup
 from common.constants import DEFAULT_ROM_PATH, ITERATIONS_PER_BACKUP
-from database.db_config import init_fresh_db
+from common.embedding_service import embedding_service
+from database.db_config import create_tables, init_fresh_db, unit_of_work
 from emulator.emulator import YellowLegacyEmulator
+from llm.response_cache import llm_response_cache
+from llm.service import context_caches, latency_tracker
+from memory.embedding_index import embedding_index
 from otel_config import setup_telemetry
+from overworld_map.store import map_store
 from streaming.server import BackgroundStreamServer
 
 
@@ -25,7 +31,7 @@ async def main(
     track_telemetry: bool = False,
 ) -> None:
     """
-    Get the emulator ticking on an async thread, and iteratively run the agent.
+    Get the emulator ticking on its own thread, and iteratively run the agent.
 
     :param rom_path: The path to the ROM file.
     :param backup_folder: Optional path to load a saved state from.
@@ -42,17 +48,18 @@ async def main(
     folder = await get_output_folder()
 
     if backup_folder:
-        state = await load_backup(backup_folder)
+        state, emulator_state = await load_backup(backup_folder)
         state.folder = folder
-        emulator_state = state.emulator_save_state
     elif load_latest:
-        state = await load_latest_backup()
+        state, emulator_state = await load_latest_backup()
         state.folder = folder
-        emulator_state = state.emulator_save_state
     else:
         await init_fresh_db()
         state = AgentState(folder=folder)
         emulator_state = None
+    await create_tables()  # Backups may be from before some tables were added.
+    await map_store.load()
+    await embedding_index.load()
 
     await aiofiles.os.makedirs(folder)
 
@@ -66,13 +73,25 @@ async def main(
         try:
             while True:
                 workflow = build_agent_workflow(state, emulator)
-                await workflow.execute()
+                async with unit_of_work():  # Each iteration's DB writes go in one transaction.
+                    await workflow.execute()
                 state = await workflow.get_state()
                 if state.iteration % ITERATIONS_PER_BACKUP == 0:
-                    await create_backup(state)
+                    logger.info(f"Game state parser cache: {emulator.parser_cache}")
+                    logger.info(f"Animation waits: {emulator.animation_watcher}")
+                    logger.info(f"Emulator frames: {emulator.get_frame_stats()}")
+                    logger.info(f"Emulator save states: {emulator.save_states}")
+                    logger.info(f"Embedding cache: {embedding_service}")
+                    logger.info(f"LLM response cache: {llm_response_cache}")
+                    logger.info(f"LLM p95 latencies: {latency_tracker}")
+                    logger.info(f"Speculative overworld tool calls: {speculative_calls}")
+                    for model_id, context_cache in context_caches.items():
+                        logger.info(f"Context cache for {model_id}: {context_cache}")
+                    await create_backup(state, emulator.save_states.latest)
         except Exception:  # noqa: BLE001
             logger.exception("Agent workflow raised an exception.")
-            await create_backup(state)
+            await map_store.checkpoint()
+            await create_backup(state, emulator.save_states.latest)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,167 @@
+import numpy as np
+from loguru import logger
+
+from database.long_term_memory.repository import get_all_long_term_memory_embeddings
+
+# Below this many memories, scanning all of them is fast enough that clustering isn't worth it.
+_DEFAULT_IVF_MIN_SIZE = 10_000
+_DEFAULT_IVF_PROBES = 8
+_KMEANS_ITERATIONS = 10
+
+
+class EmbeddingIndex:
+    """
+    An in-process index of the long-term memory embeddings, for finding the memories most similar
+    to a query without going back to the DB.
+
+    The embeddings are kept as a contiguous float32 matrix of unit vectors, so the cosine similarity
+    of every memory to a query is a single matrix-vector product. Once there are enough memories,
+    they are also clustered with k-means into an inverted file (IVF) index, and only the memories in
+    the clusters nearest to the query are scored.
+    """
+
+    def __init__(
+        self,
+        ivf_min_size: int = _DEFAULT_IVF_MIN_SIZE,
+        ivf_probes: int = _DEFAULT_IVF_PROBES,
+    ) -> None:
+        """
+        Initialize the index.
+
+        :param ivf_min_size: The number of memories at which to start using the IVF index.
+        :param ivf_probes: The number of nearest clusters to score on each search.
+        """
+        self.ivf_min_size = ivf_min_size
+        self.ivf_probes = ivf_probes
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._titles: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._centroids: np.ndarray | None = None
+        self._clusters = np.empty(0, dtype=np.int32)
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        """Get the number of memories in the index."""
+        return len(self._titles)
+
+    @property
+    def titles(self) -> list[str]:
+        """The titles of the memories in the index, in the order they were added."""
+        return list(self._titles)
+
+    async def load(self) -> None:
+        """Replace the contents of the index with the embeddings in the DB."""
+        embeddings = await get_all_long_term_memory_embeddings()
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._titles = []
+        self._rows = {}
+        self._centroids = None
+        self._trained_size = 0
+        for title, embedding in embeddings.items():
+            self._set(title, embedding)
+        if len(self) >= self.ivf_min_size:
+            self._train_ivf()
+        logger.info(f"Loaded {len(embeddings)} long-term memory embeddings into the index.")
+
+    def add(self, title: str, embedding: list[float]) -> None:
+        """
+        Add a memory's embedding, or replace it if the memory is already in the index.
+
+        :param title: The title of the memory.
+        :param embedding: The embedding of the memory.
+        """
+        row = self._set(title, embedding)
+        if self._centroids is not None:
+            self._clusters[row] = np.argmax(self._centroids @ self._matrix[row])
+        # Re-cluster as the index grows, so the clusters stay balanced.
+        if len(self) >= max(self.ivf_min_size, 2 * self._trained_size):
+            self._train_ivf()
+
+    def _set(self, title: str, embedding: list[float]) -> int:
+        """Store a memory's normalized embedding in its row, and get the row."""
+        vector = _normalize(np.asarray(embedding, dtype=np.float32))
+        if not self._titles:
+            self._matrix = np.empty((16, len(vector)), dtype=np.float32)
+            self._clusters = np.empty(16, dtype=np.int32)
+        elif len(vector) != self._matrix.shape[1]:
+            raise ValueError(f"Expected {self._matrix.shape[1]} dimensions, got {len(vector)}.")
+
+        row = self._rows.get(title)
+        if row is None:
+            row = len(self._titles)
+            if row == len(self._matrix):  # Double the capacity, so adding is amortized O(1).
+                self._matrix = np.concatenate([self._matrix, np.empty_like(self._matrix)])
+                self._clusters = np.concatenate([self._clusters, np.empty_like(self._clusters)])
+            self._titles.append(title)
+            self._rows[title] = row
+        self._matrix[row] = vector
+        return row
+
+    def search(
+        self,
+        query: list[float],
+        num_results: int,
+        min_similarity: float = -1.0,
+    ) -> dict[str, float]:
+        """
+        Get the memories most similar to a query.
+
+        :param query: The embedding of the query.
+        :param num_results: The maximum number of memories to return.
+        :param min_similarity: The minimum cosine similarity of a memory to the query.
+        :return: The titles of the most similar memories, and their cosine similarity to the query.
+        """
+        if not self._titles:
+            return {}
+        vector = _normalize(np.asarray(query, dtype=np.float32))
+        if self._centroids is None:
+            rows = np.arange(len(self))
+            similarities = self._matrix[: len(self)] @ vector  # A view, so nothing is copied.
+        else:
+            rows = self._get_nearest_cluster_rows(vector)
+            similarities = self._matrix[rows] @ vector
+        if len(rows) > num_results:
+            top = np.argpartition(similarities, -num_results)[-num_results:]
+            rows, similarities = rows[top], similarities[top]
+        return {
+            self._titles[row]: float(similarity)
+            for row, similarity in zip(rows, similarities, strict=True)
+            if similarity >= min_similarity
+        }
+
+    def _get_nearest_cluster_rows(self, vector: np.ndarray) -> np.ndarray:
+        """Get the rows in the clusters nearest to a query, which are the ones worth scoring."""
+        if self._centroids is None:
+            raise ValueError("The IVF index hasn't been trained.")
+        probes = min(self.ivf_probes, len(self._centroids))
+        nearest = np.argpartition(self._centroids @ vector, -probes)[-probes:]
+        return np.flatnonzero(np.isin(self._clusters[: len(self)], nearest))
+
+    def _train_ivf(self) -> None:
+        """Cluster the memories with spherical k-means, and assign each one to its cluster."""
+        vectors = self._matrix[: len(self)]
+        num_clusters = int(np.sqrt(len(vectors)))
+        rng = np.random.default_rng(0)
+        centroids = vectors[rng.choice(len(vectors), num_clusters, replace=False)]
+        for _ in range(_KMEANS_ITERATIONS):
+            clusters = np.argmax(vectors @ centroids.T, axis=1)
+            one_hot = np.zeros((len(vectors), num_clusters), dtype=np.float32)
+            one_hot[np.arange(len(vectors)), clusters] = 1
+            sums = one_hot.T @ vectors
+            is_empty = ~sums.any(axis=1)
+            sums[is_empty] = centroids[is_empty]  # Keep the old centroid of an empty cluster.
+            centroids = sums / np.linalg.norm(sums, axis=1, keepdims=True)
+
+        self._centroids = centroids
+        self._clusters[: len(vectors)] = np.argmax(vectors @ centroids.T, axis=1)
+        self._trained_size = len(vectors)
+        logger.info(f"Clustered {len(vectors)} long-term memories into {num_clusters} clusters.")
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    """Scale a vector to unit length, so the dot product of two of them is their cosine."""
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+embedding_index = EmbeddingIndex()
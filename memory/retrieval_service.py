@@ -1,16 +1,12 @@
-import numpy as np
-
 from common.constants import (
     DEFAULT_MIN_SEMANTIC_SIMILARITY,
     DEFAULT_NUM_MEMORIES_RETRIEVED,
     DEFAULT_RERANKING_FACTOR,
 )
 from common.embedding_service import get_embedding
-from database.long_term_memory.repository import (
-    get_all_long_term_memory_embeddings,
-    get_long_term_memories,
-)
+from database.long_term_memory.repository import get_long_term_memories
 from database.long_term_memory.schemas import LongTermMemoryRead
+from memory.embedding_index import EmbeddingIndex, embedding_index
 
 
 class MemoryRetrievalService:
@@ -21,6 +17,7 @@ class MemoryRetrievalService:
         num_memories: int = DEFAULT_NUM_MEMORIES_RETRIEVED,
         reranking_factor: float = DEFAULT_RERANKING_FACTOR,
         min_semantic_similarity: float = DEFAULT_MIN_SEMANTIC_SIMILARITY,
+        index: EmbeddingIndex = embedding_index,
     ) -> None:
         """
         Initialize the memory similarity service.
@@ -28,6 +25,8 @@ class MemoryRetrievalService:
         :param num_memories: The number of memories to return.
         :param reranking_factor: The multiplier for determining how many more memories to pull
             before reranking.
+        :param min_semantic_similarity: The minimum similarity of a memory to the query.
+        :param index: The index of the memory embeddings to search.
         """
         if num_memories < 1:
             raise ValueError("Number of memories must be greater than 0")
@@ -37,6 +36,7 @@ class MemoryRetrievalService:
         self.num_memories = num_memories
         self.num_to_rerank = int(self.num_memories * reranking_factor)
         self.min_semantic_similarity = min_semantic_similarity
+        self.index = index
 
     async def get_most_relevant_memories(
         self,
@@ -50,12 +50,15 @@ class MemoryRetrievalService:
         :param iteration: The current iteration of the Agent.
         :return: A list of the `num_memories` most relevant memories to the `query`.
         """
-        embeddings = await get_all_long_term_memory_embeddings()
-        if len(embeddings) <= self.num_memories:
-            return await get_long_term_memories(list(embeddings.keys()), iteration)
+        if len(self.index) <= self.num_memories:
+            return await get_long_term_memories(self.index.titles, iteration)
 
         query_embedding = await get_embedding(query)
-        top_similarities = await self._get_top_n_semantic_similarity(query_embedding, embeddings)
+        top_similarities = self.index.search(
+            query_embedding,
+            self.num_to_rerank,
+            self.min_semantic_similarity,
+        )
         if not top_similarities:
             return []
 
@@ -66,31 +69,6 @@ class MemoryRetrievalService:
         reranked_memories = self._rerank_memories(iteration, memories_to_rerank, top_similarities)
         return reranked_memories[: self.num_memories]
 
-    async def _get_top_n_semantic_similarity(
-        self,
-        query_embedding: list[float],
-        memory_embeddings: dict[str, list[float]],
-    ) -> dict[str, float]:
-        """
-        Get the IDs and semantic similarity of the most relevant memories to the query.
-
-        :param query_embedding: The embedding of the query.
-        :param memory_embeddings: The embeddings of the memories.
-        :return: A dictionary of the IDs and semantic similarity of the most relevant memories to
-            the query.
-        """
-        mem_ids, mem_embeddings = zip(*memory_embeddings.items(), strict=True)
-        mem_embeddings = np.array(mem_embeddings)
-        similarities = np.dot(query_embedding, mem_embeddings.T) / (
-            np.linalg.norm(query_embedding) * np.linalg.norm(mem_embeddings, axis=1)
-        )
-        top_n_ids = np.argsort(similarities)[-self.num_to_rerank :]
-        return {
-            mem_ids[i]: similarities[i]
-            for i in top_n_ids
-            if similarities[i] >= self.min_semantic_similarity
-        }
-
     def _rerank_memories(
         self,
         iteration: int,
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from memory.embedding_index import EmbeddingIndex
+
+
+@pytest.mark.unit
+def test_search_matches_a_full_scan() -> None:
+    """Test that the exact search finds the same memories as scoring every one of them."""
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(100, 8))
+    index = EmbeddingIndex()
+    for i, embedding in enumerate(embeddings):
+        index.add(f"memory {i}", embedding.tolist())
+    index.add("memory 0", embeddings[1].tolist())  # Replaces the embedding, keeping its row.
+
+    query = rng.normal(size=8)
+    results = index.search(query.tolist(), num_results=5)
+
+    embeddings[0] = embeddings[1]
+    similarities = embeddings @ query / (np.linalg.norm(embeddings, axis=1) * np.linalg.norm(query))
+    expected = {f"memory {i}": similarities[i] for i in np.argsort(similarities)[-5:]}
+    assert len(index) == 100  # noqa: PLR2004
+    assert results.keys() == expected.keys()
+    assert np.allclose([results[t] for t in expected], list(expected.values()), atol=1e-5)
+    assert not index.search(query.tolist(), num_results=5, min_similarity=1.0)
+
+
+@pytest.mark.unit
+def test_ivf_search_finds_the_nearest_cluster() -> None:
+    """Test that the approximate search still finds the nearest memories on clustered data."""
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(20, 32))
+    index = EmbeddingIndex(ivf_min_size=500, ivf_probes=3)
+    for i in range(1000):
+        index.add(f"memory {i}", (centers[i % 20] + 0.1 * rng.normal(size=32)).tolist())
+
+    results = index.search(centers[7].tolist(), num_results=10)
+    assert len(results) == 10  # noqa: PLR2004
+    assert all(int(title.split()[1]) % 20 == 7 for title in results)  # noqa: PLR2004
@@ -1,9 +1,13 @@
+from collections.abc import Container, Iterable
+from typing import Any
+
 import numpy as np
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, computed_field, field_validator, model_validator
 
 from common.constants import PLAYER_OFFSET_X, PLAYER_OFFSET_Y
 from common.enums import AsciiTile, BlockedDirection, FacingDirection, MapId, WarpType
 from common.schemas import Coords
+from common.tile_codes import ROW_SEPARATOR, TILE_CHARS, TILE_CODES, decode_tiles, encode_tiles
 from emulator.game_state import YellowLegacyGameState
 from emulator.schemas import AsciiScreenWithEntities, Sign, Sprite, Warp
 from overworld_map.prompts import LEGEND_MAP, OVERWORLD_MAP_STR_FORMAT
@@ -98,9 +102,9 @@ class OverworldWarp(Warp):
         raise ValueError(f"Unknown warp type: {self.warp_type}")
 
     @classmethod
-    def from_warp(cls, warp: Warp, visited_maps: list[MapId]) -> "OverworldWarp":
+    def from_warp(cls, warp: Warp, visited_maps: Container[MapId]) -> "OverworldWarp":
         """Create an overworld warp from a warp."""
-        # The OUTSIDE placeholder map is not in the DB, so we assume it's always visited.
+        # The OUTSIDE placeholder map is never visited itself, so we assume it's always visited.
         visited = warp.destination in visited_maps or warp.destination == MapId.OUTSIDE
         return cls(**warp.model_dump(), visited=visited)
 
@@ -118,10 +122,16 @@ class OverworldWarp(Warp):
 
 
 class OverworldMap(BaseModel):
-    """A map of a particular region of the overworld."""
+    """
+    A map of a particular region of the overworld.
+
+    The tiles are stored as one byte per tile (see `common.tile_codes`), which can be viewed as a
+    numpy array without a copy. They can be created, assigned, and serialized through
+    `ascii_tiles`, a read-only view of the tiles as one string per row.
+    """
 
     id: MapId
-    ascii_tiles: list[list[str]]
+    tile_codes: bytes = Field(exclude=True, repr=False)
     blockages: dict[Coords, BlockedDirection]
     known_sprites: dict[int, OverworldSprite]
     known_signs: dict[int, OverworldSign]
@@ -131,25 +141,95 @@ class OverworldMap(BaseModel):
     east_connection: MapId | None
     west_connection: MapId | None
 
+    @model_validator(mode="before")
+    @classmethod
+    def _from_ascii_tiles(cls, data: Any) -> Any:  # noqa: ANN401
+        """Encode the tiles if they were given as rows of characters."""
+        if isinstance(data, dict) and "ascii_tiles" in data:
+            data = {**data, "tile_codes": _encode_ascii_tiles(data["ascii_tiles"])}
+            del data["ascii_tiles"]
+        return data
+
+    @field_validator("tile_codes")
+    @classmethod
+    def _validate_tile_codes(cls, tile_codes: bytes) -> bytes:
+        """Check that the codes are all tiles, and that the rows are all the same length."""
+        if tile_codes.translate(None, bytes([*TILE_CODES.values(), ROW_SEPARATOR])):
+            raise ValueError("The map contains unknown tile codes.")
+        height = tile_codes.count(ROW_SEPARATOR) + 1
+        width = (len(tile_codes) + 1) // height - 1
+        # With the right total length, the rows are all the same width if every separator is at
+        # the end of a row.
+        if len(tile_codes) != height * (width + 1) - 1 or tile_codes[width :: width + 1] != bytes(
+            [ROW_SEPARATOR] * (height - 1),
+        ):
+            raise ValueError("All rows of the map must be the same width.")
+        return tile_codes
+
+    @computed_field
+    @property
+    def ascii_tiles(self) -> tuple[str, ...]:
+        """The tiles as one string per row, so `ascii_tiles[row][col]` is a single tile."""
+        return tuple(self.ascii_tiles_str.split("\n"))
+
+    @ascii_tiles.setter
+    def ascii_tiles(self, ascii_tiles: Iterable[Iterable[str]]) -> None:
+        self.tile_codes = self._validate_tile_codes(_encode_ascii_tiles(ascii_tiles))
+
     @property
     def height(self) -> int:
         """The height of the map."""
-        return len(self.ascii_tiles)
+        return self.tile_codes.count(ROW_SEPARATOR) + 1
 
     @property
     def width(self) -> int:
         """The width of the map."""
-        return len(self.ascii_tiles[0])
+        width = self.tile_codes.find(ROW_SEPARATOR)
+        return len(self.tile_codes) if width == -1 else width
+
+    @property
+    def tile_codes_ndarray(self) -> np.ndarray:
+        """A read-only view of the tile codes as a numpy array, without a copy."""
+        # Step over the separator at the end of each row.
+        return np.lib.stride_tricks.as_strided(
+            np.frombuffer(self.tile_codes, dtype=np.uint8),
+            shape=(self.height, self.width),
+            strides=(self.width + 1, 1),
+            writeable=False,
+        )
 
     @property
     def ascii_tiles_ndarray(self) -> np.ndarray:
-        """The ascii tiles as a numpy array."""
-        return np.array(self.ascii_tiles)
+        """The ascii tiles as a new numpy array of characters."""
+        return TILE_CHARS[self.tile_codes_ndarray]
 
     @property
     def ascii_tiles_str(self) -> str:
         """The ascii tiles as a string."""
-        return "\n".join("".join(row) for row in self.ascii_tiles)
+        return decode_tiles(self.tile_codes)
+
+    def update_tiles(self, top: int, left: int, ascii_tiles: np.ndarray) -> bool:
+        """
+        Overwrite a window of the map with new tiles.
+
+        :param top: The row of the top of the window.
+        :param left: The column of the left of the window.
+        :param ascii_tiles: A 2D array of the new tile characters.
+        :return: Whether any of the tiles changed.
+        """
+        height, width = ascii_tiles.shape
+        new_codes = np.frombuffer(encode_tiles("".join(ascii_tiles.ravel().tolist())), np.uint8)
+        window = self.tile_codes_ndarray[top : top + height, left : left + width]
+        if np.array_equal(window, new_codes.reshape(height, width)):
+            return False
+
+        # Each row is followed by a separator, except for the last, so add one to make it even.
+        codes = bytearray(self.tile_codes)
+        codes.append(ROW_SEPARATOR)
+        padded = np.frombuffer(codes, dtype=np.uint8).reshape(self.height, self.width + 1)
+        padded[top : top + height, left : left + width] = new_codes.reshape(height, width)
+        self.tile_codes = bytes(codes[:-1])
+        return True
 
     def to_string(self, game_state: YellowLegacyGameState) -> str:
         """Return a string representation of the map."""
@@ -157,7 +237,7 @@ class OverworldMap(BaseModel):
         legend = self._get_legend()
         screen = game_state.get_ascii_screen()
         facing_tile, facing_tile_coords = self._get_facing_tile_notes(game_state)
-        explored_percentage = np.mean(self.ascii_tiles_ndarray != AsciiTile.UNSEEN)
+        explored_percentage = np.mean(self.tile_codes_ndarray != TILE_CODES[AsciiTile.UNSEEN])
         tile_above, blocked_above = self._get_tile_notes(BlockedDirection.UP, screen)
         tile_below, blocked_below = self._get_tile_notes(BlockedDirection.DOWN, screen)
         tile_left, blocked_left = self._get_tile_notes(BlockedDirection.LEFT, screen)
@@ -194,7 +274,7 @@ class OverworldMap(BaseModel):
 
     def _get_legend(self) -> str:
         """Get a string representation of the legend based on the tiles on the map."""
-        tiles = {AsciiTile(t) for row in self.ascii_tiles for t in row} | _ALWAYS_VISIBLE_TILES
+        tiles = {AsciiTile(t) for t in set(self.ascii_tiles_str) - {"\n"}} | _ALWAYS_VISIBLE_TILES
         return "\n".join(f'- "{t}": {LEGEND_MAP[t]}' for t in tiles)
 
     def _get_facing_tile_notes(self, game_state: YellowLegacyGameState) -> tuple[str, Coords]:
@@ -242,9 +322,10 @@ class OverworldMap(BaseModel):
     def _get_sprite_notes(self) -> str:
         """Get the notes for the sprites on the map, sorted by index."""
         out = ""
-        if np.isin(AsciiTile.PC_TILE, self.ascii_tiles_ndarray):
+        pc_tiles = np.argwhere(self.tile_codes_ndarray == TILE_CODES[AsciiTile.PC_TILE])
+        if pc_tiles.size:
             # This is a bit of a hack, but the model really struggles to find the PC otherwise.
-            loc = np.argwhere(self.ascii_tiles_ndarray == AsciiTile.PC_TILE)[0]
+            loc = pc_tiles[0]
             out += (
                 f"- There is a PC at {Coords(row=loc[0], col=loc[1])}. It can only be interacted"
                 f" with from below.\n"
@@ -298,3 +379,8 @@ class OverworldMap(BaseModel):
             " a building or cave)."
         )
         return out.strip()
+
+
+def _encode_ascii_tiles(ascii_tiles: Iterable[Iterable[str]]) -> bytes:
+    """Encode rows of tile characters, which may be lists of characters or strings."""
+    return encode_tiles("\n".join(r if isinstance(r, str) else "".join(r) for r in ascii_tiles))
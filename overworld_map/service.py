@@ -1,33 +1,22 @@
 import asyncio
 
 from common.enums import AsciiTile, MapEntityType
-from database.map_entity_memory.repository import (
-    create_map_entity_memory,
-    delete_map_entity_memory,
-    get_map_entity_memories_for_map,
-)
 from database.map_entity_memory.schemas import MapEntityMemoryCreate, MapEntityMemoryDelete
-from database.map_memory.repository import (
-    create_map_memory,
-    get_map_memory,
-    get_visited_maps,
-    update_map_tiles,
-)
-from database.map_memory.schemas import MapMemoryCreateUpdate
 from emulator.game_state import YellowLegacyGameState
 from overworld_map.schemas import OverworldMap, OverworldSign, OverworldSprite, OverworldWarp
+from overworld_map.store import map_store
 
 
 async def get_overworld_map(iteration: int, game_state: YellowLegacyGameState) -> OverworldMap:
     """
-    Get the overworld map from the game state, loading the relevant memories from the database if
+    Get the overworld map from the game state, loading the relevant memories from the map store if
     the map is known, otherwise creating a new one.
     """
-    map_memory = await get_map_memory(game_state.map.id)
+    map_memory = map_store.get_map(game_state.map.id)
     if map_memory is None:
-        return await _create_overworld_map_from_game_state(iteration, game_state)
+        return _create_overworld_map_from_game_state(iteration, game_state)
 
-    map_entity_memories = await get_map_entity_memories_for_map(map_memory.map_id)
+    map_entity_memories = map_store.get_entities(map_memory.map_id)
 
     game_sprites = game_state.sprites
     sprites = {
@@ -37,9 +26,8 @@ async def get_overworld_map(iteration: int, game_state: YellowLegacyGameState) -
     }
 
     game_warps = game_state.warps
-    visited_maps = await get_visited_maps()
     warps = {
-        mem.entity_id: OverworldWarp.from_warp(game_warps[mem.entity_id], visited_maps)
+        mem.entity_id: OverworldWarp.from_warp(game_warps[mem.entity_id], map_store.visited_maps)
         for mem in map_entity_memories
         if mem.entity_type == MapEntityType.WARP and mem.entity_id in game_warps
     }
@@ -53,7 +41,7 @@ async def get_overworld_map(iteration: int, game_state: YellowLegacyGameState) -
 
     return OverworldMap(
         id=map_memory.map_id,
-        ascii_tiles=[list(row) for row in map_memory.tiles.split("\n")],
+        tile_codes=map_memory.tiles,
         blockages=map_memory.blockages,
         known_sprites=sprites,
         known_warps=warps,
@@ -77,7 +65,7 @@ async def update_map_with_screen_info(
     """
     if not game_state.is_text_on_screen() and overworld_map.id == game_state.map.id:
         await _add_remove_map_entities(iteration, game_state, overworld_map)
-        await _update_overworld_map_tiles(iteration, game_state, overworld_map)
+        _update_overworld_map_tiles(iteration, game_state, overworld_map)
     return await get_overworld_map(iteration, game_state)
 
 
@@ -95,7 +83,7 @@ async def _add_remove_map_entities(
     tasks = []
     tasks.extend(
         [
-            create_map_entity_memory(
+            map_store.add_entity(
                 MapEntityMemoryCreate(
                     iteration=iteration,
                     map_id=overworld_map.id,
@@ -109,7 +97,7 @@ async def _add_remove_map_entities(
     )
     tasks.extend(
         [
-            create_map_entity_memory(
+            map_store.add_entity(
                 MapEntityMemoryCreate(
                     iteration=iteration,
                     map_id=overworld_map.id,
@@ -123,7 +111,7 @@ async def _add_remove_map_entities(
     )
     tasks.extend(
         [
-            create_map_entity_memory(
+            map_store.add_entity(
                 MapEntityMemoryCreate(
                     iteration=iteration,
                     map_id=overworld_map.id,
@@ -140,7 +128,7 @@ async def _add_remove_map_entities(
     # be de-rendered.
     tasks.extend(
         [
-            delete_map_entity_memory(
+            map_store.delete_entity(
                 MapEntityMemoryDelete(
                     map_id=overworld_map.id,
                     entity_id=s.index,
@@ -154,7 +142,7 @@ async def _add_remove_map_entities(
     await asyncio.gather(*tasks)
 
 
-async def _update_overworld_map_tiles(
+def _update_overworld_map_tiles(
     iteration: int,
     game_state: YellowLegacyGameState,
     overworld_map: OverworldMap,
@@ -172,12 +160,12 @@ async def _update_overworld_map_tiles(
     width = game_state.map.width
 
     # We have to convert the blockages from screen coordinates to map coordinates before we crop.
-    overworld_map.blockages.update(
-        {
-            coord + (top, left): block  # noqa: RUF005
-            for coord, block in ascii_screen_with_entities.blockages.items()
-        }
-    )
+    blockages = {
+        coord + (top, left): block  # noqa: RUF005
+        for coord, block in ascii_screen_with_entities.blockages.items()
+    }
+    is_blockage_changed = any(overworld_map.blockages.get(c) != b for c, b in blockages.items())
+    overworld_map.blockages.update(blockages)
 
     # Crop the screen to the area that's part of the current map.
     if top < 0:
@@ -193,21 +181,13 @@ async def _update_overworld_map_tiles(
         ascii_screen = ascii_screen[:, : width - right]
         right = width
 
-    overworld_screen_tiles = overworld_map.ascii_tiles_ndarray
-    overworld_screen_tiles[top:bottom, left:right] = ascii_screen
-    overworld_map.ascii_tiles = overworld_screen_tiles.tolist()
-
-    await update_map_tiles(
-        MapMemoryCreateUpdate(
-            iteration=iteration,
-            map_id=overworld_map.id,
-            tiles=overworld_map.ascii_tiles_str,
-            blockages={str(coord): block for coord, block in overworld_map.blockages.items()},
-        ),
-    )
+    # Most steps only reveal tiles that are already known, so there's nothing to remember.
+    is_tile_changed = overworld_map.update_tiles(top, left, ascii_screen)
+    if is_tile_changed or is_blockage_changed:
+        map_store.set_map(iteration, overworld_map)
 
 
-async def _create_overworld_map_from_game_state(
+def _create_overworld_map_from_game_state(
     iteration: int,
     game_state: YellowLegacyGameState,
 ) -> OverworldMap:
@@ -225,12 +205,5 @@ async def _create_overworld_map_from_game_state(
         east_connection=game_state.map.east_connection,
         west_connection=game_state.map.west_connection,
     )
-    await create_map_memory(
-        MapMemoryCreateUpdate(
-            iteration=iteration,
-            map_id=overworld_map.id,
-            tiles=overworld_map.ascii_tiles_str,
-            blockages={str(coord): block for coord, block in overworld_map.blockages.items()},
-        ),
-    )
+    map_store.set_map(iteration, overworld_map)
     return overworld_map
@@ -0,0 +1,211 @@
+from collections.abc import Set as AbstractSet
+
+from loguru import logger
+
+from common.enums import MapEntityType, MapId
+from database.map_entity_memory.repository import (
+    create_map_entity_memory,
+    delete_map_entity_memory,
+    get_all_map_entity_memories,
+    update_map_entity_memory,
+)
+from database.map_entity_memory.schemas import (
+    MapEntityMemoryCreate,
+    MapEntityMemoryDelete,
+    MapEntityMemoryRead,
+    MapEntityMemoryUpdate,
+)
+from database.map_memory.repository import (
+    create_map_memory,
+    get_all_map_memories,
+    update_map_tiles,
+)
+from database.map_memory.schemas import MapMemoryCreateUpdate, MapMemoryRead
+from database.map_tile_delta.repository import (
+    create_map_tile_delta,
+    delete_map_tile_deltas,
+    get_all_map_tile_deltas,
+)
+from database.map_tile_delta.schemas import MapTileDeltaCreate
+from overworld_map.schemas import OverworldMap
+from overworld_map.tile_delta import TileDelta
+
+type _EntityKey = tuple[MapEntityType, int]
+
+# After this many deltas, a map is written out in full and its deltas are deleted, so that loading
+# it doesn't have to replay a long history.
+_MAX_DELTAS_PER_MAP = 100
+
+
+class MapStore:
+    """
+    The agent's map memories, kept in memory as the source of truth and checkpointed to the DB.
+
+    The tiles of a map change on every step the player takes, so they are only marked as dirty and
+    written back by `checkpoint`, once per map however many times they changed. Only the tiles and
+    blockages that changed since the last checkpoint are written, as a delta on top of the map's
+    last full write. Entity memories change rarely, so they are written through to the DB straight
+    away.
+    """
+
+    def __init__(self) -> None:
+        self._maps: dict[MapId, MapMemoryRead] = {}
+        self._entities: dict[MapId, dict[_EntityKey, MapEntityMemoryRead]] = {}
+        self._persisted_maps: dict[MapId, MapMemoryRead] = {}  # As of the last checkpoint.
+        self._delta_counts: dict[MapId, int] = {}
+        self._dirty_maps: dict[MapId, int] = {}  # The iteration of each map's latest change.
+
+    @property
+    def visited_maps(self) -> AbstractSet[MapId]:
+        """The maps that have been visited, as a live view that updates as new maps are added."""
+        return self._maps.keys()
+
+    @property
+    def dirty_maps(self) -> AbstractSet[MapId]:
+        """The maps with changes that haven't been checkpointed yet."""
+        return self._dirty_maps.keys()
+
+    async def load(self) -> None:
+        """Replace the contents of the store with the map memories in the DB."""
+        map_memories = await get_all_map_memories()
+        tile_deltas = await get_all_map_tile_deltas()
+        entity_memories = await get_all_map_entity_memories()
+
+        self._maps = {m.map_id: m for m in map_memories}
+        self._delta_counts = {}
+        for tile_delta in tile_deltas:
+            delta = TileDelta.model_validate(tile_delta, from_attributes=True)
+            self._maps[tile_delta.map_id] = delta.apply(self._maps[tile_delta.map_id])
+            self._delta_counts[tile_delta.map_id] = self._delta_counts.get(tile_delta.map_id, 0) + 1
+        self._entities = {}
+        for mem in entity_memories:
+            self._entities.setdefault(mem.map_id, {})[mem.entity_type, mem.entity_id] = mem
+        self._persisted_maps = dict(self._maps)
+        self._dirty_maps = {}
+        logger.info(
+            f"Loaded {len(map_memories)} maps with {len(tile_deltas)} tile deltas and"
+            f" {len(entity_memories)} map entities into memory.",
+        )
+
+    def get_map(self, map_id: MapId) -> MapMemoryRead | None:
+        """
+        Get the memory of a map.
+
+        :param map_id: The map to get.
+        :return: The map memory, or None if the map hasn't been visited.
+        """
+        return self._maps.get(map_id)
+
+    def get_entities(self, map_id: MapId) -> list[MapEntityMemoryRead]:
+        """
+        Get the entity memories of a map.
+
+        :param map_id: The map to get the entities of.
+        :return: The known entities of the map.
+        """
+        return list(self._entities.get(map_id, {}).values())
+
+    def set_map(self, iteration: int, overworld_map: OverworldMap) -> None:
+        """
+        Set the tiles and blockages of a map, adding it if it's new. The change is written to the
+        DB on the next checkpoint.
+
+        :param iteration: The current iteration.
+        :param overworld_map: The map to remember.
+        """
+        self._maps[overworld_map.id] = MapMemoryRead(
+            map_id=overworld_map.id,
+            tiles=overworld_map.tile_codes,
+            blockages=dict(overworld_map.blockages),
+        )
+        self._dirty_maps[overworld_map.id] = iteration
+
+    async def add_entity(self, map_entity: MapEntityMemoryCreate) -> None:
+        """
+        Add a newly seen entity.
+
+        :param map_entity: The entity to add.
+        """
+        mem = await create_map_entity_memory(map_entity)
+        self._entities.setdefault(mem.map_id, {})[mem.entity_type, mem.entity_id] = mem
+
+    async def update_entity(self, map_entity: MapEntityMemoryUpdate) -> None:
+        """
+        Update the description of a known entity.
+
+        :param map_entity: The entity to update.
+        """
+        mem = await update_map_entity_memory(map_entity)
+        self._entities.setdefault(mem.map_id, {})[mem.entity_type, mem.entity_id] = mem
+
+    async def delete_entity(self, map_entity: MapEntityMemoryDelete) -> None:
+        """
+        Forget a known entity.
+
+        :param map_entity: The entity to forget.
+        """
+        await delete_map_entity_memory(map_entity)
+        self._entities.get(map_entity.map_id, {}).pop(
+            (map_entity.entity_type, map_entity.entity_id),
+            None,
+        )
+
+    async def checkpoint(self) -> int:
+        """
+        Write the maps that changed since the last checkpoint to the DB. A new map is written in
+        full, and a known one as a delta, unless it has enough deltas that it's time to compact
+        them into a full write.
+
+        :return: The number of maps that were written.
+        """
+        writes = 0
+        for map_id, iteration in list(self._dirty_maps.items()):
+            map_memory = self._maps[map_id]
+            persisted = self._persisted_maps.get(map_id)
+            if persisted is None:
+                await create_map_memory(_get_create_update(iteration, map_memory))
+                writes += 1
+            elif not (delta := TileDelta.from_maps(persisted, map_memory)).is_empty:
+                await self._write_delta(iteration, map_memory, delta)
+                writes += 1
+            self._persisted_maps[map_id] = map_memory
+            del self._dirty_maps[map_id]  # Only once it's written, so a failed write is retried.
+        return writes
+
+    async def _write_delta(
+        self,
+        iteration: int,
+        map_memory: MapMemoryRead,
+        delta: TileDelta,
+    ) -> None:
+        """Write the changes to a map as a delta, or in full to compact its deltas."""
+        delta_count = self._delta_counts.get(map_memory.map_id, 0)
+        if delta_count >= _MAX_DELTAS_PER_MAP:
+            await update_map_tiles(_get_create_update(iteration, map_memory))
+            await delete_map_tile_deltas(map_memory.map_id)
+            self._delta_counts[map_memory.map_id] = 0
+            return
+
+        await create_map_tile_delta(
+            MapTileDeltaCreate(
+                map_id=map_memory.map_id,
+                positions=delta.positions,
+                tiles=delta.tiles,
+                blockages=delta.blockages,
+                iteration=iteration,
+            ),
+        )
+        self._delta_counts[map_memory.map_id] = delta_count + 1
+
+
+def _get_create_update(iteration: int, map_memory: MapMemoryRead) -> MapMemoryCreateUpdate:
+    """Get the schema to write a map memory in full."""
+    return MapMemoryCreateUpdate(
+        iteration=iteration,
+        map_id=map_memory.map_id,
+        tiles=map_memory.tiles,
+        blockages={str(coord): block for coord, block in map_memory.blockages.items()},
+    )
+
+
+map_store = MapStore()
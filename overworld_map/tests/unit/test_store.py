@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from common.enums import AsciiTile, BlockedDirection, MapEntityType, MapId
+from common.schemas import Coords
+from database.map_entity_memory.schemas import MapEntityMemoryCreate, MapEntityMemoryUpdate
+from overworld_map.schemas import OverworldMap
+from overworld_map.store import MapStore
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_checkpoint_writes_each_dirty_map_once() -> None:
+    """Test that the tiles are only written on a checkpoint, and then loaded back from the DB."""
+    store = MapStore()
+    overworld_map = _get_overworld_map()
+    store.set_map(0, overworld_map)
+    overworld_map.update_tiles(0, 0, np.array([[AsciiTile.FREE.value]]))
+    overworld_map.blockages[Coords(row=0, col=0)] = BlockedDirection.UP
+    store.set_map(1, overworld_map)
+
+    assert store.dirty_maps == {MapId.PALLET_TOWN}
+    assert await store.checkpoint() == 1
+    assert not store.dirty_maps
+    assert await store.checkpoint() == 0
+
+    store.set_map(2, overworld_map)
+    assert await store.checkpoint() == 0  # Nothing changed since the last checkpoint.
+
+    overworld_map.update_tiles(1, 2, np.array([[AsciiTile.WALL.value]]))
+    store.set_map(3, overworld_map)
+    assert await store.checkpoint() == 1  # Now a delta on top of the map that was created.
+
+    loaded = MapStore()
+    await loaded.load()
+    map_memory = loaded.get_map(MapId.PALLET_TOWN)
+    assert map_memory is not None
+    assert map_memory.tiles == overworld_map.tile_codes
+    assert map_memory.blockages == {Coords(row=0, col=0): BlockedDirection.UP}
+    assert MapId.PALLET_TOWN in loaded.visited_maps
+    assert not loaded.dirty_maps
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("temporary_db")
+async def test_entities_are_written_through() -> None:
+    """Test that the entity memories are kept in memory and in the DB."""
+    store = MapStore()
+    await store.add_entity(
+        MapEntityMemoryCreate(
+            map_id=MapId.PALLET_TOWN,
+            entity_id=1,
+            entity_type=MapEntityType.SIGN,
+            iteration=0,
+        ),
+    )
+    await store.update_entity(
+        MapEntityMemoryUpdate(
+            map_id=MapId.PALLET_TOWN,
+            entity_id=1,
+            entity_type=MapEntityType.SIGN,
+            description="A sign.",
+            iteration=1,
+        ),
+    )
+    assert [e.description for e in store.get_entities(MapId.PALLET_TOWN)] == ["A sign."]
+
+    loaded = MapStore()
+    await loaded.load()
+    assert loaded.get_entities(MapId.PALLET_TOWN) == store.get_entities(MapId.PALLET_TOWN)
+    assert loaded.get_entities(MapId.VIRIDIAN_CITY) == []
+
+
+def _get_overworld_map() -> OverworldMap:
+    return OverworldMap(
+        id=MapId.PALLET_TOWN,
+        ascii_tiles=[[AsciiTile.UNSEEN.value] * 3] * 2,
+        blockages={},
+        known_sprites={},
+        known_warps={},
+        known_signs={},
+        north_connection=None,
+        south_connection=None,
+        east_connection=None,
+        west_connection=None,
+    )
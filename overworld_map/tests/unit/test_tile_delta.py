@@ -0,0 +1,35 @@
+import pytest
+
+from common.enums import AsciiTile, BlockedDirection, MapId
+from common.schemas import Coords
+from common.tile_codes import encode_tiles
+from database.map_memory.schemas import MapMemoryRead
+from overworld_map.tile_delta import TileDelta
+
+
+@pytest.mark.unit
+def test_delta_only_holds_what_changed() -> None:
+    """Test that a delta packs the changed tiles and blockages, and replays them."""
+    unseen, free, wall = AsciiTile.UNSEEN.value, AsciiTile.FREE.value, AsciiTile.WALL.value
+    old = _get_map_memory(
+        f"{unseen * 3}\n{unseen * 3}",
+        {Coords(row=0, col=0): BlockedDirection.UP},
+    )
+    new = _get_map_memory(
+        f"{free}{unseen * 2}\n{unseen * 2}{wall}",
+        {Coords(row=0, col=0): BlockedDirection.UP, Coords(row=1, col=2): BlockedDirection.DOWN},
+    )
+
+    delta = TileDelta.from_maps(old, new)
+    assert len(delta.positions) == 2 * 4
+    assert len(delta.tiles) == 2  # noqa: PLR2004
+    assert delta.blockages == {Coords(row=1, col=2): BlockedDirection.DOWN}
+    assert delta.apply(old) == new
+    assert TileDelta.from_maps(new, new).is_empty
+
+
+def _get_map_memory(
+    tiles: str,
+    blockages: dict[Coords, BlockedDirection],
+) -> MapMemoryRead:
+    return MapMemoryRead(map_id=MapId.PALLET_TOWN, tiles=encode_tiles(tiles), blockages=blockages)
@@ -0,0 +1,70 @@
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+from common.enums import BlockedDirection
+from common.schemas import Coords
+from database.map_memory.schemas import MapMemoryRead
+
+# Positions are indices into the encoded tiles, which can be longer than 64K for the biggest maps.
+_POSITION_DTYPE = np.dtype("<u4")
+
+
+class TileDelta(BaseModel):
+    """
+    The tiles and blockages that changed between two versions of a map, packed so that it can be
+    stored in a few bytes instead of rewriting the whole map.
+    """
+
+    positions: bytes  # The index of each changed tile in the encoded tiles.
+    tiles: bytes  # The new code of each changed tile.
+    blockages: dict[Coords, BlockedDirection]  # The new or changed blockages.
+
+    model_config = ConfigDict(frozen=True)
+
+    @classmethod
+    def from_maps(cls, old: MapMemoryRead, new: MapMemoryRead) -> "TileDelta":
+        """
+        Get the changes from one version of a map to the next.
+
+        :param old: The earlier version of the map.
+        :param new: The later version of the map.
+        :return: The delta that turns the old version into the new one.
+        """
+        if len(old.tiles) != len(new.tiles):
+            raise ValueError(f"The size of map {new.map_id} changed, so it can't be diffed.")
+
+        old_codes = np.frombuffer(old.tiles, dtype=np.uint8)
+        new_codes = np.frombuffer(new.tiles, dtype=np.uint8)
+        positions = np.flatnonzero(old_codes != new_codes)
+        return cls(
+            positions=positions.astype(_POSITION_DTYPE).tobytes(),
+            tiles=new_codes[positions].tobytes(),
+            blockages={
+                coords: block
+                for coords, block in new.blockages.items()
+                if old.blockages.get(coords) != block
+            },
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether nothing changed."""
+        return not self.tiles and not self.blockages
+
+    def apply(self, map_memory: MapMemoryRead) -> MapMemoryRead:
+        """
+        Apply the changes to a version of the map.
+
+        :param map_memory: The version of the map that the delta was taken from.
+        :return: The new version of the map.
+        """
+        codes = np.frombuffer(map_memory.tiles, dtype=np.uint8).copy()
+        codes[np.frombuffer(self.positions, dtype=_POSITION_DTYPE)] = np.frombuffer(
+            self.tiles,
+            dtype=np.uint8,
+        )
+        return MapMemoryRead(
+            map_id=map_memory.map_id,
+            tiles=codes.tobytes(),
+            blockages={**map_memory.blockages, **self.blockages},
+        )
@@ -0,0 +1,75 @@
+"""
+Compare the total time spent waiting for animations on a replayed run, between the old polling
+loop (five identical screens, 150 ms apart) and the frame-synchronous stability detector.
+
+The run is replayed from a save state with the same buttons for both, e.g. `--buttons a a up up`.
+
+Run with `python -m scripts.benchmarks.animation_waits <path to .state file> --buttons ...`.
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from common.constants import DEFAULT_ROM_PATH
+from common.enums import Button
+from emulator.emulator import YellowLegacyEmulator
+
+
+def main() -> None:
+    """Replay the buttons with each waiting strategy and log the time spent waiting."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("save_state", type=Path)
+    parser.add_argument("--rom-path", default=DEFAULT_ROM_PATH)
+    parser.add_argument("--buttons", nargs="+", type=Button, required=True)
+    args = parser.parse_args()
+
+    legacy_seconds = asyncio.run(_replay(args.rom_path, args.save_state, args.buttons, legacy=True))
+    new_seconds = asyncio.run(_replay(args.rom_path, args.save_state, args.buttons, legacy=False))
+    logger.info(
+        f"{len(args.buttons)} button presses."
+        f" Polling: {legacy_seconds:.2f}s waiting."
+        f" Frame-synchronous: {new_seconds:.2f}s waiting.",
+    )
+
+
+async def _replay(rom_path: str, save_state: Path, buttons: list[Button], *, legacy: bool) -> float:
+    """Replay the buttons from the save state and get the total time spent waiting."""
+    async with YellowLegacyEmulator(
+        rom_path,
+        save_state_path=save_state,
+        mute_sound=True,
+        headless=True,
+    ) as emulator:
+        total = 0.0
+        for button in buttons:
+            await emulator.press_button(button, wait_for_animation=not legacy)
+            if legacy:
+                start = time.perf_counter()
+                await _wait_by_polling(emulator)
+                total += time.perf_counter() - start
+        if not legacy:
+            total = sum(emulator.animation_watcher.total_seconds.values())
+            logger.info(f"Frame-synchronous waits by context: {emulator.animation_watcher}")
+        return total
+
+
+async def _wait_by_polling(emulator: YellowLegacyEmulator) -> None:
+    """The old way of waiting for animations, which needs five identical screens in a row."""
+    successes = 0
+    required_successes = 5
+    while successes < required_successes:
+        game_state = emulator.get_game_state()
+        await asyncio.sleep(0.15)
+        new_game_state = emulator.get_game_state()
+        if game_state.screen.tiles_without_cursor == new_game_state.screen.tiles_without_cursor:
+            successes += 1
+        else:
+            successes = 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Compare the time spent in the database for a typical iteration's repository calls, with each call
+committing on its own and with all of them in one unit of work, against a fresh database file.
+
+Run with `python -m scripts.benchmarks.db_iteration`.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from common.enums import MapEntityType, MapId
+from database.base import SQLAlchemyBase
+from database.db_config import db_sessionmaker, unit_of_work
+from database.llm_messages.model import LLMMessageDBModel  # noqa: F401
+from database.llm_messages.repository import create_llm_message
+from database.llm_messages.schemas import LLMMessageCreate
+from database.long_term_memory.model import LongTermMemoryDBModel  # noqa: F401
+from database.long_term_memory.repository import get_all_long_term_memory_embeddings
+from database.map_entity_memory.model import MapEntityMemoryDBModel  # noqa: F401
+from database.map_entity_memory.repository import create_map_entity_memory
+from database.map_entity_memory.schemas import MapEntityMemoryCreate
+from database.map_memory.model import MapMemoryDBModel  # noqa: F401
+from database.map_memory.repository import create_map_memory, update_map_tiles
+from database.map_memory.schemas import MapMemoryCreateUpdate
+from llm.schemas import GEMINI_FLASH_2_5
+
+# Approximate repository calls per overworld iteration: a few new entities on entering a map, the
+# tile update, one message per LLM call, and a memory retrieval.
+_ENTITIES_PER_ITERATION = 4
+_LLM_MESSAGES_PER_ITERATION = 3
+
+
+def main() -> None:
+    """Time the iterations with and without a unit of work."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    for use_unit_of_work in (False, True):
+        seconds = asyncio.run(_run(args.iterations, use_unit_of_work=use_unit_of_work))
+        logger.info(
+            f"unit of work: {use_unit_of_work!s:>5}"
+            f" time per iteration: {seconds / args.iterations * 1e3:.2f}ms",
+        )
+
+
+async def _run(iterations: int, *, use_unit_of_work: bool) -> float:
+    """Run the iterations against a fresh database and get the total time they took."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp_dir) / 'benchmark.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLAlchemyBase.metadata.create_all)
+        db_sessionmaker.configure(bind=engine)
+
+        map_memory = MapMemoryCreateUpdate(
+            map_id=MapId.PALLET_TOWN,
+            tiles=bytes(400),
+            blockages={},
+            iteration=0,
+        )
+        await create_map_memory(map_memory)
+
+        start = time.perf_counter()
+        for iteration in range(iterations):
+            if use_unit_of_work:
+                async with unit_of_work():
+                    await _run_iteration(iteration, map_memory)
+            else:
+                await _run_iteration(iteration, map_memory)
+        seconds = time.perf_counter() - start
+
+        await engine.dispose()
+        return seconds
+
+
+async def _run_iteration(iteration: int, map_memory: MapMemoryCreateUpdate) -> None:
+    """Make one iteration's worth of repository calls."""
+    await asyncio.gather(
+        *[
+            create_map_entity_memory(
+                MapEntityMemoryCreate(
+                    map_id=MapId.PALLET_TOWN,
+                    entity_id=iteration * _ENTITIES_PER_ITERATION + i,
+                    entity_type=MapEntityType.SPRITE,
+                    iteration=iteration,
+                ),
+            )
+            for i in range(_ENTITIES_PER_ITERATION)
+        ],
+    )
+    await update_map_tiles(map_memory.model_copy(update={"iteration": iteration}))
+    await get_all_long_term_memory_embeddings()
+    for _ in range(_LLM_MESSAGES_PER_ITERATION):
+        await create_llm_message(
+            LLMMessageCreate(
+                model=GEMINI_FLASH_2_5,
+                prompt_name="benchmark",
+                prompt="prompt",
+                response="response",
+                prompt_tokens=1000,
+                thought_tokens=100,
+                response_tokens=100,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
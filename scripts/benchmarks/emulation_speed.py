@@ -0,0 +1,63 @@
+"""
+Compare the wall time of replaying the same button presses from a save state at different emulation
+speeds, the way the integration tests drive the emulator, e.g. `--buttons up up left a`.
+
+Run with `python -m scripts.benchmarks.emulation_speed <path to .state file> --buttons ...`.
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from common.constants import DEFAULT_ROM_PATH
+from common.enums import Button
+from emulator.emulator import YellowLegacyEmulator
+
+
+def main() -> None:
+    """Replay the buttons at each speed and log the wall time and the emulated frames."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("save_state", type=Path)
+    parser.add_argument("--rom-path", default=DEFAULT_ROM_PATH)
+    parser.add_argument("--buttons", nargs="+", type=Button, required=True)
+    parser.add_argument("--speeds", nargs="+", type=int, default=[1, 4, 0])
+    args = parser.parse_args()
+
+    for speed in args.speeds:
+        seconds, frames = asyncio.run(
+            _replay(args.rom_path, args.save_state, args.buttons, speed=speed),
+        )
+        logger.info(
+            f"speed: {speed or 'unlimited':>9} time: {seconds:6.2f}s frames: {frames:>6}"
+            f" ({frames / seconds:.0f} fps)",
+        )
+
+
+async def _replay(
+    rom_path: str,
+    save_state: Path,
+    buttons: list[Button],
+    *,
+    speed: int,
+) -> tuple[float, int]:
+    """Replay the buttons from the save state and get the wall time and the frames it took."""
+    async with YellowLegacyEmulator(
+        rom_path,
+        save_state_path=save_state,
+        mute_sound=True,
+        headless=True,
+        speed=speed,
+    ) as emulator:
+        start_frames = emulator.get_frame_stats().frames
+        start = time.perf_counter()
+        for button in buttons:
+            await emulator.press_button(button)
+        seconds = time.perf_counter() - start
+        return seconds, emulator.get_frame_stats().frames - start_frames
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compare the cost of the derived game state views (screen text, ASCII screen, etc.) with and without
+per-snapshot memoization, using the number of calls made in a typical overworld iteration.
+
+Run with `python -m scripts.benchmarks.game_state_memoization <path to .state file>`.
+"""
+
+import argparse
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+from loguru import logger
+from pyboy import PyBoy
+
+from common.constants import DEFAULT_ROM_PATH
+from emulator.game_state import YellowLegacyGameState
+from emulator.memory import MemorySnapshot
+from emulator.parsers.screen import Screen
+
+# Approximate call counts per overworld iteration: the map update and two map prompts each render
+# the ASCII screen, text checks run in routing and in several services, and every animation wait
+# compares the tiles at least ten times.
+_CALLS_PER_ITERATION = {
+    "get_ascii_screen": 4,
+    "screen.text": 6,
+    "screen.is_dialog_box_on_screen": 2,
+    "screen.tiles_without_cursor": 10,
+}
+
+
+def main() -> None:
+    """Time a typical iteration's worth of calls with and without memoization."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("save_state", type=Path)
+    parser.add_argument("--rom-path", default=DEFAULT_ROM_PATH)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    pyboy = PyBoy(args.rom_path, window="null", sound_volume=0)
+    with args.save_state.open("rb") as f:
+        pyboy.load_state(f)
+    pyboy.tick()
+    snapshot = MemorySnapshot.from_memory(pyboy.memory)
+    pyboy.stop(save=False)
+
+    for label, calls in [("uncached", _UNCACHED_CALLS), ("memoized", _CACHED_CALLS)]:
+        # A fresh game state per run, since the memoized views live on the snapshot.
+        states = iter(
+            [YellowLegacyGameState.from_snapshot(snapshot) for _ in range(args.iterations)]
+        )
+        seconds = timeit.timeit(
+            lambda calls=calls: _run_iteration(next(states), calls),  # noqa: B023
+            number=args.iterations,
+        )
+        logger.info(f"{label:<10} {seconds / args.iterations * 1e6:8.1f} us/iteration")
+
+
+def _run_iteration(
+    game_state: YellowLegacyGameState,
+    calls: dict[str, Callable[[YellowLegacyGameState], object]],
+) -> None:
+    for name, count in _CALLS_PER_ITERATION.items():
+        for _ in range(count):
+            calls[name](game_state)
+
+
+_UNCACHED_CALLS: dict[str, Callable[[YellowLegacyGameState], object]] = {
+    "get_ascii_screen": lambda gs: YellowLegacyGameState.__dict__["_ascii_screen"].func(gs),
+    "screen.text": lambda gs: Screen.__dict__["text"].func(gs.screen),
+    "screen.is_dialog_box_on_screen": (
+        lambda gs: Screen.__dict__["is_dialog_box_on_screen"].func(gs.screen)
+    ),
+    "screen.tiles_without_cursor": (
+        lambda gs: Screen.__dict__["tiles_without_cursor"].func(gs.screen)
+    ),
+}
+_CACHED_CALLS: dict[str, Callable[[YellowLegacyGameState], object]] = {
+    "get_ascii_screen": lambda gs: gs.get_ascii_screen(),
+    "screen.text": lambda gs: gs.screen.text,
+    "screen.is_dialog_box_on_screen": lambda gs: gs.screen.is_dialog_box_on_screen,
+    "screen.tiles_without_cursor": lambda gs: gs.screen.tiles_without_cursor,
+}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare the per-call latency of parsing the game state straight from the live emulator memory
+against parsing it from a bulk memory snapshot.
+
+Run with `python -m scripts.benchmarks.game_state_parsing <path to .state file>`.
+"""
+
+import argparse
+import timeit
+from pathlib import Path
+
+from loguru import logger
+from pyboy import PyBoy, PyBoyMemoryView
+
+from common.constants import DEFAULT_ROM_PATH
+from emulator.game_state import YellowLegacyGameState
+from emulator.memory import MemorySnapshot
+
+
+def main() -> None:
+    """Time both parsing strategies on the given save state."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("save_state", type=Path)
+    parser.add_argument("--rom-path", default=DEFAULT_ROM_PATH)
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    pyboy = PyBoy(args.rom_path, window="null", sound_volume=0)
+    with args.save_state.open("rb") as f:
+        pyboy.load_state(f)
+    pyboy.tick()
+    mem = pyboy.memory
+
+    live = _LiveMemory(mem)
+    snapshot = MemorySnapshot.from_memory(mem)
+    if YellowLegacyGameState.from_snapshot(live) != YellowLegacyGameState.from_snapshot(snapshot):
+        raise RuntimeError("The two parsing strategies disagree.")
+
+    results = {
+        "live memory (per-byte reads)": lambda: YellowLegacyGameState.from_snapshot(live),
+        "snapshot capture": lambda: MemorySnapshot.from_memory(mem),
+        "snapshot parse": lambda: YellowLegacyGameState.from_snapshot(snapshot),
+        "snapshot capture + parse": lambda: YellowLegacyGameState.from_memory(mem),
+    }
+    for name, func in results.items():
+        seconds = min(timeit.repeat(func, number=args.iterations, repeat=5)) / args.iterations
+        logger.info(f"{name:<30} {seconds * 1e6:8.1f} us/call")
+    pyboy.stop(save=False)
+
+
+class _LiveMemory:
+    """Reproduces the old access pattern, where every parser read went through PyBoy."""
+
+    def __init__(self, mem: PyBoyMemoryView) -> None:
+        self._mem = mem
+
+    def __getitem__(self, addr: int | slice) -> int | bytes:
+        if isinstance(addr, slice):
+            return bytes(self._mem[addr])
+        return self._mem[addr]
+
+    @property
+    def walkable_tiles(self) -> bytes:
+        walkable_tile_ptr = self._mem[0xD57D] | (self._mem[0xD57E] << 8)
+        tile_bank, tile_offset = divmod(walkable_tile_ptr, 0x4000)
+        tiles = []
+        for i in range(0x180):
+            tile = self._mem[tile_bank, tile_offset + i]
+            if tile == 0xFF:  # noqa: PLR2004
+                break
+            tiles.append(tile)
+        return bytes(tiles)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Compare the tail latency of critical-path LLM calls with a fixed timeout against adaptive timeouts
+and hedged requests, using a fake Gemini client that injects latencies with a heavy tail: most
+requests take around the median, and a few stall for many times longer. Also logs the number of
+requests sent, since each hedge spends quota on a second request.
+
+Time is scaled down, so the default median of 0.1s stands in for a typical 1s call, and the
+timeouts are scaled the same way.
+
+Run with `python -m scripts.benchmarks.llm_tail_latency`.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+from loguru import logger
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from database.base import SQLAlchemyBase
+from database.db_config import db_sessionmaker
+from database.llm_messages.model import LLMMessageDBModel  # noqa: F401
+from llm.scheduling import LatencyTracker
+from llm.schemas import GEMINI_FLASH_2_5
+from llm.service import MIN_TIMEOUT, TIMEOUT, GeminiLLMService
+
+_PROMPT_NAME = "press_buttons"
+# How much shorter the simulated time is than real time, e.g. a 60s timeout becomes 6s.
+_TIME_SCALE = 0.1
+
+
+class _LatencyInjectingModels:
+    """Stands in for the Gemini client's models, answering after a random, heavy-tailed delay."""
+
+    def __init__(self, median: float, stall_rate: float, rng: np.random.Generator) -> None:
+        self.median = median
+        self.stall_rate = stall_rate
+        self.rng = rng
+        self.requests = 0
+
+    async def generate_content(self, **_: Any) -> Any:  # noqa: ANN401
+        self.requests += 1
+        latency = self.median * self.rng.lognormal(sigma=0.3)
+        if self.rng.random() < self.stall_rate:
+            latency *= self.rng.uniform(5, 30)
+        await asyncio.sleep(latency)
+        return SimpleNamespace(
+            text="ok",
+            parsed=None,
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=1_000,
+                thoughts_token_count=512,
+                candidates_token_count=20,
+                cached_content_token_count=0,
+                total_token_count=1_532,
+            ),
+        )
+
+
+def main() -> None:
+    """Time the calls with each strategy, and log their latency percentiles and request counts."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--median", type=float, default=0.1)
+    parser.add_argument("--stall-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    strategies = {
+        "fixed timeout": LatencyTracker(
+            default_timeout=TIMEOUT * _TIME_SCALE,
+            min_timeout=TIMEOUT * _TIME_SCALE,
+        ),
+        "adaptive + hedged": LatencyTracker(
+            default_timeout=TIMEOUT * _TIME_SCALE,
+            min_timeout=MIN_TIMEOUT * _TIME_SCALE,
+        ),
+    }
+    for name, tracker in strategies.items():
+        models = _LatencyInjectingModels(
+            args.median,
+            args.stall_rate,
+            np.random.default_rng(args.seed),
+        )
+        latencies = asyncio.run(
+            _run(args.calls, models, tracker, hedged=name != "fixed timeout"),
+        )
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        logger.info(
+            f"{name:>17}: p50 {p50 * 1e3:6.0f}ms p95 {p95 * 1e3:6.0f}ms p99 {p99 * 1e3:6.0f}ms"
+            f" requests sent: {models.requests} for {args.calls} calls",
+        )
+
+
+async def _run(
+    calls: int,
+    models: _LatencyInjectingModels,
+    tracker: LatencyTracker,
+    *,
+    hedged: bool,
+) -> list[float]:
+    """Make the calls one after another, like an agent's iterations, and get their latencies."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp_dir) / 'benchmark.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLAlchemyBase.metadata.create_all)
+        db_sessionmaker.configure(bind=engine)
+
+        client = SimpleNamespace(aio=SimpleNamespace(models=models))
+        llm_service = GeminiLLMService(GEMINI_FLASH_2_5, client, None)  # type: ignore[arg-type]
+        llm_service.latency_tracker = tracker
+        llm_service.hedged_prompts = {_PROMPT_NAME} if hedged else set()
+
+        latencies = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            await llm_service.get_llm_response("Which button?", prompt_name=_PROMPT_NAME)
+            latencies.append(time.perf_counter() - start)
+
+        await engine.dispose()
+        return latencies
+
+
+if __name__ == "__main__":
+    main()
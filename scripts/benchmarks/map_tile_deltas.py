@@ -0,0 +1,87 @@
+"""
+Compare the tile bytes written to the DB for each step of a walk across a map when the whole map is
+rewritten against when only the delta is written, on synthetic maps the size of the largest maps in
+the game. The walk goes down the map and back up, so the way back reveals nothing new.
+
+Run with `python -m scripts.benchmarks.map_tile_deltas`.
+"""
+
+import argparse
+
+import numpy as np
+from loguru import logger
+
+from common.constants import SCREEN_SHAPE
+from common.enums import AsciiTile, MapId
+from common.tile_codes import TILE_CODES
+from database.map_memory.schemas import MapMemoryRead
+from overworld_map.schemas import OverworldMap
+from overworld_map.tile_delta import TileDelta
+
+# (height, width) in tiles of some of the largest maps.
+_MAP_SIZES = {
+    "route_17": (144, 20),
+    "viridian_forest": (48, 34),
+    "rock_tunnel_1f": (36, 40),
+}
+
+
+def main() -> None:
+    """Walk down and back up each map, and log the bytes that each approach writes."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    screen_height, screen_width = SCREEN_SHAPE
+    for name, (height, width) in _MAP_SIZES.items():
+        tiles = rng.choice(list(TILE_CODES), size=(height, width)).astype(str)
+        overworld_map = _make_map(height, width)
+        persisted = _to_map_memory(overworld_map)
+
+        rows = list(range(height - screen_height + 1))
+        full_bytes = delta_bytes = writes = 0
+        for top in rows + rows[::-1]:
+            screen = tiles[top : top + screen_height, :screen_width]
+            if not overworld_map.update_tiles(top, 0, screen):
+                continue
+            writes += 1
+            current = _to_map_memory(overworld_map)
+            delta = TileDelta.from_maps(persisted, current)
+            full_bytes += len(current.tiles)
+            delta_bytes += len(delta.positions) + len(delta.tiles)
+            persisted = current
+
+        logger.info(
+            f"{name:<16} {height:>3}x{width:<3} steps: {len(rows) * 2:>4} writes: {writes:>4}"
+            f" full rewrites: {full_bytes / 1024:7.1f} KiB deltas: {delta_bytes / 1024:6.1f} KiB",
+        )
+
+
+def _make_map(height: int, width: int) -> OverworldMap:
+    """Make an overworld map that hasn't been explored yet."""
+    return OverworldMap(
+        id=MapId.PALLET_TOWN,
+        ascii_tiles=[[AsciiTile.UNSEEN.value] * width] * height,
+        blockages={},
+        known_sprites={},
+        known_signs={},
+        known_warps={},
+        north_connection=None,
+        south_connection=None,
+        east_connection=None,
+        west_connection=None,
+    )
+
+
+def _to_map_memory(overworld_map: OverworldMap) -> MapMemoryRead:
+    """Get the map memory that the map store keeps for the map."""
+    return MapMemoryRead(
+        map_id=overworld_map.id,
+        tiles=overworld_map.tile_codes,
+        blockages=overworld_map.blockages,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compare the latency of finding the long-term memories most similar to a query by scanning lists of
+embeddings, as loaded from the DB, against the embedding index, with and without its IVF clusters,
+on synthetic clustered embeddings. Also logs the recall of the IVF search against the exact one.
+
+Run with `python -m scripts.benchmarks.memory_retrieval`.
+"""
+
+import argparse
+import time
+from functools import partial
+
+import numpy as np
+from loguru import logger
+
+from common.constants import DEFAULT_NUM_MEMORIES_RETRIEVED, DEFAULT_RERANKING_FACTOR
+from memory.embedding_index import EmbeddingIndex
+
+_DIMENSIONS = 768
+_NUM_TO_RERANK = int(DEFAULT_NUM_MEMORIES_RETRIEVED * DEFAULT_RERANKING_FACTOR)
+
+
+def main() -> None:
+    """Time a search at each number of memories, and check the recall of the IVF search."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1_000, 10_000, 50_000])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    for size in args.sizes:
+        centers = rng.normal(size=(max(size // 50, 1), _DIMENSIONS))
+        embeddings = centers[rng.integers(len(centers), size=size)]
+        embeddings += 0.5 * rng.normal(size=embeddings.shape)
+        queries = centers[rng.integers(len(centers), size=args.queries)].tolist()
+        legacy = {f"memory {i}": e for i, e in enumerate(embeddings.tolist())}
+
+        exact = _build_index(legacy, ivf_min_size=size + 1)
+        ivf = _build_index(legacy, ivf_min_size=size)
+
+        searches = {
+            "full scan": partial(_legacy_search, embeddings=legacy),
+            "index": partial(exact.search, num_results=_NUM_TO_RERANK),
+            "ivf index": partial(ivf.search, num_results=_NUM_TO_RERANK),
+        }
+        results = []
+        for name, search in searches.items():
+            start = time.perf_counter()
+            for query in queries:
+                search(query)
+            seconds = (time.perf_counter() - start) / args.queries
+            results.append(f"{name}: {seconds * 1e3:7.2f} ms")
+
+        recall = np.mean(
+            [
+                len(exact.search(q, _NUM_TO_RERANK).keys() & ivf.search(q, _NUM_TO_RERANK).keys())
+                / _NUM_TO_RERANK
+                for q in queries
+            ],
+        )
+        logger.info(f"memories: {size:>6} {' '.join(results)} ivf recall: {recall:.2f}")
+
+
+def _build_index(embeddings: dict[str, list[float]], ivf_min_size: int) -> EmbeddingIndex:
+    """Build an index of the embeddings, which is clustered once it reaches the minimum size."""
+    index = EmbeddingIndex(ivf_min_size=ivf_min_size)
+    for title, embedding in embeddings.items():
+        index.add(title, embedding)
+    return index
+
+
+def _legacy_search(query: list[float], embeddings: dict[str, list[float]]) -> dict[str, float]:
+    """Find the most similar memories the way retrieval used to, from lists of floats."""
+    mem_ids, mem_embeddings = zip(*embeddings.items(), strict=True)
+    mem_embeddings = np.array(mem_embeddings)
+    similarities = np.dot(query, mem_embeddings.T) / (
+        np.linalg.norm(query) * np.linalg.norm(mem_embeddings, axis=1)
+    )
+    top_n_ids = np.argsort(similarities)[-_NUM_TO_RERANK:]
+    return {mem_ids[i]: similarities[i] for i in top_n_ids}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Time the navigation path finding and flood fill on synthetic maps the size of the largest maps in
+the game, along with the cost of building, patching, and looking up their navigation graphs.
+
+Run with `python -m scripts.benchmarks.navigation`.
+"""
+
+import argparse
+import asyncio
+import time
+import timeit
+from collections.abc import Callable, Coroutine
+
+import numpy as np
+from loguru import logger
+
+from agent.subflows.overworld_handler.nodes.navigate.graph import (
+    NavigationGraph,
+    NavigationGraphCache,
+)
+from agent.subflows.overworld_handler.nodes.navigate.utils import (
+    calculate_path_to_target,
+    get_accessible_coords,
+)
+from common.constants import SCREEN_HEIGHT, SCREEN_SHAPE, SCREEN_WIDTH
+from common.enums import AsciiTile, MapId
+from common.schemas import Coords
+from overworld_map.schemas import OverworldMap
+
+# (height, width) in tiles of some of the largest maps.
+_MAP_SIZES = {
+    "route_17": (144, 20),
+    "viridian_forest": (48, 34),
+    "rock_tunnel_1f": (36, 40),
+    "safari_zone_west": (26, 30),
+}
+
+
+def main() -> None:
+    """Time path finding from corner to corner and a flood fill on each synthetic map."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    start = Coords(row=0, col=0)
+    for name, (height, width) in _MAP_SIZES.items():
+        map_data = _make_map(height, width, rng)
+        target = Coords(row=height - 1, col=width - 1)
+
+        path_seconds = _time(
+            lambda map_data=map_data, target=target: calculate_path_to_target(
+                start,
+                target,
+                map_data,
+                [],
+            ),
+            args.iterations,
+        )
+        fill_seconds = _time(
+            lambda map_data=map_data: get_accessible_coords(start, map_data, []),
+            args.iterations,
+        )
+        build_seconds = _time_sync(
+            lambda map_data=map_data: NavigationGraph(map_data, frozenset()),
+            args.iterations,
+        )
+        graph = NavigationGraph(map_data, frozenset())
+        revealed_map = _reveal_screen(map_data, rng)
+        patch_seconds = _time_sync(
+            lambda graph=graph, revealed_map=revealed_map: graph.patch(revealed_map),
+            args.iterations,
+        )
+        cache = NavigationGraphCache(max_size=1)
+        cache.get(map_data, [])
+        lookup_seconds = _time_sync(
+            lambda cache=cache, map_data=map_data: cache.get(map_data, []),
+            args.iterations,
+        )
+        logger.info(
+            f"{name:<18} {height:>3}x{width:<3}"
+            f" path: {path_seconds * 1e3:6.2f} ms"
+            f" accessible coords: {fill_seconds * 1e3:6.2f} ms"
+            f" graph build: {build_seconds * 1e3:6.2f} ms"
+            f" patch: {patch_seconds * 1e3:6.2f} ms"
+            f" cache hit: {lookup_seconds * 1e3:6.2f} ms",
+        )
+
+
+def _time(make_coro: Callable[[], Coroutine], iterations: int) -> float:
+    """Get the mean wall time of running a coroutine to completion."""
+
+    async def run() -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await make_coro()
+        return (time.perf_counter() - start) / iterations
+
+    return asyncio.run(run())
+
+
+def _time_sync(func: Callable[[], object], iterations: int) -> float:
+    """Get the mean wall time of a function call."""
+    return timeit.timeit(func, number=iterations) / iterations
+
+
+def _reveal_screen(map_data: OverworldMap, rng: np.random.Generator) -> OverworldMap:
+    """Get a copy of the map with a screen-sized window of tiles in the middle replaced."""
+    top, left = (map_data.height - SCREEN_HEIGHT) // 2, (map_data.width - SCREEN_WIDTH) // 2
+    revealed_map = map_data.model_copy()
+    revealed_map.update_tiles(
+        top, left, rng.choice([AsciiTile.FREE, AsciiTile.WALL], size=SCREEN_SHAPE)
+    )
+    return revealed_map
+
+
+def _make_map(height: int, width: int, rng: np.random.Generator) -> OverworldMap:
+    """Make a random map of walls, grass, and ledges with clear corners for the start and target."""
+    tiles = rng.choice(
+        [AsciiTile.FREE, AsciiTile.WALL, AsciiTile.GRASS, AsciiTile.LEDGE_DOWN],
+        size=(height, width),
+        p=[0.7, 0.18, 0.1, 0.02],
+    ).astype(str)
+    tiles[:2, :2] = AsciiTile.FREE
+    tiles[-2:, -2:] = AsciiTile.FREE
+    return OverworldMap(
+        id=MapId.PALLET_TOWN,
+        ascii_tiles=tiles.tolist(),
+        blockages={},
+        known_sprites={},
+        known_signs={},
+        known_warps={},
+        north_connection=None,
+        south_connection=None,
+        east_connection=None,
+        west_connection=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
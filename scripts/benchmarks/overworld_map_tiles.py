@@ -0,0 +1,117 @@
+"""
+Compare the memory use and latency of storing overworld map tiles as lists of characters against
+the encoded tiles, on synthetic maps the size of the largest maps in the game.
+
+Run with `python -m scripts.benchmarks.overworld_map_tiles`.
+"""
+
+import argparse
+import sys
+import timeit
+from copy import deepcopy
+
+import numpy as np
+from loguru import logger
+from pydantic import BaseModel
+
+from common.constants import SCREEN_SHAPE
+from common.enums import AsciiTile, MapId
+from common.tile_codes import TILE_CODES
+from overworld_map.schemas import OverworldMap
+
+# (height, width) in tiles of some of the largest maps.
+_MAP_SIZES = {
+    "route_17": (144, 20),
+    "viridian_forest": (48, 34),
+    "rock_tunnel_1f": (36, 40),
+}
+
+
+class _LegacyTiles(BaseModel):
+    """The tiles as they used to be stored on the overworld map."""
+
+    ascii_tiles: list[list[str]]
+
+
+def main() -> None:
+    """Compare the size and the cost of common operations for each representation of the tiles."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    for name, (height, width) in _MAP_SIZES.items():
+        tiles = rng.choice(list(TILE_CODES), size=(height, width)).astype(str)
+        screen = rng.choice(list(TILE_CODES), size=SCREEN_SHAPE).astype(str)
+        legacy = _LegacyTiles(ascii_tiles=tiles.tolist())
+        new = _make_map(tiles)
+
+        legacy_bytes = sys.getsizeof(legacy.ascii_tiles) + sum(
+            sys.getsizeof(row) for row in legacy.ascii_tiles
+        )  # The characters themselves are interned, so they're shared between maps.
+        logger.info(
+            f"{name:<16} {height:>3}x{width:<3}"
+            f" list of lists: {legacy_bytes / 1024:6.1f} KiB"
+            f" encoded: {sys.getsizeof(new.tile_codes) / 1024:6.1f} KiB",
+        )
+
+        def legacy_update(legacy: _LegacyTiles = legacy, screen: np.ndarray = screen) -> None:
+            array = np.array(legacy.ascii_tiles)
+            array[: screen.shape[0], : screen.shape[1]] = screen
+            legacy.ascii_tiles = array.tolist()
+
+        ops = {
+            "ndarray": (
+                lambda legacy=legacy: np.array(legacy.ascii_tiles),
+                lambda new=new: new.ascii_tiles_ndarray,
+            ),
+            "string": (
+                lambda legacy=legacy: "\n".join("".join(row) for row in legacy.ascii_tiles),
+                lambda new=new: new.ascii_tiles_str,
+            ),
+            "explored %": (
+                lambda legacy=legacy: np.mean(np.array(legacy.ascii_tiles) != AsciiTile.UNSEEN),
+                lambda new=new: np.mean(new.tile_codes_ndarray != TILE_CODES[AsciiTile.UNSEEN]),
+            ),
+            "screen update": (
+                legacy_update,
+                lambda new=new, screen=screen: new.update_tiles(0, 0, screen),
+            ),
+            "deep copy": (
+                lambda legacy=legacy: deepcopy(legacy),
+                lambda new=new: deepcopy(new),
+            ),
+            "dump + validate": (
+                lambda legacy=legacy: _LegacyTiles.model_validate(legacy.model_dump()),
+                lambda new=new: OverworldMap.model_validate(new.model_dump()),
+            ),
+        }
+        for op, (legacy_func, new_func) in ops.items():
+            legacy_seconds = timeit.timeit(legacy_func, number=args.iterations) / args.iterations
+            new_seconds = timeit.timeit(new_func, number=args.iterations) / args.iterations
+            logger.info(
+                f"{'':<24} {op:<16}"
+                f" list of lists: {legacy_seconds * 1e6:8.1f} us"
+                f" encoded: {new_seconds * 1e6:8.1f} us",
+            )
+
+
+def _make_map(tiles: np.ndarray) -> OverworldMap:
+    """Make an overworld map with the given tiles and nothing else on it."""
+    return OverworldMap(
+        id=MapId.PALLET_TOWN,
+        ascii_tiles=tiles.tolist(),
+        blockages={},
+        known_sprites={},
+        known_signs={},
+        known_warps={},
+        north_connection=None,
+        south_connection=None,
+        east_connection=None,
+        west_connection=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
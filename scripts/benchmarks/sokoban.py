@@ -0,0 +1,98 @@
+"""
+Time the Sokoban solver on synthetic boulder rooms, from small ones like Seafoam Islands to large
+open rooms with several boulders like Victory Road, along with the number of states it searched.
+
+Run with `python -m scripts.benchmarks.sokoban`.
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+from loguru import logger
+
+from agent.subflows.overworld_handler.nodes.sokoban_solver.schemas import (
+    FREE_TILE,
+    WALL_TILE,
+    WARP_TILE,
+    SokobanMap,
+)
+from agent.subflows.overworld_handler.nodes.sokoban_solver.solver import SokobanSolver
+from common.schemas import Coords
+
+# (height, width, number of boulders, wall density, goal tile) for each synthetic room.
+_ROOMS = {
+    "seafoam_hole": (9, 10, 2, 0.1, WARP_TILE),
+    "victory_road_plate": (18, 20, 3, 0.08, FREE_TILE),
+    "crowded": (12, 12, 6, 0.05, FREE_TILE),
+    "large_open": (30, 30, 2, 0.05, FREE_TILE),
+}
+
+
+def main() -> None:
+    """Solve each synthetic room and log the search size and the wall time."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    for name, (height, width, num_boulders, wall_density, goal_tile) in _ROOMS.items():
+        sokoban_map, player_pos = _make_room(
+            (height, width),
+            num_boulders,
+            wall_density,
+            goal_tile,
+            rng,
+        )
+        solver = SokobanSolver(sokoban_map, {})
+        solution = solver.solve(player_pos)
+        seconds = (
+            timeit.timeit(
+                lambda sokoban_map=sokoban_map, player_pos=player_pos: SokobanSolver(
+                    sokoban_map,
+                    {},
+                ).solve(player_pos),
+                number=args.iterations,
+            )
+            / args.iterations
+        )
+        logger.info(
+            f"{name:<20} {height:>2}x{width:<2} boulders: {num_boulders}"
+            f" solution: {len(solution) if solution is not None else '-':>3} buttons"
+            f" expanded: {solver.expanded_states:>6} generated: {solver.generated_states:>6}"
+            f" time: {seconds * 1e3:8.2f} ms",
+        )
+
+
+def _make_room(
+    shape: tuple[int, int],
+    num_boulders: int,
+    wall_density: float,
+    goal_tile: str,
+    rng: np.random.Generator,
+) -> tuple[SokobanMap, Coords]:
+    """
+    Make a walled room with scattered walls, boulders away from the walls, and a goal in the far
+    corner from the player.
+    """
+    height, width = shape
+    tiles = np.where(rng.random(shape) < wall_density, WALL_TILE, FREE_TILE)
+    tiles[[0, -1], :] = WALL_TILE
+    tiles[:, [0, -1]] = WALL_TILE
+    tiles[1:3, 1:3] = FREE_TILE
+    tiles[-3:-1, -3:-1] = FREE_TILE
+    goal = Coords(row=height - 2, col=width - 2)
+    tiles[goal.row, goal.col] = goal_tile
+
+    inner = np.argwhere(tiles[2:-2, 2:-2] == FREE_TILE) + 2
+    boulders = {
+        Coords(row=row, col=col)
+        for row, col in inner[rng.choice(len(inner), num_boulders, replace=False)]
+    }
+    sokoban_map = SokobanMap(tiles=tiles.tolist(), boulders=boulders, goals={goal})
+    return sokoban_map, Coords(row=1, col=1)
+
+
+if __name__ == "__main__":
+    main()